@@ -1,14 +1,114 @@
+import json
+import os
+import queue
+import re
+import threading
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import quote, unquote
+
+from flask import Flask, Response, g, jsonify, request
+from flask_cors import CORS
+from werkzeug.test import EnvironBuilder
+
+import instrumentation
+from compute_executor import ComputeTimeout, ExecutorBusy, get_executor
+from lazy_import import LazyModule
+from response_cache import DEFAULT_MAX_BYTES, ResponseCache, canonical_key
+import serialization
+from singleflight import SingleFlight
+
+# Modules Quant A / Quant B et dépendances lourdes (pandas, scipy, yfinance, ML) chargés à la première
+# requête qui les utilise: le process démarre et répond à /api/health sans les importer
+quant_a = LazyModule('quant_a')
+quant_b = LazyModule('quant_b')
+price_store = LazyModule('price_store')
+price_stream = LazyModule('price_stream')
+indicators = LazyModule('indicators')
+rebalancing = LazyModule('rebalancing')
+screener = LazyModule('screener')
+risk_engine = LazyModule('risk_engine')
+ml_service = LazyModule('ml_service')
+ml_prediction = LazyModule('ml_prediction')
+rolling_analytics = LazyModule('rolling_analytics')
+factor_model = LazyModule('factor_model')
 
+app = Flask(__name__)
+CORS(app, expose_headers=['ETag', 'Server-Timing'])
 
-from flask import Flask, jsonify, request
-from flask_cors import CORS
+# Requêtes identiques simultanées (refresh frontend synchronisés) -> un seul calcul partagé
+route_flights = SingleFlight()
 
-# Import des modules Quant A et Quant B
-import quant_a
-import quant_b
+# Résultats de /api/portfolio, clé = spec normalisée + version des données
+portfolio_cache = ResponseCache(
+    max_bytes=int(float(os.environ.get('PORTFOLIO_CACHE_MAX_MB', DEFAULT_MAX_BYTES / 2**20)) * 2**20)
+)
 
-app = Flask(__name__)
-CORS(app)
+STREAM_MAX_TICKERS = 50
+BATCH_MAX_QUERIES = 50
+DEFAULT_BATCH_WORKERS = 8
+STREAM_HEARTBEAT = 15  # secondes sans événement avant un commentaire keep-alive
+
+# Compteurs additionnels exposés par /api/stats (ex: préchargement du mode ASGI)
+extra_stats = {}
+
+
+def register_stats(name, snapshot):
+    extra_stats[name] = snapshot
+
+
+# ============================================================================
+# INSTRUMENTATION (Server-Timing, latences, ?profile=1)
+# ============================================================================
+
+@app.before_request
+def start_instrumentation():
+    instrumentation.begin()
+    if request.args.get('profile') == '1' and instrumentation.profiling_enabled():
+        g.profiler = instrumentation.start_profile()
+
+
+@app.after_request
+def finish_instrumentation(response):
+    profile = None
+    if 'profiler' in g:
+        profiler = g.pop('profiler')
+        profile = (instrumentation.stop_profile(profiler) if profiler is not None
+                   else {'error': 'Un autre profil est déjà en cours, réessayez'})
+
+    stages = instrumentation.end()
+    if stages is None:
+        return response
+    total = stages.elapsed()
+    route = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+    instrumentation.REQUEST_LATENCY.observe(total, route, request.method, str(response.status_code))
+    response.headers['Server-Timing'] = instrumentation.server_timing(stages, total)
+
+    if profile is not None:
+        _attach_profile(response, profile)
+    return response
+
+
+@app.teardown_request
+def reset_instrumentation(_):
+    # Exception non gérée: after_request n'a pas été appelé
+    instrumentation.end()
+    profiler = g.pop('profiler', None)
+    if profiler is not None:
+        instrumentation.stop_profile(profiler)
+
+
+def _attach_profile(response, profile):
+    """Résumé cProfile ajouté aux réponses JSON (objet), sous la clé 'profile'"""
+    if response.is_streamed or not response.is_json:
+        return
+    payload = response.get_json(silent=True)
+    if not isinstance(payload, dict):
+        return
+    payload['profile'] = profile
+    response.set_data(json.dumps(payload))
+    # Corps modifié: l'ETag ne correspond plus à la représentation en cache
+    response.headers.pop('ETag', None)
 
 
 @app.route('/api/health')
@@ -17,6 +117,64 @@ def health():
     return jsonify({'status': 'online', 'message': 'Backend Python OK - Yahoo Finance LIVE'})
 
 
+def _stats_snapshot():
+    return {
+        'price_store': price_store.get_store().snapshot(),
+        'indicators': indicators.streaming_stats(),
+        'compute_executor': get_executor().snapshot(),
+        'portfolio_cache': portfolio_cache.snapshot(),
+        'routes_singleflight': route_flights.snapshot(),
+        'price_stream': price_stream.get_hub().snapshot(),
+        'screener': screener.get_jobs(get_executor()).snapshot(),
+        'ml_service': ml_service.get_service().snapshot(),
+        **{name: snapshot() for name, snapshot in extra_stats.items()}
+    }
+
+
+@app.route('/api/stats')
+def stats():
+    """Compteurs du cache de prix et de la coalescence des requêtes"""
+    return jsonify(_stats_snapshot())
+
+
+@app.route('/api/metrics')
+def metrics():
+    """Métriques Prometheus: histogrammes de latence (routes, étapes) et compteurs de /api/stats"""
+    return Response(instrumentation.render_metrics(_stats_snapshot()),
+                    content_type='text/plain; version=0.0.4; charset=utf-8')
+
+
+@app.route('/api/stream')
+def stream_prices():
+    """Flux SSE des prix (?tickers=A,B,...): un événement par nouveau prix ou nouvelle barre"""
+    tickers = [t.strip().upper() for t in request.args.get('tickers', '').split(',') if t.strip()]
+    if not tickers:
+        return jsonify({'error': 'Paramètre tickers requis'}), 400
+    if len(tickers) > STREAM_MAX_TICKERS:
+        return jsonify({'error': f'Maximum {STREAM_MAX_TICKERS} tickers par flux'}), 400
+
+    hub = price_stream.get_hub()
+    subscription = hub.subscribe(tickers)
+    print(f"[Stream] Client subscribed to {len(tickers)} tickers")
+
+    def events():
+        try:
+            yield 'retry: 5000\n\n'
+            while True:
+                try:
+                    event = subscription.get(timeout=STREAM_HEARTBEAT)
+                except queue.Empty:
+                    yield ': keep-alive\n\n'
+                    continue
+                yield f'event: price\ndata: {json.dumps(event)}\n\n'
+        finally:
+            # Client déconnecté: le poller arrête de suivre les tickers orphelins
+            hub.unsubscribe(subscription)
+
+    return Response(events(), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+
 # ============================================================================
 # QUANT A - SINGLE ASSET ANALYSIS (Martin Partiot)
 # ============================================================================
@@ -27,7 +185,13 @@ def get_asset_data(ticker):
     try:
         print(f"[Quant A] Fetching data for {ticker}...")
 
-        result = quant_a.get_asset_data(ticker)
+        window = _history_params(request.args)
+        media_type = serialization.negotiate(request.accept_mimetypes)
+        layout = serialization.history_layout(media_type)
+        result = route_flights.do(
+            ('asset', ticker.upper(), *window.values(), layout),
+            quant_a.get_asset_data, ticker, **window, history_layout=layout
+        )
 
         if result is None:
             print(f"[Quant A] No data from Yahoo Finance for {ticker}")
@@ -35,26 +199,37 @@ def get_asset_data(ticker):
                 'error': f'Impossible de récupérer les données pour {ticker}. Vérifiez le symbole.'
             }), 404
 
-        print(f"[Quant A] Success: {len(result['history'])} data points retrieved")
-        return jsonify(result)
+        print(f"[Quant A] Success: {result['bars']} bars retrieved")
+        return _encoded_response(result, media_type)
 
     except Exception as e:
-        print(f"[Quant A] Error: {e}")
-        return jsonify({'error': f'Erreur lors de la récupération des données: {str(e)}'}), 500
+        return _error_response(e, 'Quant A', 'Erreur lors de la récupération des données')
 
 
 @app.route('/api/backtest', methods=['POST'])
 def backtest():
     """Effectue un backtest de stratégie sur un actif unique"""
     try:
-        data = request.get_json()
-        ticker = data.get('ticker')
-        strategy = data.get('strategy', 'buy-hold')
-        period = data.get('period', 20)
+        data = _json_body()
+        ticker = _ticker(data)
+        strategy = _param(data, 'strategy', str, 'buy-hold')
+        period = _param(data, 'period', int, 20)
+        window = _history_params(data, period_key='history_period')
+        # Gestion du risque optionnelle: stops en fraction du prix, sizing par volatilité cible
+        risk = {
+            name: _param(data, name, float)
+            for name in ('stop_loss', 'take_profit', 'trailing_stop', 'target_volatility')
+        }
+        risk['max_leverage'] = _param(data, 'max_leverage', float, 1.0)
+        media_type = serialization.negotiate(request.accept_mimetypes)
+        layout = serialization.history_layout(media_type)
 
         print(f"[Quant A] Running {strategy} strategy on {ticker} with period={period}...")
 
-        result = quant_a.backtest_strategy(ticker, strategy, period)
+        result = route_flights.do(
+            ('backtest', ticker.upper(), strategy, period, *window.values(), *risk.values(), layout),
+            quant_a.backtest_strategy, ticker, strategy, period, **window, **risk, history_layout=layout
+        )
 
         if result is None:
             print(f"[Quant A] No data from Yahoo Finance for {ticker}")
@@ -63,13 +238,87 @@ def backtest():
         print(f"[Quant A] Complete: Return={result['strategy_return']:.2f}%, " +
               f"Sharpe={result['sharpe_ratio']:.2f}, MaxDD={result['max_drawdown']:.2f}%")
 
+        return _encoded_response(result, media_type)
+
+    except Exception as e:
+        return _error_response(e, 'Quant A', 'Erreur lors du backtest')
+
+
+@app.route('/api/backtest/sweep', methods=['POST'])
+def backtest_sweep():
+    """Évalue une stratégie sur toute une grille de périodes (et de seuils) en une passe vectorisée"""
+    try:
+        data = _json_body()
+        ticker = _ticker(data)
+        strategy = _param(data, 'strategy', str, 'momentum')
+        periods = _param_list(data, 'periods', int) or list(range(
+            _param(data, 'period_min', int, 5),
+            _param(data, 'period_max', int, 100) + 1,
+            _param(data, 'period_step', int, 1)
+        ))
+        thresholds = _param_list(data, 'thresholds', float)
+        window = _history_params(data, period_key='history_period')
+        window.pop('max_points')
+
+        if strategy not in quant_a.SWEEP_STRATEGIES:
+            return jsonify({'error': f'Stratégie inconnue: {strategy}'}), 400
+        if not periods or min(periods) < 2:
+            return jsonify({'error': 'Les périodes doivent être >= 2'}), 400
+
+        print(f"[Quant A] Sweeping {strategy} on {ticker} over {len(periods)} periods...")
+
+        result = quant_a.backtest_sweep(ticker, strategy, periods, thresholds, **window)
+
+        if result is None:
+            return jsonify({'error': f'Impossible de récupérer les données pour {ticker}'}), 404
+
         return jsonify(result)
 
     except Exception as e:
-        print(f"[Quant A] Error: {e}")
-        import traceback
-        traceback.print_exc()
-        return jsonify({'error': f'Erreur lors du backtest: {str(e)}'}), 500
+        return _error_response(e, 'Quant A', 'Erreur lors du sweep')
+
+
+@app.route('/api/screener', methods=['POST'])
+def submit_screener():
+    """Lance (ou réutilise) un screening de toutes les stratégies sur un univers de tickers"""
+    try:
+        data = _json_body()
+        tickers = _param_list(data, 'tickers', str, [])
+        strategies = _param_list(data, 'strategies', str) or list(quant_a.SWEEP_STRATEGIES)
+        period = _param(data, 'period', int, 20)
+        window = _history_params(data, period_key='history_period', default_period='1y')
+        window.pop('max_points')
+        screener.validate(tickers, strategies)
+        if period < 2:
+            return jsonify({'error': 'La période doit être >= 2'}), 400
+
+        job = screener.get_jobs(get_executor()).submit(tickers, strategies, period, **window)
+        print(f"[Quant A] Screener job {job.id}: {len(tickers)} tickers x {len(strategies)} strategies ({job.status})")
+
+        status = 200 if job.status == 'done' else 202
+        return jsonify(job.to_dict()), status, {'Location': f'/api/screener/{job.id}'}
+
+    except Exception as e:
+        return _error_response(e, 'Quant A', 'Erreur lors du lancement du screener')
+
+
+@app.route('/api/screener/<job_id>')
+def get_screener(job_id):
+    """Progression d'un screening, puis classement (?sort=sharpe_ratio|strategy_return|max_drawdown&limit=N)"""
+    try:
+        sort = request.args.get('sort', 'sharpe_ratio')
+        limit = request.args.get('limit')
+        if sort not in screener.SORT_KEYS:
+            return jsonify({'error': f'Tri inconnu: {sort}'}), 400
+
+        job = screener.get_jobs(get_executor()).get(job_id)
+        if job is None:
+            return jsonify({'error': f'Job inconnu ou expiré: {job_id}'}), 404
+
+        return jsonify(job.to_dict(sort, int(limit) if limit else None))
+
+    except Exception as e:
+        return _error_response(e, 'Quant A', 'Erreur lors de la lecture du screener')
 
 
 # ============================================================================
@@ -80,13 +329,29 @@ def backtest():
 def analyze_portfolio():
     """Analyse complète d'un portefeuille multi-actifs"""
     try:
-        data = request.get_json()
-        assets = data.get('assets', [])
-        rebalance_freq = data.get('rebalance_freq', 'monthly')
+        data = _json_body()
+        assets = _assets(data)
+        rebalance_freq, rebalance = _rebalance_params(data)
+        window = _history_params(data)
+        media_type = serialization.negotiate(request.accept_mimetypes)
+        layout = serialization.history_layout(media_type)
 
         print(f"[Quant B] Analyzing portfolio with {len(assets)} assets, rebalance={rebalance_freq}")
 
-        result = quant_b.analyze_portfolio(assets, rebalance_freq)
+        # Une entrée de cache (et un ETag) par représentation
+        cache_key = quant_b.portfolio_cache_key(assets, rebalance_freq, **window, **rebalance)
+        cache_key = canonical_key(cache_key, media_type) if cache_key else None
+        cached = portfolio_cache.get(cache_key) if cache_key else None
+        if cached is not None:
+            print("[Quant B] Served from cache")
+            return _cached_response(*cached, media_type)
+
+        flight_key = ('portfolio', _assets_key(assets), rebalance_freq,
+                      *rebalance.values(), *window.values(), layout)
+        result = route_flights.do(
+            flight_key, quant_b.analyze_portfolio, assets, rebalance_freq, executor=get_executor(), **window,
+            **rebalance, history_layout=layout
+        )
 
         if result is None:
             return jsonify({'error': 'Données insuffisantes pour analyser le portefeuille'}), 400
@@ -94,13 +359,495 @@ def analyze_portfolio():
         print(f"[Quant B] Complete: Return={result['total_return']:.2f}%, " +
               f"Vol={result['portfolio_volatility']:.2f}%, Sharpe={result['sharpe_ratio']:.2f}")
 
+        # Prédiction ML stale / pending (timeout du service ML): réponse servie mais pas mise en cache
+        ml_status = (result.get('ml_prediction') or {}).get('status')
+        if cache_key is None or ml_status in ('stale', 'pending'):
+            return _encoded_response(result, media_type)
+
+        body = _encoded_response(result, media_type).get_data()
+        portfolio_cache.put(cache_key, body, cache_key)
+        return _cached_response(body, cache_key, media_type)
+
+    except Exception as e:
+        return _error_response(e, 'Quant B', 'Erreur lors de l\'analyse du portefeuille')
+
+
+def _history_params(values, period_key='period', default_period='3mo'):
+    """Fenêtre d'historique demandée (query string ou corps JSON): période, intervalle, bornes, points max"""
+    period = _param(values, period_key, str, default_period)
+    interval = _param(values, 'interval', str, '1d')
+    if period not in price_store.PERIOD_OFFSETS and period not in ('ytd', 'max'):
+        raise ValueError(f'Période inconnue: {period}')
+    if interval not in price_store.INTERVALS:
+        raise ValueError(f'Intervalle inconnu: {interval}')
+
+    return {
+        period_key: period,
+        'interval': interval,
+        'start': _param(values, 'start', str),
+        'end': _param(values, 'end', str),
+        'max_points': _param(values, 'max_points', int),
+    }
+
+
+def _json_body():
+    """Corps JSON de la requête, ValueError si ce n'est pas un objet"""
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        raise ValueError('Corps JSON invalide: objet attendu')
+    return data
+
+
+def _param(values, name, cast, default=None):
+    """
+    Paramètre scalaire converti par cast (str, int ou float), None si absent
+
+    ValueError (400) pour une valeur d'un autre type (liste, objet...): les clés de coalescence et de cache
+    sont construites à partir de ces valeurs
+    """
+    value = values.get(name, default)
+    if value is None:
+        return None
+    if cast is str:
+        if not isinstance(value, str):
+            raise ValueError(f'{name} doit être une chaîne')
+        return value
+    if isinstance(value, bool) or not isinstance(value, (int, float, str)):
+        raise ValueError(f'{name} doit être un nombre')
+    try:
+        return cast(value)
+    except ValueError:
+        raise ValueError(f'{name} invalide: {value!r}') from None
+
+
+def _param_list(values, name, cast, default=None):
+    """Liste de paramètres scalaires (même validation que _param), None si absente"""
+    items = values.get(name, default)
+    if items is None:
+        return None
+    if not isinstance(items, (list, tuple)) or any(item is None for item in items):
+        raise ValueError(f'{name} doit être une liste de valeurs')
+    return [_param({name: item}, name, cast) for item in items]
+
+
+def _ticker(values):
+    ticker = _param(values, 'ticker', str)
+    if not ticker:
+        raise ValueError('ticker manquant')
+    return ticker
+
+
+def _assets(values, weighted=True):
+    """Actifs du corps JSON: liste de {'ticker', 'weight'} (poids optionnel si weighted=False)"""
+    assets = values.get('assets') or []
+    if not isinstance(assets, list) or not all(isinstance(asset, dict) for asset in assets):
+        raise ValueError("assets doit être une liste d'objets {'ticker', 'weight'}")
+    checked = []
+    for asset in assets:
+        asset = {**asset, 'ticker': _ticker(asset)}
+        if 'weight' in asset or weighted:
+            asset['weight'] = _param(asset, 'weight', float)
+            if asset['weight'] is None:
+                raise ValueError(f"Poids manquant pour {asset['ticker']}")
+        checked.append(asset)
+    return checked
+
+
+def _assets_key(assets):
+    return tuple((asset['ticker'], asset.get('weight')) for asset in assets)
+
+
+def _rebalance_params(values):
+    """Fréquence de rééquilibrage et paramètres (seuil, coûts) validés"""
+    rebalance_freq = _param(values, 'rebalance_freq', str, 'monthly')
+    rebalance = {
+        'rebalance_threshold': _param(values, 'rebalance_threshold', float, rebalancing.DEFAULT_THRESHOLD),
+        'transaction_cost_bps': _param(values, 'transaction_cost_bps', float, rebalancing.DEFAULT_COST_BPS),
+    }
+    rebalancing.validate(rebalance_freq, rebalance['rebalance_threshold'], rebalance['transaction_cost_bps'])
+    return rebalance_freq, rebalance
+
+
+def _error_response(e, tag, message):
+    """Réponse d'erreur commune aux routes: 400 paramètres invalides, 503 calcul saturé, 504 timeout, 500 sinon"""
+    if isinstance(e, ValueError):
+        return jsonify({'error': str(e)}), 400
+    if isinstance(e, ExecutorBusy):
+        print(f"[{tag}] Rejected: {e}")
+        return jsonify({'error': 'Serveur de calcul saturé, réessayez dans quelques secondes'}), 503, {'Retry-After': '5'}
+    if isinstance(e, ComputeTimeout):
+        print(f"[{tag}] Timeout: {e}")
+        return jsonify({'error': f'Calcul trop long: {str(e)}'}), 504
+    print(f"[{tag}] Error: {e}")
+    traceback.print_exc()
+    return jsonify({'error': f'{message}: {str(e)}'}), 500
+
+
+@app.route('/api/portfolio/optimize', methods=['POST'])
+def optimize_portfolio():
+    """Poids optimaux (min-variance, max-sharpe, risk-parity, frontier) sous bornes de poids"""
+    try:
+        data = _json_body()
+        assets = _assets(data, weighted=False) or [{'ticker': t} for t in _param_list(data, 'tickers', str, [])]
+        mode = _param(data, 'mode', str, 'max-sharpe')
+        window = _history_params(data, default_period='1y')
+        window.pop('max_points')
+
+        print(f"[Quant B] Optimizing {len(assets)} assets, mode={mode}")
+
+        result = quant_b.optimize_portfolio(
+            assets, mode,
+            min_weight=_param(data, 'min_weight', float, 0.0),
+            max_weight=_param(data, 'max_weight', float, 1.0),
+            frontier_points=_param(data, 'frontier_points', int, 20),
+            **window
+        )
+
+        if result is None:
+            return jsonify({'error': 'Données insuffisantes pour optimiser le portefeuille'}), 400
+
         return jsonify(result)
 
     except Exception as e:
-        print(f"[Quant B] Error: {e}")
-        import traceback
-        traceback.print_exc()
-        return jsonify({'error': f'Erreur lors de l\'analyse du portefeuille: {str(e)}'}), 500
+        return _error_response(e, 'Quant B', 'Erreur lors de l\'optimisation')
+
+
+@app.route('/api/portfolio/ml', methods=['POST'])
+def portfolio_ml():
+    """Prédiction ML du portefeuille (modèle en cache, mis à jour incrémentalement) et évaluation walk-forward"""
+    try:
+        data = _json_body()
+        assets = _assets(data)
+        rebalance_freq, rebalance = _rebalance_params(data)
+        params = {
+            'window': _param(data, 'window', int, 5),
+            'n_days': _param(data, 'n_days', int, 5),
+            'train_size': _param(data, 'train_size', int),
+            'min_train': _param(data, 'min_train', int, ml_prediction.DEFAULT_MIN_TRAIN),
+        }
+        if not 2 <= params['window'] <= 60:
+            raise ValueError('window doit être compris entre 2 et 60')
+        if not 1 <= params['n_days'] <= 30:
+            raise ValueError('n_days doit être compris entre 1 et 30')
+        if params['train_size'] is not None and params['train_size'] < 1:
+            raise ValueError('train_size doit être positif')
+        window = _history_params(data, default_period='1y')
+        window.pop('max_points')
+
+        print(f"[Quant B] ML: {len(assets)} assets, window={params['window']}, train_size={params['train_size']}")
+
+        flight_key = ('ml', _assets_key(assets), rebalance_freq,
+                      *rebalance.values(), *params.values(), *window.values())
+        result = route_flights.do(
+            flight_key, quant_b.portfolio_ml, assets, rebalance_freq, **window, **params, **rebalance
+        )
+
+        if result is None:
+            return jsonify({'error': 'Données insuffisantes pour la prédiction du portefeuille'}), 400
+
+        return jsonify(result)
+
+    except Exception as e:
+        return _error_response(e, 'Quant B', 'Erreur lors de la prédiction')
+
+
+@app.route('/api/portfolio/rolling', methods=['POST'])
+def portfolio_rolling():
+    """Sharpe, volatilité, beta vs SPY et corrélations glissants du portefeuille (fenêtres 20 / 60 / 120 par défaut)"""
+    try:
+        data = _json_body()
+        assets = _assets(data)
+        rebalance_freq, rebalance = _rebalance_params(data)
+        windows = tuple(sorted(set(_param_list(data, 'windows', int, rolling_analytics.DEFAULT_WINDOWS))))
+        rolling_analytics.validate(windows)
+        pairs = data.get('pairs')
+        if pairs is not None and not (isinstance(pairs, list) and all(
+                isinstance(pair, list) and len(pair) == 2 and all(isinstance(t, str) for t in pair) for pair in pairs)):
+            raise ValueError('pairs doit être une liste de paires de tickers')
+        pairs = tuple(tuple(pair) for pair in pairs) if pairs is not None else None
+        window = _history_params(data, default_period='1y')
+        media_type = serialization.negotiate(request.accept_mimetypes)
+        layout = serialization.history_layout(media_type)
+
+        print(f"[Quant B] Rolling analytics: {len(assets)} assets, windows={list(windows)}")
+
+        flight_key = ('rolling', _assets_key(assets), windows, pairs, rebalance_freq,
+                      *rebalance.values(), *window.values(), layout)
+        result = route_flights.do(
+            flight_key, quant_b.portfolio_rolling, assets, windows, pairs, rebalance_freq, executor=get_executor(),
+            **window, **rebalance, history_layout=layout
+        )
+
+        if result is None:
+            return jsonify({'error': 'Données insuffisantes pour les métriques glissantes'}), 400
+
+        return _encoded_response(result, media_type)
+
+    except Exception as e:
+        return _error_response(e, 'Quant B', 'Erreur lors du calcul des métriques glissantes')
+
+
+@app.route('/api/portfolio/factors', methods=['POST'])
+def portfolio_factors():
+    """Expositions factorielles (betas, alpha, t-stats, R²) de chaque actif et du portefeuille, en une régression"""
+    try:
+        data = _json_body()
+        assets = _assets(data, weighted=False) or [{'ticker': t} for t in _param_list(data, 'tickers', str, [])]
+        factors = _param_list(data, 'factors', str)
+        specs = factor_model.resolve(factors)
+        rebalance_freq, rebalance = _rebalance_params(data)
+        window = _history_params(data, default_period='1y')
+        window.pop('max_points')
+
+        print(f"[Quant B] Factor exposures: {len(assets)} assets, factors={[spec[0] for spec in specs]}")
+
+        flight_key = ('factors', _assets_key(assets), tuple(specs), rebalance_freq,
+                      *rebalance.values(), *window.values())
+        result = route_flights.do(
+            flight_key, quant_b.portfolio_factors, assets, factors, rebalance_freq, executor=get_executor(),
+            **window, **rebalance
+        )
+
+        if result is None:
+            return jsonify({'error': 'Données insuffisantes pour la régression factorielle'}), 400
+
+        return jsonify(result)
+
+    except Exception as e:
+        return _error_response(e, 'Quant B', 'Erreur lors de la régression factorielle')
+
+
+@app.route('/api/portfolio/risk', methods=['POST'])
+def portfolio_risk():
+    """VaR / CVaR simulées (parametric, bootstrap, normal, student-t) et scénarios forward du portefeuille"""
+    try:
+        data = _json_body()
+        assets = data.get('assets', [])
+        method = _param(data, 'method', str, 'bootstrap')
+        params = {
+            'horizon': _param(data, 'horizon', int, risk_engine.DEFAULT_HORIZON),
+            'paths': _param(data, 'paths', int, risk_engine.DEFAULT_PATHS),
+            'confidence': tuple(_param_list(data, 'confidence', float, risk_engine.DEFAULT_CONFIDENCE)),
+            'seed': _param(data, 'seed', int, risk_engine.DEFAULT_SEED),
+            'block_size': _param(data, 'block_size', int, risk_engine.DEFAULT_BLOCK_SIZE),
+            'dof': _param(data, 'dof', float, risk_engine.DEFAULT_DOF),
+        }
+        risk_engine.validate(method, params['horizon'], params['paths'], params['confidence'],
+                             params['block_size'], params['dof'])
+        window = _history_params(data, default_period='1y')
+        window.pop('max_points')
+
+        print(f"[Quant B] Risk simulation: {len(assets)} assets, method={method}, paths={params['paths']}")
+
+        flight_key = ('risk', _assets_key(assets), method,
+                      *params.values(), *window.values())
+        result = route_flights.do(
+            flight_key, quant_b.portfolio_risk, assets, method, executor=get_executor(), **params, **window
+        )
+
+        if result is None:
+            return jsonify({'error': 'Données insuffisantes pour simuler le risque du portefeuille'}), 400
+
+        return jsonify(result)
+
+    except Exception as e:
+        return _error_response(e, 'Quant B', 'Erreur lors de la simulation du risque')
+
+
+def _encoded_response(result, media_type):
+    """Réponse dans le format négocié: jsonify pour le JSON historique, encodeur rapide sinon"""
+    with instrumentation.span('serialize'):
+        if media_type == serialization.JSON:
+            response = jsonify(result)
+        else:
+            response = app.response_class(serialization.encode(result, media_type), mimetype=media_type)
+    response.vary.add('Accept')
+    return response
+
+
+def _cached_response(body, etag, media_type=serialization.JSON):
+    """Réponse avec ETag; 304 si le client a déjà cette version (If-None-Match)"""
+    # make_conditional() ne traite que GET/HEAD: /api/portfolio est un POST
+    if request.if_none_match.contains(etag):
+        portfolio_cache.record_not_modified()
+        response = app.response_class(status=304)
+    else:
+        response = app.response_class(body, mimetype=media_type)
+    response.set_etag(etag)
+    response.vary.add('Accept')
+    return response
+
+
+# ============================================================================
+# BATCH (plusieurs sous-requêtes asset / backtest / portfolio en un aller-retour)
+# ============================================================================
+
+ASSET_ROUTE = re.compile(r'^/api/asset/([^/]+)$')
+
+# type de sous-requête -> (méthode, route); les paramètres sont ceux de la route
+BATCH_ROUTES = {
+    'asset': ('GET', '/api/asset/{ticker}'),
+    'backtest': ('POST', '/api/backtest'),
+    'portfolio': ('POST', '/api/portfolio'),
+}
+
+_batch_pool = None
+_batch_lock = threading.Lock()
+
+
+def required_series(method, path, values):
+    """
+    Séries (ticker, period, interval, start) lues par une requête, d'après sa route et ses paramètres
+
+    values: query string (GET) ou corps JSON (POST). Utilisé pour précharger les prix (mode ASGI, /api/batch).
+    """
+    match = ASSET_ROUTE.match(path)
+    if method == 'GET' and match:
+        window = _history_params(values)
+        return [(unquote(match.group(1)), window['period'], window['interval'], window['start'])]
+    if method != 'POST':
+        return []
+
+    if path in ('/api/backtest', '/api/backtest/sweep'):
+        window = _history_params(values, period_key='history_period')
+        return [(values['ticker'], window['history_period'], window['interval'], window['start'])]
+
+    if path in ('/api/portfolio', '/api/portfolio/rolling'):
+        window = _history_params(values, default_period='3mo' if path == '/api/portfolio' else '1y')
+        tickers = [asset['ticker'] for asset in values.get('assets', [])] + ['SPY']
+        return [(ticker, window['period'], window['interval'], window['start']) for ticker in tickers]
+
+    if path in ('/api/portfolio/risk', '/api/portfolio/ml'):
+        window = _history_params(values, default_period='1y')
+        return [(asset['ticker'], window['period'], window['interval'], window['start'])
+                for asset in values.get('assets', [])]
+
+    if path in ('/api/portfolio/optimize', '/api/portfolio/factors'):
+        window = _history_params(values, default_period='1y')
+        tickers = [asset['ticker'] for asset in values.get('assets', [])] or values.get('tickers', [])
+        if path == '/api/portfolio/factors':
+            tickers = tickers + factor_model.factor_tickers(factor_model.resolve(values.get('factors')))
+        return [(ticker, window['period'], window['interval'], window['start']) for ticker in tickers]
+
+    if path == '/api/batch':
+        series = []
+        for query in values.get('queries', []):
+            try:
+                series.extend(required_series(*batch_subrequest(query)[:2], _subrequest_values(query)))
+            except (ValueError, KeyError, TypeError, AttributeError):
+                continue
+        return series
+    return []
+
+
+def batch_subrequest(query):
+    """(méthode, chemin, query string, corps JSON) de la sous-requête, ValueError si le type est inconnu"""
+    kind = query.get('type')
+    if not isinstance(kind, str) or kind not in BATCH_ROUTES:
+        raise ValueError(f"Type de sous-requête inconnu: {kind} ({', '.join(BATCH_ROUTES)})")
+    method, route = BATCH_ROUTES[kind]
+    values = _subrequest_values(query)
+    if method == 'GET':
+        ticker = values.pop('ticker', None)
+        if not ticker:
+            raise ValueError('ticker manquant')
+        return method, route.format(ticker=quote(str(ticker), safe='')), values, None
+    return method, route, None, values
+
+
+def _subrequest_values(query):
+    # Paramètres de la route: à plat dans la sous-requête ou sous 'params'
+    params = query.get('params') or {}
+    if not isinstance(params, dict):
+        raise ValueError('params doit être un objet')
+    values = dict(params)
+    values.update({k: v for k, v in query.items() if k not in ('id', 'type', 'params')})
+    return values
+
+
+def _get_batch_pool():
+    global _batch_pool
+    with _batch_lock:
+        if _batch_pool is None:
+            _batch_pool = ThreadPoolExecutor(
+                max_workers=int(os.environ.get('BATCH_WORKERS', DEFAULT_BATCH_WORKERS)), thread_name_prefix='batch'
+            )
+        return _batch_pool
+
+
+def _prefetch(series):
+    """Charge une seule fois chaque série distincte, en parallèle (get_many par fenêtre d'historique)"""
+    windows = {}
+    for ticker, period, interval, start in series:
+        windows.setdefault((period, interval, start), set()).add(ticker.upper())
+    for (period, interval, start), tickers in windows.items():
+        # Les erreurs sont renvoyées par les sous-requêtes elles-mêmes
+        price_store.get_many(sorted(tickers), period=period, interval=interval, start=start)
+    return sum(len(tickers) for tickers in windows.values())
+
+
+def _dispatch(method, path, query, body):
+    """Exécute une sous-requête sur les routes de l'app (validation, caches, erreurs identiques), corps JSON"""
+    environ = EnvironBuilder(path=path, method=method, query_string=query, json=body,
+                             headers={'Accept': serialization.JSON}).get_environ()
+    with app.request_context(environ):
+        response = app.full_dispatch_request()
+    return response.status_code, response.get_data()
+
+
+@app.route('/api/batch', methods=['POST'])
+def batch():
+    """Plusieurs sous-requêtes (asset, backtest, portfolio) exécutées en parallèle, une réponse par sous-requête"""
+    try:
+        data = _json_body()
+        queries = data.get('queries')
+        if not isinstance(queries, list) or not queries:
+            raise ValueError('queries doit être une liste non vide')
+        if len(queries) > BATCH_MAX_QUERIES:
+            raise ValueError(f'{BATCH_MAX_QUERIES} sous-requêtes max par batch')
+
+        # Sous-requêtes identiques calculées une seule fois
+        items, unique = [], {}
+        for index, query in enumerate(queries):
+            item = {'id': query.get('id', index) if isinstance(query, dict) else index}
+            try:
+                if not isinstance(query, dict):
+                    raise ValueError('Sous-requête invalide')
+                item['type'] = query.get('type')
+                subrequest = batch_subrequest(query)
+                item['key'] = canonical_key(*subrequest)
+                unique.setdefault(item['key'], subrequest)
+            except ValueError as e:
+                item['result'] = (400, json.dumps({'error': str(e)}).encode())
+            items.append(item)
+
+        series = []
+        for method, path, query, body in unique.values():
+            try:
+                series.extend(required_series(method, path, query if method == 'GET' else body))
+            except (ValueError, KeyError, TypeError, AttributeError):
+                continue  # paramètres invalides: la sous-requête renverra l'erreur
+        with instrumentation.span('fetch'):
+            loaded = _prefetch(series)
+
+        print(f"[Batch] {len(queries)} queries ({len(unique)} distinct), {loaded} series")
+
+        with instrumentation.span('batch'):
+            futures = {key: _get_batch_pool().submit(_dispatch, *subrequest) for key, subrequest in unique.items()}
+            results = {key: future.result() for key, future in futures.items()}
+
+        # Corps des sous-réponses insérés tels quels (JSON déjà encodé par chaque route)
+        parts, errors = [], 0
+        for item in items:
+            status, body = item['result'] if 'result' in item else results[item['key']]
+            errors += status >= 400
+            head = json.dumps({'id': item['id'], 'type': item.get('type'), 'status': status})
+            parts.append(head[:-1].encode() + b', "body": ' + (body or b'null') + b'}')
+        body = b'{"results": [' + b', '.join(parts) + b'], "errors": ' + str(errors).encode() + b'}'
+        return app.response_class(body, mimetype=serialization.JSON)
+
+    except Exception as e:
+        return _error_response(e, 'Batch', 'Erreur lors du batch')
 
 
 # ============================================================================
@@ -0,0 +1,168 @@
+"""
+ASGI - mode de service asynchrone des routes de app.py
+Les téléchargements upstream se font dans la boucle d'événements; les routes Flask ne lisent plus que le cache.
+
+- Avant chaque requête, les séries nécessaires sont préchargées (client HTTP async si la source le permet)
+- Concurrence vers l'upstream bornée (PRICE_UPSTREAM_CONCURRENCY), téléchargements identiques partagés
+- Les routes elles-mêmes (validation, cache, ETag, erreurs) restent celles de app.py, exécutées dans un pool
+  de threads (ASGI_THREADS) qui n'est plus bloqué par le réseau
+
+Lancement: uvicorn asgi:app --host 0.0.0.0 --port 5000
+"""
+
+import asyncio
+import json
+import os
+from urllib.parse import parse_qs
+
+from a2wsgi import WSGIMiddleware
+
+import app as flask_app
+from lazy_import import LazyModule
+
+price_store = LazyModule('price_store')
+
+DEFAULT_UPSTREAM_CONCURRENCY = 16
+DEFAULT_THREADS = 32
+
+
+class AsyncPrefetcher:
+    """Amène le cache du PriceStore à jour sans bloquer de thread pendant les téléchargements"""
+
+    def __init__(self, store=None, max_concurrency=DEFAULT_UPSTREAM_CONCURRENCY):
+        self._store = store
+        self.max_concurrency = max_concurrency
+        self._semaphore = None
+        self._inflight = {}
+        self.stats = {'requests': 0, 'downloads': 0, 'coalesced': 0, 'errors': 0}
+
+    @property
+    def store(self):
+        # Store partagé résolu à la première requête (import de price_store différé)
+        if self._store is None:
+            self._store = price_store.get_store()
+        return self._store
+
+    async def ensure(self, ticker, period='3mo', interval='1d', start=None):
+        if self.store.in_memory(ticker, interval):
+            plan = self.store.plan(ticker, period=period, interval=interval, start=start)
+        else:
+            # Cache froid: plan() charge le .npz du disque (plusieurs Mo), hors de la boucle
+            plan = await asyncio.get_running_loop().run_in_executor(
+                None, lambda: self.store.plan(ticker, period=period, interval=interval, start=start)
+            )
+        if plan is None:
+            return
+        key, kind, since = plan
+
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._download(ticker, interval, kind, since))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        else:
+            self.stats['coalesced'] += 1
+        # shield: une requête annulée n'interrompt pas un téléchargement partagé
+        await asyncio.shield(task)
+
+    async def ensure_many(self, requests):
+        self.stats['requests'] += 1
+        await asyncio.gather(*(self.ensure(*request) for request in requests))
+
+    async def _download(self, ticker, interval, kind, since):
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        source = self.store.source
+        loop = asyncio.get_running_loop()
+        try:
+            async with self._semaphore:
+                self.stats['downloads'] += 1
+                if hasattr(source, 'fetch_async'):
+                    frame = await source.fetch_async(ticker, interval, start=since)
+                else:
+                    frame = await loop.run_in_executor(None, lambda: source.fetch(ticker, interval, start=since))
+            # Écriture du cache disque hors de la boucle
+            await loop.run_in_executor(None, self.store.ingest, ticker, interval, kind, since, frame)
+        except Exception as e:
+            # La route repassera par le chemin synchrone, qui sert le cache existant ou renvoie l'erreur
+            self.stats['errors'] += 1
+            print(f"[ASGI] Prefetch failed for {ticker}: {e}")
+
+    async def aclose(self):
+        source = getattr(self._store, 'source', None)
+        if hasattr(source, 'aclose'):
+            await source.aclose()
+
+    def snapshot(self):
+        return {**self.stats, 'in_flight': len(self._inflight), 'max_concurrency': self.max_concurrency}
+
+
+def prefetch_requests(method, path, query_string, body):
+    """Séries (ticker, period, interval, start) lues par une requête, d'après sa route et ses paramètres"""
+    try:
+        if method == 'GET':
+            values = {k: v[0] for k, v in parse_qs(query_string.decode()).items()}
+        elif method == 'POST' and body:
+            values = json.loads(body)
+        else:
+            return []
+        return flask_app.required_series(method, path, values)
+    except (ValueError, KeyError, TypeError, AttributeError):
+        # Requête invalide: la route Flask renverra l'erreur appropriée
+        return []
+
+
+class AsyncApp:
+    """Application ASGI: préchargement async des prix puis délégation à l'app Flask"""
+
+    def __init__(self, wsgi_app, prefetcher, threads=DEFAULT_THREADS):
+        self.prefetcher = prefetcher
+        self.wsgi = WSGIMiddleware(wsgi_app, workers=threads)
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            return await self._lifespan(receive, send)
+        if scope['type'] != 'http':
+            return await self.wsgi(scope, receive, send)
+
+        # Corps lu une fois pour le préchargement, puis rejoué pour Flask
+        body, more = b'', True
+        while more:
+            message = await receive()
+            if message['type'] == 'http.disconnect':
+                return
+            body += message.get('body', b'')
+            more = message.get('more_body', False)
+
+        requests = prefetch_requests(scope['method'], scope['path'], scope.get('query_string', b''), body)
+        if requests:
+            await self.prefetcher.ensure_many(requests)
+
+        replayed = False
+
+        async def replay():
+            nonlocal replayed
+            if not replayed:
+                replayed = True
+                return {'type': 'http.request', 'body': body, 'more_body': False}
+            return await receive()
+
+        await self.wsgi(scope, replay, send)
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                await self.prefetcher.aclose()
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+
+prefetcher = AsyncPrefetcher(
+    max_concurrency=int(os.environ.get('PRICE_UPSTREAM_CONCURRENCY', DEFAULT_UPSTREAM_CONCURRENCY))
+)
+flask_app.register_stats('async_prefetch', prefetcher.snapshot)
+
+app = AsyncApp(flask_app.app, prefetcher, threads=int(os.environ.get('ASGI_THREADS', DEFAULT_THREADS)))
@@ -0,0 +1,139 @@
+"""
+Benchmark - test de charge Flask (threads) vs ASGI (asgi.py)
+Les deux modes servent les mêmes routes avec une source HttpChartSource pointée sur le mock
+(benchmarks/mock_price_server.py, latence simulée). PRICE_CACHE_TTL=1 et des tickers parcourus en
+tourniquet: chaque requête /api/asset redemande la fin de série à l'upstream, pendant que /api/health
+doit rester rapide. Mesure requêtes/s et latences p50/p99 par route.
+
+Usage: python benchmarks/bench_async_load.py [--concurrency 64] [--duration 10] [--latency 0.1]
+"""
+
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import time
+
+import httpx
+import numpy as np
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MOCK_PORT = 8900
+FLASK_PORT = 8901
+ASGI_PORT = 8902
+
+SERVERS = {
+    'flask': [sys.executable, '-c', f'import app; app.app.run(port={FLASK_PORT}, threaded=True)'],
+    'asgi': [sys.executable, '-m', 'uvicorn', 'asgi:app', '--port', str(ASGI_PORT), '--log-level', 'warning'],
+}
+PORTS = {'flask': FLASK_PORT, 'asgi': ASGI_PORT}
+
+
+def start(command, env=None):
+    return subprocess.Popen(command, cwd=BACKEND, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+def wait_ready(url, timeout=30):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            httpx.get(url, timeout=1)
+            return
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    raise RuntimeError(f'{url} ne répond pas')
+
+
+async def warm(base_url, tickers, concurrency):
+    # Premier chargement complet de chaque ticker, hors mesure
+    semaphore = asyncio.Semaphore(concurrency)
+    async with httpx.AsyncClient(base_url=base_url, timeout=60) as client:
+        async def get(ticker):
+            async with semaphore:
+                await client.get(f'/api/asset/{ticker}')
+        await asyncio.gather(*(get(ticker) for ticker in tickers))
+
+
+async def load(base_url, tickers, concurrency, duration):
+    latencies = {'asset': [], 'health': []}
+    errors = 0
+    deadline = time.perf_counter() + duration
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        async def worker(worker_id):
+            nonlocal errors
+            i = worker_id
+            while time.perf_counter() < deadline:
+                # 1 requête sur 5 sur /api/health: elle ne doit pas attendre l'upstream
+                route = 'health' if i % 5 == 0 else 'asset'
+                path = '/api/health' if route == 'health' else f'/api/asset/{tickers[i % len(tickers)]}'
+                t0 = time.perf_counter()
+                try:
+                    response = await client.get(path)
+                    if response.status_code != 200:
+                        errors += 1
+                except httpx.HTTPError:
+                    errors += 1
+                latencies[route].append(time.perf_counter() - t0)
+                i += concurrency
+
+        t0 = time.perf_counter()
+        await asyncio.gather(*(worker(w) for w in range(concurrency)))
+        elapsed = time.perf_counter() - t0
+
+    return latencies, errors, elapsed
+
+
+def report(mode, latencies, errors, elapsed):
+    total = sum(len(v) for v in latencies.values())
+    print(f"{mode:>6} {total / elapsed:>9.1f} req/s  erreurs={errors}")
+    for route, values in latencies.items():
+        if values:
+            p50, p99 = np.percentile(values, [50, 99]) * 1000
+            print(f"{'':>6} {route:>8}: n={len(values):>6}  p50={p50:>8.1f} ms  p99={p99:>8.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--concurrency', type=int, default=64)
+    parser.add_argument('--duration', type=float, default=10)
+    parser.add_argument('--latency', type=float, default=0.1)
+    parser.add_argument('--tickers', type=int, default=500)
+    parser.add_argument('--modes', default='flask,asgi')
+    args = parser.parse_args()
+
+    tickers = [f'T{i:03d}' for i in range(args.tickers)]
+    env = {
+        **os.environ,
+        'PRICE_SOURCE': 'http',
+        'PRICE_SOURCE_URL': f'http://127.0.0.1:{MOCK_PORT}',
+        'PRICE_CACHE_DIR': '',
+        'PRICE_CACHE_TTL': '1',
+        'COMPUTE_WORKERS': '0',
+    }
+
+    mock = start([sys.executable, 'benchmarks/mock_price_server.py', '--port', str(MOCK_PORT),
+                  '--latency', str(args.latency)])
+    try:
+        wait_ready(f'http://127.0.0.1:{MOCK_PORT}/')
+        print(f"concurrence={args.concurrency}, durée={args.duration}s, latence upstream={args.latency * 1000:.0f} ms")
+        for mode in args.modes.split(','):
+            server = start(SERVERS[mode], env)
+            try:
+                base_url = f'http://127.0.0.1:{PORTS[mode]}'
+                wait_ready(f'{base_url}/api/health')
+                asyncio.run(warm(base_url, tickers, args.concurrency))
+                report(mode, *asyncio.run(load(base_url, tickers, args.concurrency, args.duration)))
+            finally:
+                server.terminate()
+                server.wait()
+    finally:
+        mock.terminate()
+        mock.wait()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,48 @@
+"""
+Benchmark - sweep vectorisé vs backtests individuels
+Compare backtest_sweep sur les périodes 5..100 à 96 appels backtest_strategy (données en cache).
+
+Usage: python benchmarks/bench_backtest_sweep.py
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import price_store  # noqa: E402
+from price_store import PriceStore, SyntheticSource  # noqa: E402
+
+price_store.set_store(PriceStore(source=SyntheticSource(), cache_dir=None))
+
+import quant_a  # noqa: E402
+
+PERIODS = range(5, 101)
+
+
+def main():
+    quant_a.get_asset_data('AAPL')  # préchauffe le cache de prix
+
+    print(f"{'strategy':>15} {'single x1 (ms)':>15} {'loop x96 (ms)':>14} {'sweep (ms)':>11}")
+    for strategy in quant_a.SWEEP_STRATEGIES:
+        quant_a.backtest_sweep('AAPL', strategy, PERIODS)  # imports paresseux hors mesure
+
+        t0 = time.perf_counter()
+        quant_a.backtest_strategy('AAPL', strategy, 20)
+        t_single = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        for period in PERIODS:
+            quant_a.backtest_strategy('AAPL', strategy, period)
+        t_loop = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        quant_a.backtest_sweep('AAPL', strategy, PERIODS)
+        t_sweep = time.perf_counter() - t0
+
+        print(f"{strategy:>15} {t_single * 1000:>15.2f} {t_loop * 1000:>14.1f} {t_sweep * 1000:>11.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+"""
+Benchmark - /api/batch contre des requêtes séparées
+Chargement d'une page type (données d'un actif + backtests de plusieurs stratégies + un portefeuille),
+cache de prix froid et source synthétique à latence simulée: N appels successifs (comme le frontend)
+contre un seul POST /api/batch. Compte aussi les téléchargements upstream.
+
+Usage: python benchmarks/bench_batch.py [--latency 0.2] [--rounds 3]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import price_store  # noqa: E402
+from price_store import PriceStore, SyntheticSource  # noqa: E402
+
+STRATEGIES = ('buy-hold', 'momentum', 'mean-reversion', 'bollinger')
+ASSETS = [{'ticker': 'MSFT', 'weight': 40}, {'ticker': 'GOOGL', 'weight': 30}, {'ticker': 'NVDA', 'weight': 30}]
+
+
+def page_queries(ticker):
+    return ([{'id': 'asset', 'type': 'asset', 'ticker': ticker}]
+            + [{'id': s, 'type': 'backtest', 'ticker': ticker, 'strategy': s, 'period': 20} for s in STRATEGIES]
+            + [{'id': 'portfolio', 'type': 'portfolio', 'assets': ASSETS + [{'ticker': ticker, 'weight': 10}]}])
+
+
+def separate(client, queries):
+    for query in queries:
+        params = {k: v for k, v in query.items() if k not in ('id', 'type')}
+        if query['type'] == 'asset':
+            response = client.get(f"/api/asset/{params.pop('ticker')}")
+        else:
+            response = client.post(f"/api/{query['type']}", json=params)
+        assert response.status_code == 200, response.get_data()
+
+
+def batched(client, queries):
+    response = client.post('/api/batch', json={'queries': queries})
+    assert response.status_code == 200 and response.get_json()['errors'] == 0, response.get_data()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--latency', type=float, default=0.2, help='latence upstream simulée (s)')
+    parser.add_argument('--rounds', type=int, default=3)
+    args = parser.parse_args()
+
+    source = SyntheticSource(latency=args.latency)
+    import app  # noqa: E402
+    client = app.app.test_client()
+
+    print(f"{len(page_queries('AAPL'))} requêtes par page, latence upstream {args.latency * 1000:.0f} ms")
+    for name, run in (('requêtes séparées', separate), ('/api/batch', batched)):
+        timings, downloads = [], 0
+        for round_ in range(args.rounds):
+            # Cache froid et ticker différent à chaque tour
+            price_store.set_store(PriceStore(source=source, cache_dir=None))
+            calls = source.calls
+            t0 = time.perf_counter()
+            run(client, page_queries(f'T{round_:03d}'))
+            timings.append((time.perf_counter() - t0) * 1000)
+            downloads += source.calls - calls
+        print(f"{name:<20} {min(timings):>8.1f} ms (min)  {downloads / args.rounds:>5.1f} téléchargements / page")
+
+
+if __name__ == '__main__':
+    main()
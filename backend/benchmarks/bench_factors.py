@@ -0,0 +1,77 @@
+"""
+Benchmark - régression factorielle d'un univers (factor_model) contre des appels par actif
+Marché seul: calculate_beta + calculate_alpha actif par actif (Series pandas alignées par date) contre une
+régression groupée. Plusieurs facteurs: un np.linalg.lstsq par actif contre un seul solve pour tout
+l'univers. Vérifie que les deux donnent les mêmes betas.
+
+Usage: python benchmarks/bench_factors.py [--days 1260] [--assets 50 500 1000] [--factors 4]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import factor_model  # noqa: E402
+from quant_metrics import calculate_alpha, calculate_beta  # noqa: E402
+
+
+def timed(fn, repeat=3):
+    result = fn()
+    timings = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - t0) * 1000)
+    return result, statistics.median(timings)
+
+
+def pairwise(assets, market):
+    # Ancien chemin: deux appels par actif (alpha recalcule beta)
+    return np.array([[calculate_beta(assets[c], market), calculate_alpha(assets[c], market)] for c in assets])
+
+
+def lstsq_loop(returns, factors):
+    X = np.column_stack([np.ones(len(returns)), factors])
+    excess = returns - factor_model.RISK_FREE_RATE / factor_model.PERIODS_PER_YEAR
+    return np.column_stack([np.linalg.lstsq(X, excess[:, j], rcond=None)[0][1:] for j in range(returns.shape[1])])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--days', type=int, default=1260)
+    parser.add_argument('--assets', type=int, nargs='+', default=[50, 500, 1000])
+    parser.add_argument('--factors', type=int, default=4)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    index = pd.bdate_range('2020-01-01', periods=args.days)
+    factors = rng.normal(2e-4, 0.01, (args.days, args.factors))
+    print(f"{args.days} barres, {args.factors} facteurs")
+    for n_assets in args.assets:
+        loadings = rng.normal(1.0, 0.4, (args.factors, n_assets))
+        returns = factors @ loadings + rng.normal(0, 0.012, (args.days, n_assets))
+
+        market = pd.Series(factors[:, 0], index=index)
+        assets = pd.DataFrame(returns, index=index)
+        slow, slow_ms = timed(lambda: pairwise(assets, market), repeat=1)
+        fast, fast_ms = timed(lambda: factor_model.regress(returns, factors[:, :1]))
+        error = np.max(np.abs(slow[:, 0] - fast['betas'][0]))
+        print(f"{n_assets:>5} actifs, marché   : calculate_beta/alpha {slow_ms:>9.1f} ms  "
+              f"factor_model {fast_ms:>7.2f} ms  x{slow_ms / fast_ms:>7.1f}  écart beta max {error:.1e}")
+
+        slow, slow_ms = timed(lambda: lstsq_loop(returns, factors), repeat=1)
+        fast, fast_ms = timed(lambda: factor_model.regress(returns, factors))
+        error = np.max(np.abs(slow - fast['betas']))
+        print(f"{n_assets:>5} actifs, {args.factors} facteurs: lstsq par actif      {slow_ms:>9.1f} ms  "
+              f"factor_model {fast_ms:>7.2f} ms  x{slow_ms / fast_ms:>7.1f}  écart beta max {error:.1e}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+"""
+Benchmark - historiques longs (1M+ barres)
+Mesure latence et pic mémoire (tracemalloc) de get_asset_data, backtest_strategy et analyze_portfolio
+sur des barres minute synthétiques, avec et sans sous-échantillonnage LTTB de l'historique.
+
+Usage: python benchmarks/bench_long_history.py [--bars 1000000] [--max-points 2000]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import price_store  # noqa: E402
+from price_store import FixtureSource, PriceStore  # noqa: E402
+
+TICKERS = ('AAA', 'BBB', 'SPY')
+
+
+def minute_bars(n, seed):
+    rng = np.random.default_rng(seed)
+    index = pd.date_range('2020-01-01', periods=n, freq='min', tz='UTC')
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.0005, n)))
+    return pd.DataFrame({
+        'Open': close, 'High': close * 1.0002, 'Low': close * 0.9998, 'Close': close,
+        'Volume': np.full(n, 1000.0),
+    }, index=index)
+
+
+def measure(label, fn):
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - t0
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    size = len(json.dumps(result, default=str)) if result is not None else 0
+    print(f"{label:>34} {elapsed * 1000:>10.1f} {peak / 2**20:>10.1f} {size / 1024:>10.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--bars', type=int, default=1_000_000)
+    parser.add_argument('--max-points', type=int, default=2000)
+    args = parser.parse_args()
+
+    frames = {ticker: minute_bars(args.bars, seed) for seed, ticker in enumerate(TICKERS)}
+    price_store.set_store(PriceStore(source=FixtureSource(frames), cache_dir=None))
+
+    import quant_a
+    import quant_b
+
+    window = {'interval': '1m', 'max_points': args.max_points}
+    assets = [{'ticker': 'AAA', 'weight': 60}, {'ticker': 'BBB', 'weight': 40}]
+
+    for ticker in TICKERS:  # préchauffe le cache de prix
+        price_store.get_history(ticker, period='max', interval='1m')
+
+    print(f"{args.bars} barres 1m, max_points={args.max_points}")
+    print(f"{'':>34} {'ms':>10} {'peak MB':>10} {'JSON KB':>10}")
+    measure('asset (LTTB)', lambda: quant_a.get_asset_data('AAA', period='max', **window))
+    measure('asset (full)', lambda: quant_a.get_asset_data('AAA', period='max', interval='1m', max_points=0))
+    for strategy in ('momentum', 'bollinger', 'rsi', 'breakout'):
+        measure(f'backtest {strategy} (cold)',
+                lambda: quant_a.backtest_strategy('AAA', strategy, 20, history_period='max', **window))
+        measure(f'backtest {strategy} (warm)',
+                lambda: quant_a.backtest_strategy('AAA', strategy, 20, history_period='max', **window))
+    measure('portfolio (LTTB)', lambda: quant_b.analyze_portfolio(assets, period='max', **window))
+
+
+if __name__ == '__main__':
+    main()
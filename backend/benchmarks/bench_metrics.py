@@ -0,0 +1,64 @@
+"""
+Benchmark - compute_all_metrics vs appels individuels de quant_metrics
+Mesure le chemin historique (une fonction par métrique, comme analyze_portfolio) et le noyau
+vectorisé, pour une série et pour K séries scorées en un seul appel 2-D.
+
+Usage: python benchmarks/bench_metrics.py
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from quant_metrics import (  # noqa: E402
+    calculate_var, calculate_cvar, calculate_sortino_ratio,
+    calculate_calmar_ratio, calculate_omega_ratio, calculate_skewness,
+    calculate_kurtosis, calculate_hit_ratio, calculate_win_loss_ratio,
+    calculate_information_ratio, calculate_beta, calculate_alpha,
+    compute_all_metrics
+)
+
+
+def per_function(returns, benchmark):
+    return [
+        calculate_sortino_ratio(returns), calculate_calmar_ratio(returns, -10.0),
+        calculate_var(returns), calculate_cvar(returns), calculate_omega_ratio(returns),
+        calculate_skewness(returns), calculate_kurtosis(returns), calculate_hit_ratio(returns),
+        calculate_win_loss_ratio(returns), calculate_beta(returns, benchmark),
+        calculate_alpha(returns, benchmark), calculate_information_ratio(returns, benchmark),
+    ]
+
+
+def timed(fn, repeat=5):
+    best = float('inf')
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main():
+    rng = np.random.default_rng(42)
+    print(f"{'T':>6} {'K':>5} {'per-function (ms)':>18} {'kernel (ms)':>12} {'speedup':>8}")
+
+    for n_obs in (63, 252, 2520):
+        for n_series in (1, 100, 500):
+            R = rng.normal(0.0004, 0.012, (n_obs, n_series))
+            B = rng.normal(0.0003, 0.010, n_obs)
+            series = [pd.Series(R[:, j]) for j in range(n_series)]
+            bench = pd.Series(B)
+
+            t_loop = timed(lambda: [per_function(s, bench) for s in series], repeat=1 if n_series > 1 else 5)
+            t_kernel = timed(lambda: compute_all_metrics(R, benchmark=B, max_drawdown=-10.0))
+            print(f"{n_obs:>6} {n_series:>5} {t_loop * 1000:>18.2f} {t_kernel * 1000:>12.2f} "
+                  f"{t_loop / t_kernel:>7.0f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,111 @@
+"""
+Benchmark - prédiction ML du portefeuille (ml_prediction / ml_service)
+Coût d'une prédiction /api/portfolio: réentraînement scikit-learn complet (ancienne implémentation),
+ajustement NumPy complet, mise à jour incrémentale (nouvelle barre) et prédiction en cache du service.
+Évaluation walk-forward vectorisée comparée à une boucle de réentraînements (mêmes prédictions).
+
+Usage: python benchmarks/bench_ml.py [--days 1260] [--window 5] [--repeat 20]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import ml_prediction  # noqa: E402
+from ml_service import ModelService  # noqa: E402
+
+
+def timed(fn, repeat):
+    fn()
+    timings = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - t0) * 1000)
+    return statistics.median(timings)
+
+
+def sklearn_refit(returns, window, n_days):
+    # Ancienne implémentation: LinearRegression réentraînée à chaque requête
+    from sklearn.linear_model import LinearRegression
+    X, y = ml_prediction.create_features(returns, window)
+    model = LinearRegression(fit_intercept=False).fit(X, y)
+    model.score(X, y)
+    recent = list(returns[-window:])
+    for _ in range(n_days):
+        next_return = float(model.predict(ml_prediction._feature_row(recent, window)[None, :])[0])
+        recent = recent[1:] + [next_return]
+
+
+def walk_forward_loop(returns, window, train_size, min_train):
+    X, y = ml_prediction.create_features(returns, window)
+    min_train = max(min_train, X.shape[1] + 1)
+    predicted = []
+    for end in range(min_train, len(y)):
+        start = 0 if train_size is None else max(end - max(train_size, min_train), 0)
+        model = ml_prediction.OnlineOLS(X.shape[1])
+        model.update(X[start:end], y[start:end])
+        predicted.append(X[end] @ model.coefficients())
+    return np.array(predicted) * 100
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--days', type=int, default=1260)
+    parser.add_argument('--window', type=int, default=5)
+    parser.add_argument('--n-days', type=int, default=5)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    returns = rng.normal(4e-4, 0.012, args.days + args.repeat)
+    dates = np.arange(args.days + args.repeat, dtype=np.int64)
+    history = returns[:args.days]
+    print(f"{args.days} rendements, fenêtre {args.window}, horizon {args.n_days}")
+
+    try:
+        refit = timed(lambda: sklearn_refit(history, args.window, args.n_days), args.repeat)
+        print(f"{'réentraînement scikit-learn':<32} {refit:>9.3f} ms")
+    except ImportError:
+        print(f"{'réentraînement scikit-learn':<32} {'-':>9} (scikit-learn absent)")
+
+    full = timed(lambda: ml_prediction.predict_portfolio_returns(history, args.n_days, args.window), args.repeat)
+    print(f"{'ajustement NumPy complet':<32} {full:>9.3f} ms")
+
+    # Nouvelle barre à chaque pas: la série glisse d'un cran, le service retire / ajoute une ligne
+    service = ModelService(timeout=30)
+    service.predict('bench', dates[:args.days], returns[:args.days], args.n_days, args.window)
+    incremental = []
+    for i in range(1, args.repeat + 1):
+        t0 = time.perf_counter()
+        result = service.predict('bench', dates[i:args.days + i], returns[i:args.days + i], args.n_days, args.window)
+        incremental.append((time.perf_counter() - t0) * 1000)
+        assert result['update'] == 'incremental', result['update']
+    print(f"{'mise à jour incrémentale':<32} {statistics.median(incremental):>9.3f} ms")
+
+    last = slice(args.repeat, args.days + args.repeat)
+    cached = timed(lambda: service.predict('bench', dates[last], returns[last], args.n_days, args.window), args.repeat)
+    print(f"{'prédiction en cache':<32} {cached:>9.3f} ms")
+    print(f"service: {service.snapshot()}")
+
+    print()
+    for train_size in (None, 250):
+        label = 'croissante' if train_size is None else f'glissante {train_size}'
+        vectorized = timed(lambda: ml_prediction.walk_forward(history, args.window, train_size), max(args.repeat // 4, 1))
+        t0 = time.perf_counter()
+        reference = walk_forward_loop(history, args.window, train_size, ml_prediction.DEFAULT_MIN_TRAIN)
+        loop = (time.perf_counter() - t0) * 1000
+        result = ml_prediction.walk_forward(history, args.window, train_size)
+        error = np.max(np.abs(np.array(result['predicted']) - reference))
+        print(f"walk-forward {label:<14} {result['windows']:>5} fenêtres: vectorisé {vectorized:>8.2f} ms  "
+              f"boucle {loop:>9.2f} ms  x{loop / vectorized:>6.1f}  écart max {error:.1e}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+"""
+Benchmark - téléchargement des constituants d'un portefeuille
+Compare la boucle séquentielle historique à PriceStore.get_many sur une source locale
+avec latence réseau simulée, pour un nombre croissant d'actifs.
+
+Usage: python benchmarks/bench_portfolio_fetch.py [--latency 0.05]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from price_store import PriceStore, SyntheticSource  # noqa: E402
+
+
+def make_store(latency):
+    # Pas de cache disque et TTL nul: chaque appel paie la latence upstream
+    return PriceStore(source=SyntheticSource(latency=latency), cache_dir=None, ttl=0)
+
+
+def sequential(store, tickers):
+    return {t: store.get_history(t, period='3mo') for t in tickers}
+
+
+def parallel(store, tickers):
+    frames, _ = store.get_many(tickers, period='3mo')
+    return frames
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--latency', type=float, default=0.05)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[2, 4, 8, 16, 32])
+    args = parser.parse_args()
+
+    print(f"Latence simulée: {args.latency * 1000:.0f} ms par ticker (+ SPY)")
+    print(f"{'assets':>6} {'sequential (s)':>15} {'parallel (s)':>13} {'speedup':>8}")
+
+    for n in args.sizes:
+        tickers = [f'T{i:03d}' for i in range(n)] + ['SPY']
+
+        store = make_store(args.latency)
+        t0 = time.perf_counter()
+        seq = sequential(store, tickers)
+        t_seq = time.perf_counter() - t0
+
+        store = make_store(args.latency)
+        t0 = time.perf_counter()
+        par = parallel(store, tickers)
+        t_par = time.perf_counter() - t0
+
+        assert all(seq[t].equals(par[t]) for t in tickers)
+        print(f"{n:>6} {t_seq:>15.3f} {t_par:>13.3f} {t_seq / t_par:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+"""
+Benchmark - simulation de rééquilibrage
+Temps de rebalancing.simulate par calendrier (none, daily, weekly, monthly, quarterly, threshold)
+sur un univers synthétique, comparé à une boucle Python jour par jour (quantités, valeur, coûts).
+
+Usage: python benchmarks/bench_rebalancing.py [--assets 100] [--years 10] [--cost-bps 10]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import rebalancing  # noqa: E402
+
+
+def timed(fn, repeat=5):
+    best = float('inf')
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best, result
+
+
+def loop_reference(prices, weights, rebalances, cost_bps):
+    # Simulation naïve: une itération Python par barre
+    weights = weights / weights.sum()
+    shares = weights / prices[0]
+    values = [1.0]
+    rebalance_set = set(rebalances.tolist())
+    for t in range(1, len(prices)):
+        value = shares @ prices[t]
+        if t in rebalance_set:
+            traded = np.abs(shares * prices[t] / value - weights).sum()
+            value *= 1 - traded * cost_bps / 10_000
+            shares = value * weights / prices[t]
+        values.append(value)
+    return np.array(values)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--assets', type=int, default=100)
+    parser.add_argument('--years', type=int, default=10)
+    parser.add_argument('--cost-bps', type=float, default=10)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    bars = args.years * rebalancing.TRADING_DAYS
+    prices = 100 * np.cumprod(1 + rng.normal(0.0003, 0.015, (bars, args.assets)), axis=0)
+    dates = pd.bdate_range(end='2026-01-02', periods=bars).to_numpy()
+    weights = rng.uniform(1, 2, args.assets)
+
+    print(f"{args.assets} actifs x {bars} barres, coûts {args.cost_bps} bps")
+    for schedule in rebalancing.SCHEDULES:
+        elapsed, result = timed(lambda: rebalancing.simulate(
+            prices, weights, schedule, dates, threshold=0.02, cost_bps=args.cost_bps
+        ))
+        t0 = time.perf_counter()
+        reference = loop_reference(prices, weights, result['rebalances'], args.cost_bps)
+        loop_elapsed = time.perf_counter() - t0
+        error = np.abs(result['values'] - reference).max()
+        summary = rebalancing.turnover_summary(result)
+        print(f"{schedule:>10}: {elapsed * 1000:>7.2f} ms (boucle {loop_elapsed * 1000:>7.1f} ms, écart {error:.1e})  "
+              f"rééquilibrages={summary['rebalances']:>5}  turnover/an={summary['annual_turnover']:>7.1f}%")
+
+
+if __name__ == '__main__':
+    main()
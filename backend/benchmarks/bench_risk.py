@@ -0,0 +1,69 @@
+"""
+Benchmark - moteur de risque (VaR / CVaR simulées)
+Temps et pic mémoire de risk_engine.simulate par méthode, en mono-processus puis réparti en shards
+dans un ComputeExecutor; vérifie que le résultat ne dépend pas du nombre de shards.
+
+Usage: python benchmarks/bench_risk.py [--assets 10] [--paths 200000] [--horizon 10] [--workers 2]
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import risk_engine  # noqa: E402
+from compute_executor import ComputeExecutor  # noqa: E402
+
+
+def synthetic_returns(n_assets, n_days, seed=0):
+    rng = np.random.default_rng(seed)
+    correlation = np.full((n_assets, n_assets), 0.4) + 0.6 * np.eye(n_assets)
+    volatility = rng.uniform(0.01, 0.025, n_assets)
+    return rng.multivariate_normal(np.full(n_assets, 3e-4), correlation * np.outer(volatility, volatility), n_days)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--assets', type=int, default=10)
+    parser.add_argument('--days', type=int, default=1260)
+    parser.add_argument('--paths', type=int, default=200_000)
+    parser.add_argument('--horizon', type=int, default=10)
+    parser.add_argument('--workers', type=int, default=2)
+    args = parser.parse_args()
+
+    returns = synthetic_returns(args.assets, args.days)
+    weights = np.ones(args.assets)
+    size = risk_engine.chunk_size(args.horizon, args.assets, args.paths)
+    print(f"{args.assets} actifs, {args.paths} trajectoires x {args.horizon} jours, blocs de {size} trajectoires")
+
+    executor = ComputeExecutor(max_workers=args.workers)
+    try:
+        for method in risk_engine.METHODS:
+            tracemalloc.start()
+            t0 = time.perf_counter()
+            single = risk_engine.simulate(returns, weights, method, args.horizon, args.paths)
+            elapsed = time.perf_counter() - t0
+            peak = tracemalloc.get_traced_memory()[1] / 2**20
+            tracemalloc.stop()
+
+            t0 = time.perf_counter()
+            sharded = risk_engine.simulate(returns, weights, method, args.horizon, args.paths, executor=executor)
+            sharded_elapsed = time.perf_counter() - t0
+
+            level = single['levels'][0.99]
+            same = level['var'] == sharded['levels'][0.99]['var'] and level['cvar'] == sharded['levels'][0.99]['cvar']
+            print(f"{method:>10}: {elapsed * 1000:>8.1f} ms (pic {peak:>6.1f} Mo)  "
+                  f"{sharded['shards']} shards: {sharded_elapsed * 1000:>8.1f} ms  identique={same}  "
+                  f"VaR99={level['var'] * 100:>6.2f}% [{level['var_band'][0] * 100:.2f}, {level['var_band'][1] * 100:.2f}]  "
+                  f"CVaR99={level['cvar'] * 100:>6.2f}%")
+    finally:
+        executor.shutdown()
+
+
+if __name__ == '__main__':
+    main()
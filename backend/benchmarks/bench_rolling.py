@@ -0,0 +1,76 @@
+"""
+Benchmark - métriques glissantes (rolling_analytics) contre pandas
+Sharpe / volatilité / beta glissants et corrélations par paire pour 3 tailles de fenêtre:
+sommes cumulées partagées entre fenêtres vs pandas rolling (dont DataFrame.rolling().corr(),
+qui produit une matrice N x N par date). Vérifie que les deux donnent les mêmes séries.
+
+Usage: python benchmarks/bench_rolling.py [--days 1260] [--assets 2 10 25 50]
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import rolling_analytics  # noqa: E402
+
+WINDOWS = rolling_analytics.DEFAULT_WINDOWS
+
+
+def with_pandas(portfolio, assets, benchmark):
+    portfolio, benchmark, assets = pd.Series(portfolio), pd.Series(benchmark), pd.DataFrame(assets)
+    results = {}
+    for window in WINDOWS:
+        rolling = portfolio.rolling(window)
+        correlation = assets.rolling(window).corr()
+        upper = np.triu_indices(assets.shape[1], k=1)
+        matrices = correlation.to_numpy().reshape(len(assets), assets.shape[1], assets.shape[1])
+        results[window] = {
+            'sharpe': ((rolling.mean() - 0.02 / 252) / rolling.std() * np.sqrt(252)).to_numpy()[window - 1:],
+            'beta': (rolling.cov(benchmark) / benchmark.rolling(window).var()).to_numpy()[window - 1:],
+            'correlation': matrices[window - 1:, upper[0], upper[1]],
+        }
+    return results
+
+
+def timed(fn):
+    t0 = time.perf_counter()
+    result = fn()
+    elapsed = (time.perf_counter() - t0) * 1000
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1] / 2**20
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--days', type=int, default=1260)
+    parser.add_argument('--assets', type=int, nargs='+', default=[2, 10, 25, 50])
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    print(f"{args.days} barres, fenêtres {list(WINDOWS)}")
+    for n_assets in args.assets:
+        assets = rng.normal(3e-4, 0.012, (args.days, n_assets))
+        portfolio = assets.mean(axis=1)
+        benchmark = 0.8 * portfolio + rng.normal(0, 0.005, args.days)
+
+        fast, fast_ms, fast_peak = timed(lambda: rolling_analytics.compute(portfolio, assets, WINDOWS, benchmark))
+        slow, slow_ms, slow_peak = timed(lambda: with_pandas(portfolio, assets, benchmark))
+        error = max(np.nanmax(np.abs(fast[w][name] - slow[w][name]))
+                    for w in WINDOWS for name in ('sharpe', 'beta', 'correlation'))
+        pairs = n_assets * (n_assets - 1) // 2
+        print(f"{n_assets:>4} actifs ({pairs:>5} paires): rolling_analytics {fast_ms:>8.1f} ms ({fast_peak:>6.1f} Mo)  "
+              f"pandas {slow_ms:>9.1f} ms ({slow_peak:>7.1f} Mo)  x{slow_ms / fast_ms:>6.1f}  écart max {error:.1e}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+"""
+Benchmark - screener d'univers vs backtests individuels
+Compare, sur un univers synthétique (données en cache), les appels backtest_strategy ticker par ticker
+au calcul matriciel du screener (mono-processus puis shards dans un ComputeExecutor), et mesure
+un job complet (chargement + calcul + classement).
+
+Usage: python benchmarks/bench_screener.py [--tickers 500] [--workers 2] [--sample 50]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import price_store  # noqa: E402
+from price_store import PriceStore, SyntheticSource  # noqa: E402
+
+price_store.set_store(PriceStore(source=SyntheticSource(), cache_dir=None))
+
+import quant_a  # noqa: E402
+import screener  # noqa: E402
+from compute_executor import ComputeExecutor  # noqa: E402
+
+HISTORY = '2y'
+
+
+def wait(job):
+    while job.status not in ('done', 'failed'):
+        time.sleep(0.05)
+    return job
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--tickers', type=int, default=500)
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--sample', type=int, default=50)
+    args = parser.parse_args()
+
+    tickers = [f'T{i:03d}' for i in range(args.tickers)]
+    strategies = quant_a.SWEEP_STRATEGIES
+
+    t0 = time.perf_counter()
+    frames, _ = price_store.get_many(tickers, period=HISTORY)
+    print(f"{args.tickers} tickers x {len(strategies)} stratégies, chargement initial {time.perf_counter() - t0:.2f} s")
+
+    # Boucle de backtests individuels, extrapolée depuis un échantillon
+    t0 = time.perf_counter()
+    for ticker in tickers[:args.sample]:
+        for strategy in strategies:
+            quant_a.backtest_strategy(ticker, strategy, 20, HISTORY)
+    loop = (time.perf_counter() - t0) / args.sample * args.tickers
+    print(f"{'backtest_strategy x' + str(args.tickers * len(strategies)):>28}: {loop:>8.2f} s (extrapolé)")
+
+    blocks = screener.calendar_blocks(frames)
+    t0 = time.perf_counter()
+    for matrix, _ in blocks:
+        screener.screen_block(matrix, strategies, 20)
+    print(f"{'matrice, 1 processus':>28}: {time.perf_counter() - t0:>8.2f} s")
+
+    executor = ComputeExecutor(max_workers=args.workers)
+    try:
+        for label, jobs in (('job, 1 processus', screener.ScreenerJobs()),
+                            (f'job, {args.workers} workers', screener.ScreenerJobs(executor=executor))):
+            if jobs.executor is not None:
+                wait(jobs.submit(tickers[:10], strategies, 20, HISTORY))  # démarrage des workers hors mesure
+            t0 = time.perf_counter()
+            job = wait(jobs.submit(tickers, strategies, 20, HISTORY))
+            best = job.to_dict(limit=1)['rows'][0]
+            print(f"{label:>28}: {time.perf_counter() - t0:>8.2f} s  "
+                  f"meilleur Sharpe {best['ticker']} {best['strategy']} {best['sharpe_ratio']:.2f}")
+    finally:
+        executor.shutdown(wait=True)
+
+    sharpe = [row['sharpe_ratio'] for row in job.rows if row['sharpe_ratio'] is not None]
+    print(f"{len(job.rows)} lignes, Sharpe médian {np.median(sharpe):.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+"""
+Benchmark - sérialisation de l'historique
+Compare le format historique (lignes + jsonify) au format colonnaire (orjson, msgpack si installé)
+pour un historique multi-actifs complet (sans sous-échantillonnage).
+
+Usage: python benchmarks/bench_serialization.py [--bars 2520] [--assets 10]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import serialization  # noqa: E402
+from flask import Flask, jsonify  # noqa: E402
+from history import build_history  # noqa: E402
+
+
+def timed(fn, repeat=5):
+    best = float('inf')
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--bars', type=int, default=2520)
+    parser.add_argument('--assets', type=int, default=10)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    index = pd.bdate_range(end='2026-01-02', periods=args.bars, tz='America/New_York')
+    columns = {'portfolio': 100 * np.exp(np.cumsum(rng.normal(0, 0.01, args.bars)))}
+    for i in range(args.assets):
+        columns[f'T{i}'] = 100 * np.exp(np.cumsum(rng.normal(0, 0.015, args.bars)))
+
+    app = Flask(__name__)
+    formats = [serialization.COLUMNAR_JSON] + ([serialization.MSGPACK] if serialization.msgpack else [])
+
+    print(f"{args.bars} barres x {args.assets + 1} séries")
+    print(f"{'format':>38} {'build (ms)':>11} {'encode (ms)':>12} {'KB':>9}")
+    with app.app_context():
+        t_build, rows = timed(lambda: build_history(index, columns, max_points=0))
+        t_encode, response = timed(lambda: jsonify({'history': rows}).get_data())
+        print(f"{'rows + jsonify':>38} {t_build * 1000:>11.1f} {t_encode * 1000:>12.1f} {len(response) / 1024:>9.0f}")
+
+    for media_type in formats:
+        t_build, cols = timed(lambda: build_history(index, columns, max_points=0, layout='columns'))
+        t_encode, body = timed(lambda: serialization.encode({'history': cols}, media_type))
+        print(f"{media_type:>38} {t_build * 1000:>11.1f} {t_encode * 1000:>12.1f} {len(body) / 1024:>9.0f}")
+
+
+if __name__ == '__main__':
+    main()
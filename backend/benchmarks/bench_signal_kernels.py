@@ -0,0 +1,135 @@
+"""
+Benchmark - signaux dépendant du chemin (signal_kernels) contre pandas
+RSI de Wilder + hystérésis 30 / 70, breakout (entrée / sortie propagées) et stops (stop-loss, take-profit,
+stop suiveur) sur 1M de barres: Series remplies de NaN + masques + ffill (ancienne implémentation de
+backtest_strategy; boucle Python barre par barre pour les stops) contre les noyaux NumPy et, si Numba
+est installé, les noyaux compilés. Vérifie que tous donnent les mêmes positions.
+
+Usage: python benchmarks/bench_signal_kernels.py [--bars 1000000] [--period 14] [--repeat 3]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import signal_kernels  # noqa: E402
+
+STOPS = {'stop_loss': 0.05, 'take_profit': 0.15, 'trailing_stop': 0.04}
+
+
+def timed(fn, repeat):
+    result = fn()
+    timings = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - t0) * 1000)
+    return result, statistics.median(timings)
+
+
+def pandas_rsi(prices, period):
+    # RSI de Wilder (ewm amorcé par la moyenne simple) puis hystérésis par Series NaN + ffill
+    delta = prices.diff().iloc[1:]
+    averages = []
+    for moves in (delta.clip(lower=0), (-delta).clip(lower=0)):
+        seeded = pd.concat([pd.Series([moves.iloc[:period].mean()]), moves.iloc[period:]], ignore_index=True)
+        averages.append(seeded.ewm(alpha=1 / period, adjust=False).mean().to_numpy())
+    rsi = pd.Series(np.nan, index=prices.index)
+    rsi.iloc[period:] = 100 - 100 / (1 + averages[0] / averages[1])
+    signals = pd.Series(np.nan, index=prices.index)
+    signals[rsi < 30] = 1.0
+    signals[rsi > 70] = 0.0
+    return signals.ffill().fillna(0.0).to_numpy()
+
+
+def pandas_breakout(prices, period):
+    previous = prices.shift(1).rolling(period)
+    signals = pd.Series(np.nan, index=prices.index)
+    signals[prices > previous.max()] = 1.0
+    signals[prices < previous.min()] = 0.0
+    return signals.ffill().fillna(0.0).to_numpy(), (previous.max().to_numpy(), previous.min().to_numpy())
+
+
+def python_stops(prices, entries, exits):
+    # Ce que l'on écrirait sans noyau: une itération Python par barre
+    out = np.zeros(len(prices))
+    held, entry, peak = 0.0, 0.0, 0.0
+    for t, price in enumerate(prices.tolist()):
+        if held:
+            peak = max(peak, price)
+            if (exits[t] or price <= entry * (1 - STOPS['stop_loss']) or price >= entry * (1 + STOPS['take_profit'])
+                    or price <= peak * (1 - STOPS['trailing_stop'])):
+                held = 0.0
+                continue
+        elif entries[t] and not exits[t]:
+            held, entry, peak = 1.0, price, price
+        out[t] = held
+    return out
+
+
+def with_backend(name, fn):
+    # Force le backend des noyaux le temps d'un appel
+    compiled = signal_kernels._kernels
+    if name == 'numpy':
+        signal_kernels._kernels = (None, None, 'numpy')
+    try:
+        return fn()
+    finally:
+        signal_kernels._kernels = compiled
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--bars', type=int, default=1_000_000)
+    parser.add_argument('--period', type=int, default=14)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    values = 100 * np.exp(np.cumsum(rng.normal(0, 0.002, args.bars)))
+    prices = pd.Series(values, index=pd.date_range('2000-01-03', periods=args.bars, freq='min'))
+
+    backends = ['numpy']
+    if signal_kernels.get_kernels()[2] == 'numba':
+        t0 = time.perf_counter()
+        signal_kernels.positions(values[:100], values[:100] > 0, values[:100] < 0)
+        signal_kernels.wilder_rsi(values[:100], args.period)
+        print(f"compilation Numba (ou chargement du cache): {(time.perf_counter() - t0) * 1000:.0f} ms")
+        backends.append('numba')
+    else:
+        print("Numba absent: noyaux NumPy seulement (pip install numba)")
+
+    breakout, (high, low) = pandas_breakout(prices, 20)
+    with np.errstate(invalid='ignore'):
+        entries, exits = values > high, values < low
+
+    cases = {
+        'rsi + hystérésis': (lambda: pandas_rsi(prices, args.period), lambda: (
+            lambda rsi: signal_kernels.positions(values, rsi < 30, rsi > 70))(signal_kernels.wilder_rsi(values, args.period))),
+        'breakout (hystérésis)': (lambda: pandas_breakout(prices, 20)[0],
+                                  lambda: signal_kernels.positions(values, entries, exits)),
+        'breakout + stops': (lambda: python_stops(values, entries, exits),
+                             lambda: signal_kernels.positions(values, entries, exits, **STOPS)),
+    }
+
+    print(f"{args.bars} barres, période {args.period}")
+    for name, (reference, kernel) in cases.items():
+        expected, reference_ms = timed(reference, args.repeat)
+        line = f"{name:<24} pandas {reference_ms:>9.1f} ms"
+        for backend in backends:
+            result, elapsed = with_backend(backend, lambda: timed(kernel, args.repeat))
+            with np.errstate(invalid='ignore'):
+                assert np.array_equal(result, expected), f"{name}: positions différentes ({backend})"
+            line += f"  {backend} {elapsed:>8.1f} ms (x{reference_ms / elapsed:>5.1f})"
+        print(line)
+
+
+if __name__ == '__main__':
+    main()
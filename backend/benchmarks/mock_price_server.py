@@ -0,0 +1,78 @@
+"""
+Mock price server - serveur local au format de l'API chart de Yahoo
+Sert des barres journalières déterministes (SyntheticSource) avec une latence réseau simulée,
+pour les tests de charge de HttpChartSource sans dépendre de Yahoo.
+
+Usage: python benchmarks/mock_price_server.py [--port 8900] [--latency 0.1]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+from urllib.parse import parse_qs
+
+import numpy as np
+import pandas as pd
+import uvicorn
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from price_store import SyntheticSource  # noqa: E402
+
+PREFIX = '/v8/finance/chart/'
+
+
+class MockChartServer:
+    """Application ASGI: GET /v8/finance/chart/<ticker>?period1=&period2=&interval="""
+
+    def __init__(self, latency=0.1):
+        self.latency = latency
+        self.source = SyntheticSource()
+        self.requests = 0
+
+    def payload(self, ticker, period1, period2):
+        df = self.source.fetch(ticker)
+        ts = df.index.tz_convert('UTC').as_unit('ns').asi8 // 10**9
+        lo, hi = np.searchsorted(ts, period1), np.searchsorted(ts, period2, side='right')
+        quote = {column.lower(): df[column].to_numpy()[lo:hi].tolist() for column in df.columns}
+        return {'chart': {'result': [{
+            'meta': {'symbol': ticker, 'exchangeTimezoneName': self.source.tz},
+            'timestamp': ts[lo:hi].tolist(),
+            'indicators': {'quote': [quote]},
+        }], 'error': None}}
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            return
+        self.requests += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+        path = scope['path']
+        if not path.startswith(PREFIX):
+            return await self._send(send, 404, {'error': 'not found'})
+        query = {k: v[0] for k, v in parse_qs(scope.get('query_string', b'').decode()).items()}
+        period1 = int(query.get('period1', 0))
+        period2 = int(query.get('period2', pd.Timestamp.now().timestamp()))
+        await self._send(send, 200, self.payload(path[len(PREFIX):].upper(), period1, period2))
+
+    @staticmethod
+    async def _send(send, status, body):
+        data = json.dumps(body).encode()
+        await send({'type': 'http.response.start', 'status': status,
+                    'headers': [(b'content-type', b'application/json'), (b'content-length', str(len(data)).encode())]})
+        await send({'type': 'http.response.body', 'body': data})
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--port', type=int, default=8900)
+    parser.add_argument('--latency', type=float, default=0.1)
+    args = parser.parse_args()
+    uvicorn.run(MockChartServer(args.latency), host='127.0.0.1', port=args.port, log_level='warning')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,259 @@
+"""
+Benchmark suite - référence de performance des chemins critiques de Quant A, Quant B et quant_metrics
+Données déterministes (SyntheticSource à horloge fixe, cache en mémoire préchauffé): seuls les calculs
+sont mesurés, pas le réseau.
+
+- quant_a: backtest_strategy pour chaque stratégie x longueur d'historique, get_asset_data
+- quant_b: analyze_portfolio de 2 à 100 actifs
+- quant_metrics: chaque métrique individuelle + compute_all_metrics / compute_benchmark_metrics
+- serialization: jsonify / orjson des réponses backtest et portefeuille
+- startup: import de app.py et première réponse /api/health dans un process neuf (budget STARTUP_BUDGET_MS)
+- Temps (médiane et min sur --repeat exécutions) et pic mémoire (tracemalloc, exécution séparée)
+- Résultats en JSON; comparaison à une référence avec seuil de régression (code de sortie 1 si régression)
+
+Usage:
+    python benchmarks/suite.py                            # mesure + comparaison à benchmarks/baseline.json
+    python benchmarks/suite.py --filter quant_b --repeat 3
+    python benchmarks/suite.py --output results.json --threshold 0.3
+    python benchmarks/suite.py --save-baseline            # remplace la référence
+"""
+
+import argparse
+import json
+import os
+import platform
+import re
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND)
+
+import price_store  # noqa: E402
+from price_store import PriceStore, SyntheticSource  # noqa: E402
+
+# Horloge figée: mêmes dates et mêmes prix à chaque exécution
+FIXED_CLOCK = pd.Timestamp('2026-01-02 21:00', tz='UTC').timestamp()
+price_store.set_store(PriceStore(source=SyntheticSource(clock=lambda: FIXED_CLOCK), cache_dir=None,
+                                 clock=lambda: FIXED_CLOCK))
+
+import quant_a  # noqa: E402
+import quant_b  # noqa: E402
+import quant_metrics  # noqa: E402
+import serialization  # noqa: E402
+from flask import Flask, jsonify  # noqa: E402
+
+DEFAULT_BASELINE = os.path.join(BACKEND, 'benchmarks', 'baseline.json')
+DEFAULT_THRESHOLD = 0.25   # +25% sur la médiane = régression
+NOISE_FLOOR_MS = 0.05      # écarts absolus plus petits ignorés
+MEMORY_FLOOR_KB = 256
+STARTUP_BUDGET_MS = 1000   # démarrage à froid: au-delà, régression même sans référence
+
+HISTORY_PERIODS = ('3mo', '1y', '5y', '10y')
+PORTFOLIO_SIZES = (2, 5, 10, 25, 50, 100)
+METRIC_BARS = 1260
+
+
+# ============================================================================
+# CAS
+# ============================================================================
+
+def _tickers(n):
+    return [f'T{i:03d}' for i in range(n)]
+
+
+def _returns(n, seed):
+    return np.random.default_rng(seed).normal(0.0004, 0.012, n)
+
+
+def build_cases():
+    """Liste (nom, fonction sans argument); le préchauffage du cache de prix se fait ici"""
+    cases = []
+    if quant_a.get_asset_data('AAPL', period='3mo') is None:
+        raise RuntimeError('Fournisseur de prix synthétique vide')
+
+    for period in HISTORY_PERIODS:
+        quant_a.get_asset_data('AAPL', period=period)
+        for strategy in quant_a.SWEEP_STRATEGIES:
+            cases.append((f'quant_a.backtest.{strategy}.{period}',
+                          lambda s=strategy, p=period: quant_a.backtest_strategy('AAPL', s, 20, p)))
+        cases.append((f'quant_a.asset_data.{period}', lambda p=period: quant_a.get_asset_data('AAPL', period=p)))
+
+    price_store.get_many(_tickers(max(PORTFOLIO_SIZES)) + ['SPY'], period='1y')
+    for size in PORTFOLIO_SIZES:
+        assets = [{'ticker': ticker, 'weight': 100 / size} for ticker in _tickers(size)]
+        cases.append((f'quant_b.portfolio.{size:03d}_assets',
+                      lambda a=assets: quant_b.analyze_portfolio(a, 'monthly', period='1y')))
+
+    returns, benchmark = _returns(METRIC_BARS, 1), _returns(METRIC_BARS, 2)
+    series = pd.Series(returns)
+    metrics = {
+        'var': lambda: quant_metrics.calculate_var(returns),
+        'cvar': lambda: quant_metrics.calculate_cvar(returns),
+        'sortino_ratio': lambda: quant_metrics.calculate_sortino_ratio(series),
+        'calmar_ratio': lambda: quant_metrics.calculate_calmar_ratio(series, -10.0),
+        'omega_ratio': lambda: quant_metrics.calculate_omega_ratio(series),
+        'beta': lambda: quant_metrics.calculate_beta(series, pd.Series(benchmark)),
+        'alpha': lambda: quant_metrics.calculate_alpha(series, pd.Series(benchmark)),
+        'information_ratio': lambda: quant_metrics.calculate_information_ratio(series, pd.Series(benchmark)),
+        'skewness': lambda: quant_metrics.calculate_skewness(series),
+        'kurtosis': lambda: quant_metrics.calculate_kurtosis(series),
+        'tail_ratio': lambda: quant_metrics.calculate_tail_ratio(series),
+        'hit_ratio': lambda: quant_metrics.calculate_hit_ratio(series),
+        'win_loss_ratio': lambda: quant_metrics.calculate_win_loss_ratio(series),
+        'compute_all_metrics': lambda: quant_metrics.compute_all_metrics(returns, benchmark, max_drawdown=-10.0),
+        'compute_benchmark_metrics': lambda: quant_metrics.compute_benchmark_metrics(returns, benchmark),
+    }
+    cases.extend((f'quant_metrics.{name}', fn) for name, fn in metrics.items())
+
+    app = Flask(__name__)
+    backtest = quant_a.backtest_strategy('AAPL', 'momentum', 20, '10y', max_points=0)
+    backtest_columns = quant_a.backtest_strategy('AAPL', 'momentum', 20, '10y', max_points=0, history_layout='columns')
+    portfolio = quant_b.analyze_portfolio([{'ticker': t, 'weight': 10} for t in _tickers(10)], period='1y')
+
+    def jsonify_body(payload):
+        with app.app_context():
+            return jsonify(payload).get_data()
+
+    cases.extend([
+        ('startup.import_app', lambda: _python('import app')),
+        ('startup.health', lambda: _python("import app; assert app.app.test_client().get('/api/health').status_code == 200")),
+        ('serialization.backtest_10y.jsonify', lambda: jsonify_body(backtest)),
+        ('serialization.backtest_10y.columnar', lambda: serialization.encode(backtest_columns,
+                                                                            serialization.COLUMNAR_JSON)),
+        ('serialization.portfolio_010.jsonify', lambda: jsonify_body(portfolio)),
+        ('serialization.portfolio_010.orjson', lambda: serialization.encode(portfolio, serialization.JSON)),
+    ])
+    return cases
+
+
+def _python(code):
+    # Process neuf (modules non importés): mesure le démarrage réel, interpréteur compris
+    env = {**os.environ, 'PRICE_SOURCE': 'synthetic', 'PYTHONWARNINGS': 'ignore'}
+    subprocess.run([sys.executable, '-c', code], cwd=BACKEND, env=env, check=True, stdout=subprocess.DEVNULL)
+
+
+# ============================================================================
+# MESURE
+# ============================================================================
+
+def measure(fn, repeat):
+    fn()  # préchauffage (imports paresseux, caches)
+    timings = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - t0) * 1000)
+
+    # Pic mémoire sur une exécution séparée: tracemalloc ralentit le code mesuré
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return {
+        'median_ms': round(statistics.median(timings), 4),
+        'min_ms': round(min(timings), 4),
+        'peak_kb': round(peak / 1024, 1),
+    }
+
+
+def run(cases, repeat, pattern=None):
+    results = {}
+    for name, fn in cases:
+        if pattern and not re.search(pattern, name):
+            continue
+        results[name] = measure(fn, repeat)
+        r = results[name]
+        print(f"{name:<48} {r['median_ms']:>10.3f} ms  (min {r['min_ms']:>9.3f})  {r['peak_kb']:>10.1f} KB")
+    return results
+
+
+def metadata(repeat):
+    return {
+        'date': pd.Timestamp.now(tz='UTC').isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'machine': platform.machine(),
+        'cpus': os.cpu_count(),
+        'repeat': repeat,
+    }
+
+
+def compare(results, baseline, threshold):
+    """Régressions de temps (médiane) et de pic mémoire par rapport à la référence"""
+    regressions = []
+    print(f"\n{'cas':<48} {'réf (ms)':>10} {'actuel':>10} {'ratio':>7}")
+    for name, current in results.items():
+        reference = baseline.get(name)
+        if reference is None:
+            print(f"{name:<48} {'-':>10} {current['median_ms']:>10.3f}    nouveau")
+            continue
+
+        ratio = current['median_ms'] / reference['median_ms'] if reference['median_ms'] else float('inf')
+        slower = ratio > 1 + threshold and current['median_ms'] - reference['median_ms'] > NOISE_FLOOR_MS
+        heavier = (current['peak_kb'] > reference['peak_kb'] * (1 + threshold)
+                   and current['peak_kb'] - reference['peak_kb'] > MEMORY_FLOOR_KB)
+        flags = ' '.join(flag for flag, hit in (('TEMPS', slower), ('MEMOIRE', heavier)) if hit)
+        print(f"{name:<48} {reference['median_ms']:>10.3f} {current['median_ms']:>10.3f} {ratio:>7.2f} {flags}")
+        if flags:
+            regressions.append(name)
+    return regressions
+
+
+def over_budget(results):
+    """Cas de démarrage au-delà de STARTUP_BUDGET_MS (indépendant de la référence)"""
+    slow = [name for name, r in results.items() if name.startswith('startup.') and r['median_ms'] > STARTUP_BUDGET_MS]
+    for name in slow:
+        print(f"{name}: {results[name]['median_ms']:.0f} ms > budget {STARTUP_BUDGET_MS} ms")
+    return slow
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--filter', help='expression régulière sur le nom des cas')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--output', help='fichier JSON des résultats')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE)
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument('--save-baseline', action='store_true', help='enregistre les résultats comme référence')
+    args = parser.parse_args()
+
+    results = run(build_cases(), args.repeat, args.filter)
+    report = {'meta': metadata(args.repeat), 'results': results}
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+
+    slow = over_budget(results)
+
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+        print(f"\nRéférence enregistrée: {args.baseline}")
+        return 1 if slow else 0
+
+    if not os.path.exists(args.baseline):
+        print(f"\nPas de référence ({args.baseline}): lancer avec --save-baseline")
+        return 1 if slow else 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    regressions = compare(results, baseline['results'], args.threshold) + slow
+    if regressions:
+        print(f"\n{len(regressions)} régression(s) au-delà de +{args.threshold:.0%}")
+        return 1
+    print(f"\nAucune régression au-delà de +{args.threshold:.0%}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
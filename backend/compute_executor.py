@@ -0,0 +1,216 @@
+"""
+Compute Executor - exécution des calculs lourds hors du thread de requête Flask
+Envoie les jobs CPU (analytics de portefeuille) vers un pool de processus.
+
+- Les tableaux NumPy transitent par mémoire partagée (pas de DataFrames picklés)
+- Nombre de workers, timeout par job et file d'attente bornée configurables
+- File pleine -> ExecutorBusy (l'API répond 503)
+- Worker mort (OOM, segfault) -> pool abandonné et recréé au job suivant
+- Étapes instrumentées dans le worker renvoyées avec le résultat (Server-Timing de la requête)
+"""
+
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import shared_memory
+
+import numpy as np
+
+import instrumentation
+
+DEFAULT_TIMEOUT = 30  # secondes
+
+
+class ExecutorBusy(Exception):
+    """Trop de jobs en attente: la requête doit être rejetée (503)"""
+
+
+class ComputeTimeout(Exception):
+    """Le job n'a pas terminé dans le délai imparti"""
+
+
+# ============================================================================
+# MÉMOIRE PARTAGÉE
+# ============================================================================
+
+def _to_shared(arrays):
+    """Copie chaque tableau dans un segment partagé; renvoie (descripteurs, segments)"""
+    descriptors, segments = {}, []
+    try:
+        for name, array in arrays.items():
+            array = np.ascontiguousarray(array)
+            if array.dtype.hasobject:
+                # Des pointeurs Python n'ont pas de sens dans un autre process
+                raise TypeError(f'{name}: tableau de dtype objet non partageable')
+            if array.nbytes == 0:
+                descriptors[name] = array  # rien à partager, envoyé tel quel
+                continue
+            shm = shared_memory.SharedMemory(create=True, size=array.nbytes)
+            segments.append(shm)
+            np.ndarray(array.shape, dtype=array.dtype, buffer=shm.buf)[...] = array
+            descriptors[name] = (shm.name, array.shape, array.dtype.str)
+    except BaseException:
+        # Mémoire insuffisante, dtype objet...: aucun segment ne doit survivre à l'échec
+        _unlink(segments)
+        raise
+    return descriptors, segments
+
+
+def _unlink(segments):
+    for shm in segments:
+        shm.close()
+        shm.unlink()
+
+
+def _run_job(fn, descriptors, kwargs):
+    # Côté worker: vues NumPy sur les segments du parent, sans copie; renvoie (résultat, étapes)
+    segments, arrays = [], {}
+    try:
+        for name, desc in descriptors.items():
+            if isinstance(desc, np.ndarray):
+                arrays[name] = desc
+                continue
+            shm_name, shape, dtype = desc
+            # Le parent reste propriétaire du segment (c'est lui qui le libère)
+            shm = shared_memory.SharedMemory(name=shm_name)
+            segments.append(shm)
+            arrays[name] = np.ndarray(shape, dtype=np.dtype(dtype), buffer=shm.buf)
+        with instrumentation.capture() as stages:
+            result = fn(**arrays, **kwargs)
+        return result, stages.durations
+    finally:
+        arrays.clear()
+        for shm in segments:
+            shm.close()
+
+
+# ============================================================================
+# EXECUTOR
+# ============================================================================
+
+class ComputeExecutor:
+    """Pool de processus avec backpressure; max_workers=0 exécute les jobs dans le thread appelant"""
+
+    def __init__(self, max_workers=None, max_pending=None, timeout=DEFAULT_TIMEOUT):
+        self.max_workers = (os.cpu_count() or 1) if max_workers is None else max_workers
+        self.max_pending = max_pending if max_pending is not None else 2 * max(self.max_workers, 1)
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._pool = None
+        self._pool_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self.stats = {'submitted': 0, 'completed': 0, 'rejected': 0, 'timeouts': 0, 'errors': 0}
+
+    def _get_pool(self):
+        with self._pool_lock:
+            if self._pool is None:
+                # spawn: pas de fork d'un process Flask multi-threadé
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context('spawn')
+                )
+            return self._pool
+
+    def _discard_pool(self, pool):
+        # Un worker mort laisse le pool cassé pour toujours: on l'abandonne, _get_pool en recrée un
+        with self._pool_lock:
+            if self._pool is pool:
+                self._pool = None
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    def _count(self, key):
+        with self._stats_lock:
+            self.stats[key] += 1
+
+    def run(self, fn, arrays, timeout=None, **kwargs):
+        """
+        Exécute fn(**arrays, **kwargs) dans un worker et renvoie son résultat
+
+        Args:
+            fn: fonction de niveau module (picklable)
+            arrays: dict nom -> np.ndarray, transmis par mémoire partagée
+            timeout: délai max en secondes (défaut: self.timeout)
+        """
+        if not self._slots.acquire(blocking=False):
+            self._count('rejected')
+            raise ExecutorBusy(f'{self.max_pending} jobs déjà en attente')
+        self._count('submitted')
+
+        if self.max_workers == 0:
+            try:
+                result = fn(**arrays, **kwargs)
+            except Exception:
+                self._count('errors')
+                raise
+            finally:
+                self._slots.release()
+            self._count('completed')
+            return result
+
+        # Jusqu'à la soumission, toute erreur rend le slot et les segments déjà créés
+        segments, pool = [], None
+        try:
+            descriptors, segments = _to_shared(arrays)
+            pool = self._get_pool()
+            future = pool.submit(_run_job, fn, descriptors, kwargs)
+        except BaseException as e:
+            self._count('errors')
+            self._release(segments)
+            if isinstance(e, BrokenProcessPool):
+                self._discard_pool(pool)
+            raise
+
+        # Le slot et les segments ne sont libérés qu'à la fin réelle du job (même après un timeout)
+        future.add_done_callback(lambda _: self._release(segments))
+        try:
+            result, durations = future.result(timeout=self.timeout if timeout is None else timeout)
+        except FutureTimeout:
+            self._count('timeouts')
+            raise ComputeTimeout(f'Calcul non terminé après {self.timeout if timeout is None else timeout}s')
+        except BrokenProcessPool:
+            self._count('errors')
+            self._discard_pool(pool)
+            raise
+        except Exception:
+            self._count('errors')
+            raise
+        self._count('completed')
+        instrumentation.merge(durations)
+        return result
+
+    def _release(self, segments):
+        _unlink(segments)
+        self._slots.release()
+
+    def snapshot(self):
+        with self._stats_lock:
+            stats = dict(self.stats)
+        stats.update({'workers': self.max_workers, 'max_pending': self.max_pending})
+        return stats
+
+    def shutdown(self, wait=False):
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=wait, cancel_futures=True)
+                self._pool = None
+
+
+_default_executor = None
+_default_lock = threading.Lock()
+
+
+def get_executor():
+    """Executor partagé, configuré par COMPUTE_WORKERS / COMPUTE_MAX_PENDING / COMPUTE_TIMEOUT"""
+    global _default_executor
+    with _default_lock:
+        if _default_executor is None:
+            workers = os.environ.get('COMPUTE_WORKERS')
+            pending = os.environ.get('COMPUTE_MAX_PENDING')
+            _default_executor = ComputeExecutor(
+                max_workers=int(workers) if workers is not None else None,
+                max_pending=int(pending) if pending is not None else None,
+                timeout=float(os.environ.get('COMPUTE_TIMEOUT', DEFAULT_TIMEOUT))
+            )
+        return _default_executor
@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+"""
+Daily Report Generator
+Run this script daily (cron, scheduler) to get a market summary of a watchlist
+
+- Watchlist loaded from config (--watchlist, REPORT_WATCHLIST or watchlist.txt), thousands of symbols
+- Quotes fetched in batches through the shared price store (bounded thread pool), failed symbols retried
+- Each day's snapshot written to a compact columnar file (reports/snapshot_YYYY-MM-DD.npz)
+- A re-run the same day only fetches the symbols not captured yet (or those that failed)
+- CSV (all symbols) and HTML (top movers, errors) summaries rendered next to the snapshot
+
+Usage:
+    python daily_report.py
+    python daily_report.py --watchlist sp500.txt --batch-size 200 --top 20
+    python daily_report.py --force        # refetch every symbol of the day
+"""
+
+import argparse
+import csv
+import html
+import json
+import os
+import threading
+import time
+from datetime import datetime
+
+import numpy as np
+
+from price_store import get_store
+
+# Default tickers to track (no watchlist configured)
+TICKERS = ['AAPL', 'MSFT', 'GOOGL', 'TSLA']
+
+BACKEND = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_WATCHLIST = os.path.join(BACKEND, 'watchlist.txt')
+DEFAULT_REPORT_DIR = os.path.join(BACKEND, 'reports')
+DEFAULT_BATCH_SIZE = 100
+DEFAULT_RETRIES = 2
+RETRY_DELAY = 1.0  # seconds, doubled after each attempt
+DEFAULT_TOP = 10
+
+QUOTE_FIELDS = ('open', 'high', 'low', 'close', 'previous_close', 'volume', 'change', 'day_change')
+
+
+# ============================================================================
+# WATCHLIST
+# ============================================================================
+
+def load_watchlist(path=None):
+    """
+    Symbols to report on, upper-cased and de-duplicated (file order kept)
+
+    path: text file (one symbol per line or comma separated, '#' comments) or JSON
+    (list, or {"tickers": [...]}). Default: REPORT_WATCHLIST, then watchlist.txt, then TICKERS.
+    """
+    path = path or os.environ.get('REPORT_WATCHLIST') or (DEFAULT_WATCHLIST if os.path.exists(DEFAULT_WATCHLIST)
+                                                           else None)
+    if path is None:
+        return list(TICKERS)
+
+    with open(path) as f:
+        content = f.read()
+    if path.endswith('.json'):
+        data = json.loads(content)
+        symbols = data['tickers'] if isinstance(data, dict) else data
+    else:
+        symbols = [s for line in content.splitlines() for s in line.split('#', 1)[0].replace(',', ' ').split()]
+    return list(dict.fromkeys(s.strip().upper() for s in symbols if s.strip()))
+
+
+# ============================================================================
+# SNAPSHOT (columnar, one file per day)
+# ============================================================================
+
+class Snapshot:
+    """Quotes captured for one day: ticker -> dict of QUOTE_FIELDS + session date, and ticker -> error"""
+
+    def __init__(self, day, quotes=None, errors=None):
+        self.day = day
+        self.quotes = quotes or {}
+        self.errors = errors or {}
+
+    @classmethod
+    def load(cls, path, day):
+        if not os.path.exists(path):
+            return cls(day)
+        with np.load(path, allow_pickle=False) as data:
+            tickers = data['ticker'].tolist()
+            sessions = data['session'].astype('datetime64[D]').astype(str).tolist()
+            columns = {field: data[field].tolist() for field in QUOTE_FIELDS}
+            quotes = {
+                ticker: {'session': sessions[i], **{field: columns[field][i] for field in QUOTE_FIELDS}}
+                for i, ticker in enumerate(tickers)
+            }
+            errors = dict(zip(data['error_ticker'].tolist(), data['error_message'].tolist()))
+        return cls(day, quotes, errors)
+
+    def save(self, path):
+        # One array per field (float64 columns, fixed-width strings): no pickle, loads in one read
+        tickers = list(self.quotes)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f'{path}.{threading.get_ident()}.tmp'
+        with open(tmp_path, 'wb') as f:
+            np.savez_compressed(
+                f,
+                ticker=np.array(tickers, dtype=str),
+                session=np.array([self.quotes[t]['session'] for t in tickers], dtype='datetime64[D]'),
+                **{field: np.array([self.quotes[t][field] for t in tickers], dtype=np.float64)
+                   for field in QUOTE_FIELDS},
+                error_ticker=np.array(list(self.errors), dtype=str),
+                error_message=np.array(list(self.errors.values()), dtype=str),
+            )
+        os.replace(tmp_path, path)
+
+    def movers(self, top=DEFAULT_TOP):
+        """(gainers, losers): top symbols by change vs previous close"""
+        ranked = sorted((q['day_change'], t) for t, q in self.quotes.items() if np.isfinite(q['day_change']))
+        return [t for _, t in reversed(ranked[-top:])], [t for _, t in ranked[:top]]
+
+
+def quote_from_history(hist):
+    """Last session of a daily history: open / close / previous close and changes (%)"""
+    last = hist.iloc[-1]
+    previous_close = float(hist['Close'].iloc[-2]) if len(hist) > 1 else np.nan
+    close, open_price = float(last['Close']), float(last['Open'])
+    return {
+        'session': hist.index[-1].strftime('%Y-%m-%d'),
+        'open': open_price,
+        'high': float(last['High']),
+        'low': float(last['Low']),
+        'close': close,
+        'previous_close': previous_close,
+        'volume': float(last['Volume']),
+        'change': (close - open_price) / open_price * 100 if open_price else np.nan,
+        'day_change': (close - previous_close) / previous_close * 100 if previous_close else np.nan,
+    }
+
+
+# ============================================================================
+# REPORT
+# ============================================================================
+
+class DailyReport:
+    """Snapshot of a watchlist for the current day, captured incrementally"""
+
+    def __init__(self, tickers=None, report_dir=None, batch_size=None, retries=None, store=None, day=None):
+        self.tickers = load_watchlist() if tickers is None else list(dict.fromkeys(t.upper() for t in tickers))
+        self.report_dir = report_dir or os.environ.get('REPORT_DIR', DEFAULT_REPORT_DIR)
+        self.batch_size = batch_size or int(os.environ.get('REPORT_BATCH_SIZE', DEFAULT_BATCH_SIZE))
+        self.retries = int(os.environ.get('REPORT_RETRIES', DEFAULT_RETRIES)) if retries is None else retries
+        self.store = store or get_store()
+        self.day = day or datetime.now().strftime('%Y-%m-%d')
+
+    def path(self, extension):
+        name = 'snapshot' if extension == 'npz' else 'report'
+        return os.path.join(self.report_dir, f'{name}_{self.day}.{extension}')
+
+    def capture(self, force=False, progress=None):
+        """
+        Fetch the quotes missing from today's snapshot (all of them if force) and save it after each batch
+
+        Returns:
+            (snapshot, number of symbols fetched in this run)
+        """
+        snapshot = Snapshot(self.day) if force else Snapshot.load(self.path('npz'), self.day)
+        pending = [t for t in self.tickers if t not in snapshot.quotes]
+
+        for i in range(0, len(pending), self.batch_size):
+            batch = pending[i:i + self.batch_size]
+            quotes, errors = self._fetch_batch(batch)
+            snapshot.quotes.update(quotes)
+            for ticker in batch:
+                snapshot.errors.pop(ticker, None)
+            snapshot.errors.update(errors)
+            # Saved per batch: an interrupted run resumes where it stopped
+            snapshot.save(self.path('npz'))
+            if progress is not None:
+                progress(min(i + self.batch_size, len(pending)), len(pending))
+
+        if not pending and not os.path.exists(self.path('npz')):
+            snapshot.save(self.path('npz'))
+        return snapshot, len(pending)
+
+    def _fetch_batch(self, batch):
+        # Concurrency bounded by the price store pool (PRICE_FETCH_WORKERS), failures retried with backoff
+        quotes, errors = {}, {}
+        todo = batch
+        for attempt in range(self.retries + 1):
+            if attempt:
+                time.sleep(RETRY_DELAY * 2 ** (attempt - 1))
+            frames, fetch_errors = self.store.get_many(todo, period='5d')
+            for ticker in todo:
+                frame = frames.get(ticker)
+                if ticker in fetch_errors:
+                    errors[ticker] = fetch_errors[ticker]
+                elif frame is None or frame.empty:
+                    errors[ticker] = 'No data'
+                else:
+                    quotes[ticker] = quote_from_history(frame)
+                    errors.pop(ticker, None)
+            # Empty histories (unknown symbol) are not retried
+            todo = [t for t in todo if t in fetch_errors]
+            if not todo:
+                break
+
+        # The report reads each series once: no need to keep thousands of them in memory
+        for ticker in batch:
+            self.store.invalidate(ticker)
+        return quotes, errors
+
+    def render(self, snapshot, top=DEFAULT_TOP):
+        """Write the CSV (every symbol) and HTML (movers, errors) summaries, return their paths"""
+        os.makedirs(self.report_dir, exist_ok=True)
+        ordered = sorted(snapshot.quotes.items(),
+                         key=lambda item: -item[1]['day_change'] if np.isfinite(item[1]['day_change']) else np.inf)
+        with open(self.path('csv'), 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['ticker', 'session', *QUOTE_FIELDS, 'error'])
+            for ticker, quote in ordered:
+                writer.writerow([ticker, quote['session'], *(_csv_number(quote[field]) for field in QUOTE_FIELDS), ''])
+            for ticker, message in snapshot.errors.items():
+                writer.writerow([ticker, '', *([''] * len(QUOTE_FIELDS)), message])
+
+        with open(self.path('html'), 'w') as f:
+            f.write(render_html(snapshot, top))
+        return self.path('csv'), self.path('html')
+
+
+def _csv_number(value):
+    return '' if not np.isfinite(value) else f'{value:.4f}'.rstrip('0').rstrip('.')
+
+
+def render_html(snapshot, top=DEFAULT_TOP):
+    gainers, losers = snapshot.movers(top)
+
+    def table(title, tickers):
+        rows = ''.join(
+            f"<tr><td>{html.escape(t)}</td><td>{q['close']:.2f}</td><td>{q['day_change']:+.2f}%</td>"
+            f"<td>{q['change']:+.2f}%</td></tr>"
+            for t, q in ((t, snapshot.quotes[t]) for t in tickers)
+        )
+        return (f'<h2>{title}</h2><table><tr><th>Ticker</th><th>Close</th><th>vs prev. close</th>'
+                f'<th>vs open</th></tr>{rows}</table>')
+
+    errors = ''.join(f'<tr><td>{html.escape(t)}</td><td>{html.escape(m)}</td></tr>'
+                     for t, m in sorted(snapshot.errors.items()))
+    return (
+        '<!DOCTYPE html><html><head><meta charset="utf-8">'
+        f'<title>Daily Market Report - {snapshot.day}</title>'
+        '<style>body{font-family:sans-serif;background:#111;color:#eee}table{border-collapse:collapse}'
+        'td,th{padding:4px 12px;border-bottom:1px solid #333;text-align:right}td:first-child{text-align:left}'
+        '</style></head><body>'
+        f'<h1>Daily Market Report - {snapshot.day}</h1>'
+        f'<p>{len(snapshot.quotes)} symbols captured, {len(snapshot.errors)} errors</p>'
+        + table('Top gainers', gainers) + table('Top losers', losers)
+        + (f'<h2>Errors</h2><table><tr><th>Ticker</th><th>Error</th></tr>{errors}</table>' if errors else '')
+        + '</body></html>\n'
+    )
+
+
+def generate_report(tickers=None, force=False, top=DEFAULT_TOP, **options):
+    report = DailyReport(tickers, **options)
+
+    print("=" * 60)
+    print(f"Daily Market Report - {datetime.now().strftime('%Y-%m-%d %H:%M')}")
+    print("=" * 60)
+
+    def progress(done, total):
+        print(f"  fetched {done}/{total}", end='\r' if done < total else '\n', flush=True)
+
+    t0 = time.perf_counter()
+    snapshot, fetched = report.capture(force=force, progress=progress)
+    print(f"{len(report.tickers)} symbols, {fetched} fetched in {time.perf_counter() - t0:.1f}s "
+          f"({len(report.tickers) - fetched} already captured today), {len(snapshot.errors)} errors")
+
+    gainers, losers = snapshot.movers(top)
+    for title, tickers in (('Top gainers', gainers), ('Top losers', losers)):
+        print(f"\n{title}:")
+        for ticker in tickers:
+            quote = snapshot.quotes[ticker]
+            print(f"  {ticker:<8} Close: ${quote['close']:.2f}  Change: {quote['day_change']:+.2f}%")
+    for ticker, message in list(snapshot.errors.items())[:top]:
+        print(f"\n{ticker}: Error - {message}")
+
+    csv_path, html_path = report.render(snapshot, top)
+    print(f"\nSnapshot: {report.path('npz')}\nCSV: {csv_path}\nHTML: {html_path}")
+    print("\n" + "=" * 60)
+    return snapshot
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--watchlist', help='symbols file (text or JSON), default REPORT_WATCHLIST / watchlist.txt')
+    parser.add_argument('--output-dir', help='snapshot and summaries directory (default REPORT_DIR / reports/)')
+    parser.add_argument('--batch-size', type=int)
+    parser.add_argument('--retries', type=int)
+    parser.add_argument('--top', type=int, default=DEFAULT_TOP)
+    parser.add_argument('--force', action='store_true', help="refetch the symbols already in today's snapshot")
+    args = parser.parse_args()
+
+    generate_report(load_watchlist(args.watchlist), force=args.force, top=args.top, report_dir=args.output_dir,
+                    batch_size=args.batch_size, retries=args.retries)
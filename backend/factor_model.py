@@ -0,0 +1,163 @@
+"""
+Factor Model - expositions factorielles (betas, alpha, t-stats, R²) d'un univers d'actifs et du portefeuille
+Utilisé par Quant B (/api/portfolio/factors), généralise beta / alpha vs SPY à plusieurs facteurs.
+
+- Facteurs: marché (SPY), taille (IWM - SPY), value (IWD - IWF), momentum (MTUM - SPY), ETF sectoriels
+  ou n'importe quel ticker (rendement en excès du taux sans risque)
+- Une seule résolution des moindres carrés pour toutes les colonnes partageant le même historique
+  (SVD de la matrice des facteurs alignée par date, puis un produit matriciel), au lieu d'une régression par actif
+- Colonnes groupées par première barre valide (historiques plus courts): un solve par groupe
+- Même convention que Quant B: taux sans risque 2% annuel, annualisation sur 252 barres
+"""
+
+import numpy as np
+
+RISK_FREE_RATE = 0.02
+PERIODS_PER_YEAR = 252
+MAX_FACTORS = 12
+MAX_ASSETS = 1000
+
+# Facteur -> (ticker long, ticker short): spread long - short, ou excès de rendement du ticker seul
+FACTORS = {
+    'market': ('SPY', None),
+    'size': ('IWM', 'SPY'),
+    'value': ('IWD', 'IWF'),
+    'momentum': ('MTUM', 'SPY'),
+}
+SECTOR_ETFS = ('XLB', 'XLC', 'XLE', 'XLF', 'XLI', 'XLK', 'XLP', 'XLRE', 'XLU', 'XLV', 'XLY')
+DEFAULT_FACTORS = ('market', 'size', 'value')
+
+
+def resolve(factors=None):
+    """
+    Spécification des facteurs: liste de (nom, ticker long, ticker short ou None), ValueError si invalide
+
+    factors: noms de FACTORS et / ou tickers (ETF sectoriels, indices...), défaut DEFAULT_FACTORS
+    """
+    names = list(DEFAULT_FACTORS if factors is None else factors)
+    if not 1 <= len(names) <= MAX_FACTORS:
+        raise ValueError(f'Entre 1 et {MAX_FACTORS} facteurs')
+    specs = []
+    for name in names:
+        if not isinstance(name, str) or not name.strip():
+            raise ValueError(f'Facteur invalide: {name!r}')
+        name = name.strip()
+        key = name.lower()
+        specs.append((key, *FACTORS[key]) if key in FACTORS else (name.upper(), name.upper(), None))
+    if len({spec[0] for spec in specs}) != len(specs):
+        raise ValueError('Facteurs en double')
+    return specs
+
+
+def factor_tickers(specs):
+    """Tickers à télécharger pour construire les facteurs"""
+    return sorted({ticker for _, long, short in specs for ticker in (long, short) if ticker is not None})
+
+
+def factor_returns(specs, returns, risk_free_rate=RISK_FREE_RATE):
+    """
+    Rendements des facteurs (T, F) à partir des rendements alignés de leurs tickers
+
+    returns: dict ticker -> (T,) rendements aux mêmes dates
+    """
+    daily_rf = risk_free_rate / PERIODS_PER_YEAR
+    columns = [returns[long] - returns[short] if short is not None else returns[long] - daily_rf
+               for _, long, short in specs]
+    return np.column_stack(columns)
+
+
+# ============================================================================
+# RÉGRESSION
+# ============================================================================
+
+def regress(returns, factors, risk_free_rate=RISK_FREE_RATE):
+    """
+    Régression des rendements en excès de chaque colonne sur les facteurs (avec constante)
+
+    Args:
+        returns: (T, N) rendements sans NaN, une colonne par actif
+        factors: (T, F) rendements des facteurs aux mêmes dates
+
+    Returns:
+        dict de tableaux: alpha (N,) annualisé en %, alpha_t (N,), betas (F, N), t_stats (F, N),
+        r_squared, adj_r_squared, residual_volatility (N,) annualisée en %, observations, rank
+    """
+    Y = np.asarray(returns, dtype=np.float64)
+    X = np.column_stack([np.ones(len(Y)), np.asarray(factors, dtype=np.float64)])
+    n, k = X.shape
+
+    # Une seule SVD de X (T x (F+1)) pour toutes les colonnes: coefficients = V S^-1 U' Y, un produit matriciel.
+    # Valeurs singulières négligeables écartées (facteurs colinéaires): solution de norme minimale, comme lstsq
+    U, S, Vt = np.linalg.svd(X, full_matrices=False)
+    keep = S > S[0] * max(n, k) * np.finfo(np.float64).eps
+    rank = int(keep.sum())
+    V = Vt[keep].T / S[keep]
+    coefficients = V @ (U[:, keep].T @ Y)
+
+    # Résidus puis écarts à la moyenne dans un même tampon (pas de copie de Y)
+    buffer = X @ coefficients
+    np.subtract(Y, buffer, out=buffer)
+    rss = np.einsum('ij,ij->j', buffer, buffer)
+    np.subtract(Y, Y.mean(axis=0), out=buffer)
+    tss = np.einsum('ij,ij->j', buffer, buffer)
+    # Régression sur les rendements bruts: seule la constante change avec le taux sans risque
+    coefficients[0] -= risk_free_rate / PERIODS_PER_YEAR
+    dof = n - rank
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        sigma2 = rss / dof if dof > 0 else np.full(Y.shape[1], np.nan)
+        # Erreurs standard: diagonale de (X'X)^-1 = V S^-2 V', partagée par toutes les colonnes
+        scale = np.sqrt(np.einsum('ij,ij->i', V, V))
+        t_stats = coefficients / np.outer(scale, np.sqrt(sigma2))
+        r_squared = np.where(tss > 0, 1 - rss / tss, np.nan)
+        adj_r_squared = 1 - (1 - r_squared) * (n - 1) / dof if dof > 0 else np.full(Y.shape[1], np.nan)
+
+    return {
+        'alpha': coefficients[0] * PERIODS_PER_YEAR * 100,
+        'alpha_t': t_stats[0],
+        'betas': coefficients[1:],
+        't_stats': t_stats[1:],
+        'r_squared': r_squared,
+        'adj_r_squared': adj_r_squared,
+        'residual_volatility': np.sqrt(sigma2 * PERIODS_PER_YEAR) * 100,
+        'observations': np.full(Y.shape[1], n),
+        'rank': np.full(Y.shape[1], rank),
+    }
+
+
+def exposures(returns, factors, risk_free_rate=RISK_FREE_RATE, min_observations=None):
+    """
+    Comme regress, pour des colonnes d'historiques de longueurs différentes (NaN en tête de colonne)
+
+    Les colonnes commençant à la même barre sont régressées ensemble sur leurs dates communes;
+    moins de `min_observations` rendements (défaut: facteurs + 3) -> NaN.
+    """
+    R = np.asarray(returns, dtype=np.float64)
+    F = np.asarray(factors, dtype=np.float64)
+    n_factors = F.shape[1]
+    min_observations = n_factors + 3 if min_observations is None else min_observations
+
+    out = {
+        'alpha': np.full(R.shape[1], np.nan),
+        'alpha_t': np.full(R.shape[1], np.nan),
+        'betas': np.full((n_factors, R.shape[1]), np.nan),
+        't_stats': np.full((n_factors, R.shape[1]), np.nan),
+        'r_squared': np.full(R.shape[1], np.nan),
+        'adj_r_squared': np.full(R.shape[1], np.nan),
+        'residual_volatility': np.full(R.shape[1], np.nan),
+        'observations': np.zeros(R.shape[1], dtype=np.int64),
+        'rank': np.zeros(R.shape[1], dtype=np.int64),
+    }
+    valid = ~np.isnan(R)
+    first = np.where(valid.any(axis=0), valid.argmax(axis=0), len(R))
+    for start in np.unique(first):
+        cols = np.flatnonzero(first == start)
+        block = R[start:, cols]
+        # Trou après la première barre: colonne ignorée (séries alignées par ffill en amont)
+        complete = ~np.isnan(block).any(axis=0)
+        cols, block = cols[complete], block[:, complete]
+        if len(block) < min_observations or not len(cols):
+            continue
+        for name, values in regress(block, F[start:], risk_free_rate).items():
+            out[name][..., cols] = values
+    return out
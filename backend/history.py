@@ -0,0 +1,104 @@
+"""
+History - séries longues prêtes pour les graphiques
+Réduit un historique (jusqu'à des millions de barres) au nombre de points affichables.
+
+- Sous-échantillonnage LTTB (Largest-Triangle-Three-Buckets): conserve la forme et les extrêmes visuels
+- Une série pilote le choix des points, les autres colonnes sont prises aux mêmes dates
+- Formatage des dates uniquement sur les points conservés (jour ou minute selon l'intervalle)
+- Variante colonnaire (dates entières + un tableau NumPy par série) pour les clients qui la négocient
+"""
+
+import os
+
+import numpy as np
+
+DEFAULT_MAX_POINTS = 2000
+
+INTRADAY_INTERVALS = {'1m', '2m', '5m', '15m', '30m', '60m', '90m', '1h'}
+
+
+def default_max_points():
+    return int(os.environ.get('HISTORY_MAX_POINTS', DEFAULT_MAX_POINTS))
+
+
+def lttb_indices(y, n_out):
+    """
+    Indices des points retenus par LTTB (premier et dernier toujours inclus)
+
+    y: array (n,) de valeurs, abscisses supposées régulièrement espacées (une barre = un pas)
+    n_out: nombre de points voulu (>= 3 pour un vrai sous-échantillonnage)
+    """
+    y = np.asarray(y, dtype=np.float64)
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    # n-2 points intérieurs répartis en n_out-2 buckets (le "bucket suivant" du dernier est le point final)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    # Moyenne de chaque bucket (point C du triangle), par sommes cumulées
+    x = np.arange(n, dtype=np.float64)
+    cs_y = np.concatenate(([0.0], np.cumsum(y)))
+    next_edges = np.append(edges[1:], n)
+    next_start, next_stop = edges[1:], next_edges[1:]
+    counts = (next_stop - next_start).astype(np.float64)
+    avg_x = (next_start + next_stop - 1) / 2.0
+    avg_y = (cs_y[next_stop] - cs_y[next_start]) / counts
+
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for b in range(n_out - 2):
+        lo, hi = edges[b], edges[b + 1]
+        # Aire (x2) du triangle A-B-C pour chaque candidat B du bucket
+        area = np.abs((x[a] - avg_x[b]) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (avg_y[b] - y[a]))
+        a = lo + int(np.argmax(area))
+        selected[b + 1] = a
+    return selected
+
+
+def build_history(index, columns, max_points=None, interval='1d', primary=None, layout='rows'):
+    """
+    Historique limité à max_points points
+
+    Args:
+        index: DatetimeIndex des barres
+        columns: dict nom -> array aligné sur index
+        max_points: plafond de points (None = HISTORY_MAX_POINTS, 0 = pas de limite)
+        interval: intervalle des barres, détermine le format des dates
+        primary: colonne qui pilote le sous-échantillonnage (défaut: la première)
+        layout: 'rows' -> [{'date': ..., colonne: valeur}], 'columns' -> voir _columnar()
+    """
+    if max_points is None:
+        max_points = default_max_points()
+
+    arrays = {name: np.asarray(values, dtype=np.float64) for name, values in columns.items()}
+    n = len(index)
+    if max_points and n > max_points:
+        keep = lttb_indices(arrays[primary or next(iter(arrays))], max_points)
+    else:
+        keep = slice(None)
+
+    if layout == 'columns':
+        return _columnar(index[keep], {name: array[keep] for name, array in arrays.items()}, interval)
+
+    date_format = '%Y-%m-%d %H:%M' if interval in INTRADAY_INTERVALS else '%Y-%m-%d'
+    dates = index[keep].strftime(date_format).tolist()
+    values = {name: array[keep].tolist() for name, array in arrays.items()}
+
+    return [
+        {'date': date, **{name: values[name][i] for name in values}}
+        for i, date in enumerate(dates)
+    ]
+
+
+def _columnar(index, arrays, interval):
+    # Dates entières: jours depuis 1970-01-01 (date locale de la place) ou secondes UTC en intraday,
+    # une série NumPy par colonne (NaN -> null à l'encodage)
+    if interval in INTRADAY_INTERVALS:
+        utc = index.tz_convert('UTC') if index.tz is not None else index
+        dates, unit = utc.as_unit('ns').asi8 // 10**9, 's'
+    else:
+        local = index.tz_localize(None) if index.tz is not None else index
+        dates, unit = local.as_unit('ns').asi8 // (86400 * 10**9), 'day'
+    series = {name: np.ascontiguousarray(array) for name, array in arrays.items()}
+    return {'dates': dates, 'date_unit': unit, 'series': series}
@@ -0,0 +1,409 @@
+"""
+Indicator Engine - indicateurs glissants incrémentaux pour Quant A
+Met à jour MA, écart-type et bandes de breakout en O(1) par nouvelle barre.
+(Le RSI de Wilder, récursif depuis le début de la série, est calculé par signal_kernels.)
+
+- Sommes glissantes compensées (moyenne mobile)
+- Variance glissante de Welford (bandes de Bollinger)
+- Deques monotones pour les plus hauts / plus bas glissants (breakout)
+
+L'état est conservé par (ticker, stratégie, période): un refresh ne traite que les barres
+arrivées depuis le précédent. La dernière barre, encore susceptible d'être révisée
+(séance en cours), est évaluée sans être intégrée à l'état.
+
+Mémoire bornée: chaque état ne garde que les barres de la plus longue série demandée, et le moteur
+évince les états les moins récents au-delà de DEFAULT_MAX_BARS barres au total.
+"""
+
+import math
+import threading
+from collections import OrderedDict, deque
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_MAX_STATES = 1024
+DEFAULT_MAX_BARS = 4_000_000  # barres conservées, tous états confondus (~32 octets par barre)
+
+
+# ============================================================================
+# ACCUMULATEURS GLISSANTS
+# ============================================================================
+
+class RollingSum:
+    """Somme glissante compensée (Neumaier) sur `period` valeurs"""
+
+    def __init__(self, period):
+        self.period = period
+        self.window = deque()
+        self.total = 0.0
+        self.compensation = 0.0
+        self.nonzero = 0  # une fenêtre de zéros donne exactement 0 (pas de résidu d'arrondi)
+
+    def _add(self, x):
+        t = self.total + x
+        if abs(self.total) >= abs(x):
+            self.compensation += (self.total - t) + x
+        else:
+            self.compensation += (x - t) + self.total
+        self.total = t
+
+    def full(self):
+        return len(self.window) == self.period
+
+    def push(self, x):
+        if self.full():
+            old = self.window.popleft()
+            self._add(-old)
+            self.nonzero -= old != 0
+        self.window.append(x)
+        self._add(x)
+        self.nonzero += x != 0
+
+    def value(self):
+        return self.total + self.compensation if self.nonzero else 0.0
+
+    def peek(self, x):
+        """Somme si `x` était ajoutée, sans modifier l'état"""
+        total, nonzero = self.value(), self.nonzero
+        if self.full():
+            total -= self.window[0]
+            nonzero -= self.window[0] != 0
+        total += x
+        nonzero += x != 0
+        return total if nonzero else 0.0
+
+
+class RollingMoments:
+    """Moyenne et variance (ddof=1) glissantes par l'algorithme de Welford"""
+
+    def __init__(self, period):
+        self.period = period
+        self.window = deque()
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def _next(self, x):
+        n = len(self.window)
+        if n < self.period:
+            delta = x - self.mean
+            mean = self.mean + delta / (n + 1)
+            m2 = self.m2 + delta * (x - mean)
+        else:
+            old = self.window[0]
+            mean = self.mean + (x - old) / n
+            m2 = self.m2 + (x - old) * (x - mean + old - self.mean)
+        return mean, max(m2, 0.0)
+
+    def push(self, x):
+        self.mean, self.m2 = self._next(x)
+        if len(self.window) == self.period:
+            self.window.popleft()
+        self.window.append(x)
+
+    def variance(self):
+        return self.m2 / (self.period - 1)
+
+    def peek_variance(self, x):
+        return self._next(x)[1] / (self.period - 1)
+
+
+class RollingExtrema:
+    """Plus haut / plus bas des `period` dernières valeurs (deques monotones)"""
+
+    def __init__(self, period):
+        self.period = period
+        self.count = 0
+        self.maxima = deque()  # (index, valeur), valeurs décroissantes
+        self.minima = deque()  # (index, valeur), valeurs croissantes
+
+    def push(self, x):
+        i = self.count
+        while self.maxima and self.maxima[-1][1] <= x:
+            self.maxima.pop()
+        while self.minima and self.minima[-1][1] >= x:
+            self.minima.pop()
+        self.maxima.append((i, x))
+        self.minima.append((i, x))
+        if self.maxima[0][0] <= i - self.period:
+            self.maxima.popleft()
+        if self.minima[0][0] <= i - self.period:
+            self.minima.popleft()
+        self.count += 1
+
+    def high(self):
+        return self.maxima[0][1] if self.count >= self.period else np.nan
+
+    def low(self):
+        return self.minima[0][1] if self.count >= self.period else np.nan
+
+
+# ============================================================================
+# ÉTAT PAR (TICKER, STRATÉGIE, PÉRIODE)
+# ============================================================================
+
+STRATEGY_OUTPUTS = {
+    'momentum': ('ma',),
+    'mean-reversion': ('ma',),
+    'bollinger': ('ma', 'std'),
+    'breakout': ('rolling_high', 'rolling_low'),
+}
+
+# Au-delà, un rattrapage barre par barre coûte plus cher qu'un recalcul complet (rolling pandas)
+BULK_THRESHOLD = 4096
+
+
+class _Buffer:
+    """Tableau NumPy extensible (capacité doublée), pour garder les séries en float64/int64"""
+
+    def __init__(self, dtype):
+        self.data = np.empty(256, dtype=dtype)
+        self.size = 0
+
+    def _reserve(self, n):
+        if self.size + n > len(self.data):
+            grown = np.empty(max(2 * len(self.data), self.size + n), dtype=self.data.dtype)
+            grown[:self.size] = self.data[:self.size]
+            self.data = grown
+
+    def append(self, x):
+        self._reserve(1)
+        self.data[self.size] = x
+        self.size += 1
+
+    def extend(self, values):
+        self._reserve(len(values))
+        self.data[self.size:self.size + len(values)] = values
+        self.size += len(values)
+
+    def view(self):
+        return self.data[:self.size]
+
+    def trim(self, keep):
+        """Ne garde que les `keep` dernières valeurs (recopie amortie: seulement au double de keep)"""
+        if self.size > 2 * keep:
+            self.data = self.data[self.size - keep:self.size].copy()
+            self.size = keep
+
+    def __len__(self):
+        return self.size
+
+
+class IndicatorState:
+    """Indicateurs d'une stratégie, alimentés barre par barre"""
+
+    def __init__(self, strategy, period):
+        self.strategy = strategy
+        self.period = period
+        self.timestamps = _Buffer(np.int64)
+        self.prices = _Buffer(np.float64)
+        self.outputs = {name: _Buffer(np.float64) for name in STRATEGY_OUTPUTS[strategy]}
+
+        self.span = 0  # plus longue série demandée (barres)
+
+        self.sum = RollingSum(period)
+        self.moments = RollingMoments(period)
+        self.extrema = RollingExtrema(period)
+
+    def __len__(self):
+        return len(self.timestamps)
+
+    def trim(self):
+        # Les barres antérieures à la plus longue série demandée ne servent plus
+        for buffer in (self.timestamps, self.prices, *self.outputs.values()):
+            buffer.trim(self.span)
+
+    def _values(self, x, commit):
+        full = len(self.timestamps) + 1 >= self.period
+        p = self.period
+
+        if self.strategy in ('momentum', 'mean-reversion', 'bollinger'):
+            if commit:
+                self.sum.push(x)
+                ma = self.sum.value() / p
+            else:
+                ma = self.sum.peek(x) / p
+            if self.strategy != 'bollinger':
+                return (ma if full else np.nan,)
+
+            if commit:
+                self.moments.push(x)
+                var = self.moments.variance()
+            else:
+                var = self.moments.peek_variance(x)
+            return (ma if full else np.nan, np.sqrt(var) if full else np.nan)
+
+        # breakout: bandes calculées sur les barres précédentes, jour courant exclu
+        values = (self.extrema.high(), self.extrema.low())
+        if commit:
+            self.extrema.push(x)
+        return values
+
+    def commit(self, ts, x):
+        for name, value in zip(self.outputs, self._values(x, commit=True)):
+            self.outputs[name].append(value)
+        self.timestamps.append(ts)
+        self.prices.append(x)
+
+    def peek(self, x):
+        return self._values(x, commit=False)
+
+    def bulk_load(self, timestamps, values):
+        """Initialise un état vide en une passe (rolling pandas), puis reconstruit les accumulateurs sur la fin"""
+        p, n = self.period, len(values)
+        series = pd.Series(values)
+
+        if self.strategy in ('momentum', 'mean-reversion', 'bollinger'):
+            self.outputs['ma'].extend(series.rolling(p).mean().to_numpy())
+            if self.strategy == 'bollinger':
+                self.outputs['std'].extend(series.rolling(p).std().to_numpy())
+        else:
+            previous = series.shift(1).rolling(p)
+            self.outputs['rolling_high'].extend(previous.max().to_numpy())
+            self.outputs['rolling_low'].extend(previous.min().to_numpy())
+
+        self.timestamps.extend(timestamps)
+        self.prices.extend(values)
+
+        # Accumulateurs: seules les `period` dernières barres comptent
+        tail = values[-p:]
+        self.sum = _rolling_sum_from(p, tail)
+        self.moments.window = deque(tail.tolist())
+        self.moments.mean = float(np.mean(tail))
+        self.moments.m2 = float(np.sum((tail - self.moments.mean) ** 2))
+        self.extrema.count = n - len(tail)
+        for x in tail.tolist():
+            self.extrema.push(x)
+
+
+def _rolling_sum_from(period, tail):
+    rolling = RollingSum(period)
+    rolling.window = deque(tail.tolist())
+    rolling.total = math.fsum(rolling.window)
+    rolling.nonzero = int(np.count_nonzero(tail))
+    return rolling
+
+
+# ============================================================================
+# MOTEUR
+# ============================================================================
+
+class IndicatorEngine:
+    """Cache LRU d'états d'indicateurs, clé (ticker, intervalle, stratégie, période)"""
+
+    def __init__(self, max_states=DEFAULT_MAX_STATES, max_bars=DEFAULT_MAX_BARS):
+        self.max_states = max_states
+        self.max_bars = max_bars
+        self._states = OrderedDict()
+        self._bars = 0
+        self._lock = threading.Lock()
+        self.stats = {'bars_processed': 0, 'resets': 0}
+
+    def indicators(self, ticker, strategy, period, prices, interval='1d'):
+        """
+        Indicateurs de `strategy` alignés sur `prices`, identiques à pandas .rolling() sur cette série
+
+        Returns:
+            dict nom -> pd.Series (ma, std, rolling_high, rolling_low selon la stratégie)
+        """
+        key = (ticker.upper(), interval, strategy, period)
+        index = prices.index
+        ts = (index.tz_convert('UTC') if index.tz is not None else index).as_unit('ns').asi8
+        values = prices.to_numpy(dtype=np.float64)
+        n = len(values)
+
+        with self._lock:
+            state = self._states.pop(key, None)
+            if state is not None:
+                self._bars -= len(state)
+        resets = 0
+        if state is not None and not self._consistent(state, ts, values):
+            resets = 1
+            state = None
+
+        # Barres nouvelles depuis le dernier appel; la dernière reste provisoire
+        first_new = 0
+        if state is not None:
+            first_new = int(np.searchsorted(ts, state.timestamps.view()[-1], side='right'))
+            if n - 1 - first_new > BULK_THRESHOLD:
+                state = None
+                first_new = 0
+
+        if state is None:
+            state = IndicatorState(strategy, period)
+            if n > 1:
+                state.bulk_load(ts[:n - 1], values[:n - 1])
+        else:
+            for i in range(first_new, n - 1):
+                state.commit(ts[i], values[i])
+
+        start = int(np.searchsorted(state.timestamps.view(), ts[0]))
+        committed = min(n - 1, len(state.timestamps) - start)
+        last = state.peek(values[-1]) if committed < n else None
+
+        # Extraction avant de rendre l'état au cache: une autre requête peut ensuite le faire avancer
+        result = {}
+        for i, name in enumerate(state.outputs):
+            column = np.empty(n)
+            column[:committed] = state.outputs[name].view()[start:start + committed]
+            if last is not None:
+                column[committed:] = last[i]
+            result[name] = column
+        state.span = max(state.span, n)
+        state.trim()
+
+        with self._lock:
+            self.stats['resets'] += resets
+            self.stats['bars_processed'] += max(n - 1 - first_new, 0) + 1
+            # Requête concurrente sur la même clé: son état est remplacé par le nôtre
+            replaced = self._states.pop(key, None)
+            self._bars += len(state) - (len(replaced) if replaced is not None else 0)
+            self._states[key] = state
+            self._evict()
+
+        self._apply_window_start(result, strategy, period)
+        return {name: pd.Series(column, index=index) for name, column in result.items()}
+
+    def _evict(self):
+        # États les moins récemment utilisés d'abord (appelé sous self._lock)
+        while len(self._states) > 1 and (len(self._states) > self.max_states or self._bars > self.max_bars):
+            _, state = self._states.popitem(last=False)
+            self._bars -= len(state)
+
+    def snapshot(self):
+        with self._lock:
+            return {**self.stats, 'states': len(self._states), 'bars': self._bars}
+
+    @staticmethod
+    def _consistent(state, ts, values):
+        """L'état couvre le début de la série demandée et aucune barre connue n'a été révisée"""
+        known_ts, known_prices = state.timestamps.view(), state.prices.view()
+        if not len(known_ts) or ts[0] < known_ts[0]:
+            return False
+        first_known = int(np.searchsorted(known_ts, ts[0]))
+        overlap = len(known_ts) - first_known
+        if first_known >= len(known_ts) or overlap > len(ts):
+            return False
+        # Recouvrement complet (dates et prix): un ajustement de split / dividende en milieu de série
+        # invalide l'état. Comparaison vectorisée, négligeable devant un recalcul pandas
+        return (np.array_equal(ts[:overlap], known_ts[first_known:]) and
+                np.array_equal(values[:overlap], known_prices[first_known:]))
+
+    @staticmethod
+    def _apply_window_start(result, strategy, period):
+        # L'état a pu voir des barres antérieures à la série demandée: on reproduit le
+        # comportement de pandas sur cette seule série (fenêtres incomplètes -> NaN)
+        warmup = period if strategy == 'breakout' else period - 1
+        for column in result.values():
+            column[:warmup] = np.nan
+
+
+_default_engine = IndicatorEngine()
+
+
+def streaming_indicators(ticker, strategy, period, prices, interval='1d'):
+    return _default_engine.indicators(ticker, strategy, period, prices, interval)
+
+
+def streaming_stats():
+    return _default_engine.snapshot()
@@ -0,0 +1,245 @@
+"""
+Instrumentation - temps par étape des requêtes, métriques Prometheus et profilage à la demande
+Utilisé par Quant A / Quant B (étapes fetch, align, signals, metrics, ml, history) et par l'API Flask.
+
+- span(name) / Stopwatch: durée d'une étape, cumulée dans la requête en cours (contextvars)
+- Étapes d'une requête renvoyées dans l'en-tête Server-Timing
+- Étapes mesurées dans un worker du ComputeExecutor: renvoyées avec le résultat et fusionnées côté requête
+- Histogrammes de latence par route et par étape, rendus au format texte Prometheus (/api/metrics)
+- Profilage cProfile opt-in (?profile=1): résumé des fonctions les plus coûteuses, un profil à la fois
+"""
+
+import bisect
+import contextvars
+import cProfile
+import math
+import os
+import pstats
+import re
+import threading
+import time
+from contextlib import contextmanager
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+PROFILE_LIMIT = 25
+
+_current = contextvars.ContextVar('instrumentation_stages', default=None)
+
+
+# ============================================================================
+# ÉTAPES
+# ============================================================================
+
+class Stages:
+    """Durées cumulées par étape (secondes), dans l'ordre de première apparition"""
+
+    def __init__(self):
+        self.durations = {}
+        self.started = time.perf_counter()
+
+    def add(self, name, seconds):
+        self.durations[name] = self.durations.get(name, 0.0) + seconds
+
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+
+def record(name, seconds):
+    """Enregistre une durée d'étape: histogramme global + requête en cours s'il y en a une"""
+    STAGE_LATENCY.observe(seconds, name)
+    stages = _current.get()
+    if stages is not None:
+        stages.add(name, seconds)
+
+
+def merge(durations):
+    """Fusionne les étapes mesurées ailleurs (worker du ComputeExecutor) dans la requête en cours"""
+    for name, seconds in durations.items():
+        record(name, seconds)
+
+
+@contextmanager
+def span(name):
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(name, time.perf_counter() - t0)
+
+
+class Stopwatch:
+    """Étapes successives d'une fonction: lap(name) enregistre le temps écoulé depuis le lap précédent"""
+
+    def __init__(self):
+        self._last = time.perf_counter()
+
+    def lap(self, name):
+        now = time.perf_counter()
+        record(name, now - self._last)
+        self._last = now
+
+
+def begin():
+    """Démarre la collecte des étapes pour le contexte courant (début de requête)"""
+    stages = Stages()
+    _current.set(stages)
+    return stages
+
+
+def end():
+    """Arrête la collecte et renvoie les étapes collectées (None si aucune collecte en cours)"""
+    stages = _current.get()
+    _current.set(None)
+    return stages
+
+
+@contextmanager
+def capture():
+    """Collecte les étapes du bloc (job exécuté dans un worker)"""
+    stages = Stages()
+    token = _current.set(stages)
+    try:
+        yield stages
+    finally:
+        _current.reset(token)
+
+
+def server_timing(stages, total=None):
+    """Valeur de l'en-tête Server-Timing: une entrée par étape (ms) puis total"""
+    entries = [f'{name};dur={seconds * 1000:.2f}' for name, seconds in stages.durations.items()]
+    entries.append(f'total;dur={(stages.elapsed() if total is None else total) * 1000:.2f}')
+    return ', '.join(entries)
+
+
+# ============================================================================
+# MÉTRIQUES PROMETHEUS
+# ============================================================================
+
+class Histogram:
+    """Histogramme cumulatif au sens Prometheus, une série par combinaison de labels"""
+
+    def __init__(self, name, documentation, labels, buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labels = labels
+        self.buckets = tuple(buckets)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, *label_values):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = {'counts': [0] * (len(self.buckets) + 1), 'sum': 0.0}
+            series['counts'][index] += 1
+            series['sum'] += value
+
+    def snapshot(self):
+        with self._lock:
+            return {labels: {'counts': list(s['counts']), 'sum': s['sum']} for labels, s in self._series.items()}
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} histogram']
+        for label_values, series in sorted(self.snapshot().items()):
+            labels = dict(zip(self.labels, label_values))
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), series['counts']):
+                cumulative += count
+                le = '+Inf' if bound == math.inf else f'{bound:g}'
+                lines.append(f'{self.name}_bucket{_labels({**labels, "le": le})} {cumulative}')
+            lines.append(f'{self.name}_sum{_labels(labels)} {series["sum"]:.6f}')
+            lines.append(f'{self.name}_count{_labels(labels)} {cumulative}')
+        return lines
+
+
+def _labels(labels):
+    if not labels:
+        return ''
+    escaped = (str(v).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for v in labels.values())
+    return '{' + ','.join(f'{k}="{v}"' for k, v in zip(labels, escaped)) + '}'
+
+
+def _metric_name(*parts):
+    return re.sub(r'[^a-zA-Z0-9_]', '_', '_'.join(parts))
+
+
+def _flatten(prefix, values):
+    # Compteurs numériques des snapshots (/api/stats), dictionnaires imbriqués aplatis
+    for key, value in values.items():
+        name = _metric_name(prefix, str(key))
+        if isinstance(value, dict):
+            yield from _flatten(name, value)
+        elif isinstance(value, (int, float)) and not isinstance(value, bool) and math.isfinite(value):
+            yield name, value
+
+
+def render_metrics(snapshots, prefix='quant'):
+    """
+    Exposition texte Prometheus (version 0.0.4)
+
+    Args:
+        snapshots: dict composant -> compteurs (mêmes données que /api/stats), exportés en gauges
+    """
+    lines = REQUEST_LATENCY.render() + STAGE_LATENCY.render()
+    for name, value in _flatten(prefix, snapshots):
+        lines.append(f'# TYPE {name} gauge')
+        lines.append(f'{name} {value:g}' if isinstance(value, float) else f'{name} {value}')
+    return '\n'.join(lines) + '\n'
+
+
+REQUEST_LATENCY = Histogram('quant_request_duration_seconds', 'Durée des requêtes API par route',
+                            ('route', 'method', 'status'))
+STAGE_LATENCY = Histogram('quant_stage_duration_seconds', 'Durée des étapes de calcul (fetch, signals, metrics...)',
+                          ('stage',))
+
+
+# ============================================================================
+# PROFILAGE
+# ============================================================================
+
+_profile_lock = threading.Lock()
+
+
+def profiling_enabled():
+    """?profile=1 accepté sauf si API_PROFILING=0"""
+    return os.environ.get('API_PROFILING', '1') != '0'
+
+
+def start_profile():
+    """Profileur actif pour le thread courant, ou None si un autre profil est déjà en cours"""
+    if not _profile_lock.acquire(blocking=False):
+        return None
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+    except Exception:
+        _profile_lock.release()
+        raise
+    return profiler
+
+
+def stop_profile(profiler, limit=PROFILE_LIMIT):
+    """Arrête le profileur et renvoie le résumé des `limit` fonctions au temps cumulé le plus élevé"""
+    try:
+        profiler.disable()
+    finally:
+        _profile_lock.release()
+
+    stats = pstats.Stats(profiler)
+    rows = sorted(stats.stats.items(), key=lambda item: item[1][3], reverse=True)[:limit]
+    return {
+        'total_ms': round(stats.total_tt * 1000, 3),
+        'calls': stats.total_calls,
+        'sort': 'cumulative',
+        'functions': [
+            {
+                'function': f'{os.path.basename(filename)}:{line}({function})',
+                'calls': calls,
+                'primitive_calls': primitive,
+                'tottime_ms': round(tottime * 1000, 3),
+                'cumtime_ms': round(cumtime * 1000, 3),
+            }
+            for (filename, line, function), (primitive, calls, tottime, cumtime, _) in rows
+        ],
+    }
@@ -0,0 +1,29 @@
+"""
+Lazy Import - modules chargés au premier accès à un de leurs attributs
+Le process démarre (et répond à /api/health) sans importer pandas, scipy, yfinance ni la pile ML:
+app.py / asgi.py diffèrent les modules de calcul, ceux-ci diffèrent leurs dépendances lourdes.
+"""
+
+import importlib
+import sys
+
+
+class LazyModule:
+    """Mandataire d'un module: `quant_a = LazyModule('quant_a')` puis `quant_a.backtest_strategy(...)`"""
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+
+    def _load(self):
+        if self._module is None:
+            # import_module est thread-safe (verrou d'import par module)
+            self._module = importlib.import_module(self._name)
+        return self._module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __repr__(self):
+        state = 'chargé' if self._module is not None or self._name in sys.modules else 'non chargé'
+        return f'<LazyModule {self._name} ({state})>'
@@ -0,0 +1,275 @@
+"""
+ML Prediction Module for Portfolio Analysis
+Simple and robust linear regression model for portfolio return predictions
+Ordinary least squares on a rolling window of lagged returns, solved from sufficient statistics
+(X'X, X'y, y'y) so that rows can be added or removed without refitting (see ml_service.py)
+"""
+
+
+import numpy as np
+import pandas as pd
+
+CONFIDENCE_MULTIPLIER = 1.96  # 95% confidence
+MIN_TRAINING_SAMPLES = 10
+DEFAULT_MIN_TRAIN = 60
+
+
+def feature_names(window=5):
+    return ['intercept'] + [f'lag_{i}' for i in range(1, window + 1)] + ['rolling_std']
+
+
+def create_features(returns, window=5):
+    """
+    Create features from historical returns using a rolling window
+
+    Row t predicts returns[t] from information available at t-1 only:
+    - Lagged returns (t-1, t-2, ..., t-window)
+    - Rolling standard deviation of the lags
+    The rolling mean and momentum (lag_1 - rolling mean) are linear combinations of the lags:
+    they add nothing to a least-squares fit and are left out to keep X'X invertible.
+
+    Returns:
+        X: (n - window, window + 2) design matrix (intercept first)
+        y: (n - window,) targets
+    """
+    returns = np.asarray(returns, dtype=np.float64)
+    n_rows = len(returns) - window
+    if n_rows <= 0:
+        return np.empty((0, window + 2)), np.empty(0)
+
+    # lags[j] = returns[j + window - 1], ..., returns[j] -> lag_1 ... lag_window of target j + window
+    lags = np.lib.stride_tricks.sliding_window_view(returns[:-1], window)[:, ::-1]
+    X = np.column_stack([np.ones(n_rows), lags, lags.std(axis=1, ddof=1)])
+    return X, returns[window:]
+
+
+def _feature_row(recent, window):
+    lags = np.asarray(recent[-window:], dtype=np.float64)[::-1]
+    return np.concatenate([[1.0], lags, [lags.std(ddof=1)]])
+
+
+def _solve(xtx, xty):
+    # Ridge infime: X'X reste inversible si une colonne est constante (rendements nuls)
+    ridge = 1e-12 * max(np.trace(xtx), 1.0) / len(xtx)
+    return np.linalg.solve(xtx + ridge * np.eye(len(xtx)), xty)
+
+
+class OnlineOLS:
+    """
+    Least squares from sufficient statistics
+
+    update(X, y) adds rows, update(X, y, sign=-1) removes them: O(rows * features^2)
+    instead of a refit on the whole history.
+    """
+
+    def __init__(self, n_features):
+        self.xtx = np.zeros((n_features, n_features))
+        self.xty = np.zeros(n_features)
+        self.yty = 0.0
+        self.y_sum = 0.0
+        self.n = 0
+
+    def update(self, X, y, sign=1):
+        self.xtx += sign * (X.T @ X)
+        self.xty += sign * (X.T @ y)
+        self.yty += sign * float(y @ y)
+        self.y_sum += sign * float(y.sum())
+        self.n += sign * len(y)
+
+    def coefficients(self):
+        return _solve(self.xtx, self.xty)
+
+    def sse(self, beta):
+        # Somme des carrés des résidus sans repasser sur les lignes
+        return max(self.yty - 2 * beta @ self.xty + beta @ self.xtx @ beta, 0.0)
+
+    def r2(self, beta):
+        sst = self.yty - self.y_sum ** 2 / self.n
+        return 1 - self.sse(beta) / sst if sst > 0 else 0.0
+
+
+def training_metrics(ols, beta, X, y):
+    """In-sample metrics: mse / r2 from the sufficient statistics, mae / direction accuracy from the rows"""
+    predictions = X @ beta
+    return {
+        'mse': float(ols.sse(beta) / ols.n),
+        'mae': float(np.mean(np.abs(y - predictions))),
+        'r2': float(ols.r2(beta)),
+        # Direction accuracy (did we predict the sign correctly?)
+        'direction_accuracy': float(np.mean((predictions > 0) == (y > 0)) * 100),
+        'training_samples': int(ols.n),
+    }
+
+
+def train_prediction_model(returns, window=5):
+    """
+    Train a simple linear regression model on historical returns
+
+    Args:
+        returns: pd.Series or array of portfolio returns
+        window: number of lookback periods
+
+    Returns:
+        model: fitted OnlineOLS (sufficient statistics)
+        beta: coefficients (intercept first)
+        feature_names: list of feature column names
+        metrics: dict with training metrics
+    """
+    X, y = create_features(returns, window)
+    if len(y) < MIN_TRAINING_SAMPLES:
+        return None, None, None, None
+
+    model = OnlineOLS(X.shape[1])
+    model.update(X, y)
+    beta = model.coefficients()
+    return model, beta, feature_names(window), training_metrics(model, beta, X, y)
+
+
+def predict_next_returns(model, beta, recent_returns, window=5, n_steps=5):
+    """
+    Predict future returns using the trained model (each prediction feeds the next step's lags)
+
+    Args:
+        model: fitted OnlineOLS (residual variance for the confidence band)
+        beta: coefficients
+        recent_returns: recent return history (must have at least 'window' values)
+        window: lookback window size
+        n_steps: number of future periods to predict
+
+    Returns:
+        predictions: dict with prediction results
+    """
+    recent = list(np.asarray(recent_returns, dtype=np.float64)[-window:])
+    predictions = []
+    for _ in range(n_steps):
+        next_return = float(_feature_row(recent, window) @ beta)
+        predictions.append(next_return)
+        recent = recent[1:] + [next_return]
+
+    predictions = np.array(predictions)
+    cumulative_predictions = np.cumprod(1 + predictions) - 1
+
+    # Bande de confiance: écart-type des résidus du modèle (erreur à un pas)
+    dof = max(model.n - len(beta), 1)
+    residual_std = np.sqrt(model.sse(beta) / dof)
+    lower_bound = predictions - CONFIDENCE_MULTIPLIER * residual_std
+    upper_bound = predictions + CONFIDENCE_MULTIPLIER * residual_std
+
+    return {
+        'predictions': [float(p) * 100 for p in predictions],  # Convert to percentages
+        'cumulative_return': float(cumulative_predictions[-1]) * 100,
+        'confidence_lower': [float(l) * 100 for l in lower_bound],
+        'confidence_upper': [float(u) * 100 for u in upper_bound],
+        'n_steps': n_steps
+    }
+
+
+def predict_portfolio_returns(portfolio_returns, n_days=5, window=5):
+    """
+    Complete pipeline: train model and predict future portfolio returns
+
+    Args:
+        portfolio_returns: pd.Series of historical portfolio returns
+        n_days: number of days to predict into the future
+        window: lookback window for features
+
+    Returns:
+        dict with predictions and model metrics
+    """
+    try:
+        # Ensure we have enough data
+        if len(portfolio_returns) < window + MIN_TRAINING_SAMPLES:
+            return {
+                'error': 'Insufficient data for prediction',
+                'min_required': window + MIN_TRAINING_SAMPLES,
+                'available': len(portfolio_returns)
+            }
+
+        returns = np.asarray(portfolio_returns, dtype=np.float64)
+        model, beta, _, metrics = train_prediction_model(returns, window)
+        if model is None:
+            return {'error': 'Failed to train prediction model'}
+
+        return {
+            'model_metrics': metrics,
+            'predictions': predict_next_returns(model, beta, returns, window, n_days),
+            'window_size': window,
+            'prediction_horizon': n_days
+        }
+
+    except Exception as e:
+        print(f"Error in prediction pipeline: {e}")
+        return {'error': str(e)}
+
+
+def walk_forward(returns, window=5, train_size=None, min_train=DEFAULT_MIN_TRAIN, dates=None):
+    """
+    Out-of-sample walk-forward evaluation, vectorized over all windows
+
+    Row e is predicted by a model fitted on rows [e - train_size, e) (expanding window if
+    train_size is None). Every window's X'X / X'y is a difference of cumulative sums, and all
+    windows are solved in one batched np.linalg.solve: no refit loop.
+
+    Returns:
+        dict with out-of-sample metrics and the predicted / actual series (in %)
+    """
+    X, y = create_features(returns, window)
+    n_rows, n_features = X.shape
+    min_train = max(min_train, n_features + 1)
+    if n_rows <= min_train:
+        return {'error': 'Insufficient data for walk-forward evaluation', 'min_required': window + min_train + 1,
+                'available': len(np.asarray(returns))}
+
+    xtx = np.concatenate([np.zeros((1, n_features, n_features)),
+                          np.cumsum(X[:, :, None] * X[:, None, :], axis=0)])
+    xty = np.concatenate([np.zeros((1, n_features)), np.cumsum(X * y[:, None], axis=0)])
+
+    ends = np.arange(min_train, n_rows)
+    starts = np.zeros_like(ends) if train_size is None else np.maximum(ends - max(train_size, min_train), 0)
+    A = xtx[ends] - xtx[starts]
+    b = xty[ends] - xty[starts]
+    ridge = 1e-12 * np.maximum(np.trace(A, axis1=1, axis2=2), 1.0) / n_features
+    beta = np.linalg.solve(A + ridge[:, None, None] * np.eye(n_features), b[:, :, None])[:, :, 0]
+
+    predicted = np.einsum('ij,ij->i', X[ends], beta)
+    actual = y[ends]
+    # R² hors échantillon contre la moyenne de la fenêtre d'entraînement (colonne intercept = sommes de y)
+    train_mean = b[:, 0] / (ends - starts)
+    errors = actual - predicted
+    benchmark = ((actual - train_mean) ** 2).sum()
+
+    result = {
+        'windows': int(len(ends)),
+        'train_size': train_size,
+        'min_train': min_train,
+        'direction_accuracy': float(np.mean((predicted > 0) == (actual > 0)) * 100),
+        'mse': float(np.mean(errors ** 2)),
+        'mae': float(np.mean(np.abs(errors))),
+        'r2_oos': float(1 - (errors ** 2).sum() / benchmark) if benchmark > 0 else 0.0,
+        'predicted': (predicted * 100).tolist(),
+        'actual': (actual * 100).tolist(),
+    }
+    if dates is not None:
+        result['dates'] = [d.strftime('%Y-%m-%d') for d in pd.DatetimeIndex(dates)[window:][ends]]
+    return result
+
+
+def get_prediction_summary(prediction_result):
+    """
+    Generate a human-readable summary of predictions
+    """
+    if 'error' in prediction_result:
+        return f"Prediction unavailable: {prediction_result['error']}"
+
+    metrics = prediction_result['model_metrics']
+    preds = prediction_result['predictions']
+
+    summary = {
+        'model_accuracy': f"{metrics['direction_accuracy']:.1f}%",
+        'model_r2': f"{metrics['r2']:.3f}",
+        'expected_return': f"{preds['cumulative_return']:+.2f}%",
+        'next_period_prediction': f"{preds['predictions'][0]:+.2f}%",
+        'prediction_range': f"[{min(preds['predictions']):.2f}%, {max(preds['predictions']):.2f}%]"
+    }
+
+    return summary
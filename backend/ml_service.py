@@ -0,0 +1,208 @@
+"""
+ML Service - modèles de prédiction des rendements de portefeuille, hors du chemin de requête
+Utilisé par Quant B à la place d'un réentraînement complet de ml_prediction à chaque /api/portfolio.
+
+- Un modèle par portefeuille (spec normalisée), en cache LRU avec la série de rendements qui l'a produit
+- Mise à jour incrémentale: seules les lignes nouvelles, révisées (dernière barre partielle) ou sorties
+  de la fenêtre sont ajoutées / retirées des statistiques suffisantes; réentraînement complet sinon
+- Calcul dans un pool de threads dédié: au-delà de ML_TIMEOUT la requête reçoit la dernière prédiction
+  connue (stale) ou pending, le calcul continue et sert la requête suivante
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+
+import numpy as np
+
+from ml_prediction import MIN_TRAINING_SAMPLES, OnlineOLS, create_features, predict_next_returns, training_metrics
+
+DEFAULT_TIMEOUT = 1.0  # secondes
+MAX_MODELS = 256
+MAX_INCREMENTAL_UPDATES = 500  # puis réentraînement complet (dérive numérique des soustractions)
+
+
+class _Model:
+    """Statistiques suffisantes d'un portefeuille et série (dates, rendements) correspondante"""
+
+    def __init__(self, window):
+        self.window = window
+        self.dates = None
+        self.returns = None
+        self.ols = None
+        self.beta = None
+        self.updates = 0
+        # (dates, rendements, prédiction) publiés ensemble: lus sans verrou par les requêtes
+        self.published = None
+        self.lock = threading.Lock()
+
+    def prediction_for(self, dates, returns):
+        """Prédiction publiée si elle correspond exactement à cette série, sinon None"""
+        published = self.published
+        if published is None:
+            return None
+        known_dates, known_returns, prediction = published
+        if len(known_dates) == len(dates) and np.array_equal(known_dates, dates) \
+                and np.array_equal(known_returns, returns):
+            return prediction
+        return None
+
+    def refresh(self, dates, returns):
+        """Met le modèle à jour pour la nouvelle série; renvoie 'incremental' ou 'full'"""
+        plan = self._plan(dates, returns)
+        if plan is None:
+            X, y = create_features(returns, self.window)
+            self.ols = OnlineOLS(X.shape[1])
+            self.ols.update(X, y)
+            self.updates = 0
+            mode = 'full'
+        else:
+            # Lignes [drop_front, drop_front + keep) de l'ancienne série = lignes [0, keep) de la nouvelle
+            drop_front, keep = plan
+            old_rows = len(self.returns) - self.window
+            self.ols.update(*self._rows(self.returns, 0, drop_front), sign=-1)
+            self.ols.update(*self._rows(self.returns, drop_front + keep, old_rows), sign=-1)
+            self.ols.update(*self._rows(returns, keep, len(returns) - self.window))
+            self.updates += 1
+            mode = 'incremental'
+
+        self.dates, self.returns = dates, returns
+        self.beta = self.ols.coefficients()
+        return mode
+
+    def _rows(self, returns, start, stop):
+        # Lignes [start, stop) du design: la ligne j utilise les rendements j .. j + window
+        return create_features(returns[start:stop + self.window], self.window)
+
+    def _plan(self, dates, returns):
+        # (lignes retirées en tête, lignes conservées) ou None si un réentraînement complet est préférable
+        if self.ols is None or self.updates >= MAX_INCREMENTAL_UPDATES:
+            return None
+        offset = int(np.searchsorted(self.dates, dates[0]))
+        if offset >= len(self.dates) or self.dates[offset] != dates[0]:
+            return None
+        overlap = min(len(self.dates) - offset, len(dates))
+        if not np.array_equal(self.dates[offset:offset + overlap], dates[:overlap]):
+            return None
+
+        # Première barre révisée: une ligne dépend des `window` rendements précédents et du sien
+        changed = np.flatnonzero(self.returns[offset:offset + overlap] != returns[:overlap])
+        unchanged = int(changed[0]) if len(changed) else overlap
+        keep = max(unchanged - self.window, 0)
+        old_rows = len(self.returns) - self.window
+        if keep < (old_rows - keep) + (len(returns) - self.window - keep):
+            return None  # plus de lignes à retirer / ajouter qu'à conserver
+        return offset, keep
+
+
+class ModelService:
+    """Cache de modèles par portefeuille, mises à jour en tâche de fond avec repli au-delà du timeout"""
+
+    def __init__(self, timeout=DEFAULT_TIMEOUT, max_models=MAX_MODELS, workers=2):
+        self.timeout = timeout
+        self.max_models = max_models
+        self._models = OrderedDict()
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='ml')
+        self.stats = {'requests': 0, 'cached': 0, 'incremental': 0, 'full_fits': 0, 'stale': 0, 'pending': 0,
+                      'errors': 0}
+
+    def predict(self, key, dates, returns, n_days=5, window=5, timeout=None):
+        """
+        Prédiction pour la série (dates, rendements) du portefeuille `key`
+
+        Returns:
+            dict au format de ml_prediction.predict_portfolio_returns avec 'status' (fresh | stale)
+            et 'update' (cached | incremental | full), ou {'status': 'pending'} si rien n'est encore calculé
+        """
+        dates = np.asarray(dates)
+        returns = np.asarray(returns, dtype=np.float64)
+        if len(returns) < window + MIN_TRAINING_SAMPLES:
+            return {'error': 'Insufficient data for prediction', 'min_required': window + MIN_TRAINING_SAMPLES,
+                    'available': len(returns)}
+
+        key = (key, window, n_days)
+        with self._lock:
+            self.stats['requests'] += 1
+            model = self._models.get(key)
+            if model is None:
+                model = self._models[key] = _Model(window)
+                self._evict()
+            self._models.move_to_end(key)
+            cached = model.prediction_for(dates, returns)
+            if cached is not None:
+                self.stats['cached'] += 1
+                return {**cached, 'status': 'fresh', 'update': 'cached'}
+
+            version = (key, len(dates), dates[-1].item(), float(returns[-1]), float(returns.sum()))
+            future = self._inflight.get(version)
+            if future is None:
+                future = self._inflight[version] = self._pool.submit(self._update, model, dates, returns, n_days)
+                future.add_done_callback(lambda _: self._done(version))
+
+        try:
+            return future.result(timeout=self.timeout if timeout is None else timeout)
+        except FutureTimeout:
+            # Le calcul continue en arrière-plan: la prochaine requête trouvera le modèle à jour
+            stale = model.published[2] if model.published is not None else None
+            self._count('stale' if stale is not None else 'pending')
+            return {**stale, 'status': 'stale'} if stale is not None else {'status': 'pending'}
+
+    def _update(self, model, dates, returns, n_days):
+        try:
+            with model.lock:
+                # Requêtes concurrentes sur des versions différentes: une autre a pu publier celle-ci
+                prediction = model.prediction_for(dates, returns)
+                if prediction is not None:
+                    return {**prediction, 'status': 'fresh', 'update': 'cached'}
+
+                mode = model.refresh(dates, returns)
+                X, y = create_features(returns, model.window)
+                prediction = {
+                    'model_metrics': training_metrics(model.ols, model.beta, X, y),
+                    'predictions': predict_next_returns(model.ols, model.beta, returns, model.window, n_days),
+                    'window_size': model.window,
+                    'prediction_horizon': n_days,
+                }
+                model.published = (dates, returns, prediction)
+                self._count('full_fits' if mode == 'full' else 'incremental')
+                return {**prediction, 'status': 'fresh', 'update': mode}
+        except Exception as e:
+            self._count('errors')
+            print(f"[ML Service] Error: {e}")
+            return {'error': str(e)}
+
+    def _done(self, version):
+        with self._lock:
+            self._inflight.pop(version, None)
+
+    def _evict(self):
+        while len(self._models) > self.max_models:
+            self._models.popitem(last=False)
+
+    def _count(self, key):
+        with self._lock:
+            self.stats[key] += 1
+
+    def snapshot(self):
+        with self._lock:
+            return {**self.stats, 'models': len(self._models), 'in_flight': len(self._inflight),
+                    'timeout': self.timeout}
+
+
+_default_service = None
+_default_lock = threading.Lock()
+
+
+def get_service():
+    """Service partagé du process, configuré par ML_TIMEOUT / ML_MAX_MODELS"""
+    global _default_service
+    with _default_lock:
+        if _default_service is None:
+            _default_service = ModelService(
+                timeout=float(os.environ.get('ML_TIMEOUT', DEFAULT_TIMEOUT)),
+                max_models=int(os.environ.get('ML_MAX_MODELS', MAX_MODELS))
+            )
+        return _default_service
@@ -0,0 +1,246 @@
+"""
+Portfolio Optimizer - allocations optimales sur la matrice de covariance
+Utilisé par Quant B pour proposer des poids à partir des rendements historiques.
+
+- Covariance shrinkée (Ledoit-Wolf), estimée une fois et partagée par tous les points de la frontière
+- Min-variance et frontière: QP à ensemble actif en NumPy (bornes + contraintes d'égalité), démarrage à chaud
+- Max-Sharpe et risk-parity: SciPy (SLSQP / L-BFGS-B, gradients analytiques)
+- Contraintes long-only et bornes de poids (globales ou par actif)
+"""
+
+import numpy as np
+
+from lazy_import import LazyModule
+
+# SciPy / scikit-learn importés au premier calcul
+scipy_optimize = LazyModule('scipy.optimize')
+covariance = LazyModule('sklearn.covariance')
+
+TRADING_DAYS = 252
+MODES = ('min-variance', 'max-sharpe', 'risk-parity', 'frontier')
+DEFAULT_FRONTIER_POINTS = 20
+
+
+# ============================================================================
+# ENTRÉES
+# ============================================================================
+
+def estimate_inputs(returns, shrinkage=True):
+    """
+    Rendements espérés et covariance annualisés à partir des rendements journaliers
+
+    Returns:
+        mu (N,), cov (N, N), intensité de shrinkage (0 sans shrinkage)
+    """
+    returns = np.asarray(returns, dtype=np.float64)
+    mu = returns.mean(axis=0) * TRADING_DAYS
+    if shrinkage:
+        cov, delta = covariance.ledoit_wolf(returns)
+    else:
+        cov, delta = np.cov(returns, rowvar=False), 0.0
+    return mu, cov * TRADING_DAYS, float(delta)
+
+
+def weight_bounds(n, min_weight=0.0, max_weight=1.0):
+    """Bornes (lo, hi) par actif; scalaires ou listes de longueur n"""
+    lo = np.broadcast_to(np.asarray(min_weight, dtype=np.float64), (n,)).copy()
+    hi = np.broadcast_to(np.asarray(max_weight, dtype=np.float64), (n,)).copy()
+    if np.any(lo > hi) or lo.sum() > 1 + 1e-9 or hi.sum() < 1 - 1e-9:
+        raise ValueError('Contraintes de poids infaisables (somme des bornes incompatible avec 100%)')
+    return lo, hi
+
+
+def _feasible_start(lo, hi):
+    # Point intérieur de la boîte qui somme à 1
+    spare = hi - lo
+    return lo + (1 - lo.sum()) * spare / spare.sum() if spare.sum() > 0 else lo.copy()
+
+
+def _solve(objective, jac, w0, lo, hi, constraints=()):
+    budget = {'type': 'eq', 'fun': lambda w: w.sum() - 1, 'jac': lambda w: np.ones_like(w)}
+    result = scipy_optimize.minimize(objective, w0, jac=jac, method='SLSQP', bounds=list(zip(lo, hi)),
+                                     constraints=[budget, *constraints], options={'maxiter': 500, 'ftol': 1e-12})
+    return np.clip(result.x, lo, hi)
+
+
+def quadratic_program(Q, c, A, b, lo, hi, w0, max_iter=500):
+    """
+    min ½ w'Qw - c'w  s.t.  A w = b,  lo <= w <= hi   (méthode primale à ensemble actif)
+
+    w0 doit être réalisable; les variables de w0 sur une borne forment l'ensemble actif initial.
+    Chaque itération résout le système KKT dont les variables de l'ensemble actif sont fixées.
+    """
+    w = np.clip(np.array(w0, dtype=np.float64), lo, hi)
+    at_lo, at_hi = np.isclose(w, lo), np.isclose(w, hi) & ~np.isclose(w, lo)
+    n, m = len(w), len(b)
+
+    # Système KKT complet, construit une fois; les variables fixées y deviennent des lignes identité
+    kkt = np.zeros((n + m, n + m))
+    kkt[:n, :n], kkt[:n, n:], kkt[n:, :n] = Q, A.T, A
+    rhs = np.concatenate([c, b])
+
+    for _ in range(max_iter):
+        fixed = at_lo | at_hi
+        F = np.flatnonzero(~fixed)
+        X = np.flatnonzero(fixed)
+        system, target_rhs = kkt.copy(), rhs.copy()
+        system[X] = 0.0
+        system[X, X] = 1.0
+        target_rhs[X] = w[X]
+        try:
+            solution = np.linalg.solve(system, target_rhs)
+        except np.linalg.LinAlgError:
+            solution = np.linalg.lstsq(system, target_rhs, rcond=None)[0]
+        nu = solution[n:]
+        step = solution[F] - w[F]
+
+        if np.max(np.abs(step), initial=0.0) < 1e-12:
+            # Stationnaire sur l'ensemble actif: on libère la borne dont le multiplicateur a le mauvais signe
+            grad = Q @ w - c + A.T @ nu
+            violation = np.where(at_lo, -grad, 0.0) + np.where(at_hi, grad, 0.0)
+            worst = int(np.argmax(violation))
+            if violation[worst] <= 1e-10:
+                return w
+            at_lo[worst] = at_hi[worst] = False
+            continue
+
+        # Pas maximal avant de toucher une borne
+        with np.errstate(divide='ignore', invalid='ignore'):
+            ratio = np.where(step < 0, (lo[F] - w[F]) / step, np.where(step > 0, (hi[F] - w[F]) / step, np.inf))
+        blocking = int(np.argmin(ratio))
+        alpha = min(1.0, max(ratio[blocking], 0.0))
+        w[F] += alpha * step
+        if alpha < 1.0:
+            i = F[blocking]
+            if step[blocking] < 0:
+                w[i], at_lo[i] = lo[i], True
+            else:
+                w[i], at_hi[i] = hi[i], True
+    return w
+
+
+# ============================================================================
+# OPTIMISEURS
+# ============================================================================
+
+def min_variance(cov, lo, hi, w0=None):
+    n = len(cov)
+    return quadratic_program(cov, np.zeros(n), np.ones((1, n)), np.ones(1), lo, hi,
+                             _feasible_start(lo, hi) if w0 is None else w0)
+
+
+def max_sharpe(mu, cov, lo, hi, risk_free_rate=0.02):
+    def objective(w):
+        return -(mu @ w - risk_free_rate) / np.sqrt(w @ cov @ w)
+
+    def jac(w):
+        cov_w = cov @ w
+        vol = np.sqrt(w @ cov_w)
+        excess = mu @ w - risk_free_rate
+        return -(mu * vol - excess * cov_w / vol) / vol ** 2
+
+    return _solve(objective, jac, _feasible_start(lo, hi), lo, hi)
+
+
+def risk_parity(cov, lo, hi):
+    """Contributions au risque égales; formulation convexe de Spinu, puis bornes si elles sont actives"""
+    n = len(cov)
+    budget = np.full(n, 1.0 / n)
+    result = scipy_optimize.minimize(lambda y: 0.5 * y @ cov @ y - budget @ np.log(y), np.full(n, 1.0 / n),
+                                     jac=lambda y: cov @ y - budget / y, method='L-BFGS-B',
+                                     bounds=[(1e-12, None)] * n)
+    w = result.x / result.x.sum()
+    if np.all(w >= lo - 1e-9) and np.all(w <= hi + 1e-9):
+        return w
+
+    # Bornes actives: écart quadratique aux contributions cibles, sous contraintes
+    def objective(w):
+        contributions = w * (cov @ w)
+        return np.sum((contributions / contributions.sum() - budget) ** 2)
+
+    return _solve(objective, None, np.clip(w, lo, hi), lo, hi)
+
+
+def efficient_frontier(mu, cov, lo, hi, n_points=DEFAULT_FRONTIER_POINTS):
+    """Portefeuilles de variance minimale pour n_points rendements cibles, du min-variance au rendement max"""
+    n = len(mu)
+    w_min = min_variance(cov, lo, hi)
+    w_max = _max_return_weights(mu, lo, hi)
+    r_min, r_max = mu @ w_min, mu @ w_max
+
+    # Même covariance pour tous les points; seule la cible de rendement change
+    A = np.vstack([np.ones(n), mu])
+    frontier = [w_min]
+    w = w_min
+    for target in np.linspace(r_min, r_max, n_points)[1:]:
+        # Démarrage à chaud réalisable: on glisse du point précédent vers w_max jusqu'à la cible
+        r_prev = mu @ w
+        theta = (target - r_prev) / (r_max - r_prev) if r_max > r_prev else 0.0
+        w0 = w + theta * (w_max - w)
+        w = quadratic_program(cov, np.zeros(n), A, np.array([1.0, target]), lo, hi, w0)
+        frontier.append(w)
+    return np.array(frontier)
+
+
+def _max_return_weights(mu, lo, hi):
+    # Rendement max sous bornes: on remplit les actifs par rendement décroissant
+    w = lo.copy()
+    spare = 1 - lo.sum()
+    for i in np.argsort(-mu):
+        add = min(hi[i] - lo[i], spare)
+        w[i] += add
+        spare -= add
+    return w
+
+
+# ============================================================================
+# MÉTRIQUES
+# ============================================================================
+
+def portfolio_stats(weights, mu, cov, risk_free_rate=0.02):
+    """Rendement, volatilité, Sharpe et contributions au risque, pour un (N,) ou plusieurs (K, N) portefeuilles"""
+    W = np.atleast_2d(weights)
+    cov_w = W @ cov
+    variance = np.einsum('kn,kn->k', W, cov_w)
+    volatility = np.sqrt(variance)
+    expected = W @ mu
+    with np.errstate(invalid='ignore', divide='ignore'):
+        sharpe = np.where(volatility > 0, (expected - risk_free_rate) / volatility, 0.0)
+        contributions = W * cov_w / variance[:, None]
+    stats = {
+        'expected_return': expected,
+        'volatility': volatility,
+        'sharpe_ratio': sharpe,
+        'risk_contributions': contributions,
+    }
+    return stats if np.ndim(weights) == 2 else {k: v[0] for k, v in stats.items()}
+
+
+def optimize(returns, mode='min-variance', min_weight=0.0, max_weight=1.0, risk_free_rate=0.02,
+             frontier_points=DEFAULT_FRONTIER_POINTS, shrinkage=True):
+    """
+    Point d'entrée: rendements journaliers (T, N) -> poids optimaux
+
+    Returns:
+        dict avec weights (N,) (ou frontier (K, N) + min_variance / max_sharpe en mode 'frontier'),
+        mu, cov et shrinkage
+    """
+    if mode not in MODES:
+        raise ValueError(f'Mode inconnu: {mode}')
+
+    mu, cov, delta = estimate_inputs(returns, shrinkage)
+    lo, hi = weight_bounds(len(mu), min_weight, max_weight)
+    result = {'mu': mu, 'cov': cov, 'shrinkage': delta}
+
+    if mode == 'min-variance':
+        result['weights'] = min_variance(cov, lo, hi)
+    elif mode == 'max-sharpe':
+        result['weights'] = max_sharpe(mu, cov, lo, hi, risk_free_rate)
+    elif mode == 'risk-parity':
+        result['weights'] = risk_parity(cov, lo, hi)
+    else:
+        frontier = efficient_frontier(mu, cov, lo, hi, frontier_points)
+        result['frontier'] = frontier
+        result['min_variance'] = frontier[0]
+        result['max_sharpe'] = max_sharpe(mu, cov, lo, hi, risk_free_rate)
+    return result
@@ -0,0 +1,582 @@
+"""
+Price Store - Cache local partagé des barres OHLCV
+Point d'accès unique aux historiques de prix pour Quant A, Quant B et le Daily Report.
+
+- Cache disque colonnaire (un fichier .npz par (ticker, interval), une colonne par champ)
+- Fraîcheur pilotée par un TTL, puis rafraîchissement incrémental (seule la fin manquante est téléchargée);
+  un rafraîchissement en échec sert le cache et n'est retenté qu'après DEFAULT_RETRY_AFTER
+- Source de données interchangeable (Yahoo Finance en production, fixtures locales pour les tests)
+"""
+
+import logging
+import os
+import threading
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor, wait
+
+import numpy as np
+import pandas as pd
+
+from instrumentation import span
+from lazy_import import LazyModule
+from singleflight import SingleFlight
+
+COLUMNS = ['Open', 'High', 'Low', 'Close', 'Volume']
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.price_cache')
+DEFAULT_TTL = 300  # secondes
+DEFAULT_RETRY_AFTER = 30  # secondes avant de retenter un rafraîchissement en échec
+DEFAULT_FETCH_WORKERS = 8
+DEFAULT_FETCH_TIMEOUT = 20  # secondes, par appel get_many
+DEFAULT_UPSTREAM_CONNECTIONS = 16  # connexions keep-alive max vers une source HTTP
+
+logger = logging.getLogger(__name__)
+
+yf = LazyModule('yfinance')  # importé au premier téléchargement Yahoo (import lent)
+
+PERIOD_OFFSETS = {
+    '1d': pd.DateOffset(days=1),
+    '5d': pd.DateOffset(days=5),
+    '1mo': pd.DateOffset(months=1),
+    '3mo': pd.DateOffset(months=3),
+    '6mo': pd.DateOffset(months=6),
+    '1y': pd.DateOffset(years=1),
+    '2y': pd.DateOffset(years=2),
+    '5y': pd.DateOffset(years=5),
+    '10y': pd.DateOffset(years=10),
+}
+
+INTERVALS = ('1m', '2m', '5m', '15m', '30m', '60m', '90m', '1h', '1d', '5d', '1wk', '1mo', '3mo')
+
+# Profondeur max par requête Yahoo pour les intervalles intraday (jours): au-delà, découpage en fenêtres
+INTRADAY_CHUNK_DAYS = {'1m': 7, '2m': 59, '5m': 59, '15m': 59, '30m': 59, '60m': 729, '90m': 59, '1h': 729}
+
+
+# ============================================================================
+# SOURCES DE DONNÉES
+# ============================================================================
+
+class YahooSource:
+    """Source Yahoo Finance (réseau)"""
+
+    def fetch(self, ticker, interval='1d', start=None, end=None):
+        chunk_days = INTRADAY_CHUNK_DAYS.get(interval)
+        if chunk_days is not None and start is not None:
+            return self._fetch_chunked(ticker, interval, start, end, chunk_days)
+
+        kwargs = {'interval': interval}
+        if start is None and end is None:
+            kwargs['period'] = 'max'
+        if start is not None:
+            kwargs['start'] = start
+        if end is not None:
+            kwargs['end'] = end
+        return yf.Ticker(ticker).history(**kwargs)
+
+    def _fetch_chunked(self, ticker, interval, start, end, chunk_days):
+        # Yahoo refuse les fenêtres intraday trop longues: une requête par tranche de chunk_days
+        start = _to_timestamp(start, 'UTC')
+        end = _to_timestamp(end, 'UTC') if end is not None else pd.Timestamp.now(tz='UTC')
+        frames = []
+        while start < end:
+            stop = min(start + pd.Timedelta(days=chunk_days), end)
+            frames.append(yf.Ticker(ticker).history(interval=interval, start=start, end=stop))
+            start = stop
+        frames = [df for df in frames if not df.empty]
+        return pd.concat(frames) if frames else pd.DataFrame(columns=COLUMNS)
+
+
+class HttpChartSource:
+    """
+    Source HTTP au format de l'API chart de Yahoo (/v8/finance/chart/<ticker>)
+
+    Connexions keep-alive mutualisées (httpx); fetch() pour le mode Flask, fetch_async() pour le mode ASGI.
+    """
+
+    def __init__(self, base_url='https://query1.finance.yahoo.com', max_connections=DEFAULT_UPSTREAM_CONNECTIONS,
+                 timeout=DEFAULT_FETCH_TIMEOUT):
+        self.base_url = base_url.rstrip('/')
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self._client = None
+        self._async_client = None
+        self._lock = threading.Lock()
+
+    def _limits(self):
+        import httpx
+        return httpx.Limits(max_connections=self.max_connections, max_keepalive_connections=self.max_connections)
+
+    def _request(self, ticker, interval, start, end):
+        now = int(time.time())
+        period1 = int(_to_timestamp(start, 'UTC').timestamp()) if start is not None else 0
+        period2 = int(_to_timestamp(end, 'UTC').timestamp()) if end is not None else now
+        url = f'{self.base_url}/v8/finance/chart/{ticker}'
+        return url, {'period1': period1, 'period2': period2, 'interval': interval}
+
+    def fetch(self, ticker, interval='1d', start=None, end=None):
+        import httpx
+        with self._lock:
+            if self._client is None:
+                self._client = httpx.Client(limits=self._limits(), timeout=self.timeout,
+                                            headers={'User-Agent': 'Mozilla/5.0'})
+        url, params = self._request(ticker, interval, start, end)
+        response = self._client.get(url, params=params)
+        response.raise_for_status()
+        return self._parse(response.json(), interval)
+
+    async def fetch_async(self, ticker, interval='1d', start=None, end=None):
+        import httpx
+        # Client créé dans la boucle d'événements qui l'utilise (une seule boucle en mode ASGI)
+        if self._async_client is None:
+            self._async_client = httpx.AsyncClient(limits=self._limits(), timeout=self.timeout,
+                                                   headers={'User-Agent': 'Mozilla/5.0'})
+        url, params = self._request(ticker, interval, start, end)
+        response = await self._async_client.get(url, params=params)
+        response.raise_for_status()
+        return self._parse(response.json(), interval)
+
+    async def aclose(self):
+        if self._async_client is not None:
+            await self._async_client.aclose()
+            self._async_client = None
+
+    @staticmethod
+    def _parse(payload, interval):
+        chart = payload.get('chart') or {}
+        if chart.get('error'):
+            raise ValueError(chart['error'].get('description') or str(chart['error']))
+        result = (chart.get('result') or [None])[0]
+        if not result or not result.get('timestamp'):
+            return pd.DataFrame(columns=COLUMNS)
+
+        quote = result['indicators']['quote'][0]
+        tz = result.get('meta', {}).get('exchangeTimezoneName') or 'UTC'
+        index = pd.to_datetime(np.asarray(result['timestamp'], dtype=np.int64), unit='s', utc=True).tz_convert(tz)
+        if interval not in INTRADAY_CHUNK_DAYS:
+            index = index.normalize()  # barres journalières et plus: minuit local, comme yfinance
+        return pd.DataFrame({
+            column: np.asarray(quote.get(column.lower(), []), dtype=np.float64) for column in COLUMNS
+        }, index=index)
+
+
+class FixtureSource:
+    """Source locale: DataFrames en mémoire ou dossier de CSV (<TICKER>.csv)"""
+
+    def __init__(self, frames=None, directory=None):
+        self.frames = {t.upper(): df for t, df in (frames or {}).items()}
+        self.directory = directory
+        self.calls = 0
+
+    def _load(self, ticker):
+        if ticker not in self.frames and self.directory:
+            path = os.path.join(self.directory, f'{ticker}.csv')
+            if os.path.exists(path):
+                df = pd.read_csv(path, index_col=0)
+                df.index = pd.to_datetime(df.index, utc=True)
+                self.frames[ticker] = df
+        return self.frames.get(ticker)
+
+    def fetch(self, ticker, interval='1d', start=None, end=None):
+        self.calls += 1
+        df = self._load(ticker.upper())
+        if df is None:
+            return pd.DataFrame(columns=COLUMNS)
+        if start is not None:
+            df = df[df.index >= _to_timestamp(start, df.index.tz)]
+        if end is not None:
+            df = df[df.index < _to_timestamp(end, df.index.tz)]
+        return df.copy()
+
+
+class SyntheticSource:
+    """Source déterministe (marche aléatoire géométrique par ticker), latence réseau simulable"""
+
+    EPOCH = '2000-01-03'
+
+    def __init__(self, latency=0.0, volatility=0.015, tz='America/New_York', clock=time.time):
+        self.latency = latency
+        self.volatility = volatility
+        self.tz = tz
+        self.clock = clock
+        self.calls = 0
+        self._frames = {}
+
+    def fetch(self, ticker, interval='1d', start=None, end=None):
+        self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+        today = pd.Timestamp(self.clock(), unit='s', tz='UTC').tz_convert(self.tz).normalize().tz_localize(None)
+        key = (ticker.upper(), today)
+        if key not in self._frames:
+            self._frames[key] = self._generate(ticker, today)
+        df = self._frames[key]
+
+        if start is not None:
+            df = df[df.index >= _to_timestamp(start, df.index.tz)]
+        if end is not None:
+            df = df[df.index < _to_timestamp(end, df.index.tz)]
+        return df.copy()
+
+    def _generate(self, ticker, today):
+        days = np.arange(np.datetime64(self.EPOCH), np.datetime64(today.date()) + 1)
+        index = pd.DatetimeIndex(days[np.is_busday(days)].astype('datetime64[ns]')).tz_localize(self.tz)
+
+        # Même ticker -> mêmes prix, quel que soit l'intervalle demandé
+        rng = np.random.default_rng(zlib.crc32(ticker.upper().encode()))
+        log_returns = rng.normal(0.0003, self.volatility, len(index))
+        close = 100 * np.exp(np.cumsum(log_returns))
+        spread = np.abs(rng.normal(0, self.volatility / 2, len(index)))
+        return pd.DataFrame({
+            'Open': close * (1 - spread / 2),
+            'High': close * (1 + spread),
+            'Low': close * (1 - spread),
+            'Close': close,
+            'Volume': rng.integers(100_000, 10_000_000, len(index)).astype(float),
+        }, index=index)
+
+
+def _to_timestamp(value, tz):
+    ts = pd.Timestamp(value)
+    if ts.tzinfo is None and tz is not None:
+        return ts.tz_localize(tz)
+    if ts.tzinfo is not None and tz is None:
+        return ts.tz_convert(None)
+    return ts
+
+
+# ============================================================================
+# STORE
+# ============================================================================
+
+class PriceStore:
+    """Cache OHLCV partagé, clé (ticker, interval)"""
+
+    def __init__(self, source=None, cache_dir=DEFAULT_CACHE_DIR, ttl=DEFAULT_TTL, clock=time.time,
+                 fetch_workers=DEFAULT_FETCH_WORKERS, fetch_timeout=DEFAULT_FETCH_TIMEOUT,
+                 retry_after=DEFAULT_RETRY_AFTER):
+        self.source = source or YahooSource()
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.retry_after = retry_after
+        self.clock = clock
+        self.fetch_timeout = fetch_timeout
+        self._pool = ThreadPoolExecutor(max_workers=fetch_workers, thread_name_prefix='price-fetch')
+        self._entries = {}
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'full_fetches': 0, 'tail_fetches': 0, 'errors': 0}
+        # Les requêtes concurrentes pour la même série partagent un seul téléchargement
+        self.flights = SingleFlight()
+
+    # --- API publique -------------------------------------------------------
+
+    def get_history(self, ticker, period='3mo', interval='1d', start=None, end=None):
+        """Équivalent de yf.Ticker(ticker).history(...) servi depuis le cache"""
+        ticker = ticker.upper()
+        entry, req_start, covered, fresh = self._lookup(ticker, period, interval, start)
+
+        if fresh:
+            self._count('hits')
+            frame = entry['frame']
+        elif covered:
+            frame = self.flights.do((ticker, interval, 'tail'), self._refresh_tail, ticker, interval)
+        else:
+            frame = self.flights.do((ticker, interval, req_start), self._fetch_full, ticker, interval, req_start)
+
+        return self._slice(frame, req_start, end)
+
+    def plan(self, ticker, period='3mo', interval='1d', start=None):
+        """
+        Téléchargement nécessaire pour que get_history soit servi depuis le cache
+
+        Returns:
+            None si le cache est frais, sinon (clé single-flight, 'tail' | 'full', date de début à télécharger)
+        """
+        ticker = ticker.upper()
+        entry, req_start, covered, fresh = self._lookup(ticker, period, interval, start)
+        if fresh:
+            return None
+        if covered:
+            return (ticker, interval, 'tail'), 'tail', entry['frame'].index[-1]
+        return (ticker, interval, req_start), 'full', req_start
+
+    def in_memory(self, ticker, interval='1d'):
+        """True si la série est déjà en mémoire (plan() ne lira pas le cache disque)"""
+        with self._lock:
+            return (ticker.upper(), interval) in self._entries
+
+    def ingest(self, ticker, interval, kind, since, frame):
+        """Intègre des barres téléchargées hors du store (client async), selon un plan() préalable"""
+        ticker = ticker.upper()
+        frame = self._normalize(frame)
+        if kind == 'tail':
+            self._count('tail_fetches')
+            entry = self._get_entry(ticker, interval)
+            return self._merge_tail(ticker, interval, entry, frame)
+        self._count('full_fetches')
+        if not frame.empty:
+            self._put_entry(ticker, interval, frame, since)
+        return frame
+
+    def get_many(self, tickers, period='3mo', interval='1d', start=None, end=None, timeout=None):
+        """
+        Télécharge plusieurs tickers en parallèle (pool de threads borné)
+
+        Returns:
+            frames: dict ticker -> DataFrame (dans l'ordre de `tickers`, tickers en échec absents)
+            errors: dict ticker -> message d'erreur (exception upstream ou timeout)
+        """
+        timeout = self.fetch_timeout if timeout is None else timeout
+        unique = list(dict.fromkeys(tickers))
+        futures = {
+            ticker: self._pool.submit(self.get_history, ticker, period, interval, start, end)
+            for ticker in unique
+        }
+        wait(futures.values(), timeout=timeout)
+
+        frames, errors = {}, {}
+        for ticker, future in futures.items():
+            if not future.done():
+                # Le téléchargement continue en arrière-plan et alimentera le cache
+                errors[ticker] = f'Timeout après {timeout}s'
+            elif future.exception() is not None:
+                errors[ticker] = str(future.exception())
+            else:
+                frames[ticker] = future.result()
+        return frames, errors
+
+    def snapshot(self):
+        with self._lock:
+            stats = dict(self.stats)
+            stats['entries'] = len(self._entries)
+        lookups = stats['hits'] + stats['full_fetches'] + stats['tail_fetches']
+        stats['hit_rate'] = stats['hits'] / lookups if lookups else 0.0
+        stats['singleflight'] = self.flights.snapshot()
+        return stats
+
+    def invalidate(self, ticker=None, interval='1d'):
+        with self._lock:
+            if ticker is None:
+                self._entries.clear()
+            else:
+                self._entries.pop((ticker.upper(), interval), None)
+
+    # --- Fetch --------------------------------------------------------------
+
+    def _fetch_full(self, ticker, interval, req_start):
+        self._count('full_fetches')
+        try:
+            with span('upstream'):
+                frame = self._normalize(self.source.fetch(ticker, interval, start=req_start))
+        except Exception:
+            self._count('errors')
+            raise
+        if frame.empty:
+            return frame
+        self._put_entry(ticker, interval, frame, req_start)
+        return frame
+
+    def _refresh_tail(self, ticker, interval):
+        """Ne télécharge que les barres à partir de la dernière connue (qui peut être partielle)"""
+        entry = self._get_entry(ticker, interval)
+        if self._is_fresh(entry):
+            # Rafraîchie entre-temps par un autre appel (ou en attente après un échec)
+            self._count('hits')
+            return entry['frame']
+
+        self._count('tail_fetches')
+        frame = entry['frame']
+        try:
+            with span('upstream'):
+                tail = self._normalize(self.source.fetch(ticker, interval, start=frame.index[-1]))
+        except Exception as e:
+            # Upstream indisponible: on sert le cache existant plutôt que d'échouer, sans retenter
+            # le téléchargement à chaque requête avant retry_after
+            logger.warning('Tail refresh failed for %s (%s): %s', ticker, interval, e)
+            with self._lock:
+                entry['retry_at'] = self.clock() + self.retry_after
+                self.stats['errors'] += 1
+            return frame
+        return self._merge_tail(ticker, interval, entry, tail)
+
+    def _merge_tail(self, ticker, interval, entry, tail):
+        frame = entry['frame']
+        if not tail.empty:
+            if tail.index.tz is not None and frame.index.tz is not None:
+                tail.index = tail.index.tz_convert(frame.index.tz)
+            frame = pd.concat([frame[frame.index < tail.index[0]], tail])
+            frame = frame[~frame.index.duplicated(keep='last')].sort_index()
+
+        self._put_entry(ticker, interval, frame, entry['coverage_start'])
+        return frame
+
+    def _lookup(self, ticker, period, interval, start):
+        now = pd.Timestamp(self.clock(), unit='s', tz='UTC')
+        req_start = self._request_start(now, period, start)
+
+        entry = self._get_entry(ticker, interval)
+        covered = entry is not None and (
+            entry['coverage_start'] is None or
+            (req_start is not None and req_start >= entry['coverage_start'])
+        )
+        fresh = covered and self._is_fresh(entry)
+        return entry, req_start, covered, fresh
+
+    def _is_fresh(self, entry):
+        now = self.clock()
+        return now - entry['fetched_at'] < self.ttl or now < entry.get('retry_at', 0)
+
+    @staticmethod
+    def _normalize(df):
+        if df is None or df.empty:
+            return pd.DataFrame(columns=COLUMNS)
+        df = df.reindex(columns=COLUMNS).astype(float)
+        return df[~df.index.duplicated(keep='last')].sort_index()
+
+    @staticmethod
+    def _request_start(now, period, start):
+        if start is not None:
+            return _to_timestamp(start, 'UTC')
+        if period in (None, 'max'):
+            return None
+        if period == 'ytd':
+            return pd.Timestamp(year=now.year, month=1, day=1, tz='UTC')
+        if period not in PERIOD_OFFSETS:
+            raise ValueError(f"Période inconnue: {period}")
+        return now.normalize() - PERIOD_OFFSETS[period]
+
+    @staticmethod
+    def _slice(frame, start, end):
+        # Index trié: recherche binaire plutôt qu'un masque sur toute la série (historiques longs)
+        if frame.empty:
+            return frame
+        lo, hi = 0, len(frame)
+        if start is not None:
+            lo = frame.index.searchsorted(_to_timestamp(start, frame.index.tz), side='left')
+        if end is not None:
+            hi = frame.index.searchsorted(_to_timestamp(end, frame.index.tz), side='left')
+        return frame.iloc[lo:hi]
+
+    def _count(self, key):
+        with self._lock:
+            self.stats[key] += 1
+
+    # --- Entrées (mémoire + disque) -------------------------------------------
+
+    def _path(self, ticker, interval):
+        safe = ''.join(c if c.isalnum() or c in '-_.' else '_' for c in ticker)
+        return os.path.join(self.cache_dir, interval, f'{safe}.npz')
+
+    def _get_entry(self, ticker, interval):
+        key = (ticker, interval)
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None and self.cache_dir:
+            entry = self._load(ticker, interval)
+            if entry is not None:
+                with self._lock:
+                    self._entries[key] = entry
+        return entry
+
+    def _put_entry(self, ticker, interval, frame, coverage_start):
+        entry = {'frame': frame, 'fetched_at': self.clock(), 'coverage_start': coverage_start}
+        with self._lock:
+            self._entries[(ticker, interval)] = entry
+        if self.cache_dir:
+            self._save(ticker, interval, entry)
+
+    def _save(self, ticker, interval, entry):
+        path = self._path(ticker, interval)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        frame = entry['frame']
+        index = frame.index.tz_convert('UTC') if frame.index.tz is not None else frame.index
+        coverage = entry['coverage_start']
+
+        tmp_path = f'{path}.{threading.get_ident()}.tmp'
+        with open(tmp_path, 'wb') as f:
+            np.savez(
+                f,
+                ts=index.as_unit('ns').asi8,
+                tz=np.array(str(frame.index.tz) if frame.index.tz is not None else ''),
+                fetched_at=np.array(entry['fetched_at']),
+                coverage_start=np.array(coverage.value if coverage is not None else -1),
+                **{col: frame[col].to_numpy(dtype=np.float64) for col in COLUMNS}
+            )
+        os.replace(tmp_path, path)
+
+    def _load(self, ticker, interval):
+        path = self._path(ticker, interval)
+        if not os.path.exists(path):
+            return None
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                tz = str(data['tz'])
+                index = pd.DatetimeIndex(data['ts'].astype('datetime64[ns]'))
+                index = index.tz_localize('UTC').tz_convert(tz) if tz else index
+                frame = pd.DataFrame({col: data[col] for col in COLUMNS}, index=index)
+                coverage = int(data['coverage_start'])
+                return {
+                    'frame': frame,
+                    'fetched_at': float(data['fetched_at']),
+                    'coverage_start': pd.Timestamp(coverage, tz='UTC') if coverage >= 0 else None,
+                }
+        except Exception as e:
+            # Fichier illisible (écriture interrompue, format obsolète): supprimé, la série est retéléchargée
+            logger.warning('Corrupted cache file %s: %s', path, e)
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            return None
+
+
+# ============================================================================
+# STORE PAR DÉFAUT
+# ============================================================================
+
+_default_store = None
+_default_lock = threading.Lock()
+
+
+def source_from_env():
+    """Source choisie par PRICE_SOURCE: yahoo (défaut), http (PRICE_SOURCE_URL) ou synthetic"""
+    kind = os.environ.get('PRICE_SOURCE', 'yahoo')
+    if kind == 'http':
+        return HttpChartSource(
+            os.environ.get('PRICE_SOURCE_URL', 'https://query1.finance.yahoo.com'),
+            max_connections=int(os.environ.get('PRICE_UPSTREAM_CONNECTIONS', DEFAULT_UPSTREAM_CONNECTIONS))
+        )
+    if kind == 'synthetic':
+        return SyntheticSource()
+    return YahooSource()
+
+
+def get_store():
+    """Store partagé du process, configuré par PRICE_SOURCE / PRICE_CACHE_DIR / PRICE_CACHE_TTL"""
+    global _default_store
+    with _default_lock:
+        if _default_store is None:
+            _default_store = PriceStore(
+                source=source_from_env(),
+                cache_dir=os.environ.get('PRICE_CACHE_DIR', DEFAULT_CACHE_DIR),
+                ttl=float(os.environ.get('PRICE_CACHE_TTL', DEFAULT_TTL)),
+                fetch_workers=int(os.environ.get('PRICE_FETCH_WORKERS', DEFAULT_FETCH_WORKERS)),
+                fetch_timeout=float(os.environ.get('PRICE_FETCH_TIMEOUT', DEFAULT_FETCH_TIMEOUT))
+            )
+        return _default_store
+
+
+def set_store(store):
+    """Remplace le store partagé (ex: PriceStore(source=FixtureSource(...)) pour les tests)"""
+    global _default_store
+    with _default_lock:
+        _default_store = store
+
+
+def get_history(ticker, period='3mo', interval='1d', start=None, end=None):
+    return get_store().get_history(ticker, period=period, interval=interval, start=start, end=end)
+
+
+def get_many(tickers, period='3mo', interval='1d', start=None, end=None, timeout=None):
+    return get_store().get_many(tickers, period=period, interval=interval, start=start, end=end, timeout=timeout)
@@ -0,0 +1,146 @@
+"""
+Price Stream - diffusion des prix en push (Server-Sent Events)
+Un seul poller partagé interroge le cache de prix pour l'ensemble des tickers suivis,
+et ne pousse aux clients abonnés que les changements (nouveau prix, nouvelle barre).
+
+- Charge upstream proportionnelle au nombre de tickers distincts, pas au nombre de clients
+- Le poller s'arrête quand plus personne n'est abonné
+- Chaque abonné reçoit immédiatement le dernier état connu de ses tickers
+"""
+
+import os
+import queue
+import threading
+
+from price_store import get_store
+
+DEFAULT_POLL_INTERVAL = 15  # secondes
+DEFAULT_QUEUE_SIZE = 256
+
+
+class Subscription:
+    """File d'événements d'un client SSE"""
+
+    def __init__(self, tickers, maxsize=DEFAULT_QUEUE_SIZE):
+        self.tickers = tickers
+        self.queue = queue.Queue(maxsize=maxsize)
+
+    def get(self, timeout=None):
+        return self.queue.get(timeout=timeout)
+
+
+class PriceStreamHub:
+    """Abonnements par ticker et poller unique (thread) qui publie les deltas"""
+
+    def __init__(self, store=None, poll_interval=DEFAULT_POLL_INTERVAL):
+        self.store = store
+        self.poll_interval = poll_interval
+        self._subscribers = {}  # ticker -> set(Subscription)
+        self._snapshots = {}    # ticker -> dernier événement publié
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+        self.stats = {'polls': 0, 'tickers_polled': 0, 'events': 0, 'dropped': 0, 'errors': 0}
+
+    def subscribe(self, tickers):
+        subscription = Subscription(list(dict.fromkeys(t.upper() for t in tickers)))
+        with self._lock:
+            for ticker in subscription.tickers:
+                self._subscribers.setdefault(ticker, set()).add(subscription)
+                if ticker in self._snapshots:
+                    self._offer(subscription, self._snapshots[ticker])
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='price-stream', daemon=True)
+                self._thread.start()
+        # Tickers encore jamais vus: premier poll sans attendre l'intervalle
+        self._wake.set()
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            for ticker in subscription.tickers:
+                subscribers = self._subscribers.get(ticker)
+                if subscribers is None:
+                    continue
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[ticker]
+                    self._snapshots.pop(ticker, None)
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                **self.stats,
+                'tickers': len(self._subscribers),
+                'subscribers': len({s for subs in self._subscribers.values() for s in subs}),
+                'poll_interval': self.poll_interval,
+            }
+
+    # --- Poller -------------------------------------------------------------
+
+    def _run(self):
+        while True:
+            with self._lock:
+                tickers = list(self._subscribers)
+                if not tickers:
+                    self._thread = None
+                    return
+            self._wake.clear()
+            self._poll(tickers)
+            self._wake.wait(self.poll_interval)
+
+    def _poll(self, tickers):
+        store = self.store or get_store()
+        # Le cache de prix décide s'il faut aller chercher la fin de série upstream (TTL)
+        frames, errors = store.get_many(tickers, period='5d')
+        with self._lock:
+            self.stats['polls'] += 1
+            self.stats['tickers_polled'] += len(tickers)
+            self.stats['errors'] += len(errors)
+
+        for ticker, df in frames.items():
+            if len(df) < 2:
+                continue
+            event = self._event(ticker, df)
+            with self._lock:
+                previous = self._snapshots.get(ticker)
+                if previous is not None and (previous['price'], previous['bar']) == (event['price'], event['bar']):
+                    continue
+                event['new_bar'] = previous is not None and previous['bar'] != event['bar']
+                self._snapshots[ticker] = event
+                for subscription in self._subscribers.get(ticker, ()):
+                    self._offer(subscription, event)
+
+    @staticmethod
+    def _event(ticker, df):
+        close = df['Close']
+        price, previous_close = float(close.iloc[-1]), float(close.iloc[-2])
+        return {
+            'ticker': ticker,
+            'price': price,
+            'change': (price - previous_close) / previous_close * 100,
+            'bar': df.index[-1].isoformat(),
+        }
+
+    def _offer(self, subscription, event):
+        # Client trop lent: on perd l'événement plutôt que de bloquer le poller
+        try:
+            subscription.queue.put_nowait(event)
+            self.stats['events'] += 1
+        except queue.Full:
+            self.stats['dropped'] += 1
+
+
+_default_hub = None
+_default_lock = threading.Lock()
+
+
+def get_hub():
+    """Hub partagé du process, intervalle de poll configuré par STREAM_POLL_INTERVAL"""
+    global _default_hub
+    with _default_lock:
+        if _default_hub is None:
+            _default_hub = PriceStreamHub(
+                poll_interval=float(os.environ.get('STREAM_POLL_INTERVAL', DEFAULT_POLL_INTERVAL))
+            )
+        return _default_hub
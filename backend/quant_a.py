@@ -0,0 +1,372 @@
+import pandas as pd
+import numpy as np
+from price_store import get_history
+from indicators import STRATEGY_OUTPUTS, streaming_indicators
+from history import build_history
+from instrumentation import Stopwatch
+import signal_kernels
+
+
+def get_asset_data(ticker, period='3mo', interval='1d', start=None, end=None, max_points=None,
+                   history_layout='rows'):
+
+    timer = Stopwatch()
+    data = get_history(ticker, period=period, interval=interval, start=start, end=end)
+    timer.lap('fetch')
+
+    if data.empty:
+        return None
+
+    prices = data['Close']
+    current_price = float(prices.iloc[-1])
+    previous_price = float(prices.iloc[-2])
+    price_change = ((current_price - previous_price) / previous_price) * 100
+
+    # Historique long: sous-échantillonné (LTTB) à max_points points pour le graphique
+    history = build_history(prices.index, {'price': prices.to_numpy()}, max_points, interval, layout=history_layout)
+    timer.lap('history')
+
+    return {
+        'ticker': ticker,
+        'current_price': current_price,
+        'price_change': price_change,
+        'interval': interval,
+        'bars': len(prices),
+        'history': history
+    }
+
+
+def backtest_strategy(ticker, strategy='buy-hold', period=20, history_period='3mo', interval='1d',
+                      start=None, end=None, max_points=None, history_layout='rows',
+                      stop_loss=None, take_profit=None, trailing_stop=None, target_volatility=None, max_leverage=1.0):
+
+    signal_kernels.validate_risk(stop_loss, take_profit, trailing_stop, target_volatility, max_leverage)
+
+    timer = Stopwatch()
+    df = get_history(ticker, period=history_period, interval=interval, start=start, end=end)
+    timer.lap('fetch')
+
+    if df.empty:
+        return None
+
+    prices = df['Close']
+    returns = prices.pct_change().fillna(0)
+    values = prices.to_numpy(dtype=np.float64)
+
+    # Indicateurs glissants maintenus incrémentalement entre deux refresh
+    indicators = streaming_indicators(ticker, strategy, period, prices, interval) if strategy in STRATEGY_OUTPUTS else {}
+
+    # Implémentation des stratégies: signaux d'entrée / de sortie, la position est tenue entre les deux
+    if strategy == 'momentum':
+        # Long si prix > MA, sinon cash (0)
+        with np.errstate(invalid='ignore'):
+            entries = values > indicators['ma'].to_numpy()
+        exits = ~entries
+
+    elif strategy == 'mean-reversion':
+        # Long si prix < MA (sous-évalué), sinon cash
+        with np.errstate(invalid='ignore'):
+            entries = values < indicators['ma'].to_numpy()
+        exits = ~entries
+
+    elif strategy == 'bollinger':
+        # Long si prix dans bande basse (survente), cash sinon
+        ma = indicators['ma'].to_numpy()
+        std = indicators['std'].to_numpy()
+
+        # Gestion division par zéro: si std=0, z_score=0
+        with np.errstate(invalid='ignore', divide='ignore'):
+            z_score = np.where(std > 0, (values - ma) / std, 0.0)
+
+        # Signal d'achat si z-score < -0.5 (prix bas)
+        entries = z_score < -0.5
+        exits = ~entries
+
+    elif strategy == 'rsi':
+        # RSI (Relative Strength Index) de Wilder - Indicateur de momentum
+        # RSI = 100 - (100 / (1 + RS)), où RS = moyenne lissée des gains / moyenne lissée des pertes
+        rsi = signal_kernels.wilder_rsi(values, period)
+
+        # Stratégie: Long si RSI < 30 (oversold), cash si RSI > 70 (overbought)
+        # Entre 30 et 70: on garde la position précédente
+        with np.errstate(invalid='ignore'):
+            entries = rsi < 30
+            exits = rsi > 70
+
+    elif strategy == 'breakout':
+        # Breakout Strategy - Trade les cassures de range
+        # Long quand prix casse au-dessus du plus haut des N derniers jours (excluant le jour courant)
+        # Exit quand prix casse en-dessous du plus bas récent, position maintenue entre les deux
+        with np.errstate(invalid='ignore'):
+            entries = values > indicators['rolling_high'].to_numpy()
+            exits = values < indicators['rolling_low'].to_numpy()
+
+    else:  # buy-hold
+        entries = np.ones(len(values), dtype=bool)
+        exits = np.zeros(len(values), dtype=bool)
+
+    # Taille de position (ciblage de volatilité) puis stops, en une passe sur l'historique
+    sizes = 1.0
+    if target_volatility is not None:
+        sizes = signal_kernels.volatility_target_sizes(returns.to_numpy(), target_volatility,
+                                                       max_leverage=max_leverage)
+    positions = signal_kernels.positions(values, entries, exits, sizes, stop_loss, take_profit, trailing_stop)
+    held = positions != 0
+    trades = int(held[0]) + int(np.count_nonzero(held[1:] & ~held[:-1]))
+
+    # Position prise à la clôture, appliquée au rendement de la barre suivante
+    strategy_returns = returns * pd.Series(positions, index=prices.index).shift(1).fillna(0)
+
+    timer.lap('signals')
+
+    # Calcul des métriques
+    cumulative_returns = (1 + strategy_returns).cumprod()
+    total_return = (cumulative_returns.iloc[-1] - 1) * 100
+
+    # Sharpe Ratio (avec taux sans risque 2% annuel)
+    risk_free_rate = 0.02 / 252  # Taux journalier
+    mean_return = strategy_returns.mean()
+    std_return = strategy_returns.std()
+    sharpe_ratio = ((mean_return - risk_free_rate) / std_return) * np.sqrt(252) if std_return != 0 else 0
+
+    # Max Drawdown
+    running_max = cumulative_returns.expanding().max()
+    drawdown = (cumulative_returns - running_max) / running_max
+    max_drawdown = drawdown.min() * 100
+    timer.lap('metrics')
+
+    # Historique pour graphique - normaliser le prix à 100 aussi pour comparaison
+    normalized_prices = (prices / prices.iloc[0]) * 100
+    history = build_history(
+        cumulative_returns.index,
+        {'value': cumulative_returns.to_numpy() * 100, 'price': normalized_prices.to_numpy()},
+        max_points, interval, layout=history_layout
+    )
+    timer.lap('history')
+
+    return {
+        'ticker': ticker,
+        'strategy': strategy,
+        'period': period,
+        'interval': interval,
+        'bars': len(prices),
+        'strategy_return': float(total_return),
+        'sharpe_ratio': float(sharpe_ratio),
+        'max_drawdown': float(max_drawdown),
+        'trades': trades,
+        'history': history
+    }
+
+
+def calculate_simple_metrics(returns):
+
+    mean_return = returns.mean() * 252 * 100  # Annualisé en %
+    volatility = returns.std() * np.sqrt(252) * 100  # Annualisée en%
+
+    # Sharpe Ratio avec risk-free rate
+    risk_free_rate = 0.02 / 252  # Taux journalier (2% annuel)
+    sharpe_ratio = ((returns.mean() - risk_free_rate) / returns.std()) * np.sqrt(252) if returns.std() != 0 else 0
+
+    # Max Drawdown
+    cumulative = (1 + returns).cumprod()
+    running_max = cumulative.expanding().max()
+    drawdown = (cumulative - running_max) / running_max
+    max_drawdown = drawdown.min() * 100
+
+    return {
+        'annual_return': float(mean_return),
+        'volatility': float(volatility),
+        'sharpe_ratio': float(sharpe_ratio),
+        'max_drawdown': float(max_drawdown)
+    }
+
+
+# Stratégies supportées par le sweep vectorisé
+SWEEP_STRATEGIES = ('buy-hold', 'momentum', 'mean-reversion', 'bollinger', 'rsi', 'breakout')
+
+DEFAULT_THRESHOLDS = {
+    'bollinger': 0.5,     # entrée si z-score < -0.5
+    'rsi': (30, 70),      # entrée si RSI < 30, sortie si RSI > 70
+}
+
+
+def backtest_sweep(ticker, strategy='momentum', periods=range(5, 101), thresholds=None,
+                   history_period='3mo', interval='1d', start=None, end=None):
+
+    timer = Stopwatch()
+    df = get_history(ticker, period=history_period, interval=interval, start=start, end=end)
+    timer.lap('fetch')
+
+    if df.empty:
+        return None
+
+    prices = df['Close'].to_numpy(dtype=np.float64)
+    periods = np.asarray(list(periods), dtype=np.int64)
+
+    if thresholds is None or strategy not in DEFAULT_THRESHOLDS:
+        thresholds = [DEFAULT_THRESHOLDS.get(strategy)]
+
+    # Grille (seuils x périodes) aplatie en colonnes: une colonne = un jeu de paramètres
+    n_thr, n_per = len(thresholds), len(periods)
+    grid_periods = np.tile(periods, n_thr)
+    grid_thresholds = [thr for thr in thresholds for _ in range(n_per)]
+
+    signals = sweep_signals(prices, strategy, grid_periods, grid_thresholds)
+    timer.lap('signals')
+    # buy-hold ne dépend d'aucun paramètre: une seule colonne, diffusée sur la grille
+    metrics = {
+        name: np.broadcast_to(values, (n_thr * n_per,))
+        for name, values in sweep_metrics(prices, signals).items()
+    }
+    timer.lap('metrics')
+
+    surface = {
+        name: [[_finite_or_none(v) for v in row] for row in values.reshape(n_thr, n_per)]
+        for name, values in metrics.items()
+    }
+
+    best = int(np.nanargmax(np.where(np.isfinite(metrics['sharpe_ratio']), metrics['sharpe_ratio'], -np.inf)))
+
+    return {
+        'ticker': ticker,
+        'strategy': strategy,
+        'periods': periods.tolist(),
+        'thresholds': [list(t) if isinstance(t, tuple) else t for t in thresholds],
+        **surface,
+        'best': {
+            'period': int(grid_periods[best]),
+            'threshold': grid_thresholds[best],
+            'strategy_return': _finite_or_none(metrics['strategy_return'][best]),
+            'sharpe_ratio': _finite_or_none(metrics['sharpe_ratio'][best]),
+            'max_drawdown': _finite_or_none(metrics['max_drawdown'][best]),
+        }
+    }
+
+
+def sweep_signals(prices, strategy, periods, thresholds=None):
+    """
+    Positions (dates x paramètres) de `strategy`, mêmes règles que backtest_strategy
+
+    prices: array (T,) commun à toutes les colonnes, ou (T, K) une série par colonne
+    periods: array (K,) de périodes, une par colonne
+    thresholds: liste de K seuils (bollinger: z-score, rsi: (bas, haut)), None = valeurs par défaut
+    """
+    periods = np.asarray(periods, dtype=np.int64)
+    n_cols = len(periods)
+    P = np.broadcast_to(prices[:, None], (len(prices), n_cols)) if prices.ndim == 1 else prices
+
+    if strategy in ('momentum', 'mean-reversion'):
+        ma = _rolling_mean_matrix(P, periods)
+        with np.errstate(invalid='ignore'):
+            return (P > ma) if strategy == 'momentum' else (P < ma)
+
+    if strategy == 'bollinger':
+        z_entry = _threshold_column(thresholds, n_cols, DEFAULT_THRESHOLDS['bollinger'])
+        ma = _rolling_mean_matrix(P, periods)
+        std = np.sqrt(_rolling_var_matrix(P, periods))
+        with np.errstate(invalid='ignore', divide='ignore'):
+            z_score = np.where(std > 0, (P - ma) / std, 0.0)
+        return z_score < -z_entry
+
+    if strategy == 'rsi':
+        levels = thresholds if thresholds is not None else [DEFAULT_THRESHOLDS['rsi']] * n_cols
+        lower = np.array([lvl[0] for lvl in levels], dtype=np.float64)
+        upper = np.array([lvl[1] for lvl in levels], dtype=np.float64)
+
+        rsi = signal_kernels.wilder_rsi(P, periods)
+        with np.errstate(invalid='ignore'):
+            return signal_kernels.positions(P, rsi < lower, rsi > upper)
+
+    if strategy == 'breakout':
+        rolling_high, rolling_low = _rolling_extrema_matrix(P, periods)
+        with np.errstate(invalid='ignore'):
+            return signal_kernels.positions(P, P > rolling_high, P < rolling_low)
+
+    # buy-hold: investi en permanence, sans décalage
+    return None
+
+
+def sweep_metrics(prices, signals):
+    """Rendement total, Sharpe et max drawdown de chaque colonne de signaux (mêmes formules que backtest_strategy)"""
+    P = prices[:, None] if prices.ndim == 1 else prices
+    returns = np.zeros_like(P, dtype=np.float64)
+    returns[1:] = P[1:] / P[:-1] - 1
+
+    if signals is None:
+        strategy_returns = returns
+    else:
+        positions = np.zeros(signals.shape)
+        positions[1:] = signals[:-1]
+        strategy_returns = returns * positions
+
+    cumulative = np.cumprod(1 + strategy_returns, axis=0)
+    total_return = (cumulative[-1] - 1) * 100
+
+    risk_free_rate = 0.02 / 252
+    mean_return = strategy_returns.mean(axis=0)
+    std_return = strategy_returns.std(axis=0, ddof=1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        sharpe_ratio = np.where(std_return != 0, (mean_return - risk_free_rate) / std_return * np.sqrt(252), 0.0)
+
+    running_max = np.maximum.accumulate(cumulative, axis=0)
+    max_drawdown = ((cumulative - running_max) / running_max).min(axis=0) * 100
+
+    return {
+        'strategy_return': total_return,
+        'sharpe_ratio': sharpe_ratio,
+        'max_drawdown': max_drawdown,
+    }
+
+
+def _rolling_mean_matrix(X, periods):
+    # Moyenne glissante par colonne via sommes cumulées: O(T) quelle que soit la période
+    T = X.shape[0]
+    rows = np.arange(T)[:, None]
+    cols = np.arange(X.shape[1])[None, :]
+    lag = rows + 1 - periods[None, :]
+
+    cs = np.zeros((T + 1, X.shape[1]))
+    np.cumsum(X, axis=0, out=cs[1:])
+
+    out = (cs[rows + 1, cols] - cs[np.maximum(lag, 0), cols]) / periods[None, :]
+    out[lag < 0] = np.nan
+    return out
+
+
+def _rolling_var_matrix(X, periods):
+    # Variance glissante (ddof=1) par sommes cumulées, sur données centrées pour limiter les erreurs d'arrondi
+    centered = X - X[:1]
+    mean = _rolling_mean_matrix(centered, periods)
+    mean_sq = _rolling_mean_matrix(centered ** 2, periods)
+    p = periods[None, :].astype(np.float64)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        var = (mean_sq - mean ** 2) * p / (p - 1)
+    return np.maximum(var, 0.0)
+
+
+def _rolling_extrema_matrix(X, periods):
+    # Plus haut / plus bas des `period` barres précédentes (jour courant exclu), une passe O(T) par période
+    from scipy.ndimage import maximum_filter1d, minimum_filter1d
+
+    high = np.full(X.shape, np.nan)
+    low = np.full(X.shape, np.nan)
+    for period in np.unique(periods):
+        cols = np.flatnonzero(periods == period)
+        if period >= X.shape[0]:
+            continue
+        block = np.ascontiguousarray(X[:, cols])
+        origin = (period - 1) // 2
+        high[period:, cols] = maximum_filter1d(block, size=period, axis=0, origin=origin)[period - 1:-1]
+        low[period:, cols] = minimum_filter1d(block, size=period, axis=0, origin=origin)[period - 1:-1]
+    return high, low
+
+
+def _threshold_column(thresholds, n_cols, default):
+    if thresholds is None:
+        return np.full(n_cols, default)
+    return np.array([default if t is None else t for t in thresholds], dtype=np.float64)
+
+
+def _finite_or_none(value):
+    value = float(value)
+    return value if np.isfinite(value) else None
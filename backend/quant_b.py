@@ -0,0 +1,775 @@
+import pandas as pd
+import numpy as np
+from quant_metrics import calculate_cvar, calculate_var, compute_all_metrics, compute_benchmark_metrics
+from ml_prediction import DEFAULT_MIN_TRAIN, walk_forward
+from price_store import get_many
+from response_cache import canonical_key
+from history import build_history
+from instrumentation import Stopwatch, span
+from optimizer import DEFAULT_FRONTIER_POINTS, optimize, portfolio_stats
+from rebalancing import DEFAULT_COST_BPS, DEFAULT_THRESHOLD, simulate, turnover_summary
+import factor_model
+import ml_service
+import risk_engine
+import rolling_analytics
+
+
+def clean_value(value):
+    """Nettoie les valeurs NaN/inf/None pour JSON - garde les vraies valeurs"""
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        if np.isnan(value) or np.isinf(value):
+            return None
+        # Garde la valeur réelle même si c'est 0
+        return round(float(value), 4)
+    return value
+
+
+def portfolio_cache_key(assets, rebalance_freq='monthly', period='3mo', interval='1d', start=None, end=None,
+                        max_points=None, rebalance_threshold=DEFAULT_THRESHOLD, transaction_cost_bps=DEFAULT_COST_BPS):
+    """
+    Clé canonique d'une analyse: poids normalisés, tickers triés, fréquence de rééquilibrage, fenêtre
+    d'historique et version des données (dernière barre de chaque série). None si la spec est invalide.
+    """
+    if len(assets) < 2:
+        return None
+
+    tickers = [asset['ticker'] for asset in assets]
+    weights = np.array([asset['weight'] for asset in assets], dtype=float)
+    if weights.sum() == 0:
+        return None
+
+    # Même appel que analyze_portfolio: les séries sont ensuite servies par le cache de prix
+    frames, _ = get_many(tickers + ['SPY'], period=period, interval=interval, start=start, end=end)
+
+    spec = sorted(zip(tickers, np.round(weights / weights.sum(), 12).tolist()))
+    versions = {ticker: _data_version(frames.get(ticker)) for ticker in sorted(set(tickers + ['SPY']))}
+
+    # Les contributions utilisent les poids bruts: leur somme fait aussi partie de la clé
+    window = [period, interval, start, end, max_points]
+    rebalancing = [rebalance_freq, rebalance_threshold, transaction_cost_bps]
+    return canonical_key(spec, float(weights.sum()), rebalancing, window, versions)
+
+
+def _data_version(df):
+    # Horodatage et clôture de la dernière barre (la barre du jour évolue en séance)
+    if df is None or df.empty:
+        return None
+    return [int(df.index[-1].value), float(df['Close'].iloc[-1])]
+
+
+def analyze_portfolio(assets, rebalance_freq='monthly', executor=None, period='3mo', interval='1d',
+                      start=None, end=None, max_points=None, history_layout='rows',
+                      rebalance_threshold=DEFAULT_THRESHOLD, transaction_cost_bps=DEFAULT_COST_BPS):
+
+    if len(assets) < 2:
+        return None
+
+    # Récupération des données: tous les actifs + le benchmark SPY en parallèle
+    all_prices = {}
+    all_data = {}
+
+    timer = Stopwatch()
+    frames, fetch_errors = get_many([asset['ticker'] for asset in assets] + ['SPY'],
+                                    period=period, interval=interval, start=start, end=end)
+    timer.lap('fetch')
+
+    for asset in assets:
+        ticker = asset['ticker']
+        if ticker in fetch_errors:
+            print(f"[Portfolio] Error fetching {ticker}: {fetch_errors[ticker]}")
+            continue
+
+        df = frames[ticker]
+        if not df.empty:
+            all_prices[ticker] = df['Close']
+            all_data[ticker] = {
+                'current_price': float(df['Close'].iloc[-1]),
+                'weight': asset['weight']
+            }
+
+    if len(all_prices) < 2:
+        return None
+
+    prices_df = pd.DataFrame(all_prices).dropna()
+
+    # Benchmark SPY (Alpha / Beta)
+    spy_close = None
+    if 'SPY' in fetch_errors:
+        print(f"[Portfolio] Error fetching SPY: {fetch_errors['SPY']}")
+    else:
+        spy_close = frames['SPY']['Close']
+
+    # Les calculs CPU partent dans un worker: seuls des tableaux NumPy transitent (mémoire partagée)
+    arrays = {
+        'prices': prices_df.to_numpy(dtype=np.float64),
+        'dates': _utc_nanoseconds(prices_df.index),
+    }
+    if spy_close is not None:
+        arrays['spy_prices'] = spy_close.to_numpy(dtype=np.float64)
+        arrays['spy_dates'] = _utc_nanoseconds(spy_close.index)
+
+    params = {
+        'tickers': list(prices_df.columns),
+        'tz': str(prices_df.index.tz) if prices_df.index.tz is not None else None,
+        # Poids des seuls actifs récupérés (même ordre que les colonnes de prix)
+        'weights': [all_data[ticker]['weight'] for ticker in prices_df.columns],
+        'rebalance_freq': rebalance_freq,
+        'rebalance_threshold': rebalance_threshold,
+        'transaction_cost_bps': transaction_cost_bps,
+        'interval': interval,
+        'max_points': max_points,
+        'history_layout': history_layout,
+    }
+    timer.lap('align')
+
+    if executor is not None:
+        result = executor.run(compute_portfolio_analytics, arrays, **params)
+    else:
+        result = compute_portfolio_analytics(**arrays, **params)
+
+    if result is None:
+        return None
+
+    # Prédiction ML hors du worker: modèle en cache dans le service du process, mis à jour incrémentalement
+    series = result.pop('portfolio_returns')
+    model_key = _model_key(params['tickers'], params['weights'], rebalance_freq, rebalance_threshold,
+                           transaction_cost_bps, period, interval, start, end)
+    with span('ml'):
+        result['ml_prediction'] = _ml_prediction(
+            ml_service.get_service().predict(model_key, series['dates'], series['values'])
+        )
+
+    for ticker, contribution in result.pop('contributions').items():
+        all_data[ticker].update(contribution)
+
+    result['assets_data'] = all_data
+    result['fetch_errors'] = fetch_errors
+    return result
+
+
+def _utc_nanoseconds(index):
+    return (index.tz_convert('UTC') if index.tz is not None else index).as_unit('ns').asi8
+
+
+def _rebuild_index(dates, tz):
+    index = pd.DatetimeIndex(np.asarray(dates).astype('datetime64[ns]'))
+    return index.tz_localize('UTC').tz_convert(tz) if tz else index
+
+
+def compute_portfolio_analytics(prices, dates, tickers, tz, weights, rebalance_freq,
+                                spy_prices=None, spy_dates=None, interval='1d', max_points=None,
+                                history_layout='rows', rebalance_threshold=DEFAULT_THRESHOLD,
+                                transaction_cost_bps=DEFAULT_COST_BPS):
+    """Partie CPU de analyze_portfolio, exécutable dans un process worker (entrées NumPy uniquement)"""
+
+    timer = Stopwatch()
+    prices_df = pd.DataFrame(np.array(prices), index=_rebuild_index(dates, tz), columns=tickers)
+
+    # Calcul des rendements
+    returns_df = prices_df.pct_change().dropna()
+
+    # Poids du portefeuille - validation
+    asset_weights = weights  # poids saisis (en %), pour les contributions
+    weights = np.array(weights)
+
+    if weights.sum() == 0:
+        print("[Portfolio] Error: Sum of weights is zero")
+        return None
+
+    # Normalisation des poids
+    weights = weights / weights.sum()
+
+    # Rééquilibrage selon la fréquence: quantités fixes entre deux dates, poids cibles à chaque date
+    local_dates = prices_df.index.tz_localize(None) if prices_df.index.tz is not None else prices_df.index
+    simulation = simulate(prices_df.to_numpy(), weights, rebalance_freq, local_dates.to_numpy(),
+                          threshold=rebalance_threshold, cost_bps=transaction_cost_bps)
+    portfolio_values = pd.Series(simulation['values'] * 100, index=prices_df.index)
+    portfolio_returns = portfolio_values.pct_change().dropna()
+
+    summary = turnover_summary(simulation)
+    rebalancing = {
+        'frequency': rebalance_freq,
+        'rebalances': summary.pop('rebalances'),
+        'dates': [d.strftime('%Y-%m-%d') for d in prices_df.index[simulation['rebalances']]],
+        **{key: clean_value(value) for key, value in summary.items()},
+        'final_weights': {ticker: clean_value(w) for ticker, w in zip(tickers, simulation['final_weights'])},
+    }
+    timer.lap('rebalance')
+
+    # Calcul des métriques de base
+    total_return = ((portfolio_values.iloc[-1] / portfolio_values.iloc[0]) - 1) * 100
+    portfolio_volatility = portfolio_returns.std() * np.sqrt(252) * 100
+
+    # Sharpe Ratio avec risk-free rate (2% annuel)
+    risk_free_rate = 0.02 / 252  # Taux journalier
+    sharpe_ratio = ((portfolio_returns.mean() - risk_free_rate) / portfolio_returns.std()) * np.sqrt(252) \
+        if portfolio_returns.std() != 0 else 0
+
+    # Max Drawdown
+    cumulative = portfolio_values
+    running_max = cumulative.expanding().max()
+    drawdown = (cumulative - running_max) / running_max
+    max_drawdown = drawdown.min() * 100
+
+    # Métriques avancées (un seul passage sur les rendements)
+    metrics = compute_all_metrics(portfolio_returns.to_numpy(), max_drawdown=max_drawdown)
+    sortino_ratio = metrics['sortino_ratio']
+    calmar_ratio = metrics['calmar_ratio']
+    var_95 = metrics['var']
+    cvar_95 = metrics['cvar']
+    omega_ratio = metrics['omega_ratio']
+    skewness = metrics['skewness']
+    kurtosis = metrics['kurtosis']
+    hit_ratio = metrics['hit_ratio']
+    win_loss = metrics['win_loss_ratio']
+
+    # Alpha et Beta vs SPY
+    try:
+        if spy_prices is None:
+            raise ValueError('SPY indisponible')
+        spy_close = pd.Series(np.array(spy_prices), index=_rebuild_index(spy_dates, tz))
+        spy_returns = spy_close.pct_change().dropna()
+
+        # Aligner les dates
+        combined = pd.DataFrame({
+            'portfolio': portfolio_returns,
+            'spy': spy_returns
+        }).dropna()
+
+        if len(combined) > 10:
+            benchmark_metrics = compute_benchmark_metrics(combined['portfolio'].to_numpy(), combined['spy'].to_numpy())
+            beta = benchmark_metrics['beta']
+            alpha = benchmark_metrics['alpha']
+            info_ratio = benchmark_metrics['information_ratio']
+        else:
+            beta = alpha = info_ratio = 0.0
+    except:
+        beta = alpha = info_ratio = 0.0
+
+    # Matrice de corrélation
+    correlation_matrix = returns_df.corr().to_dict()
+
+    # Contribution de chaque actif
+    contributions = {}
+    for ticker, weight in zip(tickers, asset_weights):
+        asset_return = ((prices_df[ticker].iloc[-1] / prices_df[ticker].iloc[0]) - 1) * 100
+        contributions[ticker] = {
+            'return': float(asset_return),
+            'contribution': float(asset_return * weight / 100)
+        }
+    timer.lap('metrics')
+
+    # Historique pour graphique - normaliser tous les actifs à 100 comme le portefeuille
+    normalized_prices = (prices_df / prices_df.iloc[0]) * 100
+
+    # Sous-échantillonnage piloté par la valeur du portefeuille, actifs pris aux mêmes dates
+    history = build_history(
+        portfolio_values.index,
+        {'portfolio': portfolio_values.to_numpy(), **{ticker: normalized_prices[ticker].to_numpy() for ticker in tickers}},
+        max_points, interval, primary='portfolio', layout=history_layout
+    )
+    timer.lap('history')
+
+    return {
+        'total_return': clean_value(total_return),
+        'total_value': clean_value(portfolio_values.iloc[-1]),
+        'portfolio_volatility': clean_value(portfolio_volatility),
+        'sharpe_ratio': clean_value(sharpe_ratio),
+        'sortino_ratio': clean_value(sortino_ratio),
+        'calmar_ratio': clean_value(calmar_ratio),
+        'max_drawdown': clean_value(max_drawdown),
+        'var_95': clean_value(var_95),
+        'cvar_95': clean_value(cvar_95),
+        'omega_ratio': clean_value(omega_ratio),
+        'alpha': clean_value(alpha),
+        'beta': clean_value(beta),
+        'information_ratio': clean_value(info_ratio),
+        'skewness': clean_value(skewness),
+        'kurtosis': clean_value(kurtosis),
+        'hit_ratio': clean_value(hit_ratio),
+        'win_loss_ratio': clean_value(win_loss),
+        'correlation_matrix': correlation_matrix,
+        'contributions': contributions,
+        'history': history,
+        'rebalancing': rebalancing,
+        # Pour le service ML du process parent (retiré de la réponse)
+        'portfolio_returns': {'dates': _utc_nanoseconds(portfolio_returns.index), 'values': portfolio_returns.to_numpy()},
+    }
+
+
+def _model_key(tickers, weights, rebalance_freq, rebalance_threshold, transaction_cost_bps, period, interval,
+               start, end):
+    # Même portefeuille et même fenêtre = même modèle, quelle que soit la route (/api/portfolio, /api/portfolio/ml)
+    weights = np.asarray(weights, dtype=float)
+    return canonical_key(list(tickers), (weights / weights.sum()).round(12).tolist(), rebalance_freq,
+                         rebalance_threshold, transaction_cost_bps, period, interval, start, end)
+
+
+def _ml_prediction(prediction_result):
+    """Résumé API d'une prédiction du service ML (None si l'historique est trop court)"""
+    if prediction_result.get('status') == 'pending':
+        return {'enabled': False, 'status': 'pending'}
+    if 'error' in prediction_result:
+        return None if 'min_required' in prediction_result else {'enabled': False, 'error': prediction_result['error']}
+
+    predictions = prediction_result['predictions']
+    return {
+        'enabled': True,
+        'next_day_prediction': clean_value(predictions['predictions'][0]),
+        'five_day_cumulative': clean_value(predictions['cumulative_return']),
+        'model_accuracy': clean_value(prediction_result['model_metrics']['direction_accuracy']),
+        'model_r2': clean_value(prediction_result['model_metrics']['r2']),
+        'predictions_detail': predictions['predictions'],
+        'confidence_lower': predictions['confidence_lower'],
+        'confidence_upper': predictions['confidence_upper'],
+        'training_samples': prediction_result['model_metrics']['training_samples'],
+        'status': prediction_result['status'],
+        'update': prediction_result['update'],
+    }
+
+
+def portfolio_ml(assets, rebalance_freq='monthly', period='1y', interval='1d', start=None, end=None, window=5,
+                 n_days=5, train_size=None, min_train=DEFAULT_MIN_TRAIN, rebalance_threshold=DEFAULT_THRESHOLD,
+                 transaction_cost_bps=DEFAULT_COST_BPS):
+    """
+    Prédiction ML du portefeuille et évaluation walk-forward hors échantillon
+
+    Le modèle de prédiction est celui du service ML, partagé avec /api/portfolio pour la même spec.
+    train_size: lignes d'entraînement de chaque fenêtre walk-forward (None = fenêtre croissante)
+    """
+    if len(assets) < 2:
+        return None
+
+    tickers = [asset['ticker'] for asset in assets]
+    timer = Stopwatch()
+    frames, fetch_errors = get_many(tickers, period=period, interval=interval, start=start, end=end)
+    timer.lap('fetch')
+
+    prices_df = pd.DataFrame({
+        ticker: frames[ticker]['Close'] for ticker in tickers if ticker in frames and not frames[ticker].empty
+    }).dropna()
+    if len(prices_df.columns) < 2 or len(prices_df) < 3:
+        return None
+
+    weights = {asset['ticker']: asset['weight'] for asset in assets}
+    weights = np.array([weights[ticker] for ticker in prices_df.columns], dtype=float)
+    if weights.sum() == 0:
+        return None
+    timer.lap('align')
+
+    # Mêmes opérations que compute_portfolio_analytics: série identique, donc modèle partagé
+    local_dates = prices_df.index.tz_localize(None) if prices_df.index.tz is not None else prices_df.index
+    simulation = simulate(prices_df.to_numpy(), weights, rebalance_freq, local_dates.to_numpy(),
+                          threshold=rebalance_threshold, cost_bps=transaction_cost_bps)
+    portfolio_values = simulation['values'] * 100
+    returns = portfolio_values[1:] / portfolio_values[:-1] - 1
+    timer.lap('rebalance')
+
+    model_key = _model_key(prices_df.columns, weights, rebalance_freq, rebalance_threshold, transaction_cost_bps,
+                           period, interval, start, end)
+    prediction = _ml_prediction(ml_service.get_service().predict(
+        model_key, _utc_nanoseconds(prices_df.index[1:]), returns, n_days=n_days, window=window
+    ))
+    timer.lap('ml')
+
+    evaluation = walk_forward(returns, window, train_size, min_train, dates=local_dates[1:])
+    for name in ('direction_accuracy', 'mse', 'mae', 'r2_oos'):
+        if name in evaluation:
+            evaluation[name] = clean_value(evaluation[name])
+    timer.lap('walk_forward')
+
+    return {
+        'tickers': list(prices_df.columns),
+        'observations': len(returns),
+        'window': window,
+        'horizon': n_days,
+        'prediction': prediction,
+        'walk_forward': evaluation,
+        'fetch_errors': fetch_errors,
+    }
+
+
+def optimize_portfolio(assets, mode='max-sharpe', min_weight=0.0, max_weight=1.0, period='1y', interval='1d',
+                       start=None, end=None, frontier_points=DEFAULT_FRONTIER_POINTS, risk_free_rate=0.02):
+    """
+    Poids optimaux pour les actifs du portefeuille (min-variance, max-sharpe, risk-parity ou frontier)
+
+    Les bornes globales min_weight / max_weight peuvent être surchargées par actif
+    (clés 'min_weight' / 'max_weight' de chaque asset).
+    """
+    if len(assets) < 2:
+        return None
+
+    tickers = list(dict.fromkeys(asset['ticker'] for asset in assets))
+    timer = Stopwatch()
+    frames, fetch_errors = get_many(tickers, period=period, interval=interval, start=start, end=end)
+    timer.lap('fetch')
+
+    prices_df = pd.DataFrame({
+        ticker: frames[ticker]['Close'] for ticker in tickers if ticker in frames and not frames[ticker].empty
+    }).dropna()
+    if len(prices_df.columns) < 2 or len(prices_df) < 3:
+        return None
+
+    returns = prices_df.pct_change().dropna().to_numpy()
+    tickers = list(prices_df.columns)
+    specs = {asset['ticker']: asset for asset in assets}
+    lo = [specs[t].get('min_weight', min_weight) for t in tickers]
+    hi = [specs[t].get('max_weight', max_weight) for t in tickers]
+    timer.lap('align')
+
+    result = optimize(returns, mode, lo, hi, risk_free_rate, frontier_points)
+    timer.lap('optimize')
+    mu, cov = result['mu'], result['cov']
+
+    def allocation(weights):
+        stats = portfolio_stats(weights, mu, cov, risk_free_rate)
+        return {
+            'weights': {t: clean_value(w) for t, w in zip(tickers, weights)},
+            'expected_return': clean_value(stats['expected_return'] * 100),
+            'volatility': clean_value(stats['volatility'] * 100),
+            'sharpe_ratio': clean_value(stats['sharpe_ratio']),
+            'risk_contributions': {t: clean_value(rc * 100) for t, rc in zip(tickers, stats['risk_contributions'])},
+        }
+
+    response = {
+        'mode': mode,
+        'tickers': tickers,
+        'observations': len(returns),
+        'shrinkage': clean_value(result['shrinkage']),
+        'fetch_errors': fetch_errors,
+    }
+    if mode == 'frontier':
+        response['frontier'] = [allocation(w) for w in result['frontier']]
+        response['min_variance'] = allocation(result['min_variance'])
+        response['max_sharpe'] = allocation(result['max_sharpe'])
+    else:
+        response.update(allocation(result['weights']))
+    return response
+
+
+def portfolio_risk(assets, method='bootstrap', horizon=risk_engine.DEFAULT_HORIZON, paths=risk_engine.DEFAULT_PATHS,
+                   confidence=risk_engine.DEFAULT_CONFIDENCE, seed=risk_engine.DEFAULT_SEED,
+                   block_size=risk_engine.DEFAULT_BLOCK_SIZE, dof=risk_engine.DEFAULT_DOF, executor=None,
+                   period='1y', interval='1d', start=None, end=None):
+    """
+    VaR / CVaR simulées du portefeuille à `horizon` barres, intervalles de confiance et scénarios forward
+
+    Les VaR / CVaR historiques journalières (percentile simple) sont renvoyées pour comparaison.
+    """
+    if len(assets) < 2:
+        return None
+
+    tickers = [asset['ticker'] for asset in assets]
+    timer = Stopwatch()
+    frames, fetch_errors = get_many(tickers, period=period, interval=interval, start=start, end=end)
+    timer.lap('fetch')
+
+    prices_df = pd.DataFrame({
+        ticker: frames[ticker]['Close'] for ticker in tickers if ticker in frames and not frames[ticker].empty
+    }).dropna()
+    if len(prices_df.columns) < 2 or len(prices_df) < 3:
+        return None
+
+    returns = prices_df.pct_change().dropna().to_numpy()
+    weights = {asset['ticker']: asset['weight'] for asset in assets}
+    weights = np.array([weights[ticker] for ticker in prices_df.columns], dtype=float)
+    if weights.sum() == 0:
+        return None
+    timer.lap('align')
+
+    result = risk_engine.simulate(returns, weights, method, horizon, paths, confidence, seed, block_size, dof,
+                                  executor=executor)
+    timer.lap('simulate')
+    daily = returns @ (weights / weights.sum())
+
+    def by_level(values):
+        return {f'{level * 100:g}': values(level) for level in confidence}
+
+    levels = result['levels']
+    histogram = result['histogram']
+    return {
+        'method': method,
+        'horizon': horizon,
+        'paths': result['paths'],
+        'shards': result['shards'],
+        'seed': seed,
+        'tickers': list(prices_df.columns),
+        'observations': len(returns),
+        'expected_return': clean_value(result['expected_return'] * 100),
+        'volatility': clean_value(result['volatility'] * 100),
+        'var': by_level(lambda level: clean_value(levels[level]['var'] * 100)),
+        'cvar': by_level(lambda level: clean_value(levels[level]['cvar'] * 100)),
+        'var_band': by_level(lambda level: [clean_value(v * 100) for v in levels[level]['var_band']]),
+        'cvar_band': by_level(lambda level: [clean_value(v * 100) for v in levels[level]['cvar_band']]),
+        'historical': {
+            'var': by_level(lambda level: clean_value(calculate_var(daily, level))),
+            'cvar': by_level(lambda level: clean_value(calculate_cvar(daily, level))),
+        },
+        'distribution': None if histogram is None else {
+            'edges': [clean_value(edge * 100) for edge in histogram['edges']],
+            'counts': histogram['counts'].tolist(),
+        },
+        'scenarios': {
+            'days': list(range(1, horizon + 1)),
+            **{str(p): [clean_value(v * 100) for v in values] for p, values in result['fan'].items()},
+        },
+        'fetch_errors': fetch_errors,
+    }
+
+
+MAX_ROLLING_PAIRS = 190  # 20 actifs: au-delà, paires à demander explicitement
+
+
+def portfolio_rolling(assets, windows=rolling_analytics.DEFAULT_WINDOWS, pairs=None, rebalance_freq='monthly',
+                      executor=None, period='1y', interval='1d', start=None, end=None, max_points=None,
+                      history_layout='rows', rebalance_threshold=DEFAULT_THRESHOLD,
+                      transaction_cost_bps=DEFAULT_COST_BPS):
+    """
+    Sharpe, volatilité, beta vs SPY et corrélations glissants du portefeuille, par taille de fenêtre
+
+    pairs: paires de tickers [(a, b), ...] dont la corrélation glissante est renvoyée
+    (défaut: toutes si au plus MAX_ROLLING_PAIRS, sinon seulement la corrélation moyenne)
+    """
+    if len(assets) < 2:
+        return None
+
+    tickers = [asset['ticker'] for asset in assets]
+    timer = Stopwatch()
+    frames, fetch_errors = get_many(tickers + ['SPY'], period=period, interval=interval, start=start, end=end)
+    timer.lap('fetch')
+
+    prices_df = pd.DataFrame({
+        ticker: frames[ticker]['Close'] for ticker in tickers if ticker in frames and not frames[ticker].empty
+    }).dropna()
+    if len(prices_df.columns) < 2 or len(prices_df) < 3:
+        return None
+
+    weights = {asset['ticker']: asset['weight'] for asset in assets}
+    weights = [weights[ticker] for ticker in prices_df.columns]
+    if sum(weights) == 0:
+        return None
+
+    columns = list(prices_df.columns)
+    if pairs is None and len(columns) * (len(columns) - 1) // 2 <= MAX_ROLLING_PAIRS:
+        pairs = list(zip(*(np.array(columns)[index].tolist() for index in rolling_analytics.all_pairs(len(columns)))))
+    pairs = [(a, b) for a, b in pairs or [] if a in columns and b in columns and a != b]
+
+    arrays = {
+        'prices': prices_df.to_numpy(dtype=np.float64),
+        'dates': _utc_nanoseconds(prices_df.index),
+    }
+    if 'SPY' not in fetch_errors and not frames['SPY'].empty:
+        # SPY aux dates du portefeuille (dernier cours connu si une séance manque)
+        spy = frames['SPY']['Close'].reindex(prices_df.index).ffill()
+        if not spy.isna().any():
+            arrays['spy_prices'] = spy.to_numpy(dtype=np.float64)
+    timer.lap('align')
+
+    params = {
+        'tickers': columns,
+        'tz': str(prices_df.index.tz) if prices_df.index.tz is not None else None,
+        'weights': weights,
+        'windows': list(windows),
+        'pairs': pairs,
+        'rebalance_freq': rebalance_freq,
+        'rebalance_threshold': rebalance_threshold,
+        'transaction_cost_bps': transaction_cost_bps,
+        'interval': interval,
+        'max_points': max_points,
+        'history_layout': history_layout,
+    }
+    if executor is not None:
+        result = executor.run(compute_rolling_analytics, arrays, **params)
+    else:
+        result = compute_rolling_analytics(**arrays, **params)
+
+    result['fetch_errors'] = fetch_errors
+    return result
+
+
+def compute_rolling_analytics(prices, dates, tickers, tz, weights, windows, pairs, rebalance_freq, spy_prices=None,
+                              interval='1d', max_points=None, history_layout='rows',
+                              rebalance_threshold=DEFAULT_THRESHOLD, transaction_cost_bps=DEFAULT_COST_BPS):
+    """Partie CPU de portfolio_rolling, exécutable dans un process worker (entrées NumPy uniquement)"""
+    timer = Stopwatch()
+    prices = np.asarray(prices)
+    index = _rebuild_index(dates, tz)
+    weights = np.asarray(weights, dtype=float)
+
+    # Même portefeuille que /api/portfolio: rééquilibrage et coûts compris
+    local_dates = index.tz_localize(None) if index.tz is not None else index
+    simulation = simulate(prices, weights / weights.sum(), rebalance_freq, local_dates.to_numpy(),
+                          threshold=rebalance_threshold, cost_bps=transaction_cost_bps)
+    values = simulation['values']
+    portfolio_returns = values[1:] / values[:-1] - 1
+    asset_returns = prices[1:] / prices[:-1] - 1
+    spy_returns = None if spy_prices is None else np.asarray(spy_prices)[1:] / np.asarray(spy_prices)[:-1] - 1
+    timer.lap('rebalance')
+
+    position = {ticker: i for i, ticker in enumerate(tickers)}
+    selected = (np.array([position[a] for a, _ in pairs], dtype=np.int64),
+                np.array([position[b] for _, b in pairs], dtype=np.int64))
+    series = rolling_analytics.compute(portfolio_returns, asset_returns, windows, spy_returns, selected)
+    timer.lap('rolling')
+
+    results = {}
+    for window, metrics in series.items():
+        columns = {
+            'sharpe': metrics['sharpe'],
+            'volatility': metrics['volatility'],
+            **({'beta': metrics['beta']} if 'beta' in metrics else {}),
+            'average_correlation': metrics['average_correlation'],
+            **{f'{a}/{b}': metrics['correlation'][:, k] for k, (a, b) in enumerate(pairs)},
+        }
+        # La valeur k couvre les rendements k .. k + window - 1: datée à la fin de la fenêtre
+        history = build_history(index[window:], columns, max_points, interval, primary='sharpe',
+                                layout=history_layout)
+        if history_layout == 'rows':
+            history = [{key: _finite(value) for key, value in row.items()} for row in history]
+        results[str(window)] = {
+            'latest': {name: clean_value(float(column[-1])) for name, column in columns.items()},
+            'history': history,
+        }
+    timer.lap('history')
+
+    return {
+        'tickers': list(tickers),
+        'observations': len(portfolio_returns),
+        'windows': results,
+        'skipped_windows': [window for window in windows if window not in series],
+        'pairs': [f'{a}/{b}' for a, b in pairs],
+        'benchmark': 'SPY' if spy_returns is not None else None,
+    }
+
+
+def portfolio_factors(assets, factors=None, rebalance_freq='monthly', executor=None, period='1y', interval='1d',
+                      start=None, end=None, rebalance_threshold=DEFAULT_THRESHOLD,
+                      transaction_cost_bps=DEFAULT_COST_BPS):
+    """
+    Betas, alpha, t-stats et R² de chaque actif (et du portefeuille) sur plusieurs facteurs à la fois
+
+    assets: [{ticker, weight}] - sans poids (univers de tickers), pas de ligne portefeuille
+    factors: noms de factor_model.FACTORS et / ou tickers (défaut: marché, taille, value)
+    """
+    specs = factor_model.resolve(factors)
+    tickers = list(dict.fromkeys(asset['ticker'] for asset in assets))
+    if not tickers:
+        return None
+    if len(tickers) > factor_model.MAX_ASSETS:
+        raise ValueError(f'Univers limité à {factor_model.MAX_ASSETS} tickers')
+
+    timer = Stopwatch()
+    frames, fetch_errors = get_many(list(dict.fromkeys(tickers + factor_model.factor_tickers(specs))),
+                                    period=period, interval=interval, start=start, end=end)
+    timer.lap('fetch')
+
+    def available(ticker):
+        return ticker is None or (ticker in frames and not frames[ticker].empty)
+
+    missing_factors = [name for name, long, short in specs if not (available(long) and available(short))]
+    specs = [spec for spec in specs if spec[0] not in missing_factors]
+    tickers = [ticker for ticker in tickers if available(ticker)]
+    if not specs or not tickers:
+        return None
+
+    # Dates communes aux facteurs; actifs alignés dessus (NaN avant leur première cotation, trous comblés)
+    factor_columns = factor_model.factor_tickers(specs)
+    factor_prices = pd.DataFrame({ticker: frames[ticker]['Close'] for ticker in factor_columns}).dropna()
+    asset_prices = pd.DataFrame({ticker: frames[ticker]['Close'] for ticker in tickers})
+    asset_prices = asset_prices.reindex(factor_prices.index).ffill()
+    if len(factor_prices) < 3:
+        return None
+
+    weights = None
+    if all('weight' in asset for asset in assets):
+        by_ticker = {asset['ticker']: asset['weight'] for asset in assets}
+        weights = [by_ticker[ticker] for ticker in tickers]
+        if sum(weights) == 0:
+            weights = None
+
+    arrays = {
+        'prices': asset_prices.to_numpy(dtype=np.float64),
+        'factor_prices': factor_prices.to_numpy(dtype=np.float64),
+        'dates': _utc_nanoseconds(factor_prices.index),
+    }
+    timer.lap('align')
+
+    params = {
+        'tickers': tickers,
+        'factor_tickers': factor_columns,
+        'specs': specs,
+        'tz': str(factor_prices.index.tz) if factor_prices.index.tz is not None else None,
+        'weights': weights,
+        'rebalance_freq': rebalance_freq,
+        'rebalance_threshold': rebalance_threshold,
+        'transaction_cost_bps': transaction_cost_bps,
+    }
+    if executor is not None:
+        result = executor.run(compute_factor_exposures, arrays, **params)
+    else:
+        result = compute_factor_exposures(**arrays, **params)
+
+    result['missing_factors'] = missing_factors
+    result['fetch_errors'] = fetch_errors
+    return result
+
+
+def compute_factor_exposures(prices, factor_prices, dates, tickers, factor_tickers, specs, tz, weights=None,
+                             rebalance_freq='monthly', rebalance_threshold=DEFAULT_THRESHOLD,
+                             transaction_cost_bps=DEFAULT_COST_BPS):
+    """Partie CPU de portfolio_factors, exécutable dans un process worker (entrées NumPy uniquement)"""
+    timer = Stopwatch()
+    prices = np.asarray(prices)
+    factor_prices = np.asarray(factor_prices)
+    with np.errstate(invalid='ignore'):
+        columns = prices[1:] / prices[:-1] - 1
+    factor_ticker_returns = factor_prices[1:] / factor_prices[:-1] - 1
+    factors = factor_model.factor_returns(specs, dict(zip(factor_tickers, factor_ticker_returns.T)))
+
+    if weights is not None:
+        # Même portefeuille que /api/portfolio, à partir de la première date où tous les actifs cotent
+        complete = ~np.isnan(prices).any(axis=1)
+        portfolio_returns = np.full(len(columns), np.nan)
+        if complete.any():
+            first = int(complete.argmax())
+            index = _rebuild_index(dates, tz)
+            local_dates = index.tz_localize(None) if index.tz is not None else index
+            weights = np.asarray(weights, dtype=float)
+            values = simulate(prices[first:], weights / weights.sum(), rebalance_freq, local_dates[first:].to_numpy(),
+                              threshold=rebalance_threshold, cost_bps=transaction_cost_bps)['values']
+            portfolio_returns[first:] = values[1:] / values[:-1] - 1
+        columns = np.column_stack([columns, portfolio_returns])
+        timer.lap('rebalance')
+
+    fit = factor_model.exposures(columns, factors)
+    timer.lap('regression')
+
+    names = [name for name, _, _ in specs]
+
+    def exposure(i):
+        return {
+            'alpha': clean_value(float(fit['alpha'][i])),
+            'alpha_t': clean_value(float(fit['alpha_t'][i])),
+            'betas': {name: clean_value(float(value)) for name, value in zip(names, fit['betas'][:, i])},
+            't_stats': {name: clean_value(float(value)) for name, value in zip(names, fit['t_stats'][:, i])},
+            'r_squared': clean_value(float(fit['r_squared'][i])),
+            'adj_r_squared': clean_value(float(fit['adj_r_squared'][i])),
+            'residual_volatility': clean_value(float(fit['residual_volatility'][i])),
+            'observations': int(fit['observations'][i]),
+        }
+
+    return {
+        'factors': names,
+        'definitions': {name: [long, short] for name, long, short in specs},
+        'observations': len(columns),
+        'exposures': {ticker: exposure(i) for i, ticker in enumerate(tickers)},
+        'portfolio': exposure(len(tickers)) if weights is not None else None,
+    }
+
+
+def _finite(value):
+    # NaN / inf (fenêtre sans variance) -> null en JSON
+    return None if isinstance(value, float) and not np.isfinite(value) else value
@@ -1,6 +1,9 @@
 import numpy as np
 import pandas as pd
-from scipy import stats
+
+from lazy_import import LazyModule
+
+stats = LazyModule('scipy.stats')  # importé au premier calcul de skewness / kurtosis
 
 
 def calculate_var(returns, confidence_level=0.95):
@@ -71,74 +74,38 @@ def calculate_omega_ratio(returns, threshold=0):
 
 def calculate_beta(asset_returns, market_returns):
 
-    # Aligner les deux séries
-    combined = pd.DataFrame({
-        'asset': asset_returns,
-        'market': market_returns
-    }).dropna()
-
-    if len(combined) < 2:
-        return 1.0
-
-    covariance = combined['asset'].cov(combined['market'])
-    market_variance = combined['market'].var()
-
-    if market_variance == 0:
+    asset, market = _align_by_date(asset_returns, market_returns)
+    if len(asset) < 2:
         return 1.0
-
-    return covariance / market_variance
+    return compute_benchmark_metrics(asset, market)['beta']
 
 
 def calculate_alpha(asset_returns, market_returns, risk_free_rate=0.02):
 
-    asset_clean = asset_returns.dropna()
-    market_clean = market_returns.dropna()
-
-    if len(asset_clean) < 2 or len(market_clean) < 2:
+    asset, market = _align_by_date(asset_returns, market_returns)
+    if len(asset) < 2:
         return 0.0
-
-    beta = calculate_beta(asset_returns, market_returns)
-
-    # Calcul des rendements annualisés
-    asset_cumulative = (1 + asset_clean).prod() - 1
-    market_cumulative = (1 + market_clean).prod() - 1
-
-    n_days_asset = len(asset_clean)
-    n_days_market = len(market_clean)
-
-    asset_return_annual = (1 + asset_cumulative) ** (252 / n_days_asset) - 1
-    market_return_annual = (1 + market_cumulative) ** (252 / n_days_market) - 1
-
-    # Rendement attendu selon le CAPM
-    expected_return = risk_free_rate + beta * (market_return_annual - risk_free_rate)
-
-    # Alpha = Rendement réel - Rendement attendu
-    alpha = asset_return_annual - expected_return
-
-    return alpha * 100
+    return compute_benchmark_metrics(asset, market, risk_free_rate)['alpha']
 
 
 def calculate_information_ratio(asset_returns, benchmark_returns):
 
-    # Reset index pour aligner par position si les dates ne matchent pas
-    asset_vals = asset_returns.reset_index(drop=True)
-    benchmark_vals = benchmark_returns.reset_index(drop=True)
-
-    # Prendre la longueur minimale
-    min_len = min(len(asset_vals), len(benchmark_vals))
-    if min_len < 2:
+    asset, benchmark = _align_by_date(asset_returns, benchmark_returns)
+    if len(asset) < 2:
         return 0
+    return compute_benchmark_metrics(asset, benchmark)['information_ratio']
 
-    asset_vals = asset_vals[:min_len]
-    benchmark_vals = benchmark_vals[:min_len]
-
-    excess_returns = asset_vals - benchmark_vals
-    tracking_error = excess_returns.std()
 
-    if tracking_error == 0:
-        return 0
-
-    return (excess_returns.mean() / tracking_error) * np.sqrt(252)
+def _align_by_date(asset_returns, benchmark_returns):
+    # Dates communes aux deux séries (les séries d'historiques différents ne sont pas alignées par position)
+    if asset_returns.index.equals(benchmark_returns.index):
+        asset = asset_returns.to_numpy(dtype=np.float64)
+        benchmark = benchmark_returns.to_numpy(dtype=np.float64)
+    else:
+        combined = pd.concat([asset_returns, benchmark_returns], axis=1, join='inner').to_numpy(dtype=np.float64)
+        asset, benchmark = combined[:, 0], combined[:, 1]
+    valid = ~(np.isnan(asset) | np.isnan(benchmark))
+    return asset[valid], benchmark[valid]
 
 
 def calculate_skewness(returns):
@@ -188,3 +155,160 @@ def calculate_win_loss_ratio(returns):
         return float('inf') if avg_win > 0 else 0
 
     return avg_win / avg_loss
+
+
+def compute_all_metrics(returns, benchmark=None, max_drawdown=None, risk_free_rate=0.02, confidence_level=0.95):
+    """
+    Toutes les métriques de ce module en une passe, sur un tableau NumPy
+
+    returns: array (T,) ou (T, K) - une série par colonne, sans NaN
+    benchmark: array de même forme (ou (T,)), aligné par date - ajoute beta, alpha, information_ratio
+    max_drawdown: drawdown (en %) utilisé pour le Calmar; par défaut celui du cumul des rendements
+
+    Un seul tri par colonne sert au VaR, CVaR et tail ratio; les sommes préfixes du tableau trié
+    donnent Sortino, Omega, hit ratio et win/loss sans re-masquer la série.
+    Retourne des floats pour une entrée 1-D, des arrays (K,) pour une entrée 2-D.
+    """
+    R = np.asarray(returns, dtype=np.float64)
+    single = R.ndim == 1
+    if single:
+        R = R[:, None]
+    n, k = R.shape
+    cols = np.arange(k)
+
+    ordered = np.sort(R, axis=0)
+    prefix = np.zeros((n + 1, k))
+    np.cumsum(ordered, axis=0, out=prefix[1:])
+    prefix_sq = np.zeros((n + 1, k))
+    np.cumsum(ordered ** 2, axis=0, out=prefix_sq[1:])
+    total = prefix[-1]
+
+    n_neg = (ordered < 0).sum(axis=0)
+    n_nonpos = (ordered <= 0).sum(axis=0)
+    n_pos = n - n_nonpos
+    neg_sum = prefix[n_neg, cols]
+    pos_sum = total - prefix[n_nonpos, cols]
+
+    # VaR / CVaR / tail ratio: percentiles interpolés sur le tableau trié (même méthode que np.percentile)
+    var_threshold = _sorted_percentile(ordered, (1 - confidence_level) * 100)
+    n_tail = (ordered <= var_threshold).sum(axis=0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        cvar = prefix[n_tail, cols] / n_tail * 100
+        right_tail = np.abs(_sorted_percentile(ordered, 95))
+        left_tail = np.abs(_sorted_percentile(ordered, 5))
+        tail_ratio = np.where(left_tail == 0, np.where(right_tail > 0, np.inf, 1.0), right_tail / left_tail)
+
+    # Moments centrés (skewness / kurtosis biaisés comme scipy.stats)
+    mean = total / n
+    deviations = R - mean
+    m2 = np.mean(deviations ** 2, axis=0)
+    m3 = np.mean(deviations ** 3, axis=0)
+    m4 = np.mean(deviations ** 4, axis=0)
+    std = np.sqrt(m2 * n / (n - 1)) if n > 1 else np.full(k, np.nan)
+
+    daily_rf = risk_free_rate / 252
+    with np.errstate(invalid='ignore', divide='ignore'):
+        skewness = np.where(m2 > 0, m3 / m2 ** 1.5, np.nan)
+        kurtosis = np.where(m2 > 0, m4 / m2 ** 2 - 3, np.nan)
+        sharpe_ratio = np.where(std != 0, (mean - daily_rf) / std * np.sqrt(252), 0.0)
+
+        # Sortino: downside deviation = racine de la moyenne des rendements négatifs au carré (MAR = 0)
+        downside_deviation = np.sqrt(prefix_sq[n_neg, cols] / n)
+        sortino_ratio = np.where(downside_deviation != 0, (mean - daily_rf) / downside_deviation * np.sqrt(252), 0.0)
+
+        losses = -neg_sum
+        omega_ratio = np.where(losses != 0, pos_sum / losses, np.where(pos_sum > 0, np.inf, 0.0))
+
+        hit_ratio = n_pos / n * 100
+
+        avg_win = np.where(n_pos > 0, pos_sum / n_pos, 0.0)
+        avg_loss = np.abs(neg_sum / n_neg)
+        win_loss_ratio = np.where(
+            (n_neg > 0) & (avg_loss != 0), avg_win / avg_loss, np.where(avg_win > 0, np.inf, 0.0)
+        )
+
+    # Drawdown et Calmar sur le rendement composé
+    growth = np.cumprod(1 + R, axis=0)
+    if max_drawdown is None:
+        running_max = np.maximum.accumulate(growth, axis=0)
+        max_drawdown = ((growth - running_max) / running_max).min(axis=0) * 100
+    max_drawdown = np.broadcast_to(np.asarray(max_drawdown, dtype=np.float64), (k,))
+    cagr = growth[-1] ** (252 / n) - 1
+    with np.errstate(invalid='ignore', divide='ignore'):
+        calmar_ratio = np.where(np.abs(max_drawdown) > 0.01, cagr * 100 / np.abs(max_drawdown), 0.0)
+
+    metrics = {
+        'annual_return': mean * 252 * 100,
+        'volatility': std * np.sqrt(252) * 100,
+        'sharpe_ratio': sharpe_ratio,
+        'sortino_ratio': sortino_ratio,
+        'calmar_ratio': calmar_ratio,
+        'max_drawdown': max_drawdown,
+        'var': var_threshold * 100,
+        'cvar': cvar,
+        'omega_ratio': omega_ratio,
+        'skewness': skewness,
+        'kurtosis': kurtosis,
+        'tail_ratio': tail_ratio,
+        'hit_ratio': hit_ratio,
+        'win_loss_ratio': win_loss_ratio,
+    }
+
+    if benchmark is not None:
+        metrics.update(compute_benchmark_metrics(R, benchmark, risk_free_rate))
+
+    if single:
+        return {name: float(np.asarray(value).reshape(-1)[0]) for name, value in metrics.items()}
+    return {name: np.array(value) for name, value in metrics.items()}
+
+
+def compute_benchmark_metrics(returns, benchmark, risk_free_rate=0.02):
+    """
+    Beta, alpha (CAPM annualisé) et information ratio de chaque colonne vs le benchmark
+
+    Utilisé par calculate_beta / calculate_alpha / calculate_information_ratio, pour des séries déjà
+    alignées par date (sans NaN). Plusieurs facteurs à la fois: voir factor_model.
+    """
+    R = np.asarray(returns, dtype=np.float64)
+    B = np.asarray(benchmark, dtype=np.float64)
+    single = R.ndim == 1
+    if single:
+        R = R[:, None]
+    if B.ndim == 1:
+        B = B[:, None]
+    n = R.shape[0]
+
+    if n < 2:
+        values = {'beta': 1.0, 'alpha': 0.0, 'information_ratio': 0.0}
+        return values if single else {name: np.full(R.shape[1], v) for name, v in values.items()}
+
+    r_dev = R - R.mean(axis=0)
+    b_dev = B - B.mean(axis=0)
+    covariance = (r_dev * b_dev).sum(axis=0) / (n - 1)
+    market_variance = (b_dev ** 2).sum(axis=0) / (n - 1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        beta = np.where(market_variance != 0, covariance / market_variance, 1.0)
+
+    asset_annual = np.prod(1 + R, axis=0) ** (252 / n) - 1
+    market_annual = np.prod(1 + B, axis=0) ** (252 / n) - 1
+    alpha = (asset_annual - (risk_free_rate + beta * (market_annual - risk_free_rate))) * 100
+
+    excess = R - B
+    tracking_error = excess.std(axis=0, ddof=1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        information_ratio = np.where(tracking_error != 0, excess.mean(axis=0) / tracking_error * np.sqrt(252), 0.0)
+
+    metrics = {'beta': beta, 'alpha': alpha, 'information_ratio': information_ratio}
+    if single:
+        return {name: float(value[0]) for name, value in metrics.items()}
+    return metrics
+
+
+def _sorted_percentile(ordered, q):
+    # Interpolation linéaire de np.percentile, appliquée à un tableau déjà trié par colonne
+    n = ordered.shape[0]
+    position = (n - 1) * (q / 100)
+    low = int(np.floor(position))
+    high = min(low + 1, n - 1)
+    fraction = position - low
+    return ordered[low] + (ordered[high] - ordered[low]) * fraction
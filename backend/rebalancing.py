@@ -0,0 +1,150 @@
+"""
+Rebalancing - simulation vectorisée d'un portefeuille rééquilibré
+Utilisé par Quant B: valeur du portefeuille, dates de rééquilibrage, turnover et coûts de transaction.
+
+- Entre deux rééquilibrages les quantités détenues sont fixes: la valeur de chaque segment est
+  un produit de ratios de prix (pas de boucle Python jour par jour)
+- Calendrier: daily / weekly / monthly / quarterly (première barre de chaque période), ou none
+- Bande de tolérance (threshold): rééquilibrage dès qu'un poids dérive de plus de `threshold`
+- Coûts proportionnels au montant échangé (en points de base), déduits à chaque rééquilibrage
+"""
+
+import numpy as np
+
+SCHEDULES = ('none', 'daily', 'weekly', 'monthly', 'quarterly', 'threshold')
+DEFAULT_THRESHOLD = 0.05
+DEFAULT_COST_BPS = 0.0
+TRADING_DAYS = 252
+
+_NS_PER_DAY = 86_400 * 10**9
+_SEARCH_BLOCK = 32
+
+
+def validate(schedule, threshold=DEFAULT_THRESHOLD, cost_bps=DEFAULT_COST_BPS):
+    """Vérifie les paramètres de rééquilibrage (ValueError sinon)"""
+    if schedule not in SCHEDULES:
+        raise ValueError(f"Fréquence de rééquilibrage inconnue: {schedule} ({', '.join(SCHEDULES)})")
+    if not 0 < threshold < 1:
+        raise ValueError('rebalance_threshold doit être compris entre 0 et 1')
+    if not 0 <= cost_bps < 10_000:
+        raise ValueError('transaction_cost_bps doit être compris entre 0 et 10000')
+
+
+def calendar_rebalances(dates, schedule):
+    """
+    Indices des barres où le portefeuille est rééquilibré (première barre de chaque période)
+
+    Args:
+        dates: datetime64 locales (heure de la place de cotation), une par barre
+    """
+    n = len(dates)
+    if schedule == 'none' or n < 2:
+        return np.empty(0, dtype=np.int64)
+    if schedule == 'daily':
+        keys = np.asarray(dates, dtype='datetime64[ns]').astype(np.int64) // _NS_PER_DAY
+    elif schedule == 'weekly':
+        # Semaines commençant le lundi (le 1970-01-01 était un jeudi)
+        keys = (np.asarray(dates, dtype='datetime64[D]').astype(np.int64) + 3) // 7
+    else:
+        months = np.asarray(dates, dtype='datetime64[M]').astype(np.int64)
+        keys = months if schedule == 'monthly' else months // 3
+    return np.flatnonzero(np.diff(keys) != 0) + 1
+
+
+def _threshold_rebalances(prices, weights, threshold):
+    # Dépend du chemin: chaque segment cherche la première barre hors bande, par blocs croissants
+    n = len(prices)
+    rebalances = []
+    start = 0
+    while start < n - 1:
+        found = None
+        lo, block = start + 1, _SEARCH_BLOCK
+        while lo < n and found is None:
+            hi = min(lo + block, n)
+            drifted = weights * (prices[lo:hi] / prices[start])
+            drifted /= drifted.sum(axis=1, keepdims=True)
+            breach = np.flatnonzero(np.abs(drifted - weights).max(axis=1) > threshold)
+            if len(breach):
+                found = lo + int(breach[0])
+            lo, block = hi, block * 2
+        if found is None:
+            break
+        rebalances.append(found)
+        start = found
+    return np.asarray(rebalances, dtype=np.int64)
+
+
+def simulate(prices, weights, schedule='monthly', dates=None, threshold=DEFAULT_THRESHOLD,
+             cost_bps=DEFAULT_COST_BPS):
+    """
+    Valeur d'un portefeuille investi aux poids cibles à la première barre puis rééquilibré
+
+    Args:
+        prices: (T, N) prix de clôture alignés
+        weights: (N,) poids cibles (normalisés ici)
+        dates: (T,) datetime64 locales, requises pour les calendriers weekly / monthly / quarterly
+
+    Returns:
+        dict: values (T,) partant de 1, rebalances (indices), traded (fraction échangée à chaque
+        rééquilibrage), costs (fraction de la valeur perdue à chaque rééquilibrage), final_weights
+    """
+    validate(schedule, threshold, cost_bps)
+    prices = np.asarray(prices, dtype=np.float64)
+    weights = np.asarray(weights, dtype=np.float64)
+    weights = weights / weights.sum()
+    n = len(prices)
+
+    if schedule == 'threshold':
+        rebalances = _threshold_rebalances(prices, weights, threshold)
+    elif schedule == 'none':
+        rebalances = np.empty(0, dtype=np.int64)
+    elif dates is not None:
+        rebalances = calendar_rebalances(dates, schedule)
+    elif schedule == 'daily':
+        rebalances = np.arange(1, n)
+    else:
+        raise ValueError(f'Dates requises pour le rééquilibrage {schedule}')
+
+    # Barre de référence de chaque barre: début du segment (rééquilibrage) qui la précède strictement
+    starts = np.concatenate([[0], rebalances])
+    base = starts[np.searchsorted(starts, np.arange(n), side='left') - 1]
+    base[0] = 0
+
+    # Croissance de chaque barre depuis le début de son segment, à quantités fixes
+    relative = prices / prices[base]
+    growth = relative @ weights
+
+    # Rééquilibrage: poids dérivés -> poids cibles, coût sur le montant échangé
+    drifted = weights * relative[rebalances] / growth[rebalances, None]
+    traded = np.abs(drifted - weights).sum(axis=1)
+    costs = traded * cost_bps / 10_000
+
+    # Valeur au début de chaque segment: produit cumulé des croissances de segment, nettes de coûts
+    segment_values = np.concatenate([[1.0], np.cumprod(growth[rebalances] * (1 - costs))])
+    values = segment_values[np.searchsorted(starts, base)] * growth
+
+    # Après rééquilibrage la barre vaut la valeur nette de coûts
+    values[rebalances] = segment_values[1:]
+
+    last = relative[-1] * weights
+    final_weights = weights if len(rebalances) and rebalances[-1] == n - 1 else last / last.sum()
+    return {
+        'values': values,
+        'rebalances': rebalances,
+        'traded': traded,
+        'costs': costs,
+        'final_weights': final_weights,
+    }
+
+
+def turnover_summary(result, periods_per_year=TRADING_DAYS):
+    """Nombre de rééquilibrages, turnover (aller simple) total et annualisé, coûts cumulés (en %)"""
+    traded, costs = result['traded'], result['costs']
+    years = max(len(result['values']) - 1, 1) / periods_per_year
+    turnover = traded.sum() / 2
+    return {
+        'rebalances': int(len(result['rebalances'])),
+        'turnover': turnover * 100,
+        'annual_turnover': turnover / years * 100,
+        'transaction_costs': (1 - np.prod(1 - costs)) * 100,
+    }
@@ -0,0 +1,69 @@
+"""
+Response Cache - cache LRU de réponses sérialisées, borné en mémoire
+Utilisé devant /api/portfolio: une clé canonique (spec du portefeuille + version des données)
+donne directement le JSON à renvoyer et son ETag.
+"""
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+def canonical_key(*parts):
+    """Hash stable d'une structure JSON-sérialisable (ordre des clés normalisé)"""
+    payload = json.dumps(parts, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class ResponseCache:
+    """LRU clé -> (corps, ETag), évince les entrées les plus anciennes au-delà de max_bytes"""
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0, 'not_modified': 0, 'evictions': 0}
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.stats['misses'] += 1
+                return None
+            self._entries.move_to_end(key)
+            self.stats['hits'] += 1
+            return entry
+
+    def put(self, key, body, etag):
+        size = len(body)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= len(previous[0])
+            self._entries[key] = (body, etag)
+            self._size += size
+            while self._size > self.max_bytes:
+                _, (old_body, _) = self._entries.popitem(last=False)
+                self._size -= len(old_body)
+                self.stats['evictions'] += 1
+
+    def record_not_modified(self):
+        with self._lock:
+            self.stats['not_modified'] += 1
+
+    def snapshot(self):
+        with self._lock:
+            lookups = self.stats['hits'] + self.stats['misses']
+            return {
+                **self.stats,
+                'hit_rate': self.stats['hits'] / lookups if lookups else 0.0,
+                'entries': len(self._entries),
+                'bytes': self._size,
+                'max_bytes': self.max_bytes,
+            }
@@ -0,0 +1,228 @@
+"""
+Risk Engine - VaR / CVaR par simulation et scénarios forward
+Utilisé par Quant B pour une vue de risque plus robuste que le simple percentile historique.
+
+- Méthodes: parametric (formule fermée), bootstrap (blocs circulaires de rendements historiques),
+  normal et student-t (Monte Carlo multivarié corrélé, antithétique, actifs composés sur l'horizon)
+- Génération par blocs de trajectoires (mémoire bornée), un germe dérivé par bloc:
+  résultats reproductibles quel que soit le nombre de shards
+- Shards optionnels exécutés en parallèle dans le ComputeExecutor (processus)
+- Intervalles de confiance sur VaR (statistiques d'ordre) et CVaR (erreur standard de la moyenne de queue)
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from lazy_import import LazyModule
+
+stats = LazyModule('scipy.stats')  # importé à la première simulation
+
+METHODS = ('parametric', 'bootstrap', 'normal', 'student-t')
+DEFAULT_PATHS = 100_000
+MAX_PATHS = 2_000_000
+DEFAULT_HORIZON = 10  # jours de bourse
+DEFAULT_CONFIDENCE = (0.95, 0.99)
+DEFAULT_BLOCK_SIZE = 5
+MAX_BLOCK_SIZE = 252
+DEFAULT_DOF = 5
+DEFAULT_SEED = 42
+MAX_CHUNK_ELEMENTS = 1_000_000  # tirages (trajectoires x jours x actifs) par bloc, ~8 Mo par tableau
+MIN_SHARD_PATHS = 50_000
+FAN_PATHS = 10_000
+FAN_PERCENTILES = (5, 25, 50, 75, 95)
+HISTOGRAM_BINS = 50
+
+_Z_BAND = 1.959963984540054  # stats.norm.ppf(0.975)
+
+
+def validate(method, horizon, paths, confidence, block_size=DEFAULT_BLOCK_SIZE, dof=DEFAULT_DOF):
+    """Vérifie les paramètres de simulation (ValueError sinon)"""
+    if method not in METHODS:
+        raise ValueError(f"Méthode inconnue: {method} ({', '.join(METHODS)})")
+    if not 1 <= horizon <= 252:
+        raise ValueError('horizon doit être compris entre 1 et 252 jours')
+    if not 1_000 <= paths <= MAX_PATHS:
+        raise ValueError(f'paths doit être compris entre 1000 et {MAX_PATHS}')
+    if not all(0.5 < level < 1 for level in confidence):
+        raise ValueError('Les niveaux de confiance doivent être compris entre 0.5 et 1')
+    if not 1 <= block_size <= MAX_BLOCK_SIZE:
+        raise ValueError(f'block_size doit être compris entre 1 et {MAX_BLOCK_SIZE} jours')
+    # Student-t: variance finie seulement au-delà de 2 degrés de liberté
+    if not 2 < dof < np.inf:
+        raise ValueError('dof doit être > 2 (degrés de liberté de la loi de Student)')
+
+
+def chunk_size(horizon, n_assets, paths):
+    """Trajectoires par bloc: fonction de la seule requête, pour que le découpage reste reproductible"""
+    return int(max(1, min(paths, MAX_CHUNK_ELEMENTS // (horizon * n_assets))))
+
+
+# ============================================================================
+# SIMULATION
+# ============================================================================
+
+def _chunk_paths(returns, weights, method, horizon, size, rng, block_size, dof, mu, chol):
+    """Rendements cumulés du portefeuille (size, horizon), buy-and-hold sur l'horizon"""
+    n_obs, n_assets = returns.shape
+
+    if method == 'bootstrap':
+        # Blocs circulaires de jours consécutifs: conserve l'autocorrélation et la dépendance entre actifs
+        n_blocks = -(-horizon // block_size)
+        starts = rng.integers(0, n_obs, (size, n_blocks, 1))
+        rows = ((starts + np.arange(block_size)) % n_obs).reshape(size, -1)[:, :horizon]
+        daily = returns[rows]
+    else:
+        # Variables antithétiques: chaque tirage z est aussi utilisé en -z (moitié moins de tirages, variance réduite)
+        half = -(-size // 2)
+        shocks = rng.standard_normal((half, horizon, n_assets)) @ chol.T
+        daily = np.concatenate([shocks, -shocks])[:size]
+        if method == 'student-t':
+            # t multivarié: même facteur d'échelle pour tous les actifs d'un jour, variance inchangée
+            scale = np.sqrt((dof - 2) / rng.chisquare(dof, (half, horizon, 1)))
+            daily *= np.concatenate([scale, scale])[:size]
+        daily += mu
+
+    # En place: un seul tableau (size, horizon, N) vivant par bloc
+    daily += 1
+    np.cumprod(daily, axis=1, out=daily)
+    return daily @ weights - 1
+
+
+def simulate_shard(returns, weights, method, horizon, paths, size, chunk_ids, seed=DEFAULT_SEED,
+                   block_size=DEFAULT_BLOCK_SIZE, dof=DEFAULT_DOF):
+    """
+    Simule les blocs chunk_ids de `size` trajectoires (exécutable dans un worker du ComputeExecutor)
+
+    Returns:
+        dict: terminal (rendements à l'horizon des trajectoires du shard),
+        fan (premières trajectoires complètes, pour les scénarios)
+    """
+    returns = np.asarray(returns, dtype=np.float64)
+    weights = np.asarray(weights, dtype=np.float64)
+    seeds = np.random.SeedSequence(seed).spawn(-(-paths // size))
+
+    mu = returns.mean(axis=0)
+    cov = np.cov(returns, rowvar=False).reshape(len(weights), len(weights))
+    # Jitter minimal si la covariance est singulière (actifs dupliqués)
+    chol = np.linalg.cholesky(cov + np.eye(len(cov)) * 1e-12 * np.trace(cov))
+
+    terminal, fan = [], []
+    for chunk in chunk_ids:
+        rng = np.random.default_rng(seeds[chunk])
+        count = min(size, paths - chunk * size)
+        cumulative = _chunk_paths(returns, weights, method, horizon, count, rng, block_size, dof, mu, chol)
+        terminal.append(cumulative[:, -1])
+        if chunk * size < FAN_PATHS:
+            fan.append(cumulative[:FAN_PATHS - chunk * size])
+    return {
+        'terminal': np.concatenate(terminal) if terminal else np.empty(0),
+        'fan': np.concatenate(fan) if fan else np.empty((0, horizon)),
+    }
+
+
+def _sharded(returns, weights, method, horizon, paths, seed, block_size, dof, executor):
+    size = chunk_size(horizon, returns.shape[1], paths)
+    n_chunks = -(-paths // size)
+    workers = getattr(executor, 'max_workers', 0) if executor is not None else 0
+    n_shards = max(1, min(workers, n_chunks, paths // MIN_SHARD_PATHS))
+    # Plages contiguës de blocs: la concaténation des shards redonne l'ordre des blocs
+    shards = [ids.tolist() for ids in np.array_split(np.arange(n_chunks), n_shards)]
+    params = {'method': method, 'horizon': horizon, 'paths': paths, 'size': size, 'seed': seed,
+              'block_size': block_size, 'dof': dof}
+    arrays = {'returns': returns, 'weights': weights}
+
+    if not workers:
+        parts = [simulate_shard(**arrays, chunk_ids=shards[0], **params)]
+    elif n_shards == 1:
+        parts = [executor.run(simulate_shard, arrays, chunk_ids=shards[0], **params)]
+    else:
+        with ThreadPoolExecutor(max_workers=n_shards) as pool:
+            parts = list(pool.map(lambda ids: executor.run(simulate_shard, arrays, chunk_ids=ids, **params), shards))
+
+    terminal = np.concatenate([part['terminal'] for part in parts])
+    fan = np.concatenate([part['fan'] for part in parts])[:FAN_PATHS]
+    return terminal, fan, n_shards
+
+
+# ============================================================================
+# STATISTIQUES
+# ============================================================================
+
+def tail_statistics(sample, level):
+    """VaR et CVaR (rendements, négatifs = pertes) avec intervalles de confiance à 95%"""
+    ordered = np.sort(sample)
+    n = len(ordered)
+    alpha = 1 - level
+    k = int(np.floor(alpha * n))
+    var = ordered[max(k - 1, 0)]
+
+    # Statistiques d'ordre: rang de l'alpha-quantile ~ Binomiale(n, alpha)
+    spread = _Z_BAND * np.sqrt(n * alpha * (1 - alpha))
+    var_band = [ordered[max(int(np.floor(k - spread)) - 1, 0)], ordered[min(int(np.ceil(k + spread)) - 1, n - 1)]]
+
+    tail = ordered[:max(k, 1)]
+    cvar = tail.mean()
+    error = _Z_BAND * tail.std(ddof=1) / np.sqrt(len(tail)) if len(tail) > 1 else 0.0
+    return {'var': var, 'cvar': cvar, 'var_band': var_band, 'cvar_band': [cvar - error, cvar + error]}
+
+
+def _parametric(returns, weights, horizon, confidence):
+    # Normale sur le rendement du portefeuille (rééquilibré quotidiennement), erreur d'estimation de mu et sigma
+    portfolio = returns @ weights
+    n = len(portfolio)
+    mu, sigma = portfolio.mean() * horizon, portfolio.std(ddof=1) * np.sqrt(horizon)
+    levels = {}
+    for level in confidence:
+        z = stats.norm.ppf(1 - level)
+        var = mu + z * sigma
+        cvar = mu - sigma * stats.norm.pdf(z) / (1 - level)
+        var_error = _Z_BAND * sigma * np.sqrt((horizon + z ** 2 / 2) / n)
+        cvar_error = _Z_BAND * sigma * np.sqrt((horizon + (cvar - mu) ** 2 / sigma ** 2 / 2) / n)
+        levels[level] = {'var': var, 'cvar': cvar, 'var_band': [var - var_error, var + var_error],
+                         'cvar_band': [cvar - cvar_error, cvar + cvar_error]}
+    days = np.arange(1, horizon + 1)
+    fan = {p: portfolio.mean() * days + stats.norm.ppf(p / 100) * portfolio.std(ddof=1) * np.sqrt(days)
+           for p in FAN_PERCENTILES}
+    return mu, sigma, levels, fan
+
+
+def simulate(returns, weights, method='bootstrap', horizon=DEFAULT_HORIZON, paths=DEFAULT_PATHS,
+             confidence=DEFAULT_CONFIDENCE, seed=DEFAULT_SEED, block_size=DEFAULT_BLOCK_SIZE, dof=DEFAULT_DOF,
+             executor=None):
+    """
+    Distribution du rendement du portefeuille à `horizon` jours
+
+    Args:
+        returns: (T, N) rendements journaliers historiques des actifs
+        weights: (N,) poids (normalisés ici)
+        executor: ComputeExecutor optionnel pour répartir les trajectoires entre processus
+
+    Returns:
+        dict: expected_return, volatility, levels {niveau: var, cvar, bandes}, histogram, fan (percentiles
+        du rendement cumulé par jour), shards (en fractions, pas en %)
+    """
+    validate(method, horizon, paths, confidence, block_size, dof)
+    returns = np.asarray(returns, dtype=np.float64)
+    weights = np.asarray(weights, dtype=np.float64)
+    weights = weights / weights.sum()
+    if len(returns) < 2 * max(block_size, 2):
+        raise ValueError('Historique trop court pour simuler le risque')
+
+    if method == 'parametric':
+        mu, sigma, levels, fan = _parametric(returns, weights, horizon, confidence)
+        return {'expected_return': mu, 'volatility': sigma, 'levels': levels, 'histogram': None,
+                'fan': fan, 'paths': 0, 'shards': 0}
+
+    terminal, paths_sample, n_shards = _sharded(returns, weights, method, horizon, paths, seed, block_size, dof,
+                                                executor)
+    counts, edges = np.histogram(terminal, bins=HISTOGRAM_BINS)
+    return {
+        'expected_return': terminal.mean(),
+        'volatility': terminal.std(ddof=1),
+        'levels': {level: tail_statistics(terminal, level) for level in confidence},
+        'histogram': {'edges': edges, 'counts': counts},
+        'fan': dict(zip(FAN_PERCENTILES, np.percentile(paths_sample, FAN_PERCENTILES, axis=0))),
+        'paths': len(terminal),
+        'shards': n_shards,
+    }
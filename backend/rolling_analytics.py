@@ -0,0 +1,191 @@
+"""
+Rolling Analytics - Sharpe, volatilité, beta et corrélations glissants du portefeuille
+Utilisé par Quant B (/api/portfolio/rolling) en complément des métriques sur toute la période.
+
+- Sommes glissantes par différence de sommes cumulées: O(n) par taille de fenêtre, quelle que soit sa longueur
+- Séries centrées sur leur moyenne avant cumul (variance et covariance invariantes, moins d'annulation)
+- Corrélations N x N: une série par paire (triangle supérieur), produits croisés calculés par blocs de
+  paires à mémoire bornée, jamais une matrice par date
+- Même convention que Quant B: écart-type ddof=1, taux sans risque 2% annuel, annualisation sur 252 barres
+"""
+
+import numpy as np
+
+DEFAULT_WINDOWS = (20, 60, 120)
+MAX_WINDOWS = 6
+MAX_WINDOW = 1260
+RISK_FREE_RATE = 0.02
+PERIODS_PER_YEAR = 252
+MAX_CHUNK_ELEMENTS = 2_000_000  # barres x paires par bloc de produits croisés, ~16 Mo
+
+
+def validate(windows):
+    """Vérifie les tailles de fenêtre (ValueError sinon)"""
+    if not 1 <= len(windows) <= MAX_WINDOWS:
+        raise ValueError(f'Entre 1 et {MAX_WINDOWS} fenêtres')
+    if not all(2 <= window <= MAX_WINDOW for window in windows):
+        raise ValueError(f'Les fenêtres doivent être comprises entre 2 et {MAX_WINDOW} barres')
+
+
+def all_pairs(n):
+    """Indices (i, j), i < j, des paires d'actifs dans l'ordre du triangle supérieur"""
+    return np.triu_indices(n, k=1)
+
+
+# ============================================================================
+# SOMMES GLISSANTES
+# ============================================================================
+
+def cumulative(x):
+    """Sommes cumulées avec une ligne de zéros en tête: la fenêtre [a, b) vaut c[b] - c[a]"""
+    x = np.asarray(x, dtype=np.float64)
+    c = np.empty((len(x) + 1,) + x.shape[1:])
+    c[0] = 0.0
+    np.cumsum(x, axis=0, out=c[1:])
+    return c
+
+
+def window_sums(c, window):
+    """Sommes des fenêtres de `window` barres finissant à chaque barre t >= window - 1: (n - window + 1, ...)"""
+    return c[window:] - c[:-window]
+
+
+def rolling_sum(x, window):
+    return window_sums(cumulative(x), window)
+
+
+class _Moments:
+    """Sommes cumulées (centrées) d'une ou plusieurs séries, partagées par toutes les tailles de fenêtre"""
+
+    def __init__(self, x):
+        x = np.asarray(x, dtype=np.float64)
+        self.center = x.mean(axis=0)
+        self.centered = x - self.center
+        self.c1 = cumulative(self.centered)
+        self.c2 = cumulative(self.centered * self.centered)
+
+    def sums(self, window):
+        return window_sums(self.c1, window)
+
+    def sum_squares(self, window):
+        # Somme des carrés des écarts à la moyenne de la fenêtre
+        s1 = self.sums(window)
+        return np.maximum(window_sums(self.c2, window) - s1 * s1 / window, 0.0)
+
+    def mean_std(self, window):
+        return self.center + self.sums(window) / window, np.sqrt(self.sum_squares(window) / (window - 1))
+
+
+def rolling_mean_std(x, window):
+    """Moyenne et écart-type (ddof=1) glissants de chaque colonne"""
+    return _Moments(x).mean_std(window)
+
+
+# ============================================================================
+# MÉTRIQUES GLISSANTES
+# ============================================================================
+
+def rolling_sharpe(mean, std, risk_free_rate=RISK_FREE_RATE):
+    """Sharpe annualisé à partir des moyennes / écarts-types glissants (NaN si écart-type nul)"""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        sharpe = (mean - risk_free_rate / PERIODS_PER_YEAR) / std * np.sqrt(PERIODS_PER_YEAR)
+    return np.where(std > 0, sharpe, np.nan)
+
+
+def rolling_volatility(std):
+    """Volatilité annualisée en %"""
+    return std * np.sqrt(PERIODS_PER_YEAR) * 100
+
+
+def rolling_beta(returns, benchmark, windows):
+    """Beta glissant cov(r, b) / var(b) pour chaque fenêtre: dict fenêtre -> (n - fenêtre + 1,)"""
+    r, b = _Moments(returns), _Moments(benchmark)
+    cross = cumulative(r.centered * b.centered)
+    betas = {}
+    for window in windows:
+        covariance = window_sums(cross, window) - r.sums(window) * b.sums(window) / window
+        variance = b.sum_squares(window)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            betas[window] = np.where(variance > 0, covariance / variance, np.nan)
+    return betas
+
+
+def rolling_correlation(returns, windows, pairs=None, chunk_elements=MAX_CHUNK_ELEMENTS):
+    """
+    Corrélations glissantes par paire d'actifs
+
+    Les produits croisés d'un bloc de paires sont cumulés une fois, puis différenciés pour chaque fenêtre.
+
+    Args:
+        returns: (n, N) rendements alignés
+        windows: tailles de fenêtre
+        pairs: (i, j) tableaux d'indices de colonnes (défaut: toutes les paires i < j)
+
+    Returns:
+        dict fenêtre -> (n - fenêtre + 1, P) corrélations, une colonne par paire
+    """
+    moments = _Moments(returns)
+    first, second = all_pairs(moments.centered.shape[1]) if pairs is None else (np.asarray(pairs[0]),
+                                                                                np.asarray(pairs[1]))
+    n = len(moments.centered)
+    out = {window: np.empty((n - window + 1, len(first))) for window in windows}
+    # Par actif: sommes et normes de chaque fenêtre, partagées par toutes ses paires
+    sums = {window: moments.sums(window) for window in windows}
+    norms = {window: np.sqrt(moments.sum_squares(window)) for window in windows}
+
+    step = max(1, chunk_elements // max(n, 1))
+    for start in range(0, len(first), step):
+        i, j = first[start:start + step], second[start:start + step]
+        cross = cumulative(moments.centered[:, i] * moments.centered[:, j])
+        for window in windows:
+            covariance = window_sums(cross, window) - sums[window][:, i] * sums[window][:, j] / window
+            denominator = norms[window][:, i] * norms[window][:, j]
+            with np.errstate(divide='ignore', invalid='ignore'):
+                out[window][:, start:start + step] = np.where(denominator > 0, covariance / denominator, np.nan)
+    for correlation in out.values():
+        np.clip(correlation, -1.0, 1.0, out=correlation)
+    return out
+
+
+def compute(portfolio_returns, asset_returns, windows=DEFAULT_WINDOWS, benchmark_returns=None, pairs=None):
+    """
+    Toutes les séries glissantes pour chaque taille de fenêtre
+
+    Args:
+        portfolio_returns: (n,) rendements du portefeuille
+        asset_returns: (n, N) rendements des actifs, alignés
+        benchmark_returns: (n,) rendements du benchmark alignés, ou None
+        pairs: (i, j) paires de colonnes renvoyées dans 'correlation' (défaut: toutes)
+
+    Returns:
+        dict fenêtre -> {'sharpe', 'volatility', 'beta'?, 'correlation' (m, P), 'average_correlation'}
+        séries de longueur m = n - fenêtre + 1 (la valeur k couvre les barres k .. k + fenêtre - 1);
+        fenêtres plus longues que l'historique absentes. average_correlation porte sur toutes les paires.
+    """
+    portfolio = _Moments(portfolio_returns)
+    windows = [window for window in windows if window <= len(portfolio.centered)]
+    correlations = rolling_correlation(asset_returns, windows)
+    betas = rolling_beta(portfolio_returns, benchmark_returns, windows) if benchmark_returns is not None else {}
+    selected = None
+    if pairs is not None:
+        # Index des paires demandées dans l'ordre du triangle supérieur
+        n_assets = np.asarray(asset_returns).shape[1]
+        i, j = np.minimum(pairs[0], pairs[1]), np.maximum(pairs[0], pairs[1])
+        selected = i * n_assets - i * (i + 1) // 2 + (j - i - 1)
+
+    results = {}
+    for window in windows:
+        mean, std = portfolio.mean_std(window)
+        correlation = correlations[window]
+        valid = ~np.isnan(correlation)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            average = np.where(valid, correlation, 0.0).sum(axis=1) / valid.sum(axis=1)
+        results[window] = {
+            'sharpe': rolling_sharpe(mean, std),
+            'volatility': rolling_volatility(std),
+            'correlation': correlation if selected is None else correlation[:, selected],
+            'average_correlation': average,
+        }
+        if window in betas:
+            results[window]['beta'] = betas[window]
+    return results
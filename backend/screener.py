@@ -0,0 +1,286 @@
+"""
+Screener - toutes les stratégies de Quant A sur un univers de tickers, en tâche de fond
+Classe l'univers (taille S&P 500) par Sharpe, rendement ou drawdown de chaque stratégie.
+
+- Univers chargé une seule fois (cache de prix partagé), tickers groupés par calendrier: une matrice
+  dates x tickers par jeu de dates identique (actions, crypto 7j/7, places étrangères, introductions récentes)
+- Chaque ticker n'est évalué que sur ses propres barres, sans barres plates ajoutées par un ffill sur le
+  calendrier de l'univers: fenêtres MA / écart-type / RSI et Sharpe identiques à backtest_strategy
+- Stratégies évaluées en opérations vectorisées sur les colonnes (mêmes règles que backtest_strategy)
+- Colonnes réparties en shards dans le ComputeExecutor: le temps de calcul suit le nombre de coeurs
+- Jobs asynchrones avec progression; résultats en cache (même spec = même job) pendant SCREENER_RESULT_TTL
+"""
+
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from compute_executor import ExecutorBusy
+from price_store import get_many
+from quant_a import SWEEP_STRATEGIES, sweep_metrics, sweep_signals
+from response_cache import canonical_key
+
+MAX_TICKERS = 1000
+LOAD_BATCH = 50
+SHARD_COLUMNS = 64
+DEFAULT_RESULT_TTL = 900  # secondes
+MAX_JOBS = 64
+SORT_KEYS = ('sharpe_ratio', 'strategy_return', 'max_drawdown')
+METRICS = ('strategy_return', 'sharpe_ratio', 'max_drawdown')
+
+
+def validate(tickers, strategies, sort='sharpe_ratio'):
+    """Vérifie la spec d'un screening (ValueError sinon)"""
+    if not tickers:
+        raise ValueError('Univers vide')
+    if len(tickers) > MAX_TICKERS:
+        raise ValueError(f'Univers limité à {MAX_TICKERS} tickers')
+    unknown = [s for s in strategies if s not in SWEEP_STRATEGIES]
+    if unknown:
+        raise ValueError(f"Stratégies inconnues: {', '.join(unknown)}")
+    if sort not in SORT_KEYS:
+        raise ValueError(f"Tri inconnu: {sort} ({', '.join(SORT_KEYS)})")
+
+
+# ============================================================================
+# CALCUL
+# ============================================================================
+
+def calendar_blocks(frames):
+    """
+    Clôtures groupées par calendrier
+
+    Returns:
+        liste de (matrice (T, K) sans NaN, tickers): les K tickers d'un bloc ont exactement les mêmes dates
+    """
+    groups = {}
+    for ticker, df in frames.items():
+        close = df['Close'].dropna()
+        if close.empty:
+            continue
+        key = close.index.asi8.tobytes()  # dates UTC en ns: même clé = même calendrier
+        groups.setdefault(key, []).append((ticker, close.to_numpy(dtype=np.float64)))
+    return [(np.column_stack([values for _, values in members]), [ticker for ticker, _ in members])
+            for members in groups.values()]
+
+
+def screen_block(prices, strategies, period):
+    """Métriques de chaque stratégie pour chaque colonne de prices (T, K), sans NaN (exécutable en worker)"""
+    prices = np.asarray(prices, dtype=np.float64)
+    periods = np.full(prices.shape[1], period, dtype=np.int64)
+    return {strategy: sweep_metrics(prices, sweep_signals(prices, strategy, periods)) for strategy in strategies}
+
+
+def _shards(blocks):
+    # Au plus SHARD_COLUMNS colonnes d'un même calendrier par shard
+    return [(matrix[:, i:i + SHARD_COLUMNS], tickers[i:i + SHARD_COLUMNS])
+            for matrix, tickers in blocks for i in range(0, len(tickers), SHARD_COLUMNS)]
+
+
+# ============================================================================
+# JOBS
+# ============================================================================
+
+class ScreenerJob:
+    """État d'un screening: statut, étape, progression (0 -> 1), lignes du classement"""
+
+    def __init__(self, key, spec):
+        self.id = uuid.uuid4().hex[:12]
+        self.key = key
+        self.spec = spec
+        self.status = 'pending'
+        self.stage = 'queued'
+        self.progress = 0.0
+        self.rows = None
+        self.errors = {}
+        self.error = None
+        self.created = time.time()
+        self.finished = None
+
+    def to_dict(self, sort='sharpe_ratio', limit=None):
+        payload = {
+            'job_id': self.id,
+            'status': self.status,
+            'stage': self.stage,
+            'progress': round(self.progress, 4),
+            **self.spec,
+        }
+        if self.status == 'done':
+            rows = sorted(self.rows, key=lambda row: _sort_value(row, sort), reverse=True)
+            payload.update({
+                'sort': sort,
+                'count': len(rows),
+                'rows': rows[:limit] if limit else rows,
+                'fetch_errors': self.errors,
+                'elapsed': round(self.finished - self.created, 3),
+            })
+        elif self.status == 'failed':
+            payload['error'] = self.error
+        return payload
+
+
+def _sort_value(row, sort):
+    # Drawdown négatif: le plus proche de 0 est le meilleur; métriques absentes en fin de classement
+    value = row[sort]
+    return -np.inf if value is None else value
+
+
+class ScreenerJobs:
+    """Jobs de screening exécutés en tâche de fond; une spec déjà calculée récemment est resservie"""
+
+    def __init__(self, executor=None, result_ttl=DEFAULT_RESULT_TTL, max_jobs=MAX_JOBS):
+        self.executor = executor
+        self.result_ttl = result_ttl
+        self.max_jobs = max_jobs
+        self._jobs = OrderedDict()
+        self._by_key = {}
+        self._lock = threading.Lock()
+        self._runner = ThreadPoolExecutor(max_workers=2, thread_name_prefix='screener')
+        self.stats = {'submitted': 0, 'reused': 0, 'completed': 0, 'failed': 0}
+
+    def submit(self, tickers, strategies=SWEEP_STRATEGIES, period=20, history_period='1y', interval='1d',
+               start=None, end=None):
+        tickers = list(dict.fromkeys(t.upper() for t in tickers))
+        spec = {
+            'tickers': len(tickers),
+            'strategies': list(strategies),
+            'period': period,
+            'history_period': history_period,
+            'interval': interval,
+            'start': start,
+            'end': end,
+        }
+        key = canonical_key(sorted(tickers), {**spec, 'strategies': sorted(strategies)})
+
+        with self._lock:
+            job = self._jobs.get(self._by_key.get(key))
+            if job is not None and (job.status in ('pending', 'running') or
+                                    job.status == 'done' and time.time() - job.finished < self.result_ttl):
+                self.stats['reused'] += 1
+                return job
+            job = ScreenerJob(key, spec)
+            self._jobs[job.id] = job
+            self._by_key[key] = job.id
+            self.stats['submitted'] += 1
+            self._evict()
+
+        self._runner.submit(self._run, job, tickers)
+        return job
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def snapshot(self):
+        with self._lock:
+            running = sum(job.status in ('pending', 'running') for job in self._jobs.values())
+            return {**self.stats, 'jobs': len(self._jobs), 'running': running}
+
+    def _evict(self):
+        # Jobs les plus anciens d'abord, jamais ceux en cours
+        for job_id in list(self._jobs):
+            if len(self._jobs) <= self.max_jobs:
+                return
+            job = self._jobs[job_id]
+            if job.status in ('done', 'failed'):
+                del self._jobs[job_id]
+                if self._by_key.get(job.key) == job_id:
+                    del self._by_key[job.key]
+
+    def _update(self, job, **fields):
+        with self._lock:
+            for name, value in fields.items():
+                setattr(job, name, value)
+
+    def _run(self, job, tickers):
+        try:
+            self._update(job, status='running', stage='loading')
+            spec = job.spec
+
+            # Chargement par lots pour suivre la progression (40% du job)
+            frames, errors = {}, {}
+            for i in range(0, len(tickers), LOAD_BATCH):
+                batch_frames, batch_errors = get_many(
+                    tickers[i:i + LOAD_BATCH], period=spec['history_period'], interval=spec['interval'],
+                    start=spec['start'], end=spec['end']
+                )
+                frames.update(batch_frames)
+                errors.update(batch_errors)
+                self._update(job, progress=0.4 * min(i + LOAD_BATCH, len(tickers)) / len(tickers))
+
+            shards = _shards(calendar_blocks(frames))
+            self._update(job, stage='computing')
+
+            results = [None] * len(shards)
+            done = 0
+
+            def compute(index):
+                nonlocal done
+                prices, _ = shards[index]
+                results[index] = self._compute(prices, spec['strategies'], spec['period'])
+                with self._lock:
+                    done += 1
+                    job.progress = 0.4 + 0.6 * done / len(shards)
+
+            workers = max(1, getattr(self.executor, 'max_workers', 0) or 1)
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                list(pool.map(compute, range(len(shards))))
+
+            rows = []
+            for (prices, tickers), metrics in zip(shards, results):
+                for strategy, values in metrics.items():
+                    for j, ticker in enumerate(tickers):
+                        rows.append({
+                            'ticker': ticker,
+                            'strategy': strategy,
+                            'bars': len(prices),
+                            **{name: _finite_or_none(values[name][j]) for name in METRICS},
+                        })
+
+            self._update(job, rows=rows, errors=errors, status='done', stage='done', progress=1.0,
+                         finished=time.time())
+            self._count('completed')
+        except Exception as e:
+            print(f"[Screener] Job {job.id} failed: {e}")
+            self._update(job, status='failed', stage='failed', error=str(e), finished=time.time())
+            self._count('failed')
+
+    def _compute(self, prices, strategies, period):
+        if self.executor is None:
+            return screen_block(prices, strategies, period)
+        # Tâche de fond: on laisse passer les requêtes interactives quand le pool est saturé
+        while True:
+            try:
+                return self.executor.run(screen_block, {'prices': prices}, strategies=strategies, period=period)
+            except ExecutorBusy:
+                time.sleep(0.2)
+
+    def _count(self, key):
+        with self._lock:
+            self.stats[key] += 1
+
+
+def _finite_or_none(value):
+    value = float(value)
+    return round(value, 4) if np.isfinite(value) else None
+
+
+_default_jobs = None
+_default_lock = threading.Lock()
+
+
+def get_jobs(executor=None):
+    """Gestionnaire de jobs partagé du process, durée de vie des résultats configurée par SCREENER_RESULT_TTL"""
+    global _default_jobs
+    with _default_lock:
+        if _default_jobs is None:
+            _default_jobs = ScreenerJobs(
+                executor=executor,
+                result_ttl=float(os.environ.get('SCREENER_RESULT_TTL', DEFAULT_RESULT_TTL))
+            )
+        return _default_jobs
@@ -0,0 +1,51 @@
+"""
+Serialization - formats de réponse négociés via le header Accept
+Le format historique (JSON, history en lignes) reste le défaut.
+
+- application/vnd.quant.columnar+json : history colonnaire, encodé par orjson (tableaux NumPy natifs)
+- application/x-msgpack : même contenu en MessagePack (si le paquet msgpack est installé)
+"""
+
+import numpy as np
+import orjson
+
+try:
+    import msgpack
+except ImportError:  # optionnel
+    msgpack = None
+
+JSON = 'application/json'
+COLUMNAR_JSON = 'application/vnd.quant.columnar+json'
+MSGPACK = 'application/x-msgpack'
+
+
+def available_formats():
+    # Ordre = préférence en cas d'égalité: un client */* reçoit le JSON historique
+    formats = [JSON, COLUMNAR_JSON]
+    if msgpack is not None:
+        formats.append(MSGPACK)
+    return formats
+
+
+def negotiate(accept_mimetypes):
+    """Media type de la réponse d'après Accept (werkzeug MIMEAccept), JSON par défaut"""
+    return accept_mimetypes.best_match(available_formats(), default=JSON) or JSON
+
+
+def history_layout(media_type):
+    return 'rows' if media_type == JSON else 'columns'
+
+
+def encode(payload, media_type):
+    """Corps de réponse (bytes) pour un format colonnaire"""
+    if media_type == MSGPACK:
+        return msgpack.packb(payload, default=_msgpack_default)
+    return orjson.dumps(payload, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+
+
+def _msgpack_default(value):
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f'Type non sérialisable: {type(value).__name__}')
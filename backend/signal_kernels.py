@@ -0,0 +1,304 @@
+"""
+Signal Kernels - signaux dépendant du chemin pour Quant A (RSI de Wilder, hystérésis, stops, sizing)
+Noyaux sur tableaux NumPy bruts, une passe par colonne, compilés par Numba s'il est installé.
+
+- RSI de Wilder: moyennes des gains / pertes lissées (alpha = 1 / période), amorcées par la moyenne simple
+- Positions: entrée / sortie avec hystérésis, stop-loss, take-profit et stop suiveur, taille fixée à l'entrée
+- Sans Numba (ou SIGNAL_KERNELS=numpy): équivalents NumPy vectorisés (filtre récursif scipy pour le RSI,
+  propagation des événements sans stops, une boucle par trade et non par barre avec stops)
+
+Les noyaux sont compilés au premier appel (pas d'import de Numba au démarrage de l'API).
+"""
+
+import os
+import threading
+
+import numpy as np
+
+from rolling_analytics import rolling_mean_std
+
+PERIODS_PER_YEAR = 252
+DEFAULT_VOLATILITY_WINDOW = 20
+_SCALAR_SCAN = 128  # barres d'un trade parcourues en scalaires avant la recherche par blocs (fallback NumPy)
+
+
+# ============================================================================
+# NOYAUX (Python pur, compilés par Numba si disponible)
+# ============================================================================
+
+def _wilder_rsi_loop(prices, periods, out):
+    T, K = prices.shape
+    for k in range(K):
+        p = periods[k]
+        for t in range(T):
+            out[t, k] = np.nan
+        if T <= p:
+            continue
+        gain = 0.0
+        loss = 0.0
+        for t in range(1, p + 1):
+            delta = prices[t, k] - prices[t - 1, k]
+            if delta > 0:
+                gain += delta
+            else:
+                loss -= delta
+        gain /= p
+        loss /= p
+        for t in range(p, T):
+            if t > p:
+                delta = prices[t, k] - prices[t - 1, k]
+                gain = (gain * (p - 1) + (delta if delta > 0 else 0.0)) / p
+                loss = (loss * (p - 1) + (-delta if delta < 0 else 0.0)) / p
+            # 100 - 100 / (1 + gain / loss), 50 sans gain ni perte
+            out[t, k] = 100.0 * gain / (gain + loss) if gain + loss > 0 else 50.0
+
+
+def _positions_loop(prices, entries, exits, sizes, stop_loss, take_profit, trailing_stop, out):
+    T, K = prices.shape
+    for k in range(K):
+        held = 0.0
+        entry_price = 0.0
+        peak = 0.0
+        for t in range(T):
+            price = prices[t, k]
+            if held != 0.0:
+                if price > peak:
+                    peak = price
+                if (exits[t, k] or price <= entry_price * (1.0 - stop_loss)
+                        or price >= entry_price * (1.0 + take_profit) or price <= peak * (1.0 - trailing_stop)):
+                    # Pas de réentrée sur la barre de sortie
+                    held = 0.0
+                    out[t, k] = 0.0
+                    continue
+            elif entries[t, k] and not exits[t, k] and sizes[t, k] > 0:
+                held = sizes[t, k]
+                entry_price = price
+                peak = price
+            out[t, k] = held
+
+
+_kernels = None
+_kernels_lock = threading.Lock()
+
+
+def get_kernels():
+    """(wilder_rsi, positions, backend): noyaux compilés par Numba, ou None + 'numpy' sans Numba"""
+    global _kernels
+    with _kernels_lock:
+        if _kernels is None:
+            _kernels = (None, None, 'numpy')
+            if os.environ.get('SIGNAL_KERNELS', 'auto') != 'numpy':
+                try:
+                    from numba import njit
+                except ImportError:  # optionnel
+                    pass
+                else:
+                    _kernels = (njit(cache=True, nogil=True)(_wilder_rsi_loop),
+                                njit(cache=True, nogil=True)(_positions_loop), 'numba')
+        return _kernels
+
+
+def backend():
+    return get_kernels()[2]
+
+
+# ============================================================================
+# RSI DE WILDER
+# ============================================================================
+
+def wilder_rsi(prices, periods):
+    """
+    RSI de Wilder de chaque colonne
+
+    Args:
+        prices: (T,) ou (T, K) prix sans NaN
+        periods: période (entier) ou (K,) une période par colonne
+
+    Returns:
+        RSI de même forme que prices, NaN sur les `période` premières barres
+        (100 sans perte sur la fenêtre lissée, 50 sans gain ni perte)
+    """
+    prices = np.asarray(prices, dtype=np.float64)
+    flat = prices.ndim == 1
+    P = prices[:, None] if flat else prices
+    periods = np.broadcast_to(np.asarray(periods, dtype=np.int64), (P.shape[1],))
+    if np.any(periods < 2):
+        raise ValueError('La période du RSI doit être >= 2')
+
+    kernel = get_kernels()[0]
+    if kernel is not None:
+        out = np.empty(P.shape)
+        kernel(P, np.ascontiguousarray(periods), out)
+    else:
+        out = _wilder_rsi_numpy(P, periods)
+    return out[:, 0] if flat else out
+
+
+def _wilder_rsi_numpy(P, periods):
+    from scipy.signal import lfilter
+
+    T = P.shape[0]
+    out = np.full(P.shape, np.nan)
+    delta = np.diff(P, axis=0)
+    gains, losses = np.maximum(delta, 0.0), np.maximum(-delta, 0.0)
+    for period in np.unique(periods):
+        if T <= period:
+            continue
+        cols = np.flatnonzero(periods == period)
+        if len(cols) == P.shape[1]:
+            cols = slice(None)  # une seule période: vues plutôt que copies
+        alpha = 1.0 / period
+        averages = []
+        for moves in (gains[:, cols], losses[:, cols]):
+            # Amorce: moyenne simple des `period` premiers mouvements, puis y = (1 - alpha) y + alpha x
+            seed = moves[:period].mean(axis=0)
+            smoothed = np.empty((T - period,) + seed.shape)
+            smoothed[0] = seed
+            smoothed[1:] = lfilter([alpha], [1.0, alpha - 1.0], moves[period:], axis=0,
+                                   zi=((1.0 - alpha) * seed)[None, :])[0]
+            averages.append(smoothed)
+        gain, total = averages[0], averages[0] + averages[1]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            rsi = np.multiply(gain, 100.0, out=gain)
+            rsi /= total
+        rsi[total == 0] = 50.0
+        out[period:, cols] = rsi
+    return out
+
+
+# ============================================================================
+# POSITIONS (HYSTÉRÉSIS, STOPS, SIZING)
+# ============================================================================
+
+def validate_risk(stop_loss=None, take_profit=None, trailing_stop=None, target_volatility=None, max_leverage=1.0):
+    """Vérifie les paramètres de gestion du risque (ValueError sinon)"""
+    for name, value in (('stop_loss', stop_loss), ('trailing_stop', trailing_stop)):
+        if value is not None and not 0 < value < 1:
+            raise ValueError(f'{name} doit être compris entre 0 et 1 (fraction du prix)')
+    if take_profit is not None and not take_profit > 0:
+        raise ValueError('take_profit doit être > 0 (fraction du prix)')
+    if target_volatility is not None and not target_volatility > 0:
+        raise ValueError('target_volatility doit être > 0 (volatilité annualisée, ex: 0.15)')
+    if not max_leverage > 0:
+        raise ValueError('max_leverage doit être > 0')
+
+
+def positions(prices, entries, exits, sizes=1.0, stop_loss=None, take_profit=None, trailing_stop=None):
+    """
+    Exposition à la clôture de chaque barre, en une passe sur l'historique
+
+    Hors position, une entrée (sans sortie sur la même barre, taille > 0) ouvre une position de taille
+    sizes[t], conservée jusqu'à la sortie: signal de sortie, clôture <= entrée x (1 - stop_loss),
+    >= entrée x (1 + take_profit) ou <= plus haut depuis l'entrée x (1 - trailing_stop).
+    Sans stops, équivaut au dernier signal (entrée / sortie) propagé.
+
+    Args:
+        prices: (T,) ou (T, K) clôtures
+        entries, exits: booléens de même forme
+        sizes: taille de position (scalaire ou même forme), NaN / <= 0 = pas d'entrée
+        stop_loss, take_profit, trailing_stop: fractions du prix, None = désactivé
+
+    Returns:
+        positions de même forme que prices (0 = cash), à décaler d'une barre pour les rendements
+    """
+    prices = np.asarray(prices, dtype=np.float64)
+    flat = prices.ndim == 1
+    shape = prices.shape if not flat else (len(prices), 1)
+    P = prices.reshape(shape)
+    entries = np.broadcast_to(np.asarray(entries, dtype=bool).reshape(shape), shape)
+    exits = np.broadcast_to(np.asarray(exits, dtype=bool).reshape(shape), shape)
+    sizes = np.asarray(sizes, dtype=np.float64)
+    sizes = np.broadcast_to(sizes.reshape(shape) if sizes.ndim else sizes, shape)
+    stops = tuple(np.inf if value is None else float(value) for value in (stop_loss, take_profit, trailing_stop))
+
+    kernel = get_kernels()[1]
+    if kernel is not None:
+        out = np.empty(shape)
+        kernel(P, entries, exits, sizes, *stops, out)
+    elif all(np.isinf(stops)):
+        out = _hysteresis_numpy(entries, exits, sizes)
+    else:
+        out = _positions_numpy(P, entries, exits, sizes, *stops)
+    return out[:, 0] if flat else out
+
+
+def _hysteresis_numpy(entries, exits, sizes):
+    # Dernier événement (1 = entrée, 0 = sortie) propagé vers le bas, cash avant le premier
+    with np.errstate(invalid='ignore'):
+        opens = entries & ~exits & (sizes > 0)
+    cells = np.arange(opens.size).reshape(opens.shape)  # indices à plat, croissants dans chaque colonne
+    last_event = np.where(opens | exits, cells, -1)
+    np.maximum.accumulate(last_event, axis=0, out=last_event)
+    held = (last_event >= 0) & opens.ravel()[np.maximum(last_event, 0)]
+    if sizes.strides == (0, 0):
+        return held * float(sizes[0, 0])
+
+    # Taille lue à la première barre de chaque position
+    starts = held.copy()
+    starts[1:] &= ~held[:-1]
+    start = np.where(starts, cells, 0)
+    np.maximum.accumulate(start, axis=0, out=start)
+    return np.where(held, np.ascontiguousarray(sizes).ravel()[start], 0.0)
+
+
+def _positions_numpy(P, entries, exits, sizes, stop_loss, take_profit, trailing_stop):
+    # Une itération par trade: premières barres parcourues en scalaires Python, puis recherche
+    # de la sortie par blocs vectorisés de taille croissante (trades longs)
+    T, K = P.shape
+    out = np.zeros((T, K))
+    with np.errstate(invalid='ignore'):
+        opens = entries & ~exits & (sizes > 0)
+    trailing = 1.0 - trailing_stop
+    for k in range(K):
+        prices, exit_signals = P[:, k], exits[:, k]
+        price_list, exit_list = prices.tolist(), exit_signals.tolist()
+        candidates = np.flatnonzero(opens[:, k])
+        t = 0
+        while True:
+            i = np.searchsorted(candidates, t)
+            if i == len(candidates):
+                break
+            start = candidates[i]
+            entry = price_list[start]
+            stop, target = entry * (1.0 - stop_loss), entry * (1.0 + take_profit)
+            peak, end = entry, None
+            for u in range(start + 1, min(start + 1 + _SCALAR_SCAN, T)):
+                price = price_list[u]
+                if price > peak:
+                    peak = price
+                if exit_list[u] or price <= stop or price >= target or price <= peak * trailing:
+                    end = u
+                    break
+            else:
+                u, step, end = start + 1 + _SCALAR_SCAN, _SCALAR_SCAN, T
+                while u < T:
+                    block = prices[u:u + step]
+                    with np.errstate(invalid='ignore'):
+                        hit = exit_signals[u:u + step] | (block <= stop) | (block >= target)
+                        if trailing_stop < np.inf:
+                            running = np.fmax.accumulate(np.append(peak, block))[1:]
+                            hit |= block <= running * trailing
+                            peak = running[-1]
+                    if hit.any():
+                        end = u + int(hit.argmax())
+                        break
+                    u += len(block)
+                    step *= 2
+            out[start:end, k] = sizes[start, k]
+            t = end + 1
+    return out
+
+
+def volatility_target_sizes(returns, target_volatility, window=DEFAULT_VOLATILITY_WINDOW, max_leverage=1.0):
+    """
+    Taille de position visant `target_volatility` (annualisée): cible / volatilité réalisée sur `window`
+    barres (jusqu'à la barre courante incluse), plafonnée à max_leverage; NaN tant que la fenêtre est incomplète
+    """
+    returns = np.asarray(returns, dtype=np.float64)
+    sizes = np.full(returns.shape, np.nan)
+    if len(returns) < window:
+        return sizes
+    volatility = rolling_mean_std(returns, window)[1] * np.sqrt(PERIODS_PER_YEAR)
+    with np.errstate(divide='ignore'):
+        sizes[window - 1:] = np.minimum(target_volatility / volatility, max_leverage)
+    return sizes
@@ -0,0 +1,59 @@
+"""
+Single-flight - coalescence des appels concurrents identiques
+Les appels simultanés avec la même clé partagent une seule exécution et reçoivent son résultat.
+"""
+
+import threading
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Un seul appel en vol par clé; les suivants attendent le résultat du premier"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self.stats = {'calls': 0, 'executed': 0, 'coalesced': 0}
+
+    def do(self, key, fn, *args, **kwargs):
+        with self._lock:
+            self.stats['calls'] += 1
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+                self.stats['executed'] += 1
+            else:
+                self.stats['coalesced'] += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn(*args, **kwargs)
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def in_flight(self):
+        with self._lock:
+            return len(self._calls)
+
+    def snapshot(self):
+        with self._lock:
+            return {**self.stats, 'in_flight': len(self._calls)}
@@ -0,0 +1,65 @@
+"""
+Configuration pytest - tests du backend sur des prix locaux (aucun accès réseau)
+Lancement depuis backend/: python -m pytest -q
+"""
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND)
+
+# Avant tout import de app / price_store: source synthétique, pas de cache disque, calculs dans le thread
+os.environ.setdefault('PRICE_SOURCE', 'synthetic')
+os.environ.setdefault('PRICE_CACHE_DIR', '')
+os.environ.setdefault('COMPUTE_WORKERS', '0')
+
+import price_store  # noqa: E402
+from price_store import FixtureSource, PriceStore  # noqa: E402
+
+FIXTURE_TICKERS = ('AAPL', 'MSFT', 'GOOGL', 'SPY')
+
+
+def make_frame(index, seed, volatility=0.015):
+    """OHLCV déterministe (marche aléatoire géométrique) sur les dates de `index`"""
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0.0003, volatility, len(index))))
+    spread = np.abs(rng.normal(0, volatility / 2, len(index)))
+    return pd.DataFrame({
+        'Open': close * (1 - spread / 2),
+        'High': close * (1 + spread),
+        'Low': close * (1 - spread),
+        'Close': close,
+        'Volume': rng.integers(100_000, 10_000_000, len(index)).astype(float),
+    }, index=index)
+
+
+@pytest.fixture
+def fixture_frames():
+    """Deux ans de barres journalières (jours ouvrés, New York) pour FIXTURE_TICKERS"""
+    end = pd.Timestamp.now(tz='America/New_York').normalize()
+    index = pd.bdate_range(end=end, periods=504, tz='America/New_York')
+    return {ticker: make_frame(index, seed) for seed, ticker in enumerate(FIXTURE_TICKERS)}
+
+
+@pytest.fixture
+def use_source():
+    """Installe un PriceStore sans cache disque sur la source donnée, restaure le store partagé ensuite"""
+    previous = price_store.get_store()
+
+    def install(source):
+        store = PriceStore(source=source, cache_dir=None)
+        price_store.set_store(store)
+        return store
+
+    yield install
+    price_store.set_store(previous)
+
+
+@pytest.fixture
+def fixture_store(use_source, fixture_frames):
+    return use_source(FixtureSource(fixture_frames))
@@ -0,0 +1,92 @@
+"""
+Mode ASGI: séries préchargées d'après la route, téléchargements identiques partagés, plan() d'un cache
+froid hors de la boucle d'événements, requêtes servies par les routes Flask
+"""
+
+import asyncio
+import json
+import threading
+
+import httpx
+
+import asgi
+from price_store import FixtureSource
+
+
+class CountingSource(FixtureSource):
+    def __init__(self, frames):
+        super().__init__(frames)
+        self.fetched = []
+
+    def fetch(self, ticker, interval='1d', start=None, end=None):
+        self.fetched.append(ticker)
+        return super().fetch(ticker, interval, start, end)
+
+
+def test_prefetch_requests_follow_the_routes():
+    assert asgi.prefetch_requests('GET', '/api/asset/AAPL', b'period=1y&interval=1d', b'') == \
+        [('AAPL', '1y', '1d', None)]
+    body = json.dumps({'assets': [{'ticker': 'AAPL', 'weight': 1}], 'period': '6mo'}).encode()
+    assert [s[0] for s in asgi.prefetch_requests('POST', '/api/portfolio', b'', body)] == ['AAPL', 'SPY']
+    assert asgi.prefetch_requests('POST', '/api/portfolio', b'', b'{invalide') == []
+    assert asgi.prefetch_requests('GET', '/api/asset/AAPL', b'period=7y', b'') == []
+    assert asgi.prefetch_requests('GET', '/api/health', b'', b'') == []
+
+
+def test_identical_downloads_are_shared(use_source, fixture_frames):
+    source = CountingSource(fixture_frames)
+    store = use_source(source)
+    prefetcher = asgi.AsyncPrefetcher(store)
+
+    requests = [('AAPL', '1y', '1d', None)] * 3 + [('MSFT', '1y', '1d', None)]
+    asyncio.run(prefetcher.ensure_many(requests))
+    assert sorted(source.fetched) == ['AAPL', 'MSFT']
+    assert prefetcher.snapshot()['coalesced'] == 2
+
+    # Séries en cache: la route ne télécharge plus rien
+    store.get_history('AAPL', period='1y')
+    assert sorted(source.fetched) == ['AAPL', 'MSFT'] and store.snapshot()['hits'] == 1
+
+
+def test_cold_plan_runs_off_the_event_loop(use_source, fixture_frames, monkeypatch):
+    store = use_source(CountingSource(fixture_frames))
+    prefetcher = asgi.AsyncPrefetcher(store)
+    threads = []
+    real_plan = store.plan
+
+    def recording_plan(*args, **kwargs):
+        threads.append(threading.current_thread())
+        return real_plan(*args, **kwargs)
+
+    monkeypatch.setattr(store, 'plan', recording_plan)
+
+    async def run():
+        await prefetcher.ensure('AAPL', '1y')  # cache froid: plan() dans un thread
+        await prefetcher.ensure('AAPL', '1y')  # en mémoire: plan() direct
+        return threading.current_thread()
+
+    loop_thread = asyncio.run(run())
+    assert threads[0] is not loop_thread and threads[1] is loop_thread
+
+
+def test_asgi_app_serves_flask_routes(use_source, fixture_frames):
+    import app as flask_app
+
+    source = CountingSource(fixture_frames)
+    store = use_source(source)
+    prefetcher = asgi.AsyncPrefetcher(store)
+    application = asgi.AsyncApp(flask_app.app, prefetcher, threads=4)
+
+    async def run():
+        transport = httpx.ASGITransport(app=application)
+        async with httpx.AsyncClient(transport=transport, base_url='http://test') as client:
+            asset = await client.get('/api/asset/AAPL', params={'period': '1y'})
+            backtest = await client.post('/api/backtest', json={'ticker': 'MSFT', 'history_period': '1y'})
+            invalid = await client.post('/api/backtest', json={'ticker': 'MSFT', 'history_period': '7y'})
+        return asset, backtest, invalid
+
+    asset, backtest, invalid = asyncio.run(run())
+    assert asset.status_code == 200 and asset.json()['ticker'] == 'AAPL'
+    assert backtest.status_code == 200 and invalid.status_code == 400
+    assert sorted(source.fetched) == ['AAPL', 'MSFT']
+    assert prefetcher.snapshot()['downloads'] == 2
@@ -0,0 +1,44 @@
+"""
+Sweep vectorisé de paramètres: mêmes métriques que backtest_strategy, route /api/backtest/sweep
+"""
+
+import pytest
+
+import quant_a
+
+
+@pytest.mark.parametrize('strategy', quant_a.SWEEP_STRATEGIES)
+def test_sweep_matches_single_backtests(fixture_store, strategy):
+    periods = [10, 20, 50]
+    sweep = quant_a.backtest_sweep('MSFT', strategy, periods, history_period='1y')
+
+    for j, period in enumerate(periods):
+        single = quant_a.backtest_strategy('MSFT', strategy, period, '1y')
+        for metric in ('strategy_return', 'sharpe_ratio', 'max_drawdown'):
+            assert sweep[metric][0][j] == pytest.approx(single[metric], rel=1e-9, abs=1e-9), (metric, period)
+
+
+def test_threshold_grid_matches_single_thresholds(fixture_store):
+    thresholds = [0.5, 1.0, 1.5]
+    sweep = quant_a.backtest_sweep('AAPL', 'bollinger', [20], thresholds, history_period='1y')
+    for i, threshold in enumerate(thresholds):
+        single = quant_a.backtest_sweep('AAPL', 'bollinger', [20], [threshold], history_period='1y')
+        assert sweep['sharpe_ratio'][i][0] == pytest.approx(single['sharpe_ratio'][0][0])
+    best = max(range(3), key=lambda i: sweep['sharpe_ratio'][i][0])
+    assert sweep['best']['threshold'] == thresholds[best]
+
+
+def test_sweep_route(fixture_store):
+    import app
+
+    client = app.app.test_client()
+    response = client.post('/api/backtest/sweep', json={'ticker': 'AAPL', 'strategy': 'momentum',
+                                                        'period_min': 5, 'period_max': 30, 'history_period': '1y'})
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body['periods'] == list(range(5, 31))
+    assert len(body['sharpe_ratio'][0]) == 26
+    assert body['best']['period'] in body['periods']
+
+    assert client.post('/api/backtest/sweep', json={'ticker': 'AAPL', 'strategy': 'unknown'}).status_code == 400
+    assert client.post('/api/backtest/sweep', json={'ticker': 'AAPL', 'periods': [1, 5]}).status_code == 400
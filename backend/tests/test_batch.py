@@ -0,0 +1,92 @@
+"""
+/api/batch: mêmes réponses que les routes appelées une à une, erreurs par sous-requête, paramètres invalides
+et erreurs de calcul renvoyés par le gestionnaire commun des routes
+"""
+
+import json
+
+import pytest
+
+from compute_executor import ComputeTimeout, ExecutorBusy
+from response_cache import ResponseCache
+
+PORTFOLIO = {'assets': [{'ticker': 'AAPL', 'weight': 60}, {'ticker': 'MSFT', 'weight': 40}], 'period': '6mo'}
+
+
+@pytest.fixture
+def client(fixture_store, monkeypatch):
+    import app
+
+    # Cache de /api/portfolio vide: chaque test calcule ses réponses
+    monkeypatch.setattr(app, 'portfolio_cache', ResponseCache())
+    return app.app.test_client()
+
+
+def test_batch_matches_individual_routes(client):
+    response = client.post('/api/batch', json={'queries': [
+        {'id': 'asset', 'type': 'asset', 'ticker': 'AAPL', 'period': '1mo'},
+        {'id': 'bt', 'type': 'backtest', 'params': {'ticker': 'AAPL', 'strategy': 'momentum'}},
+        {'id': 'pf', 'type': 'portfolio', 'params': PORTFOLIO},
+    ]})
+    assert response.status_code == 200
+    results = {item['id']: item for item in response.get_json()['results']}
+    assert response.get_json()['errors'] == 0
+
+    expected = {
+        'asset': client.get('/api/asset/AAPL?period=1mo'),
+        'bt': client.post('/api/backtest', json={'ticker': 'AAPL', 'strategy': 'momentum'}),
+        'pf': client.post('/api/portfolio', json=PORTFOLIO),
+    }
+    for name, single in expected.items():
+        assert results[name]['status'] == single.status_code == 200
+        assert results[name]['body'] == json.loads(single.get_data())
+
+
+def test_duplicate_and_invalid_subrequests(client):
+    query = {'type': 'backtest', 'ticker': 'MSFT'}
+    response = client.post('/api/batch', json={'queries': [
+        query, dict(query), {'type': 'unknown'}, {'type': ['asset']}, {'type': 'asset', 'params': [1]},
+        {'type': 'backtest', 'ticker': 'MSFT', 'period': [20]},
+    ]})
+    body = response.get_json()
+    assert response.status_code == 200
+    assert [item['status'] for item in body['results']] == [200, 200, 400, 400, 400, 400]
+    assert body['results'][0]['body'] == body['results'][1]['body']
+    assert body['errors'] == 4
+
+
+@pytest.mark.parametrize('route, payload', [
+    ('/api/backtest', {'ticker': 'AAPL', 'period': [20]}),
+    ('/api/backtest', {'ticker': ['AAPL']}),
+    ('/api/backtest', {'ticker': 'AAPL', 'history_period': ['1y']}),
+    ('/api/portfolio', {'assets': [{'ticker': 'AAPL', 'weight': [60]}, {'ticker': 'MSFT', 'weight': 40}]}),
+    ('/api/portfolio', {**PORTFOLIO, 'rebalance_freq': ['monthly']}),
+    ('/api/portfolio', {**PORTFOLIO, 'start': {'year': 2024}}),
+    ('/api/portfolio/risk', {**PORTFOLIO, 'confidence': [[0.95]]}),
+    ('/api/portfolio/rolling', {**PORTFOLIO, 'pairs': [['AAPL', ['MSFT']]]}),
+    ('/api/batch', [{'type': 'asset', 'ticker': 'AAPL'}]),
+])
+def test_invalid_parameter_types_are_rejected(client, route, payload):
+    response = client.post(route, json=payload)
+    assert response.status_code == 400
+    assert 'error' in response.get_json()
+
+
+@pytest.mark.parametrize('error, status', [
+    (ExecutorBusy('file pleine'), 503), (ComputeTimeout('60 s'), 504), (RuntimeError('bug'), 500),
+])
+def test_compute_errors_share_one_handler(client, monkeypatch, error, status):
+    import app
+
+    def failing(*args, **kwargs):
+        raise error
+
+    monkeypatch.setattr(app.route_flights, 'do', failing)
+    for route in ('/api/portfolio', '/api/portfolio/risk', '/api/portfolio/rolling'):
+        response = client.post(route, json=PORTFOLIO)
+        assert response.status_code == status
+        assert 'error' in response.get_json()
+    assert (response.headers.get('Retry-After') == '5') == (status == 503)
+
+    batch = client.post('/api/batch', json={'queries': [{'type': 'portfolio', 'params': PORTFOLIO}]})
+    assert batch.get_json()['results'][0]['status'] == status
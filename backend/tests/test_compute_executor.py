@@ -0,0 +1,80 @@
+"""
+ComputeExecutor: backpressure, erreurs de préparation d'un job, worker mort
+"""
+
+import os
+
+import numpy as np
+import pytest
+
+import compute_executor
+from compute_executor import BrokenProcessPool, ComputeExecutor, ExecutorBusy
+
+
+def total(x):
+    return float(x.sum())
+
+
+def die(x):
+    os._exit(1)
+
+
+@pytest.fixture
+def executor():
+    executor = ComputeExecutor(max_workers=1, max_pending=2, timeout=60)
+    yield executor
+    executor.shutdown(wait=True)
+
+
+def test_inline_executor_runs_in_thread():
+    executor = ComputeExecutor(max_workers=0)
+    assert executor.run(total, {'x': np.arange(4.0)}) == 6.0
+    assert executor.snapshot()['completed'] == 1
+
+
+def test_worker_death_recreates_pool(executor):
+    assert executor.run(total, {'x': np.arange(5.0)}) == 10.0
+    with pytest.raises(BrokenProcessPool):
+        executor.run(die, {'x': np.arange(5.0)})
+    assert executor.run(total, {'x': np.arange(5.0)}) == 10.0
+    assert executor.run(total, {'x': np.arange(3.0)}) == 3.0
+    assert executor.snapshot()['errors'] == 1
+
+
+def test_failed_setup_releases_slot(executor):
+    # dtype objet: la copie en mémoire partagée échoue avant la soumission
+    for _ in range(executor.max_pending + 1):
+        with pytest.raises(TypeError):
+            executor.run(total, {'x': np.array([object()])})
+    assert executor.run(total, {'x': np.arange(5.0)}) == 10.0
+    assert executor.snapshot()['rejected'] == 0
+
+
+def test_failed_pool_creation_releases_slot_and_segments(executor, monkeypatch):
+    unlinked = []
+    real_unlink = compute_executor._unlink
+
+    def tracking_unlink(segments):
+        unlinked.extend(shm.name for shm in segments)
+        real_unlink(segments)
+
+    def failing_pool():
+        raise OSError('création du pool impossible')
+
+    monkeypatch.setattr(compute_executor, '_unlink', tracking_unlink)
+    monkeypatch.setattr(executor, '_get_pool', failing_pool)
+    for _ in range(executor.max_pending + 1):
+        with pytest.raises(OSError):
+            executor.run(total, {'x': np.arange(5.0)})
+    assert len(unlinked) == executor.max_pending + 1
+
+    monkeypatch.undo()
+    assert executor.run(total, {'x': np.arange(5.0)}) == 10.0
+
+
+def test_full_queue_is_rejected():
+    executor = ComputeExecutor(max_workers=0, max_pending=1)
+    executor._slots.acquire()
+    with pytest.raises(ExecutorBusy):
+        executor.run(total, {'x': np.arange(3.0)})
+    assert executor.snapshot()['rejected'] == 1
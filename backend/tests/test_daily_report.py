@@ -0,0 +1,109 @@
+"""
+Daily report: watchlist, snapshot colonnaire du jour (aller-retour disque), reprise incrémentale,
+nouvelles tentatives sur erreur upstream, rendus CSV / HTML
+"""
+
+import csv
+import json
+
+import numpy as np
+import pytest
+
+import daily_report
+from daily_report import DailyReport, Snapshot, quote_from_history
+from price_store import FixtureSource, PriceStore
+
+
+class FlakySource(FixtureSource):
+    """Fixtures dont certains tickers échouent `failures` fois avant de répondre"""
+
+    def __init__(self, frames, failures):
+        super().__init__(frames)
+        self.failures = dict(failures)
+        self.fetched = []
+
+    def fetch(self, ticker, interval='1d', start=None, end=None):
+        self.fetched.append(ticker)
+        if self.failures.get(ticker, 0) > 0:
+            self.failures[ticker] -= 1
+            raise RuntimeError('upstream indisponible')
+        return super().fetch(ticker, interval, start, end)
+
+
+@pytest.fixture(autouse=True)
+def no_retry_delay(monkeypatch):
+    monkeypatch.setattr(daily_report, 'RETRY_DELAY', 0.0)
+
+
+def make_report(source, tmp_path, tickers=('AAPL', 'MSFT', 'GOOGL', 'SPY'), **options):
+    store = PriceStore(source=source, cache_dir=None)
+    return DailyReport(list(tickers), report_dir=str(tmp_path), store=store, day='2026-01-02', **options)
+
+
+def test_load_watchlist(tmp_path):
+    text = tmp_path / 'list.txt'
+    text.write_text('aapl, msft  # tech\n\nGOOGL\nAAPL\n# fin\n')
+    assert daily_report.load_watchlist(str(text)) == ['AAPL', 'MSFT', 'GOOGL']
+    as_json = tmp_path / 'list.json'
+    as_json.write_text(json.dumps({'tickers': ['spy', 'qqq', 'SPY']}))
+    assert daily_report.load_watchlist(str(as_json)) == ['SPY', 'QQQ']
+
+
+def test_snapshot_round_trip(fixture_frames, tmp_path):
+    quotes = {t: quote_from_history(df) for t, df in fixture_frames.items()}
+    quotes['NEW'] = quote_from_history(fixture_frames['AAPL'].iloc[:1])  # pas de clôture précédente: NaN
+    path = str(tmp_path / 'snapshot.npz')
+    Snapshot('2026-01-02', quotes, {'BAD': 'No data'}).save(path)
+
+    loaded = Snapshot.load(path, '2026-01-02')
+    assert loaded.errors == {'BAD': 'No data'}
+    assert loaded.quotes.keys() == quotes.keys()
+    for ticker, quote in quotes.items():
+        assert loaded.quotes[ticker]['session'] == quote['session']
+        np.testing.assert_array_equal([loaded.quotes[ticker][f] for f in daily_report.QUOTE_FIELDS],
+                                      [quote[f] for f in daily_report.QUOTE_FIELDS])
+    assert 'NEW' not in loaded.movers()[0] + loaded.movers()[1]
+
+
+def test_rerun_fetches_only_missing_symbols(fixture_frames, tmp_path):
+    source = FlakySource(fixture_frames, {})
+    snapshot, fetched = make_report(source, tmp_path, tickers=('AAPL', 'MSFT'), batch_size=1).capture()
+    assert fetched == 2 and sorted(snapshot.quotes) == ['AAPL', 'MSFT']
+
+    source.fetched.clear()
+    snapshot, fetched = make_report(source, tmp_path).capture()
+    assert fetched == 2 and sorted(source.fetched) == ['GOOGL', 'SPY']
+    assert len(snapshot.quotes) == 4
+
+    _, fetched = make_report(source, tmp_path).capture(force=True)
+    assert fetched == 4
+
+
+def test_transient_failures_are_retried(fixture_frames, tmp_path):
+    source = FlakySource(fixture_frames, {'MSFT': 1, 'GOOGL': 10})
+    snapshot, _ = make_report(source, tmp_path, tickers=('AAPL', 'MSFT', 'GOOGL', 'UNKNOWN'), retries=2).capture()
+    assert sorted(snapshot.quotes) == ['AAPL', 'MSFT']
+    assert snapshot.errors['UNKNOWN'] == 'No data' and 'upstream' in snapshot.errors['GOOGL']
+    # Symbole inconnu (historique vide): pas de nouvelle tentative
+    assert source.fetched.count('UNKNOWN') == 1 and source.fetched.count('GOOGL') == 3
+
+    # Relance: le ticker en erreur est retenté et sort des erreurs
+    source.failures['GOOGL'] = 0
+    snapshot, _ = make_report(source, tmp_path, tickers=('AAPL', 'MSFT', 'GOOGL', 'UNKNOWN')).capture()
+    assert 'GOOGL' in snapshot.quotes and 'GOOGL' not in snapshot.errors
+
+
+def test_render_csv_and_html(fixture_frames, tmp_path):
+    report = make_report(FixtureSource(fixture_frames), tmp_path, tickers=('AAPL', 'MSFT', '<B>'))
+    snapshot, _ = report.capture()
+    csv_path, html_path = report.render(snapshot, top=1)
+
+    with open(csv_path) as f:
+        rows = list(csv.DictReader(f))
+    changes = [float(row['day_change']) for row in rows if row['day_change']]
+    assert changes == sorted(changes, reverse=True) and len(changes) == 2
+    assert rows[-1]['ticker'] == '<B>' and rows[-1]['error'] == 'No data'
+
+    page = open(html_path).read()
+    assert '&lt;B&gt;' in page and '<B>' not in page
+    assert snapshot.movers(1)[0][0] in page
@@ -0,0 +1,137 @@
+"""
+Modèle factoriel: régression groupée identique à np.linalg.lstsq colonne par colonne,
+historiques de longueurs différentes, validation des facteurs, /api/portfolio/factors
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import factor_model
+from conftest import make_frame
+from price_store import FixtureSource
+
+
+def lstsq_reference(returns, factors):
+    """Régression OLS classique d'une colonne (rendements en excès, constante), statistiques recalculées"""
+    daily_rf = factor_model.RISK_FREE_RATE / factor_model.PERIODS_PER_YEAR
+    X = np.column_stack([np.ones(len(returns)), factors])
+    y = returns - daily_rf
+    coefficients, _, _, _ = np.linalg.lstsq(X, y, rcond=None)
+    residuals = y - X @ coefficients
+    dof = len(y) - X.shape[1]
+    sigma2 = residuals @ residuals / dof
+    t_stats = coefficients / np.sqrt(sigma2 * np.diag(np.linalg.inv(X.T @ X)))
+    r_squared = 1 - residuals @ residuals / np.sum((y - y.mean()) ** 2)
+    return {
+        'alpha': coefficients[0] * factor_model.PERIODS_PER_YEAR * 100,
+        'alpha_t': t_stats[0],
+        'betas': coefficients[1:],
+        't_stats': t_stats[1:],
+        'r_squared': r_squared,
+        'adj_r_squared': 1 - (1 - r_squared) * (len(y) - 1) / dof,
+        'residual_volatility': np.sqrt(sigma2 * factor_model.PERIODS_PER_YEAR) * 100,
+    }
+
+
+@pytest.fixture
+def sample():
+    rng = np.random.default_rng(41)
+    factors = rng.normal(0, 0.01, (400, 3))
+    betas = rng.normal(1, 0.5, (3, 8))
+    returns = 3e-4 + factors @ betas + rng.normal(0, 0.01, (400, 8))
+    return returns, factors
+
+
+def assert_matches_reference(fit, returns, factors, column):
+    expected = lstsq_reference(returns, factors)
+    for name, value in expected.items():
+        np.testing.assert_allclose(fit[name][..., column], value, rtol=1e-8, err_msg=name)
+
+
+def test_regress_matches_lstsq(sample):
+    returns, factors = sample
+    fit = factor_model.regress(returns, factors)
+    for column in range(returns.shape[1]):
+        assert_matches_reference(fit, returns[:, column], factors, column)
+    assert (fit['observations'] == len(returns)).all()
+    assert (fit['rank'] == factors.shape[1] + 1).all()
+
+
+def test_exposures_with_staggered_histories(sample):
+    returns, factors = sample
+    returns = returns.copy()
+    starts = [0, 0, 50, 50, 120, 399, 0, 10]
+    for column, start in enumerate(starts):
+        returns[:start, column] = np.nan
+    # Trou après la première barre: colonne écartée
+    returns[200, 7] = np.nan
+
+    fit = factor_model.exposures(returns, factors)
+    for column, start in enumerate(starts[:5]):
+        assert_matches_reference(fit, returns[start:, column], factors[start:], column)
+        assert fit['observations'][column] == len(returns) - start
+    # Une seule observation (sous min_observations) et colonne trouée: NaN
+    for column in (5, 7):
+        assert np.isnan(fit['alpha'][column]) and np.isnan(fit['betas'][:, column]).all()
+        assert fit['observations'][column] == 0
+
+
+def test_collinear_factors_keep_fitted_values(sample):
+    returns, factors = sample
+    collinear = np.column_stack([factors, factors[:, 0] + factors[:, 1]])
+    fit = factor_model.regress(returns, collinear)
+    assert (fit['rank'] == factors.shape[1] + 1).all()
+    np.testing.assert_allclose(fit['r_squared'], factor_model.regress(returns, factors)['r_squared'], rtol=1e-8)
+
+
+def test_resolve_validation():
+    assert factor_model.resolve() == [('market', 'SPY', None), ('size', 'IWM', 'SPY'), ('value', 'IWD', 'IWF')]
+    assert factor_model.resolve([' Momentum ', 'xlk']) == [('momentum', 'MTUM', 'SPY'), ('XLK', 'XLK', None)]
+    assert factor_model.factor_tickers(factor_model.resolve()) == ['IWD', 'IWF', 'IWM', 'SPY']
+    for factors in ([], ['market', 'MARKET'], ['xlk', 'XLK'], [None], [''], ['market', 3],
+                    [f'T{i}' for i in range(factor_model.MAX_FACTORS + 1)]):
+        with pytest.raises(ValueError):
+            factor_model.resolve(factors)
+
+
+@pytest.fixture
+def factor_store(use_source, fixture_frames):
+    index = fixture_frames['SPY'].index
+    frames = {**fixture_frames, **{ticker: make_frame(index, seed, 0.01)
+                                   for seed, ticker in enumerate(('IWM', 'IWD', 'IWF'), start=10)}}
+    use_source(FixtureSource(frames))
+    return frames
+
+
+def test_factors_route(factor_store):
+    import app
+
+    client = app.app.test_client()
+    assets = [{'ticker': 'AAPL', 'weight': 60}, {'ticker': 'MSFT', 'weight': 40}]
+    response = client.post('/api/portfolio/factors', json={'assets': assets, 'period': '1y'})
+    assert response.status_code == 200
+    result = response.get_json()
+    assert result['factors'] == ['market', 'size', 'value']
+    assert sorted(result['exposures']) == ['AAPL', 'MSFT']
+    assert result['portfolio'] is not None
+
+    # Même régression que lstsq sur les rendements alignés (valeurs arrondies à 4 décimales par clean_value)
+    prices = pd.DataFrame({ticker: frame['Close'] for ticker, frame in factor_store.items()}).iloc[-result[
+        'observations'] - 1:]
+    returns = prices.pct_change().iloc[1:]
+    daily_rf = factor_model.RISK_FREE_RATE / factor_model.PERIODS_PER_YEAR
+    factors = np.column_stack([returns['SPY'] - daily_rf, returns['IWM'] - returns['SPY'],
+                               returns['IWD'] - returns['IWF']])
+    expected = lstsq_reference(returns['AAPL'].to_numpy(), factors)
+    betas = result['exposures']['AAPL']['betas']
+    np.testing.assert_allclose([betas[name] for name in result['factors']], expected['betas'], atol=1e-4)
+    assert result['exposures']['AAPL']['r_squared'] == pytest.approx(expected['r_squared'], abs=1e-4)
+
+    response = client.post('/api/portfolio/factors', json={'tickers': ['AAPL', 'GOOGL'], 'factors': ['market']})
+    assert response.status_code == 200
+    assert response.get_json()['portfolio'] is None
+
+    for payload in ({'assets': assets, 'factors': ['market', 'market']}, {'assets': assets, 'factors': []},
+                    {'assets': assets, 'factors': 'market'}, {'tickers': []}):
+        assert client.post('/api/portfolio/factors', json=payload).status_code == 400
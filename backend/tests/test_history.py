@@ -0,0 +1,80 @@
+"""
+Historiques longs: LTTB identique à l'algorithme de référence, formats de dates, fenêtres start / end
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from history import build_history, lttb_indices
+
+
+def reference_lttb(y, n_out):
+    # Implémentation directe de Steinarsson (2013): un bucket à la fois, moyenne du bucket suivant
+    n = len(y)
+    every = (n - 2) / (n_out - 2)
+    selected, a = [0], 0
+    for i in range(n_out - 2):
+        lo, hi = int(i * every) + 1, int((i + 1) * every) + 1
+        next_hi = int((i + 2) * every) + 1 if i < n_out - 3 else n
+        avg_x, avg_y = (hi + next_hi - 1) / 2, np.mean(y[hi:next_hi])
+        areas = [abs((a - avg_x) * (y[j] - y[a]) - (a - j) * (avg_y - y[a])) for j in range(lo, hi)]
+        a = lo + int(np.argmax(areas))
+        selected.append(a)
+    return np.array(selected + [n - 1])
+
+
+@pytest.mark.parametrize('n, n_out', [(1000, 100), (5003, 250), (100, 3), (50, 49)])
+def test_lttb_matches_reference(n, n_out):
+    y = np.cumsum(np.random.default_rng(n).normal(size=n))
+    np.testing.assert_array_equal(lttb_indices(y, n_out), reference_lttb(y, n_out))
+
+
+def test_lttb_keeps_isolated_extremes():
+    y = np.zeros(10_000)
+    y[1234], y[7777] = 50.0, -50.0
+    keep = lttb_indices(y, 200)
+    assert len(keep) == 200 and {0, 1234, 7777, 9999} <= set(keep.tolist())
+    assert np.all(np.diff(keep) > 0)
+
+
+def test_short_series_untouched():
+    assert lttb_indices(np.arange(10.0), 20).tolist() == list(range(10))
+
+
+def test_build_history_layouts():
+    index = pd.date_range('2024-01-02 09:30', periods=3000, freq='min', tz='America/New_York')
+    price = np.linspace(100, 110, len(index))
+    rows = build_history(index, {'price': price, 'volume': price * 2}, max_points=500, interval='1m')
+    assert len(rows) == 500
+    assert rows[0] == {'date': '2024-01-02 09:30', 'price': 100.0, 'volume': 200.0}
+
+    columns = build_history(index, {'price': price}, max_points=500, interval='1m', layout='columns')
+    assert columns['date_unit'] == 's' and len(columns['dates']) == 500
+    assert columns['dates'][0] == index[0].timestamp()
+
+    daily = build_history(index[:10].normalize(), {'price': price[:10]}, max_points=0, layout='columns')
+    assert daily['date_unit'] == 'day' and daily['dates'][0] == (pd.Timestamp('2024-01-02') - pd.Timestamp(0)).days
+
+
+def test_asset_route_long_history(use_source, fixture_frames):
+    import app
+    from conftest import make_frame
+    from price_store import FixtureSource
+
+    # Dix ans de barres journalières
+    index = pd.bdate_range(end=fixture_frames['AAPL'].index[-1], periods=2520, tz='America/New_York')
+    use_source(FixtureSource({'LONG': make_frame(index, seed=3)}))
+    client = app.app.test_client()
+
+    body = client.get('/api/asset/LONG?period=10y&max_points=300').get_json()
+    assert body['bars'] > 2000 and len(body['history']) == 300
+    assert body['history'][-1]['date'] == index[-1].strftime('%Y-%m-%d')
+
+    window = client.get('/api/asset/LONG?period=max&start=2020-01-01&end=2021-01-01&max_points=0').get_json()
+    dates = [point['date'] for point in window['history']]
+    assert dates[0] >= '2020-01-01' and dates[-1] < '2021-01-01'
+    assert window['bars'] == len(dates)
+
+    assert client.get('/api/asset/LONG?period=7y').status_code == 400
+    assert client.get('/api/asset/LONG?interval=3h').status_code == 400
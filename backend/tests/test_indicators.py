@@ -0,0 +1,90 @@
+"""
+Indicateurs incrémentaux: équivalence avec pandas, révisions de prix, mémoire bornée, /api/stats
+"""
+
+import json
+
+import numpy as np
+import pytest
+
+from indicators import STRATEGY_OUTPUTS, IndicatorEngine
+
+
+def pandas_indicators(prices, strategy, period):
+    if strategy == 'breakout':
+        previous = prices.shift(1).rolling(period)
+        return {'rolling_high': previous.max(), 'rolling_low': previous.min()}
+    rolling = prices.rolling(period)
+    expected = {'ma': rolling.mean()}
+    if strategy == 'bollinger':
+        expected['std'] = rolling.std()
+    return expected
+
+
+def assert_matches_pandas(result, prices, strategy, period=20):
+    for name, expected in pandas_indicators(prices, strategy, period).items():
+        np.testing.assert_allclose(result[name].to_numpy(), expected.to_numpy(), rtol=1e-9, atol=1e-9)
+
+
+@pytest.mark.parametrize('strategy', sorted(STRATEGY_OUTPUTS))
+def test_streaming_indicators_match_pandas(fixture_frames, strategy):
+    prices = fixture_frames['AAPL']['Close']
+    engine = IndicatorEngine()
+
+    # Premier appel (chargement complet), puis nouvelles barres ajoutées une à une (mise à jour incrémentale)
+    for end in (len(prices) - 5, len(prices) - 4, len(prices)):
+        window = prices.iloc[:end]
+        assert_matches_pandas(engine.indicators('AAPL', strategy, 20, window), window, strategy)
+    assert engine.snapshot()['resets'] == 0
+
+
+def test_sliding_window_matches_pandas(fixture_frames):
+    # Série de longueur fixe qui glisse d'une barre à chaque appel (période '1y' rafraîchie chaque jour)
+    prices = fixture_frames['MSFT']['Close']
+    engine = IndicatorEngine()
+    for shift in range(5):
+        window = prices.iloc[shift:shift + 300]
+        assert_matches_pandas(engine.indicators('MSFT', 'bollinger', 20, window), window, 'bollinger')
+    assert engine.snapshot()['resets'] == 0
+
+
+def test_revised_bar_in_the_middle_resets_state(fixture_frames):
+    prices = fixture_frames['AAPL']['Close']
+    engine = IndicatorEngine()
+    engine.indicators('AAPL', 'momentum', 20, prices.iloc[:-1])
+
+    # Ajustement upstream (split, dividende) d'une barre au milieu de la série
+    revised = prices.copy()
+    revised.iloc[len(prices) // 2] *= 0.5
+    assert_matches_pandas(engine.indicators('AAPL', 'momentum', 20, revised), revised, 'momentum')
+    assert engine.snapshot()['resets'] == 1
+
+
+def test_state_keeps_only_the_longest_requested_series(fixture_frames):
+    prices = fixture_frames['AAPL']['Close']
+    engine = IndicatorEngine()
+    for shift in range(200):
+        engine.indicators('AAPL', 'momentum', 20, prices.iloc[shift:shift + 50])
+    # Au plus deux fois la série demandée (recopie amortie), pas tout l'historique parcouru
+    assert engine.snapshot()['bars'] <= 2 * 50
+
+
+def test_engine_evicts_beyond_bar_budget(fixture_frames):
+    engine = IndicatorEngine(max_bars=1000)
+    for ticker in ('AAPL', 'MSFT', 'GOOGL', 'SPY'):
+        engine.indicators(ticker, 'momentum', 20, fixture_frames[ticker]['Close'])
+    stats = engine.snapshot()
+    assert stats['bars'] <= 1000
+    assert stats['states'] == 1000 // len(fixture_frames['AAPL'])
+
+
+def test_stats_serializable_after_repeated_backtest(fixture_store):
+    import app
+
+    client = app.app.test_client()
+    for _ in range(2):
+        response = client.post('/api/backtest', json={'ticker': 'AAPL', 'strategy': 'momentum'})
+        assert response.status_code == 200
+    response = client.get('/api/stats')
+    assert response.status_code == 200
+    json.dumps(response.get_json())
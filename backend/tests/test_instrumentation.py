@@ -0,0 +1,80 @@
+"""
+Instrumentation: étapes par requête (Server-Timing), fusion des étapes d'un worker, histogrammes Prometheus,
+/api/metrics, profilage opt-in
+"""
+
+import re
+
+import pytest
+
+import instrumentation
+from instrumentation import Histogram
+
+
+def test_histogram_renders_cumulative_buckets():
+    histogram = Histogram('demo_seconds', 'Démo', ('route',), buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 0.5, 5.0):
+        histogram.observe(value, '/api/"x"')
+    lines = histogram.render()
+    assert 'demo_seconds_bucket{route="/api/\\"x\\"",le="0.1"} 1' in lines
+    assert 'demo_seconds_bucket{route="/api/\\"x\\"",le="1"} 3' in lines
+    assert 'demo_seconds_bucket{route="/api/\\"x\\"",le="+Inf"} 4' in lines
+    assert 'demo_seconds_count{route="/api/\\"x\\""} 4' in lines
+    assert 'demo_seconds_sum{route="/api/\\"x\\""} 6.050000' in lines
+
+
+def test_worker_stages_merge_into_the_request():
+    stages = instrumentation.begin()
+    try:
+        instrumentation.record('fetch', 0.010)
+        # Worker: étapes capturées à part, renvoyées avec le résultat puis fusionnées
+        with instrumentation.capture() as worker:
+            instrumentation.record('metrics', 0.020)
+        assert 'metrics' not in stages.durations
+        instrumentation.merge(worker.durations)
+        instrumentation.record('fetch', 0.005)
+    finally:
+        assert instrumentation.end() is stages
+    assert stages.durations == pytest.approx({'fetch': 0.015, 'metrics': 0.020})
+    header = instrumentation.server_timing(stages, total=0.05)
+    assert header == 'fetch;dur=15.00, metrics;dur=20.00, total;dur=50.00'
+
+
+def test_render_metrics_exports_numeric_stats():
+    text = instrumentation.render_metrics({'cache': {'hits': 3, 'hit_rate': 0.5, 'name': 'x', 'on': True}})
+    assert 'quant_cache_hits 3' in text and 'quant_cache_hit_rate 0.5' in text
+    assert 'quant_cache_name' not in text and 'quant_cache_on' not in text
+
+
+def test_server_timing_and_metrics_routes(fixture_store):
+    import app
+
+    client = app.app.test_client()
+    response = client.post('/api/backtest', json={'ticker': 'AAPL', 'strategy': 'momentum'})
+    timing = response.headers['Server-Timing']
+    names = [entry.split(';')[0] for entry in timing.split(', ')]
+    assert 'fetch' in names and names[-1] == 'total'
+    assert all(re.fullmatch(r'[\w-]+;dur=\d+\.\d{2}', entry) for entry in timing.split(', '))
+
+    metrics = client.get('/api/metrics')
+    assert metrics.mimetype == 'text/plain'
+    text = metrics.get_data(as_text=True)
+    assert re.search(r'quant_request_duration_seconds_count\{route="/api/backtest",method="POST",status="200"\} \d+',
+                     text)
+    assert 'quant_stage_duration_seconds_bucket{stage="fetch"' in text
+    assert re.search(r'^quant_price_store_hits \d+$', text, re.M)
+
+
+def test_profile_is_opt_in(fixture_store, monkeypatch):
+    import app
+
+    client = app.app.test_client()
+    payload = {'ticker': 'MSFT', 'strategy': 'rsi'}
+    assert 'profile' not in client.post('/api/backtest', json=payload).get_json()
+
+    profile = client.post('/api/backtest?profile=1', json=payload).get_json()['profile']
+    assert profile['calls'] > 0 and profile['functions']
+    assert any('quant_a.py' in row['function'] for row in profile['functions'])
+
+    monkeypatch.setenv('API_PROFILING', '0')
+    assert 'profile' not in client.post('/api/backtest?profile=1', json=payload).get_json()
@@ -0,0 +1,44 @@
+"""
+Prédiction ML: walk-forward vectorisé identique à des réentraînements, service incrémental
+"""
+
+import numpy as np
+import pytest
+
+import ml_prediction
+from ml_service import ModelService
+
+
+@pytest.mark.parametrize('train_size', [None, 250])
+def test_walk_forward_matches_refits(train_size):
+    rng = np.random.default_rng(11)
+    returns = rng.normal(4e-4, 0.012, 600)
+    result = ml_prediction.walk_forward(returns, window=5, train_size=train_size)
+
+    X, y = ml_prediction.create_features(returns, 5)
+    min_train = result['min_train']
+    expected = []
+    for end in range(min_train, len(y)):
+        start = 0 if train_size is None else max(end - max(train_size, min_train), 0)
+        beta = np.linalg.lstsq(X[start:end], y[start:end], rcond=None)[0]
+        expected.append(X[end] @ beta * 100)
+    np.testing.assert_allclose(result['predicted'], expected, rtol=1e-6, atol=1e-9)
+
+
+def test_service_updates_incrementally_and_matches_full_fit():
+    rng = np.random.default_rng(5)
+    returns = rng.normal(4e-4, 0.012, 520)
+    dates = np.arange(len(returns), dtype=np.int64)
+    service = ModelService(timeout=30)
+
+    service.predict('portfolio', dates[:500], returns[:500])
+    result = service.predict('portfolio', dates[1:501], returns[1:501])
+    assert result['update'] == 'incremental'
+
+    full = ModelService(timeout=30)
+    fresh = full.predict('portfolio', dates[1:501], returns[1:501])
+    assert fresh['update'] == 'full'
+    incremental, = service._models.values()
+    refit, = full._models.values()
+    np.testing.assert_allclose(incremental.beta, refit.beta, rtol=1e-8, atol=1e-12)
+    assert result['model_metrics'] == pytest.approx(fresh['model_metrics'], rel=1e-6)
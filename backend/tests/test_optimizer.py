@@ -0,0 +1,96 @@
+"""
+Optimiseur: QP à ensemble actif identique à la solution analytique / SLSQP, frontière efficiente,
+risk parity, bornes de poids, route /api/portfolio/optimize
+"""
+
+import numpy as np
+import pytest
+from scipy.optimize import minimize
+
+import optimizer
+
+
+@pytest.fixture
+def inputs():
+    rng = np.random.default_rng(21)
+    factors = rng.normal(0, 0.01, (750, 2))
+    returns = factors @ rng.normal(1, 0.3, (2, 6)) + rng.normal(3e-4, 0.008, (750, 6))
+    return optimizer.estimate_inputs(returns)[:2]
+
+
+def slsqp(cov, lo, hi, mu=None, target=None):
+    constraints = [{'type': 'eq', 'fun': lambda w: w.sum() - 1}]
+    if target is not None:
+        constraints.append({'type': 'eq', 'fun': lambda w: mu @ w - target})
+    result = minimize(lambda w: w @ cov @ w, np.full(len(cov), 1 / len(cov)), method='SLSQP',
+                      bounds=list(zip(lo, hi)), constraints=constraints, options={'ftol': 1e-15, 'maxiter': 1000})
+    return result.x
+
+
+def test_unconstrained_min_variance_matches_closed_form(inputs):
+    _, cov = inputs
+    lo, hi = optimizer.weight_bounds(len(cov), -5.0, 5.0)
+    inv = np.linalg.solve(cov, np.ones(len(cov)))
+    np.testing.assert_allclose(optimizer.min_variance(cov, lo, hi), inv / inv.sum(), atol=1e-10)
+
+
+def test_bounded_min_variance_matches_slsqp(inputs):
+    _, cov = inputs
+    lo, hi = optimizer.weight_bounds(len(cov), 0.05, 0.3)
+    w = optimizer.min_variance(cov, lo, hi)
+    assert w.sum() == pytest.approx(1) and np.all(w >= lo - 1e-12) and np.all(w <= hi + 1e-12)
+    assert w @ cov @ w == pytest.approx(slsqp(cov, lo, hi) @ cov @ slsqp(cov, lo, hi), rel=1e-6)
+
+
+def test_frontier_points_are_minimum_variance_for_their_return(inputs):
+    mu, cov = inputs
+    lo, hi = optimizer.weight_bounds(len(mu), 0.0, 0.5)
+    frontier = optimizer.efficient_frontier(mu, cov, lo, hi, n_points=8)
+    stats = optimizer.portfolio_stats(frontier, mu, cov)
+    assert np.all(np.diff(stats['expected_return']) > 0)
+    assert np.all(np.diff(stats['volatility']) > -1e-12)
+    for w in frontier[1:-1]:
+        reference = slsqp(cov, lo, hi, mu, mu @ w)
+        assert w @ cov @ w == pytest.approx(reference @ cov @ reference, rel=1e-5)
+
+
+def test_max_sharpe_dominates_the_frontier(inputs):
+    mu, cov = inputs
+    lo, hi = optimizer.weight_bounds(len(mu))
+    best = optimizer.portfolio_stats(optimizer.max_sharpe(mu, cov, lo, hi), mu, cov)['sharpe_ratio']
+    frontier = optimizer.portfolio_stats(optimizer.efficient_frontier(mu, cov, lo, hi, 30), mu, cov)
+    assert best >= frontier['sharpe_ratio'].max() - 1e-6
+
+
+def test_risk_parity_equalizes_contributions(inputs):
+    _, cov = inputs
+    lo, hi = optimizer.weight_bounds(len(cov))
+    contributions = optimizer.portfolio_stats(optimizer.risk_parity(cov, lo, hi), np.zeros(len(cov)), cov)
+    np.testing.assert_allclose(contributions['risk_contributions'], 1 / len(cov), rtol=1e-4)
+
+
+def test_infeasible_bounds_rejected():
+    with pytest.raises(ValueError):
+        optimizer.weight_bounds(3, 0.0, 0.2)
+    with pytest.raises(ValueError):
+        optimizer.optimize(np.zeros((10, 2)), mode='max-return')
+
+
+def test_optimize_route(fixture_store):
+    import app
+
+    client = app.app.test_client()
+    tickers = ['AAPL', 'MSFT', 'GOOGL']
+    response = client.post('/api/portfolio/optimize', json={'tickers': tickers, 'mode': 'min-variance',
+                                                            'max_weight': 0.5})
+    assert response.status_code == 200
+    weights = response.get_json()['weights']
+    assert sorted(weights) == sorted(tickers) and sum(weights.values()) == pytest.approx(1, abs=1e-6)
+    assert max(weights.values()) <= 0.5 + 1e-9
+
+    frontier = client.post('/api/portfolio/optimize', json={'tickers': tickers, 'mode': 'frontier',
+                                                            'frontier_points': 5}).get_json()
+    assert len(frontier['frontier']) == 5
+
+    assert client.post('/api/portfolio/optimize', json={'tickers': tickers, 'max_weight': 0.2}).status_code == 400
+    assert client.post('/api/portfolio/optimize', json={'tickers': tickers, 'mode': 'max-return'}).status_code == 400
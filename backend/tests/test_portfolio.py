@@ -0,0 +1,54 @@
+"""
+Portefeuille avec constituants en échec de téléchargement (résultats partiels, fetch_errors)
+"""
+
+import pandas as pd
+import pytest
+
+import quant_b
+from price_store import FixtureSource
+
+ASSETS = [{'ticker': 'AAPL', 'weight': 40}, {'ticker': 'MSFT', 'weight': 30}, {'ticker': 'GOOGL', 'weight': 30}]
+
+
+class FailingSource(FixtureSource):
+    """Fixtures dont certains tickers lèvent une erreur upstream"""
+
+    def __init__(self, frames, failing):
+        super().__init__(frames)
+        self.failing = set(failing)
+
+    def fetch(self, ticker, interval='1d', start=None, end=None):
+        if ticker.upper() in self.failing:
+            raise RuntimeError('upstream indisponible')
+        return super().fetch(ticker, interval, start, end)
+
+
+def test_partial_fetch_returns_remaining_constituents(use_source, fixture_frames):
+    use_source(FailingSource(fixture_frames, failing={'GOOGL'}))
+    result = quant_b.analyze_portfolio(ASSETS, period='1y')
+
+    assert result is not None
+    assert sorted(result['assets_data']) == ['AAPL', 'MSFT']
+    assert list(result['fetch_errors']) == ['GOOGL']
+    # Poids renormalisés sur les seuls actifs récupérés
+    assert sorted(result['rebalancing']['final_weights']) == ['AAPL', 'MSFT']
+    assert sum(result['rebalancing']['final_weights'].values()) == pytest.approx(1.0, abs=1e-3)
+
+
+def test_all_constituents_failing_returns_none(use_source, fixture_frames):
+    use_source(FailingSource(fixture_frames, failing={'AAPL', 'MSFT', 'GOOGL'}))
+    assert quant_b.analyze_portfolio(ASSETS, period='1y') is None
+
+
+def test_partial_fetch_matches_portfolio_without_failed_asset(use_source, fixture_frames):
+    use_source(FailingSource(fixture_frames, failing={'GOOGL'}))
+    partial = quant_b.analyze_portfolio(ASSETS, period='1y')
+    use_source(FixtureSource(fixture_frames))
+    reference = quant_b.analyze_portfolio(ASSETS[:2], period='1y')
+
+    pd.testing.assert_series_equal(_values(partial), _values(reference))
+
+
+def _values(result):
+    return pd.DataFrame(result['history']).set_index('date')['portfolio']
@@ -0,0 +1,108 @@
+"""
+PriceStore: cache mémoire et disque, rafraîchissement de la fin de série, fichiers corrompus, échecs upstream
+"""
+
+import logging
+import os
+
+import pytest
+
+from price_store import FixtureSource, PriceStore
+
+
+class Clock:
+    def __init__(self, now):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class RecordingSource(FixtureSource):
+    """Fixtures qui enregistrent la date de début de chaque téléchargement, en échec si failing"""
+
+    def __init__(self, frames):
+        super().__init__(frames)
+        self.starts = []
+        self.failing = False
+
+    def fetch(self, ticker, interval='1d', start=None, end=None):
+        self.starts.append(start)
+        if self.failing:
+            raise RuntimeError('upstream indisponible')
+        return super().fetch(ticker, interval, start, end)
+
+
+@pytest.fixture
+def source(fixture_frames):
+    return RecordingSource(fixture_frames)
+
+
+@pytest.fixture
+def clock(fixture_frames):
+    return Clock(fixture_frames['AAPL'].index[-1].timestamp() + 3600)
+
+
+def make_store(source, clock, cache_dir=None, ttl=300):
+    return PriceStore(source=source, cache_dir=cache_dir, ttl=ttl, clock=clock, retry_after=30)
+
+
+def test_fresh_entry_served_from_memory(source, clock):
+    store = make_store(source, clock)
+    first = store.get_history('AAPL', period='6mo')
+    second = store.get_history('aapl', period='3mo')
+    assert len(source.starts) == 1
+    assert second.index[0] >= first.index[0] and second.index[-1] == first.index[-1]
+    assert store.snapshot()['hits'] == 1
+
+
+def test_stale_entry_downloads_only_the_tail(source, clock):
+    store = make_store(source, clock)
+    frame = store.get_history('AAPL', period='1y')
+    clock.now += 600
+    assert store.get_history('AAPL', period='1y').equals(frame)
+    assert source.starts[-1] == frame.index[-1]
+    assert store.snapshot()['tail_fetches'] == 1
+
+
+def test_disk_cache_survives_a_new_store(source, clock, tmp_path):
+    frame = make_store(source, clock, cache_dir=str(tmp_path)).get_history('MSFT', period='1y')
+    reloaded = make_store(source, clock, cache_dir=str(tmp_path)).get_history('MSFT', period='1y')
+    assert len(source.starts) == 1
+    assert reloaded.equals(frame)
+
+
+def test_corrupted_cache_file_is_logged_removed_and_refetched(source, clock, tmp_path, caplog):
+    store = make_store(source, clock, cache_dir=str(tmp_path))
+    path = store._path('MSFT', '1d')
+    os.makedirs(os.path.dirname(path))
+    with open(path, 'wb') as f:
+        f.write(b'pas un npz')
+
+    with caplog.at_level(logging.WARNING, logger='price_store'):
+        frame = store.get_history('MSFT', period='1y')
+    assert 'Corrupted cache file' in caplog.text
+    assert not frame.empty and len(source.starts) == 1
+    # Remplacé par la série retéléchargée
+    assert make_store(source, clock, cache_dir=str(tmp_path))._load('MSFT', '1d')['frame'].equals(frame)
+
+
+def test_failed_tail_refresh_backs_off(source, clock):
+    store = make_store(source, clock)
+    frame = store.get_history('AAPL', period='1y')
+    clock.now += 600
+    source.failing = True
+
+    # Cache servi, puis pas de nouvel appel upstream avant retry_after
+    assert store.get_history('AAPL', period='1y').equals(frame)
+    for _ in range(5):
+        assert store.get_history('AAPL', period='1y').equals(frame)
+    assert len(source.starts) == 2
+    assert store.plan('AAPL', period='1y') is None
+    assert store.snapshot()['errors'] == 1
+
+    clock.now += 31
+    source.failing = False
+    store.get_history('AAPL', period='1y')
+    assert len(source.starts) == 3
+    assert store.snapshot()['tail_fetches'] == 2
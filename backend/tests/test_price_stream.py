@@ -0,0 +1,98 @@
+"""
+Flux de prix SSE: un poller partagé, un seul téléchargement par ticker quel que soit le nombre de clients,
+événements seulement sur changement, arrêt du poller sans abonnés, route /api/stream
+"""
+
+import json
+import time
+
+import pytest
+
+from price_store import FixtureSource, PriceStore
+from price_stream import PriceStreamHub
+
+
+class MutableSource(FixtureSource):
+    """Fixtures modifiables entre deux polls, tickers demandés enregistrés"""
+
+    def __init__(self, frames):
+        super().__init__(frames)
+        self.fetched = []
+
+    def fetch(self, ticker, interval='1d', start=None, end=None):
+        self.fetched.append(ticker)
+        return super().fetch(ticker, interval, start, end)
+
+
+@pytest.fixture
+def source(fixture_frames):
+    return MutableSource({ticker: df.iloc[:-1] for ticker, df in fixture_frames.items()})
+
+
+@pytest.fixture
+def hub(source):
+    # TTL nul: chaque poll relit la source; poll manuel (intervalle très long après le premier)
+    return PriceStreamHub(store=PriceStore(source=source, cache_dir=None, ttl=0), poll_interval=3600)
+
+
+def test_subscribers_share_one_poll_and_receive_changes_only(hub, source, fixture_frames):
+    first = hub.subscribe(['AAPL', 'msft'])
+    second = hub.subscribe(['AAPL'])
+    events = [first.get(timeout=5), first.get(timeout=5)]
+    assert sorted(event['ticker'] for event in events) == ['AAPL', 'MSFT']
+    assert second.get(timeout=5)['ticker'] == 'AAPL'
+    assert sorted(set(source.fetched)) == ['AAPL', 'MSFT']
+
+    # Rien de nouveau: aucun événement
+    hub._poll(['AAPL', 'MSFT'])
+    assert first.queue.empty() and second.queue.empty()
+
+    # Nouvelle barre sur AAPL seulement
+    source.frames['AAPL'] = fixture_frames['AAPL']
+    hub._poll(['AAPL', 'MSFT'])
+    event = first.get(timeout=1)
+    assert event['ticker'] == 'AAPL' and event['new_bar']
+    assert event['price'] == pytest.approx(float(fixture_frames['AAPL']['Close'].iloc[-1]))
+    assert second.get(timeout=1) == event and first.queue.empty()
+
+
+def test_late_subscriber_gets_last_snapshot(hub):
+    hub.subscribe(['SPY']).get(timeout=5)
+    late = hub.subscribe(['SPY'])
+    assert late.get(timeout=1)['ticker'] == 'SPY'
+
+
+def test_poller_stops_without_subscribers(hub):
+    subscription = hub.subscribe(['GOOGL'])
+    subscription.get(timeout=5)
+    hub.unsubscribe(subscription)
+    hub._wake.set()
+    deadline = time.time() + 5
+    while hub._thread is not None and time.time() < deadline:
+        time.sleep(0.01)
+    assert hub._thread is None
+    assert hub.snapshot()['tickers'] == 0 and hub.snapshot()['subscribers'] == 0
+
+
+def test_stream_route(fixture_store, monkeypatch, source):
+    import app
+    import price_stream
+
+    hub = PriceStreamHub(store=PriceStore(source=source, cache_dir=None), poll_interval=3600)
+    monkeypatch.setattr(price_stream, 'get_hub', lambda: hub)
+    client = app.app.test_client()
+
+    assert client.get('/api/stream').status_code == 400
+    tickers = ','.join(f'T{i}' for i in range(app.STREAM_MAX_TICKERS + 1))
+    assert client.get(f'/api/stream?tickers={tickers}').status_code == 400
+
+    response = client.get('/api/stream?tickers=AAPL', buffered=False)
+    assert response.mimetype == 'text/event-stream'
+    chunks = iter(response.response)
+    assert next(chunks) == b'retry: 5000\n\n'
+    event = next(chunks).decode()
+    assert event.startswith('event: price\ndata: ') and event.endswith('\n\n')
+    assert json.loads(event.split('data: ', 1)[1])['ticker'] == 'AAPL'
+
+    response.close()
+    assert hub.snapshot()['subscribers'] == 0
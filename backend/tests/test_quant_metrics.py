@@ -0,0 +1,67 @@
+"""
+Noyau compute_all_metrics: mêmes valeurs que les fonctions de quant_metrics, en 1-D et en 2-D
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from quant_metrics import (
+    calculate_alpha, calculate_beta, calculate_calmar_ratio, calculate_cvar, calculate_hit_ratio,
+    calculate_information_ratio, calculate_kurtosis, calculate_omega_ratio, calculate_skewness,
+    calculate_sortino_ratio, calculate_var, calculate_win_loss_ratio, compute_all_metrics
+)
+
+
+@pytest.fixture
+def series():
+    rng = np.random.default_rng(7)
+    index = pd.bdate_range('2022-01-03', periods=252)
+    returns = pd.Series(rng.normal(4e-4, 0.012, len(index)), index=index)
+    benchmark = pd.Series(rng.normal(3e-4, 0.010, len(index)), index=index)
+    return returns, benchmark
+
+
+def per_function(returns, benchmark):
+    return {
+        'sortino_ratio': calculate_sortino_ratio(returns),
+        'calmar_ratio': calculate_calmar_ratio(returns, -10.0),
+        'var': calculate_var(returns),
+        'cvar': calculate_cvar(returns),
+        'omega_ratio': calculate_omega_ratio(returns),
+        'skewness': calculate_skewness(returns),
+        'kurtosis': calculate_kurtosis(returns),
+        'hit_ratio': calculate_hit_ratio(returns),
+        'win_loss_ratio': calculate_win_loss_ratio(returns),
+        'beta': calculate_beta(returns, benchmark),
+        'alpha': calculate_alpha(returns, benchmark),
+        'information_ratio': calculate_information_ratio(returns, benchmark),
+    }
+
+
+def test_compute_all_metrics_matches_per_function(series):
+    returns, benchmark = series
+    metrics = compute_all_metrics(returns.to_numpy(), benchmark=benchmark.to_numpy(), max_drawdown=-10.0)
+    for name, value in per_function(returns, benchmark).items():
+        assert metrics[name] == pytest.approx(float(value), rel=1e-9, abs=1e-12), name
+
+
+def test_columns_scored_independently(series):
+    returns, benchmark = series
+    rng = np.random.default_rng(8)
+    R = np.column_stack([returns.to_numpy(), rng.normal(0, 0.02, len(returns)), np.zeros(len(returns))])
+    batched = compute_all_metrics(R, benchmark=benchmark.to_numpy())
+    for j in range(R.shape[1]):
+        single = compute_all_metrics(R[:, j], benchmark=benchmark.to_numpy())
+        for name, value in single.items():
+            np.testing.assert_allclose(batched[name][j], value, rtol=1e-12, err_msg=name)
+
+
+def test_benchmark_metrics_align_by_date(series):
+    returns, benchmark = series
+    # Historiques décalés: seules les dates communes comptent, pas les positions
+    shifted = returns.iloc[20:]
+    aligned = benchmark.loc[shifted.index]
+    assert calculate_beta(shifted, benchmark) == pytest.approx(calculate_beta(shifted, aligned))
+    assert calculate_information_ratio(shifted, benchmark) == pytest.approx(
+        calculate_information_ratio(shifted, aligned))
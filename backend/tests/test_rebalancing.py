@@ -0,0 +1,68 @@
+"""
+Rééquilibrage vectorisé: valeurs identiques à une boucle jour par jour, calendriers et seuils
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import rebalancing
+
+
+@pytest.fixture
+def universe():
+    rng = np.random.default_rng(3)
+    prices = 100 * np.cumprod(1 + rng.normal(3e-4, 0.015, (504, 5)), axis=0)
+    dates = pd.bdate_range(end='2026-01-02', periods=len(prices)).to_numpy()
+    return prices, dates, rng.uniform(1, 2, 5)
+
+
+def daily_loop(prices, weights, rebalances, cost_bps):
+    # Référence: une itération par barre (quantités, valeur, coûts au rééquilibrage)
+    weights = weights / weights.sum()
+    shares = weights / prices[0]
+    values = [1.0]
+    rebalance_set = set(rebalances.tolist())
+    for t in range(1, len(prices)):
+        value = shares @ prices[t]
+        if t in rebalance_set:
+            traded = np.abs(shares * prices[t] / value - weights).sum()
+            value *= 1 - traded * cost_bps / 10_000
+            shares = value * weights / prices[t]
+        values.append(value)
+    return np.array(values)
+
+
+@pytest.mark.parametrize('schedule', rebalancing.SCHEDULES)
+def test_simulation_matches_daily_loop(universe, schedule):
+    prices, dates, weights = universe
+    result = rebalancing.simulate(prices, weights, schedule, dates, threshold=0.02, cost_bps=10)
+    np.testing.assert_allclose(result['values'], daily_loop(prices, weights, result['rebalances'], 10), rtol=1e-10)
+
+
+def test_monthly_rebalances_on_first_bar_of_each_month(universe):
+    prices, dates, weights = universe
+    result = rebalancing.simulate(prices, weights, 'monthly', dates)
+    months = pd.DatetimeIndex(dates).to_period('M')
+    assert all(months[i] != months[i - 1] for i in result['rebalances'])
+    assert len(result['rebalances']) == len(months.unique()) - 1
+
+
+def test_threshold_rebalances_only_after_drift(universe):
+    prices, dates, weights = universe
+    loose = rebalancing.simulate(prices, weights, 'threshold', dates, threshold=0.2)
+    tight = rebalancing.simulate(prices, weights, 'threshold', dates, threshold=0.01)
+    assert len(tight['rebalances']) > len(loose['rebalances'])
+
+
+def test_costs_reduce_value(universe):
+    prices, dates, weights = universe
+    free = rebalancing.simulate(prices, weights, 'monthly', dates, cost_bps=0)
+    costly = rebalancing.simulate(prices, weights, 'monthly', dates, cost_bps=50)
+    assert costly['values'][-1] < free['values'][-1]
+    assert rebalancing.turnover_summary(costly)['transaction_costs'] > 0
+
+
+def test_invalid_schedule_rejected():
+    with pytest.raises(ValueError):
+        rebalancing.validate('hourly')
@@ -0,0 +1,72 @@
+"""
+Cache de résultats de /api/portfolio: clé canonique (spec normalisée + version des données), ETag / 304,
+LRU borné en octets
+"""
+
+import pytest
+
+import quant_b
+from price_store import FixtureSource
+from response_cache import ResponseCache, canonical_key
+
+PORTFOLIO = {'assets': [{'ticker': 'AAPL', 'weight': 60}, {'ticker': 'MSFT', 'weight': 40}], 'period': '6mo'}
+
+
+@pytest.fixture
+def client(fixture_store, monkeypatch):
+    import app
+
+    monkeypatch.setattr(app, 'portfolio_cache', ResponseCache())
+    return app.app.test_client()
+
+
+def test_canonical_key_ignores_dict_order():
+    assert canonical_key({'a': 1, 'b': [1, 2]}) == canonical_key({'b': [1, 2], 'a': 1})
+    assert canonical_key({'a': 1}) != canonical_key({'a': 2})
+
+
+def test_lru_evicts_beyond_max_bytes():
+    cache = ResponseCache(max_bytes=10)
+    cache.put('a', b'xxxx', 'a')
+    cache.put('b', b'yyyy', 'b')
+    assert cache.get('a') is not None  # 'a' devient la plus récente
+    cache.put('c', b'zzzz', 'c')
+    assert cache.get('b') is None
+    assert cache.get('a') is not None and cache.get('c') is not None
+    cache.put('huge', b'0' * 11, 'huge')
+    assert cache.get('huge') is None
+    assert cache.snapshot()['bytes'] == 8 and cache.snapshot()['evictions'] == 1
+
+
+def test_repeated_request_served_from_cache_with_etag(client):
+    import app
+
+    first = client.post('/api/portfolio', json=PORTFOLIO)
+    assert first.status_code == 200 and first.headers['ETag']
+    # Mêmes actifs dans un autre ordre: même spec normalisée
+    reordered = {**PORTFOLIO, 'assets': PORTFOLIO['assets'][::-1]}
+    second = client.post('/api/portfolio', json=reordered)
+    assert second.headers['ETag'] == first.headers['ETag']
+    assert second.get_data() == first.get_data()
+    assert app.portfolio_cache.snapshot()['hits'] == 1
+
+    not_modified = client.post('/api/portfolio', json=PORTFOLIO, headers={'If-None-Match': first.headers['ETag']})
+    assert not_modified.status_code == 304 and not_modified.get_data() == b''
+    assert app.portfolio_cache.snapshot()['not_modified'] == 1
+
+
+def test_different_spec_gets_a_different_etag(client):
+    first = client.post('/api/portfolio', json=PORTFOLIO)
+    reweighted = {**PORTFOLIO, 'assets': [{'ticker': 'AAPL', 'weight': 50}, {'ticker': 'MSFT', 'weight': 50}]}
+    assert client.post('/api/portfolio', json=reweighted).headers['ETag'] != first.headers['ETag']
+    quarterly = client.post('/api/portfolio', json={**PORTFOLIO, 'rebalance_freq': 'quarterly'})
+    assert quarterly.headers['ETag'] != first.headers['ETag']
+
+
+def test_new_bar_changes_the_data_version(use_source, fixture_frames):
+    assets = PORTFOLIO['assets']
+    use_source(FixtureSource({t: df.iloc[:-1] for t, df in fixture_frames.items()}))
+    before = quant_b.portfolio_cache_key(assets, period='6mo')
+    use_source(FixtureSource(fixture_frames))
+    after = quant_b.portfolio_cache_key(assets, period='6mo')
+    assert before is not None and after is not None and before != after
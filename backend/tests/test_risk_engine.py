@@ -0,0 +1,87 @@
+"""
+Risk engine: reproductibilité quel que soit le découpage en shards, convergence vers la loi normale,
+bootstrap tiré de l'historique, statistiques de queue, validation, route /api/portfolio/risk
+"""
+
+import numpy as np
+import pytest
+from scipy import stats
+
+import risk_engine
+
+PORTFOLIO = {'assets': [{'ticker': 'AAPL', 'weight': 60}, {'ticker': 'MSFT', 'weight': 40}], 'period': '1y'}
+
+
+@pytest.fixture
+def history():
+    rng = np.random.default_rng(13)
+    cov = np.array([[1.0, 0.6, 0.2], [0.6, 1.0, 0.3], [0.2, 0.3, 1.0]]) * 1e-4
+    returns = rng.multivariate_normal([4e-4, 3e-4, 2e-4], cov, 500)
+    return returns, np.array([0.5, 0.3, 0.2])
+
+
+def test_shards_reproduce_the_single_run(history):
+    returns, weights = history
+    params = {'method': 'student-t', 'horizon': 10, 'paths': 10_000, 'size': 3_000, 'seed': 7}
+    whole = risk_engine.simulate_shard(returns, weights, chunk_ids=[0, 1, 2, 3], **params)
+    parts = [risk_engine.simulate_shard(returns, weights, chunk_ids=ids, **params) for ids in ([0, 1], [2], [3])]
+    np.testing.assert_array_equal(whole['terminal'], np.concatenate([part['terminal'] for part in parts]))
+    assert len(whole['terminal']) == 10_000
+
+
+def test_seed_controls_the_draws(history):
+    returns, weights = history
+    first = risk_engine.simulate(returns, weights, 'normal', paths=5_000, seed=1)
+    assert risk_engine.simulate(returns, weights, 'normal', paths=5_000, seed=1)['levels'] == first['levels']
+    assert risk_engine.simulate(returns, weights, 'normal', paths=5_000, seed=2)['levels'] != first['levels']
+
+
+def test_one_day_normal_simulation_matches_closed_form(history):
+    returns, weights = history
+    result = risk_engine.simulate(returns, weights, 'normal', horizon=1, paths=400_000, confidence=(0.95,))
+    portfolio = returns @ weights
+    expected_var = portfolio.mean() + stats.norm.ppf(0.05) * portfolio.std(ddof=1)
+    level = result['levels'][0.95]
+    assert level['var'] == pytest.approx(expected_var, rel=0.02)
+    assert level['var_band'][0] <= level['var'] <= level['var_band'][1]
+
+    parametric = risk_engine.simulate(returns, weights, 'parametric', horizon=1, confidence=(0.95,))
+    assert parametric['levels'][0.95]['var'] == pytest.approx(expected_var)
+
+
+def test_bootstrap_draws_historical_days(history):
+    returns, weights = history
+    result = risk_engine.simulate_shard(returns, weights, 'bootstrap', horizon=1, paths=2_000, size=2_000,
+                                        chunk_ids=[0], block_size=1)
+    assert np.isin(np.round(result['terminal'], 12), np.round(returns @ weights, 12)).all()
+
+
+def test_tail_statistics():
+    result = risk_engine.tail_statistics(np.arange(1000.0), 0.95)
+    assert result['var'] == 49 and result['cvar'] == pytest.approx(24.5)
+    assert result['var_band'][0] < 49 < result['var_band'][1]
+
+
+@pytest.mark.parametrize('kwargs', [
+    {'method': 'historical'}, {'horizon': 0}, {'paths': 10}, {'confidence': (0.4,)},
+    {'block_size': 0}, {'block_size': 300}, {'dof': 2}, {'dof': float('inf')},
+])
+def test_invalid_parameters_rejected(kwargs):
+    params = {'method': 'bootstrap', 'horizon': 10, 'paths': 10_000, 'confidence': (0.95,), **kwargs}
+    with pytest.raises(ValueError):
+        risk_engine.validate(**params)
+
+
+def test_risk_route(fixture_store):
+    import app
+
+    client = app.app.test_client()
+    payload = {**PORTFOLIO, 'method': 'bootstrap', 'paths': 20_000, 'confidence': [0.95, 0.99]}
+    first = client.post('/api/portfolio/risk', json=payload)
+    assert first.status_code == 200
+    body = first.get_json()
+    assert sorted(body['var']) == ['95', '99'] and body['var']['99'] <= body['var']['95']
+    assert client.post('/api/portfolio/risk', json=payload).get_json()['var'] == body['var']
+
+    assert client.post('/api/portfolio/risk', json={**payload, 'dof': 2}).status_code == 400
+    assert client.post('/api/portfolio/risk', json={**payload, 'block_size': 0}).status_code == 400
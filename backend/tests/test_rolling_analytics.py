@@ -0,0 +1,86 @@
+"""
+Métriques glissantes O(n): mêmes valeurs que pandas.rolling, corrélations par blocs, sélection de paires,
+route /api/portfolio/rolling
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import rolling_analytics
+
+ASSETS = [{'ticker': 'AAPL', 'weight': 40}, {'ticker': 'MSFT', 'weight': 30}, {'ticker': 'GOOGL', 'weight': 30}]
+
+
+@pytest.fixture
+def returns():
+    rng = np.random.default_rng(17)
+    # Niveau élevé: vérifie le centrage avant cumul (pas d'annulation catastrophique)
+    assets = rng.normal(0.05, 0.01, (400, 4)) + rng.normal(0, 0.01, (400, 1))
+    benchmark = assets.mean(axis=1) + rng.normal(0, 0.004, 400)
+    return assets, assets @ np.full(4, 0.25), benchmark
+
+
+def valid(series, window):
+    return series.to_numpy()[window - 1:]
+
+
+def test_metrics_match_pandas_rolling(returns):
+    assets, portfolio, benchmark = returns
+    windows = (20, 60)
+    results = rolling_analytics.compute(portfolio, assets, windows, benchmark)
+
+    p, b, frame = pd.Series(portfolio), pd.Series(benchmark), pd.DataFrame(assets)
+    for window in windows:
+        rolling = p.rolling(window)
+        sharpe = (rolling.mean() - 0.02 / 252) / rolling.std() * np.sqrt(252)
+        beta = p.rolling(window).cov(b) / b.rolling(window).var()
+        np.testing.assert_allclose(results[window]['sharpe'], valid(sharpe, window), rtol=1e-8)
+        np.testing.assert_allclose(results[window]['volatility'], valid(rolling.std() * np.sqrt(252) * 100, window),
+                                   rtol=1e-8)
+        np.testing.assert_allclose(results[window]['beta'], valid(beta, window), rtol=1e-8)
+
+        i, j = rolling_analytics.all_pairs(4)
+        for k, (a, c) in enumerate(zip(i, j)):
+            expected = valid(frame[a].rolling(window).corr(frame[c]), window)
+            np.testing.assert_allclose(results[window]['correlation'][:, k], expected, rtol=1e-8, atol=1e-10)
+        np.testing.assert_allclose(results[window]['average_correlation'],
+                                   results[window]['correlation'].mean(axis=1))
+
+
+def test_chunked_correlation_is_identical(returns):
+    assets, _, _ = returns
+    whole = rolling_analytics.rolling_correlation(assets, (30,))
+    chunked = rolling_analytics.rolling_correlation(assets, (30,), chunk_elements=len(assets))
+    np.testing.assert_array_equal(whole[30], chunked[30])
+
+
+def test_pair_selection_and_short_history(returns):
+    assets, portfolio, _ = returns
+    everything = rolling_analytics.compute(portfolio, assets, (20,))
+    # Paires (3, 1) et (0, 2): colonnes (1, 3) et (0, 2) du triangle supérieur
+    selected = rolling_analytics.compute(portfolio, assets, (20,), pairs=(np.array([3, 0]), np.array([1, 2])))
+    i, j = rolling_analytics.all_pairs(4)
+    columns = [int(np.flatnonzero((i == a) & (j == c))[0]) for a, c in ((1, 3), (0, 2))]
+    np.testing.assert_array_equal(selected[20]['correlation'], everything[20]['correlation'][:, columns])
+    assert 'beta' not in everything[20]
+
+    assert list(rolling_analytics.compute(portfolio[:50], assets[:50], (20, 60))) == [20]
+
+
+def test_rolling_route(fixture_store):
+    import app
+
+    client = app.app.test_client()
+    response = client.post('/api/portfolio/rolling', json={'assets': ASSETS, 'windows': [20, 60],
+                                                           'pairs': [['AAPL', 'MSFT']]})
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body['pairs'] == ['AAPL/MSFT'] and body['benchmark'] == 'SPY'
+    point = body['windows']['20']['history'][-1]
+    assert {'sharpe', 'volatility', 'beta', 'AAPL/MSFT', 'average_correlation'} <= set(point)
+    assert -1 <= point['AAPL/MSFT'] <= 1
+
+    assert client.post('/api/portfolio/rolling', json={'assets': ASSETS, 'windows': [1]}).status_code == 400
+    too_many = list(range(10, 10 + rolling_analytics.MAX_WINDOWS + 1))
+    assert client.post('/api/portfolio/rolling', json={'assets': ASSETS, 'windows': too_many}).status_code == 400
@@ -0,0 +1,94 @@
+"""
+Screener: calendriers distincts (mêmes métriques que backtest_strategy), cycle de vie d'un job, route
+"""
+
+import time
+
+import pandas as pd
+import pytest
+
+import quant_a
+from conftest import make_frame
+from price_store import FixtureSource
+from screener import ScreenerJobs, calendar_blocks
+
+
+@pytest.fixture
+def mixed_calendars(use_source, fixture_frames):
+    # Crypto 7j/7 et introduction récente à côté des actions en jours ouvrés
+    end = fixture_frames['AAPL'].index[-1]
+    frames = {
+        **fixture_frames,
+        'BTC-USD': make_frame(pd.date_range(end=end, periods=730, tz='America/New_York'), seed=10, volatility=0.03),
+        'NEWCO': fixture_frames['MSFT'].iloc[-150:] * 0.5,
+    }
+    use_source(FixtureSource(frames))
+    return frames
+
+
+def wait(jobs, job, timeout=30):
+    deadline = time.time() + timeout
+    while job.status in ('pending', 'running'):
+        assert time.time() < deadline, job.stage
+        time.sleep(0.01)
+    return job
+
+
+def test_calendar_blocks_group_identical_dates(mixed_calendars):
+    blocks = calendar_blocks(mixed_calendars)
+    assert sorted(sorted(tickers) for _, tickers in blocks) == [['AAPL', 'GOOGL', 'MSFT', 'SPY'], ['BTC-USD'], ['NEWCO']]
+    for matrix, tickers in blocks:
+        assert matrix.shape == (len(mixed_calendars[tickers[0]]), len(tickers))
+
+
+def test_rows_match_single_backtests(mixed_calendars):
+    jobs = ScreenerJobs()
+    job = wait(jobs, jobs.submit(['AAPL', 'BTC-USD', 'NEWCO'], ['momentum', 'rsi'], period=20))
+    assert job.status == 'done'
+
+    for row in job.rows:
+        single = quant_a.backtest_strategy(row['ticker'], row['strategy'], 20, '1y')
+        assert row['bars'] == single['bars']
+        for metric in ('strategy_return', 'sharpe_ratio', 'max_drawdown'):
+            assert row[metric] == pytest.approx(single[metric], abs=1e-4), (row['ticker'], row['strategy'], metric)
+
+
+def test_job_lifecycle_and_reuse(fixture_store):
+    jobs = ScreenerJobs()
+    job = jobs.submit(['aapl', 'MSFT', 'AAPL'], ['momentum'])
+    assert job.spec['tickers'] == 2
+    wait(jobs, job)
+
+    payload = job.to_dict('strategy_return', limit=1)
+    assert payload['status'] == 'done' and payload['progress'] == 1.0
+    assert len(payload['rows']) == 1 and payload['count'] == 2
+    # Même univers (ordre, casse): job resservi depuis le cache de résultats
+    assert jobs.submit(['MSFT', 'AAPL'], ['momentum']) is job
+    assert jobs.snapshot()['reused'] == 1
+
+
+def test_screener_routes(fixture_store, monkeypatch):
+    import app
+    import screener
+
+    jobs = ScreenerJobs()
+    monkeypatch.setattr(screener, 'get_jobs', lambda executor=None: jobs)
+    client = app.app.test_client()
+
+    response = client.post('/api/screener', json={'tickers': ['AAPL', 'MSFT'], 'strategies': ['momentum']})
+    assert response.status_code in (200, 202)
+    job_id = response.get_json()['job_id']
+    wait(jobs, jobs.get(job_id))
+    assert client.get(f'/api/screener/{job_id}?sort=max_drawdown').get_json()['count'] == 2
+
+    assert client.get('/api/screener/inconnu').status_code == 404
+    assert client.get(f'/api/screener/{job_id}?sort=volume').status_code == 400
+    assert client.get(f'/api/screener/{job_id}?limit=abc').status_code == 400
+
+    def broken(*args, **kwargs):
+        raise RuntimeError('résultat illisible')
+
+    monkeypatch.setattr(jobs.get(job_id), 'to_dict', broken)
+    response = client.get(f'/api/screener/{job_id}')
+    assert response.status_code == 500
+    assert 'error' in response.get_json()
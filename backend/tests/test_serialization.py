@@ -0,0 +1,60 @@
+"""
+Formats négociés (Accept): JSON historique par défaut, history colonnaire (orjson) et MessagePack optionnel
+portant les mêmes valeurs
+"""
+
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+from werkzeug.datastructures import MIMEAccept
+
+import serialization
+
+
+def test_negotiation_defaults_to_row_json():
+    assert serialization.negotiate(MIMEAccept()) == serialization.JSON
+    assert serialization.negotiate(MIMEAccept([('*/*', 1)])) == serialization.JSON
+    assert serialization.negotiate(MIMEAccept([('text/html', 1)])) == serialization.JSON
+    columnar = MIMEAccept([(serialization.COLUMNAR_JSON, 1), (serialization.JSON, 0.5)])
+    assert serialization.negotiate(columnar) == serialization.COLUMNAR_JSON
+    assert serialization.history_layout(serialization.COLUMNAR_JSON) == 'columns'
+
+
+def test_encode_numpy_arrays_and_nan():
+    payload = {'series': {'ma': np.array([np.nan, 1.5])}, 'count': np.int64(2)}
+    assert json.loads(serialization.encode(payload, serialization.COLUMNAR_JSON)) == \
+        {'series': {'ma': [None, 1.5]}, 'count': 2}
+
+
+def rows_to_columns(rows):
+    return {name: [row[name] for row in rows] for name in rows[0] if name != 'date'}
+
+
+@pytest.mark.parametrize('route, payload', [
+    ('/api/backtest', {'ticker': 'AAPL', 'strategy': 'bollinger', 'history_period': '6mo'}),
+    ('/api/portfolio', {'assets': [{'ticker': 'AAPL', 'weight': 50}, {'ticker': 'MSFT', 'weight': 50}]}),
+])
+def test_columnar_response_carries_the_same_history(fixture_store, route, payload):
+    import app
+
+    client = app.app.test_client()
+    rows = client.post(route, json=payload)
+    columnar = client.post(route, json=payload, headers={'Accept': serialization.COLUMNAR_JSON})
+    assert rows.mimetype == serialization.JSON and columnar.mimetype == serialization.COLUMNAR_JSON
+    assert 'Accept' in columnar.headers['Vary']
+
+    history_rows, history = rows.get_json()['history'], json.loads(columnar.get_data())['history']
+    assert history['date_unit'] == 'day'
+    dates = pd.to_datetime(np.array(history['dates']), unit='D').strftime('%Y-%m-%d').tolist()
+    assert dates == [row['date'] for row in history_rows]
+    for name, values in rows_to_columns(history_rows).items():
+        np.testing.assert_allclose(np.array(history['series'][name], dtype=float), np.array(values, dtype=float))
+
+
+@pytest.mark.skipif(serialization.msgpack is None, reason='msgpack non installé')
+def test_msgpack_matches_columnar_json():
+    payload = {'dates': np.arange(3), 'series': {'price': np.array([1.0, 2.0, 3.0])}, 'bars': np.int64(3)}
+    decoded = serialization.msgpack.unpackb(serialization.encode(payload, serialization.MSGPACK))
+    assert decoded == json.loads(serialization.encode(payload, serialization.COLUMNAR_JSON))
@@ -0,0 +1,85 @@
+"""
+Noyaux de signaux: repli NumPy (et Numba s'il est installé) identique aux boucles de référence barre par barre
+(RSI de Wilder, hystérésis, stops, sizing par volatilité cible)
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import signal_kernels
+
+
+@pytest.fixture
+def prices():
+    rng = np.random.default_rng(29)
+    # Dérive faible + faible volatilité: trades longs (au-delà du balayage scalaire du repli NumPy)
+    returns = rng.normal(2e-4, 0.01, (3000, 6))
+    returns[:, 5] = rng.normal(0, 0.001, 3000)
+    return 100 * np.cumprod(1 + returns, axis=0)
+
+
+def reference_rsi(prices, periods):
+    out = np.empty(prices.shape)
+    signal_kernels._wilder_rsi_loop(prices, np.asarray(periods, dtype=np.int64), out)
+    return out
+
+
+def reference_positions(prices, entries, exits, sizes, stop_loss=None, take_profit=None, trailing_stop=None):
+    out = np.empty(prices.shape)
+    stops = [np.inf if value is None else value for value in (stop_loss, take_profit, trailing_stop)]
+    signal_kernels._positions_loop(prices, entries, exits, np.broadcast_to(sizes, prices.shape), *stops, out)
+    return out
+
+
+@pytest.fixture(params=['numpy', 'numba'])
+def kernels(request, monkeypatch):
+    monkeypatch.setenv('SIGNAL_KERNELS', 'auto' if request.param == 'numba' else 'numpy')
+    monkeypatch.setattr(signal_kernels, '_kernels', None)
+    if signal_kernels.backend() != request.param:
+        pytest.skip('numba non installé')
+    yield request.param
+    monkeypatch.setattr(signal_kernels, '_kernels', None)
+
+
+def test_wilder_rsi_matches_loop(kernels, prices):
+    periods = np.array([2, 14, 14, 30, 5000, 14])
+    np.testing.assert_allclose(signal_kernels.wilder_rsi(prices, periods), reference_rsi(prices, periods),
+                               rtol=1e-9, atol=1e-9)
+    flat = signal_kernels.wilder_rsi(prices[:, 0], 14)
+    np.testing.assert_allclose(flat, reference_rsi(prices[:, :1], [14])[:, 0], rtol=1e-9)
+    # Prix constants: ni gain ni perte
+    assert signal_kernels.wilder_rsi(np.full(20, 10.0), 5)[-1] == 50.0
+
+
+@pytest.mark.parametrize('stops', [
+    {}, {'stop_loss': 0.05}, {'take_profit': 0.1}, {'trailing_stop': 0.03},
+    {'stop_loss': 0.08, 'take_profit': 0.2, 'trailing_stop': 0.05}, {'stop_loss': 0.5},
+])
+def test_positions_match_loop(kernels, prices, stops):
+    rsi = reference_rsi(prices, [14] * prices.shape[1])
+    entries, exits = rsi < 40, rsi > 70
+    sizes = np.where(np.arange(len(prices))[:, None] % 7 == 0, np.nan, 1 + prices / prices.max())
+    np.testing.assert_array_equal(signal_kernels.positions(prices, entries, exits, sizes, **stops),
+                                  reference_positions(prices, entries, exits, sizes, **stops))
+    np.testing.assert_array_equal(signal_kernels.positions(prices, entries, exits, 0.5, **stops),
+                                  reference_positions(prices, entries, exits, 0.5, **stops))
+
+
+def test_volatility_target_sizes_match_pandas(prices):
+    returns = np.diff(prices[:, 0]) / prices[:-1, 0]
+    sizes = signal_kernels.volatility_target_sizes(returns, 0.15, window=20, max_leverage=2.0)
+    expected = np.minimum(0.15 / (pd.Series(returns).rolling(20).std() * np.sqrt(252)), 2.0)
+    np.testing.assert_allclose(sizes, expected.to_numpy(), rtol=1e-9)
+
+
+def test_risk_parameters(fixture_store):
+    import app
+
+    with pytest.raises(ValueError):
+        signal_kernels.validate_risk(stop_loss=1.5)
+    client = app.app.test_client()
+    payload = {'ticker': 'AAPL', 'strategy': 'rsi', 'history_period': '1y'}
+    assert client.post('/api/backtest', json={**payload, 'stop_loss': 0.05, 'target_volatility': 0.15}) \
+        .status_code == 200
+    assert client.post('/api/backtest', json={**payload, 'trailing_stop': 2}).status_code == 400
@@ -0,0 +1,85 @@
+"""
+Single-flight: appels concurrents identiques coalescés (résultat et erreur partagés), clés distinctes
+indépendantes; requêtes HTTP simultanées sur le même ticker -> un seul téléchargement
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from price_store import SyntheticSource
+from singleflight import SingleFlight
+
+
+def run_concurrently(n, fn):
+    with ThreadPoolExecutor(max_workers=n) as pool:
+        futures = [pool.submit(fn) for _ in range(n)]
+    return futures
+
+
+def wait_for_calls(flights, n, timeout=5):
+    deadline = time.time() + timeout
+    while flights.snapshot()['calls'] < n and time.time() < deadline:
+        time.sleep(0.001)
+
+
+def test_concurrent_calls_share_one_execution():
+    flights = SingleFlight()
+    release = threading.Event()
+    executed = []
+
+    def slow():
+        executed.append(1)
+        release.wait(5)
+        return object()
+
+    def call():
+        return flights.do('key', slow)
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        futures = [pool.submit(call) for _ in range(8)]
+        wait_for_calls(flights, 8)
+        release.set()
+    results = {id(future.result()) for future in futures}
+
+    assert executed == [1] and len(results) == 1
+    assert flights.snapshot() == {'calls': 8, 'executed': 1, 'coalesced': 7, 'in_flight': 0}
+
+
+def test_error_is_raised_to_every_waiter():
+    flights = SingleFlight()
+    release = threading.Event()
+
+    def failing():
+        release.wait(5)
+        raise RuntimeError('upstream')
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        futures = [pool.submit(flights.do, 'key', failing) for _ in range(4)]
+        wait_for_calls(flights, 4)
+        release.set()
+    for future in futures:
+        with pytest.raises(RuntimeError):
+            future.result()
+    # La clé est libérée: l'appel suivant s'exécute
+    assert flights.do('key', lambda: 42) == 42
+
+
+def test_distinct_keys_run_independently():
+    flights = SingleFlight()
+    assert [flights.do(k, lambda k=k: k * 2) for k in range(3)] == [0, 2, 4]
+    assert flights.snapshot()['executed'] == 3
+
+
+def test_simultaneous_requests_fetch_once(use_source):
+    import app
+
+    source = SyntheticSource(latency=0.2)
+    use_source(source)
+    client = app.app.test_client()
+
+    futures = run_concurrently(6, lambda: client.get('/api/asset/AAPL?period=1mo').status_code)
+    assert [future.result() for future in futures] == [200] * 6
+    assert source.calls == 1
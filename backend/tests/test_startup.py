@@ -0,0 +1,37 @@
+"""
+Démarrage à froid: import de app.py dans un process neuf, sous le budget de benchmarks/suite.py,
+sans charger les dépendances lourdes (importées à la première requête qui les utilise)
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(BACKEND, 'benchmarks'))
+from suite import STARTUP_BUDGET_MS  # noqa: E402
+
+HEAVY_MODULES = ('pandas', 'scipy', 'sklearn', 'yfinance', 'quant_a', 'quant_b')
+
+PROBE = f"""
+import json, sys, time
+t0 = time.perf_counter()
+import app
+elapsed = (time.perf_counter() - t0) * 1000
+print(json.dumps({{'ms': elapsed, 'loaded': [m for m in {HEAVY_MODULES!r} if m in sys.modules]}}))
+"""
+
+
+def cold_import():
+    env = {**os.environ, 'PRICE_SOURCE': 'synthetic', 'PYTHONWARNINGS': 'ignore'}
+    output = subprocess.run([sys.executable, '-c', PROBE], cwd=BACKEND, env=env, check=True,
+                            capture_output=True, text=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def test_cold_import_of_app_is_within_budget():
+    # Meilleur de 3 process neufs: insensible au bruit de la machine
+    runs = [cold_import() for _ in range(3)]
+    assert min(run['ms'] for run in runs) < STARTUP_BUDGET_MS
+    assert runs[0]['loaded'] == []
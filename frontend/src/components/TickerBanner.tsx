@@ -1,4 +1,5 @@
 import { useState, useEffect } from 'react';
+import { subscribePrices } from '../services/api';
 
 interface TickerData {
   symbol: string;
@@ -28,29 +29,14 @@ export default function TickerBanner() {
   );
 
   useEffect(() => {
-    const fetchTicker = async (symbol: string, index: number) => {
-      try {
-        const response = await fetch(`http://localhost:5000/api/asset/${symbol}`);
-        const data = await response.json();
-        if (!data.error) {
-          setTickers(prev => {
-            const newTickers = [...prev];
-            newTickers[index] = { symbol, price: data.current_price, change: data.price_change, loading: false };
-            return newTickers;
-          });
-        }
-      } catch {
-        setTickers(prev => {
-          const newTickers = [...prev];
-          newTickers[index] = { ...newTickers[index], loading: false };
-          return newTickers;
-        });
-      }
-    };
-
-    MAJOR_TICKERS.forEach((idx, i) => fetchTicker(idx.symbol, i));
-    const interval = setInterval(() => MAJOR_TICKERS.forEach((idx, i) => fetchTicker(idx.symbol, i)), 60000);
-    return () => clearInterval(interval);
+    // Live updates pushed by the backend instead of polling each symbol every minute
+    return subscribePrices(MAJOR_TICKERS.map(idx => idx.symbol), (update) => {
+      setTickers(prev => prev.map(ticker =>
+        ticker.symbol.toUpperCase() === update.ticker
+          ? { symbol: ticker.symbol, price: update.price, change: update.change, loading: false }
+          : ticker
+      ));
+    });
   }, []);
 
   return (
@@ -1,7 +1,8 @@
-import { useState, useEffect } from 'react';
+import { useState, useEffect, useRef } from 'react';
 import { LineChart, Line, XAxis, YAxis, CartesianGrid, Tooltip as ChartTooltip, Legend, ResponsiveContainer, PieChart, Pie, Cell } from 'recharts';
 import Tooltip from '../components/Tooltip';
 import TickerSearch from '../components/TickerSearch';
+import { subscribePrices } from '../services/api';
 
 interface Asset {
   ticker: string;
@@ -10,6 +11,8 @@ interface Asset {
 
 const COLORS = ['#6366f1', '#10b981', '#f59e0b', '#ef4444', '#8b5cf6', '#06b6d4', '#f97316', '#ec4899'];
 const API_URL = import.meta.env.VITE_API_URL || 'http://localhost:5000/api';
+// Minimum delay between two refreshes triggered by intraday price updates (new bars refresh immediately)
+const REFRESH_MIN_INTERVAL = 5 * 60 * 1000;
 
 export default function Portfolio() {
   const [assets, setAssets] = useState<Asset[]>([
@@ -21,6 +24,9 @@ export default function Portfolio() {
   const [rebalanceFreq, setRebalanceFreq] = useState<'daily' | 'weekly' | 'monthly'>('monthly');
   const [portfolioData, setPortfolioData] = useState<any>(null);
   const [loading, setLoading] = useState(false);
+  // ETag of the last analysis: an unchanged portfolio is answered with 304 Not Modified
+  const etagRef = useRef<string | null>(null);
+  const lastRefreshRef = useRef(0);
 
   const handleAddAsset = () => {
     if (assets.length < 8) setAssets([...assets, { ticker: 'NVDA', weight: 10 }]);
@@ -48,21 +54,30 @@ export default function Portfolio() {
   };
 
   const handleAnalyze = async () => {
+    lastRefreshRef.current = Date.now();
     normalizeWeights();
     setLoading(true);
     try {
       const response = await fetch(`${API_URL}/portfolio`, {
         method: 'POST',
-        headers: { 'Content-Type': 'application/json' },
+        headers: {
+          'Content-Type': 'application/json',
+          ...(etagRef.current && portfolioData ? { 'If-None-Match': etagRef.current } : {})
+        },
         body: JSON.stringify({
           assets: assets.map(a => ({ ticker: a.ticker, weight: a.weight / 100 })),
           rebalance_freq: rebalanceFreq
         })
       });
+      if (response.status === 304) {
+        setLoading(false);
+        return;
+      }
       const result = await response.json();
       if (result.error) {
         alert(`Error: ${result.error}`);
       } else {
+        etagRef.current = response.headers.get('ETag');
         setPortfolioData(result);
       }
     } catch (error) {
@@ -73,17 +88,22 @@ export default function Portfolio() {
 
   const totalWeight = assets.reduce((sum, a) => sum + a.weight, 0);
 
-  // Auto-refresh portfolio data every 5 minutes
-  useEffect(() => {
-    if (!portfolioData) return;
+  // Refresh when the price stream reports a change for one of the assets
+  const handleAnalyzeRef = useRef(handleAnalyze);
+  handleAnalyzeRef.current = handleAnalyze;
+  const hasData = portfolioData !== null;
+  const streamTickers = assets.map(a => a.ticker).join(',');
 
-    const intervalId = setInterval(() => {
-      console.log('🔄 Auto-refreshing portfolio data (5min interval)...');
-      handleAnalyze();
-    }, 5 * 60 * 1000); // 5 minutes in milliseconds
+  useEffect(() => {
+    if (!hasData) return;
 
-    return () => clearInterval(intervalId);
-  }, [portfolioData, assets, rebalanceFreq]);
+    return subscribePrices(streamTickers.split(','), (update) => {
+      if (update.new_bar || Date.now() - lastRefreshRef.current >= REFRESH_MIN_INTERVAL) {
+        console.log('🔄 Price update received, refreshing portfolio...');
+        handleAnalyzeRef.current();
+      }
+    });
+  }, [hasData, streamTickers]);
 
   const SmallMetric = ({ label, value, status, tooltip }: any) => (
     <div style={{ background: '#09090b', padding: '12px', borderRadius: '8px' }}>
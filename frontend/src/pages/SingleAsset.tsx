@@ -1,9 +1,12 @@
-import { useState, useEffect } from 'react';
-import { getAssetData } from '../services/api';
+import { useState, useEffect, useRef } from 'react';
+import { batchQuery, subscribePrices } from '../services/api';
 import { LineChart, Line, XAxis, YAxis, CartesianGrid, Tooltip as ChartTooltip, Legend, ResponsiveContainer } from 'recharts';
 import Tooltip from '../components/Tooltip';
 import TickerSearch from '../components/TickerSearch';
 
+// Minimum delay between two refreshes triggered by intraday price updates (new bars refresh immediately)
+const REFRESH_MIN_INTERVAL = 5 * 60 * 1000;
+
 export default function SingleAsset() {
   const [ticker, setTicker] = useState('AAPL');
   const [strategy, setStrategy] = useState('buy-hold');
@@ -12,11 +15,18 @@ export default function SingleAsset() {
   const [backtestData, setBacktestData] = useState<any>(null);
   const [loading, setLoading] = useState(false);
   const [initialLoadDone, setInitialLoadDone] = useState(false);
+  const lastRefreshRef = useRef(0);
 
   const handleFetch = async () => {
+    lastRefreshRef.current = Date.now();
     setLoading(true);
     try {
-      const result = await getAssetData(ticker);
+      // Asset data and backtest in a single request (one price load on the backend)
+      const results = await batchQuery([
+        { id: 'asset', type: 'asset', ticker },
+        { id: 'backtest', type: 'backtest', ticker, strategy, period: strategyParam },
+      ]);
+      const result = results.asset.body;
       if (result.error) {
         alert(`Error: ${result.error}`);
         setLoading(false);
@@ -24,12 +34,7 @@ export default function SingleAsset() {
       }
       setData(result);
 
-      const backtestResponse = await fetch('http://localhost:5000/api/backtest', {
-        method: 'POST',
-        headers: { 'Content-Type': 'application/json' },
-        body: JSON.stringify({ ticker, strategy, period: strategyParam })
-      });
-      const backtestResult = await backtestResponse.json();
+      const backtestResult = results.backtest.body;
       if (backtestResult.error) {
         alert(`Backtest error: ${backtestResult.error}`);
         setLoading(false);
@@ -61,17 +66,20 @@ export default function SingleAsset() {
     runBacktest();
   }, [strategy, strategyParam, ticker, initialLoadDone]);
 
-  // Auto-refresh data every 5 minutes
+  // Refresh when the price stream reports a change for this ticker
+  const handleFetchRef = useRef(handleFetch);
+  handleFetchRef.current = handleFetch;
+
   useEffect(() => {
     if (!initialLoadDone) return;
 
-    const intervalId = setInterval(() => {
-      console.log('🔄 Auto-refreshing data (5min interval)...');
-      handleFetch();
-    }, 5 * 60 * 1000); // 5 minutes in milliseconds
-
-    return () => clearInterval(intervalId);
-  }, [initialLoadDone, ticker, strategy, strategyParam]);
+    return subscribePrices([ticker], (update) => {
+      if (update.new_bar || Date.now() - lastRefreshRef.current >= REFRESH_MIN_INTERVAL) {
+        console.log('🔄 Price update received, refreshing data...');
+        handleFetchRef.current();
+      }
+    });
+  }, [initialLoadDone, ticker]);
 
   const strategies: Record<string, string> = {
     'buy-hold': 'Buy & Hold',
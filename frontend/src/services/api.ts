@@ -19,3 +19,43 @@ export async function getAssetData(ticker: string) {
   console.log(`✅ Received data for ${ticker}`);
   return data;
 }
+
+export interface BatchQuery {
+  id?: string;
+  type: 'asset' | 'backtest' | 'portfolio';
+  [param: string]: any;
+}
+
+export interface BatchResult {
+  id: string | number;
+  type: string;
+  status: number;
+  body: any;
+}
+
+// One round-trip for several sub-queries: the backend loads each ticker once and runs them concurrently
+export async function batchQuery(queries: BatchQuery[]): Promise<Record<string, BatchResult>> {
+  const response = await fetch(`${API_URL}/batch`, {
+    method: 'POST',
+    headers: { 'Content-Type': 'application/json' },
+    body: JSON.stringify({ queries })
+  });
+  const data = await response.json();
+  if (data.error) throw new Error(data.error);
+  return Object.fromEntries(data.results.map((result: BatchResult) => [String(result.id), result]));
+}
+
+export interface PriceUpdate {
+  ticker: string;
+  price: number;
+  change: number;
+  bar: string;
+  new_bar: boolean;
+}
+
+// Server-Sent Events: the backend polls each ticker once for all clients and pushes only changes
+export function subscribePrices(tickers: string[], onUpdate: (update: PriceUpdate) => void): () => void {
+  const source = new EventSource(`${API_URL}/stream?tickers=${encodeURIComponent(tickers.join(','))}`);
+  source.addEventListener('price', (event) => onUpdate(JSON.parse((event as MessageEvent).data)));
+  return () => source.close();
+}